@@ -1,7 +1,7 @@
 import asyncio
 import logging
 import sys
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from datetime import datetime, timezone
 from time import perf_counter
 from uuid import uuid4
@@ -22,7 +22,19 @@ from bond.api.security import (
     is_internal_auth_protected_path,
 )
 from bond.config import settings
+from bond.corpus.jobs import get_ingest_queue, shutdown_ingest_queue
+from bond.corpus.reranker import get_reranker
+from bond.corpus.sources.file_source import shutdown_extract_pool
+from bond.db import llm_cache, metadata_log, search_cache  # noqa: F401  (registers migrations)
+from bond.db.llm_cache import run_llm_cache_sweeper
+from bond.db.pool import sqlite_pools
+from bond.db.search_cache import get_search_cache_stats, run_search_cache_sweeper
 from bond.graph.graph import compile_graph
+from bond.llm import get_llm_cache_stats
+from bond.mcp.exa_pool import exa_mcp_pool, get_exa_pool_stats
+from bond.store.article_log import close_article_db
+from bond.store.embedding_cache import get_embedding_cache_stats
+from bond.store.embeddings import get_embedding_report, warm_up_embeddings
 
 logging.basicConfig(
     level=logging.INFO,
@@ -30,15 +42,45 @@ logging.basicConfig(
     datefmt="%Y-%m-%dT%H:%M:%S",
     stream=sys.stdout,
 )
+log = logging.getLogger(__name__)
+
+
+async def _warm_up_models() -> None:
+    """Load the shared embedding and reranker models before the first request needs them."""
+    if settings.embedding_warm_up:
+        try:
+            await asyncio.to_thread(warm_up_embeddings)
+        except Exception as exc:
+            log.warning("Embedding warm-up failed (%s) — model will load on first use", exc)
+    if settings.rerank_preload:
+        try:
+            await asyncio.to_thread(get_reranker().preload)
+        except Exception as exc:
+            log.warning("Reranker preload failed (%s) — model will load on first use", exc)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    await _warm_up_models()
+    await asyncio.to_thread(get_ingest_queue().resume)
     runtime = CommandRuntime()
     app.state.runtime = runtime
-    async with compile_graph() as graph:
+    async with sqlite_pools(settings.metadata_db_path), exa_mcp_pool(), compile_graph() as graph:
         app.state.graph = graph
-        yield
+        sweepers = [asyncio.create_task(run_search_cache_sweeper())]
+        if settings.llm_cache_enabled:
+            sweepers.append(asyncio.create_task(run_llm_cache_sweeper()))
+        try:
+            yield
+        finally:
+            for sweeper in sweepers:
+                sweeper.cancel()
+                with suppress(asyncio.CancelledError):
+                    await sweeper
     await runtime.shutdown()
+    await asyncio.to_thread(shutdown_ingest_queue)
+    await asyncio.to_thread(shutdown_extract_pool)
+    close_article_db()
 
 
 async def _check_sqlite(path: str) -> str:
@@ -88,6 +130,12 @@ async def _build_readiness_payload(request: Request) -> dict[str, object]:
         "version": request.app.version,
         "timestamp": _utc_timestamp(),
         "checks": checks,
+        "embedding_cache": get_embedding_cache_stats(),
+        "search_cache": get_search_cache_stats(),
+        "llm_cache": get_llm_cache_stats(),
+        "exa_mcp": get_exa_pool_stats(),
+        "embeddings": get_embedding_report(),
+        "reranker": get_reranker().stats(),
     }
 
 
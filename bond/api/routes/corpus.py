@@ -1,5 +1,12 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+import asyncio
+import os
+import tempfile
+from uuid import uuid4
+
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+from sse_starlette.sse import EventSourceResponse
 from bond.models import (
     IngestTextRequest,
     IngestResult,
@@ -8,10 +15,12 @@ from bond.models import (
     IngestDriveRequest,
     BatchIngestResult,
     DriveIngestResult,
+    IngestJob,
 )
 from bond.corpus.sources.text_source import ingest_text
-from bond.corpus.sources.file_source import extract_text
+from bond.corpus.sources.file_source import MAX_FILE_SIZE, extract_chunks
 from bond.corpus.ingestor import CorpusIngestor
+from bond.corpus.jobs import JobProgress, get_ingest_queue, register_job_handler
 from bond.corpus.sources.url_source import ingest_blog
 from bond.corpus.sources.drive_source import (
     build_drive_service,
@@ -19,7 +28,7 @@ from bond.corpus.sources.drive_source import (
     list_folder_files,
 )
 from bond.security import UnsafeUrlError, validate_public_url
-from bond.store.article_log import get_article_count, get_chunk_count, get_articles
+from bond.store.article_log import get_corpus_snapshot
 from bond.corpus.smoke_test import run_smoke_test, DEFAULT_QUERY
 from bond.config import settings
 
@@ -56,29 +65,156 @@ class SmokeTestResult(BaseModel):
     result_count: int
 
 
-@router.post("/ingest/text", response_model=IngestResult)
-async def ingest_text_endpoint(request: IngestTextRequest):
-    if not request.text.strip():
-        raise HTTPException(status_code=422, detail="Treść nie może być pusta.")
+# ---------------------------------------------------------------------------
+# Ingest job handlers — run on the ingest worker pool (bond/corpus/jobs.py),
+# either inline for a synchronous request or as a durable background job
+# ---------------------------------------------------------------------------
+
+def _progress_kwargs(progress: JobProgress | None) -> dict:
+    return {"on_result": progress.record} if progress is not None else {}
+
+
+@register_job_handler("text")
+def _run_text_ingest(payload: dict, progress: JobProgress | None) -> dict:
     result = ingest_text(
-        text=request.text,
-        source_type=request.source_type.value,
-        title=request.title,
+        text=payload["text"],
+        source_type=payload["source_type"],
+        title=payload["title"],
     )
+    if progress is not None:
+        progress.record({"title": payload["title"]}, result)
+    warnings = []
+    if result.get("status") == "unchanged":
+        warnings.append("Ten tekst jest już w korpusie — pominięto.")
     return IngestResult(
         article_id=result["article_id"],
-        title=request.title,
+        title=payload["title"],
         chunks_added=result["chunks_added"],
-        source_type=request.source_type.value,
-        warnings=[],
+        source_type=payload["source_type"],
+        warnings=warnings,
+    ).model_dump()
+
+
+@register_job_handler("file")
+def _run_file_ingest(payload: dict, progress: JobProgress | None) -> dict:
+    filename = payload["filename"]
+    title = payload["title"]
+    chunks = extract_chunks(payload["upload_path"], filename)
+    warnings = []
+    if chunks is None:
+        warnings.append(f"Nie udało się odczytać pliku {filename} — plik został pominięty.")
+        return IngestResult(
+            article_id="",
+            title=title,
+            chunks_added=0,
+            source_type=payload["source_type"],
+            warnings=warnings,
+        ).model_dump()
+
+    ingestor = CorpusIngestor()
+    result = ingestor.ingest_chunks(
+        chunks=chunks,
+        title=title,
+        source_type=payload["source_type"],
+        source_url="",
+    )
+    if progress is not None:
+        progress.record({"title": title}, result)
+    if result.get("status") == "unchanged":
+        warnings.append(f"Plik {filename} jest już w korpusie — pominięto.")
+    return IngestResult(
+        article_id=result["article_id"],
+        title=title,
+        chunks_added=result["chunks_added"],
+        source_type=payload["source_type"],
+        warnings=warnings,
+    ).model_dump()
+
+
+def _batch_result(result: dict, source_type: str) -> dict:
+    return BatchIngestResult(
+        articles_ingested=result["articles_ingested"],
+        total_chunks=result["total_chunks"],
+        source_type=source_type,
+        articles_unchanged=result.get("articles_unchanged", 0),
+        warnings=result.get("warnings", []),
+    ).model_dump()
+
+
+@register_job_handler("url")
+def _run_url_ingest(payload: dict, progress: JobProgress | None) -> dict:
+    result = ingest_blog(
+        url=payload["url"],
+        source_type=payload["source_type"],
+        **_progress_kwargs(progress),
+    )
+    return _batch_result(result, payload["source_type"])
+
+
+@register_job_handler("drive")
+def _run_drive_ingest(payload: dict, progress: JobProgress | None) -> dict:
+    result = ingest_drive_folder(
+        folder_id=payload["folder_id"],
+        source_type=payload["source_type"],
+        full_resync=payload.get("full_resync", False),
+        **_progress_kwargs(progress),
     )
+    return _batch_result(result, payload["source_type"])
+
+
+async def _dispatch(kind: str, payload: dict, background: bool):
+    """Run inline and return the handler's result, or enqueue and answer 202 with the job."""
+    queue = get_ingest_queue()
+    if not background:
+        return await queue.run_inline(kind, payload)
+    job = await asyncio.to_thread(queue.submit, kind, payload)
+    return JSONResponse(status_code=202, content=IngestJob(**job).model_dump())
+
+
+class _UploadTooLarge(Exception):
+    pass
+
+
+def _spool_upload(source, filename: str, directory: str) -> str:
+    """Copy an upload into ``directory`` in 1 MB blocks, giving up as soon as it passes MAX_FILE_SIZE."""
+    os.makedirs(directory, exist_ok=True)
+    safe_name = os.path.basename(filename) or "upload"
+    path = os.path.join(directory, f"{uuid4().hex}-{safe_name}")
+    written = 0
+    try:
+        with open(path, "wb") as f:
+            while block := source.read(1 << 20):
+                written += len(block)
+                if written > MAX_FILE_SIZE:
+                    raise _UploadTooLarge(filename)
+                f.write(block)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+_JOB_RESPONSES = {202: {"model": IngestJob, "description": "Zadanie importu przyjęte (background=true)"}}
+
+
+@router.post("/ingest/text", response_model=IngestResult, responses=_JOB_RESPONSES)
+async def ingest_text_endpoint(request: IngestTextRequest, background: bool = False):
+    if not request.text.strip():
+        raise HTTPException(status_code=422, detail="Treść nie może być pusta.")
+    payload = {
+        "text": request.text,
+        "title": request.title,
+        "source_type": request.source_type.value,
+    }
+    return await _dispatch("text", payload, background)
 
 
-@router.post("/ingest/file", response_model=IngestResult)
+@router.post("/ingest/file", response_model=IngestResult, responses=_JOB_RESPONSES)
 async def ingest_file_endpoint(
     file: UploadFile = File(...),
     source_type: str = Form(...),
     title: str = Form(default=""),
+    background: bool = False,
 ):
     # Validate source_type
     try:
@@ -89,40 +225,38 @@ async def ingest_file_endpoint(
             detail=f"Pole source_type musi mieć wartość 'own' albo 'external'; otrzymano: {source_type}",
         )
 
-    content = await file.read()
     filename = file.filename or "upload"
-    effective_title = title or filename
-
-    text = extract_text(content, filename)
-    warnings = []
-    if text is None:
-        warnings.append(f"Nie udało się odczytać pliku {filename} — plik został pominięty.")
-        return IngestResult(
-            article_id="",
-            title=effective_title,
-            chunks_added=0,
-            source_type=st.value,
-            warnings=warnings,
-        )
-
-    ingestor = CorpusIngestor()
-    result = ingestor.ingest(
-        text=text,
-        title=effective_title,
-        source_type=st.value,
-        source_url="",
-    )
-    return IngestResult(
-        article_id=result["article_id"],
-        title=effective_title,
-        chunks_added=result["chunks_added"],
-        source_type=st.value,
-        warnings=warnings,
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"Plik {filename} przekracza limit {MAX_FILE_SIZE // (1024 * 1024)} MB.",
     )
+    # Reject on the declared size before touching the body, then enforce while spooling
+    if file.size is not None and file.size > MAX_FILE_SIZE:
+        raise too_large
+    # Background uploads outlive the request (a job resumed after a restart still needs
+    # the file); synchronous ones go to the temp dir and are removed afterwards
+    directory = settings.ingest_upload_dir if background else tempfile.gettempdir()
+    try:
+        upload_path = await asyncio.to_thread(_spool_upload, file.file, filename, directory)
+    except _UploadTooLarge:
+        raise too_large from None
+
+    payload = {
+        "filename": filename,
+        "title": title or filename,
+        "source_type": st.value,
+        "upload_path": upload_path,
+    }
+    if background:
+        return await _dispatch("file", payload, background)
+    try:
+        return await _dispatch("file", payload, background)
+    finally:
+        os.remove(upload_path)
 
 
-@router.post("/ingest/url", response_model=BatchIngestResult)
-async def ingest_url_endpoint(request: IngestUrlRequest):
+@router.post("/ingest/url", response_model=BatchIngestResult, responses=_JOB_RESPONSES)
+async def ingest_url_endpoint(request: IngestUrlRequest, background: bool = False):
     if not request.url.strip():
         raise HTTPException(status_code=422, detail="Adres URL nie może być pusty.")
     try:
@@ -133,35 +267,26 @@ async def ingest_url_endpoint(request: IngestUrlRequest):
     except UnsafeUrlError as exc:
         raise HTTPException(status_code=422, detail=str(exc)) from exc
 
-    result = ingest_blog(url=validated_url, source_type=request.source_type.value)
-    return BatchIngestResult(
-        articles_ingested=result["articles_ingested"],
-        total_chunks=result["total_chunks"],
-        source_type=request.source_type.value,
-        warnings=result.get("warnings", []),
-    )
+    payload = {"url": validated_url, "source_type": request.source_type.value}
+    return await _dispatch("url", payload, background)
 
 
-@router.post("/ingest/drive", response_model=BatchIngestResult)
-async def ingest_drive_endpoint(request: IngestDriveRequest):
+@router.post("/ingest/drive", response_model=BatchIngestResult, responses=_JOB_RESPONSES)
+async def ingest_drive_endpoint(request: IngestDriveRequest, background: bool = False):
     if not request.folder_id.strip():
         raise HTTPException(status_code=422, detail="ID folderu nie może być puste.")
-    result = ingest_drive_folder(
-        folder_id=request.folder_id,
-        source_type=request.source_type.value,
-    )
-    return BatchIngestResult(
-        articles_ingested=result["articles_ingested"],
-        total_chunks=result["total_chunks"],
-        source_type=request.source_type.value,
-        warnings=result.get("warnings", []),
-    )
+    payload = {
+        "folder_id": request.folder_id,
+        "source_type": request.source_type.value,
+        "full_resync": request.full_resync,
+    }
+    return await _dispatch("drive", payload, background)
 
 
 @router.post("/drive-ingest", response_model=DriveIngestResult)
 async def drive_ingest_endpoint(request: IngestDriveRequest):
     """
-    List files in a Google Drive folder, then ingest all supported documents.
+    List files in a Google Drive folder (recursively), then sync it into the corpus.
     Returns a combined result: file listing + ingestion summary.
     Triggered by the MCP bond-drive server or directly by the frontend.
     """
@@ -170,17 +295,21 @@ async def drive_ingest_endpoint(request: IngestDriveRequest):
 
     # List files first so the response includes what was found
     try:
-        service = build_drive_service()
-        files = list_folder_files(service, request.folder_id)
+        service = await asyncio.to_thread(build_drive_service)
+        files = await asyncio.to_thread(list_folder_files, service, request.folder_id)
     except Exception as e:
         raise HTTPException(
             status_code=502,
             detail=f"Autoryzacja Google Drive nie powiodła się: {e}",
         )
 
-    result = ingest_drive_folder(
-        folder_id=request.folder_id,
-        source_type=request.source_type.value,
+    result = await get_ingest_queue().run_inline(
+        "drive",
+        {
+            "folder_id": request.folder_id,
+            "source_type": request.source_type.value,
+            "full_resync": request.full_resync,
+        },
     )
 
     return DriveIngestResult(
@@ -188,19 +317,62 @@ async def drive_ingest_endpoint(request: IngestDriveRequest):
         articles_ingested=result["articles_ingested"],
         total_chunks=result["total_chunks"],
         source_type=request.source_type.value,
+        articles_unchanged=result.get("articles_unchanged", 0),
+        articles_deleted=result.get("articles_deleted", 0),
         files=files,
-        warnings=result.get("warnings", []),
+        warnings=result["warnings"],
     )
 
 
+# ---------------------------------------------------------------------------
+# Ingest jobs
+# ---------------------------------------------------------------------------
+
+def _job_or_404(job: dict | None, job_id: str) -> IngestJob:
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Nie znaleziono zadania importu {job_id}.")
+    return IngestJob(**job)
+
+
+@router.get("/jobs", response_model=list[IngestJob])
+async def list_ingest_jobs(limit: int = 50):
+    jobs = await asyncio.to_thread(get_ingest_queue().recent, limit)
+    return [IngestJob(**job) for job in jobs]
+
+
+@router.get("/jobs/{job_id}", response_model=IngestJob)
+async def get_ingest_job(job_id: str):
+    return _job_or_404(await asyncio.to_thread(get_ingest_queue().get, job_id), job_id)
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=IngestJob)
+async def cancel_ingest_job(job_id: str):
+    return _job_or_404(await asyncio.to_thread(get_ingest_queue().cancel, job_id), job_id)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_ingest_job(job_id: str, request: Request):
+    """SSE stream of ``job`` events (the IngestJob JSON) whenever status or progress changes."""
+    queue = get_ingest_queue()
+    _job_or_404(await asyncio.to_thread(queue.get, job_id), job_id)
+
+    async def _events():
+        async for job in queue.watch(job_id):
+            if await request.is_disconnected():
+                return
+            yield {"event": "job", "data": IngestJob(**job).model_dump_json()}
+
+    return EventSourceResponse(_events(), headers={"Cache-Control": "no-cache"}, ping=None)
+
+
 @router.get("/status", response_model=CorpusStatus)
 async def corpus_status_endpoint():
     """
     CORP-06: Return article count and chunk count.
     CORP-07: Include low_corpus_warning when article count < LOW_CORPUS_THRESHOLD.
     """
-    article_count = get_article_count()
-    chunk_count = get_chunk_count()
+    snapshot = await asyncio.to_thread(get_corpus_snapshot)
+    article_count = snapshot["article_count"]
 
     warning = None
     if article_count < settings.low_corpus_threshold:
@@ -212,11 +384,11 @@ async def corpus_status_endpoint():
             "dla wiarygodnego dopasowania stylu."
         )
 
-    documents = [DocumentInfo(**doc) for doc in get_articles()]
+    documents = [DocumentInfo(**doc) for doc in snapshot["documents"]]
 
     return CorpusStatus(
         article_count=article_count,
-        chunk_count=chunk_count,
+        chunk_count=snapshot["chunk_count"],
         low_corpus_warning=warning,
         documents=documents,
     )
@@ -8,6 +8,10 @@ logger = logging.getLogger(__name__)
 
 _OPEN_THINKING_TAG = "<thinking>"
 _CLOSE_THINKING_TAG = "</thinking>"
+# Set by writer_node on each call of a sectional draft (WRITER_SECTION_METADATA_KEY)
+_WRITER_SECTION_KEY = "writer_section"
+# Set by writer_node on block repair calls (WRITER_REPAIR_METADATA_KEY); never streamed
+_WRITER_REPAIR_KEY = "writer_repair"
 
 # Business nodes we surface to the frontend — internal LangGraph bookkeeping nodes
 # (__start__, __end__, router functions) are intentionally excluded.
@@ -139,14 +143,61 @@ class _WriterTokenSanitizer:
             return
 
 
+class _WriterSectionOrderer:
+    """Serialize concurrently streamed writer sections back into outline order.
+
+    The earliest unfinished section streams live; tokens of later sections are
+    buffered and released, after a blank line, once every earlier section has
+    ended — so the client still receives one draft in reading order.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self._next = 0
+        self._buffered: dict[int, list[str]] = {}
+        self._ended: set[int] = set()
+        self._started: set[int] = set()
+
+    def _emit(self, section: int, text: str) -> str:
+        if section and section not in self._started:
+            text = "\n\n" + text
+        self._started.add(section)
+        return text
+
+    def feed(self, section: int, text: str) -> Iterator[str]:
+        if section == self._next:
+            yield self._emit(section, text)
+        else:
+            self._buffered.setdefault(section, []).append(text)
+
+    def end(self, section: int) -> Iterator[str]:
+        self._ended.add(section)
+        while self._next in self._ended:
+            self._next += 1
+            for text in self._buffered.pop(self._next, []):
+                yield self._emit(self._next, text)
+
+    def flush(self) -> Iterator[str]:
+        """Release whatever is still buffered (a section whose end event never came)."""
+        for section in sorted(self._buffered):
+            for text in self._buffered.pop(section):
+                yield self._emit(section, text)
+
+
 async def parse_stream_events(events: AsyncIterator[Any]) -> AsyncIterator[str]:
     """
     Parses LangGraph astream_events (v2) and yields raw JSON StreamEvent strings.
 
-    Handles three LangGraph event kinds:
+    Handles four LangGraph event kinds:
     - on_chain_start       → node_start  +  optional stage update
     - on_chain_end         → node_end
     - on_chat_model_stream → token  (empty chunks are dropped)
+    - on_chat_model_end    → buffered tokens of the next sectional writer call
+
+    Sectional writer drafts stream several sections at once; their tokens are
+    re-ordered per section (``_WriterSectionOrderer``) before being emitted.
 
     All non-token events carry JSON-encoded ``data`` fields so that the
     frontend can deserialise them uniformly.  Token events carry raw text
@@ -158,17 +209,33 @@ async def parse_stream_events(events: AsyncIterator[Any]) -> AsyncIterator[str]:
     """
     active_node: str | None = None
     writer_token_sanitizer = _WriterTokenSanitizer()
+    writer_section_orderer = _WriterSectionOrderer()
+
+    def writer_tokens(texts) -> Iterator[str]:
+        for text in texts:
+            for token_text in writer_token_sanitizer.feed(text):
+                if token_text:
+                    yield StreamEvent(type="token", data=token_text).model_dump_json()
 
     try:
         async for event in events:
             kind = event.get("event")
 
+            # Runnables inside a sectional writer call would re-announce the writer node,
+            # which makes the frontend clear the draft streamed so far
+            if kind in ("on_chain_start", "on_chain_end") and _writer_section(event) is not None:
+                continue
+            # Block repair rewrites are spliced into the draft sent at the checkpoint pause
+            if event.get("metadata", {}).get(_WRITER_REPAIR_KEY):
+                continue
+
             if kind == "on_chain_start":
                 node_name = _extract_node_name(event)
                 if node_name:
                     active_node = node_name
-                    if node_name == "writer":
+                    if node_name == "writer" and event.get("name") == node_name:
                         writer_token_sanitizer.reset()
+                        writer_section_orderer.reset()
                     label = _NODE_LABELS.get(node_name, {}).get("start", node_name)
                     yield StreamEvent(
                         type="node_start",
@@ -187,6 +254,9 @@ async def parse_stream_events(events: AsyncIterator[Any]) -> AsyncIterator[str]:
             elif kind == "on_chain_end":
                 node_name = _extract_node_name(event)
                 if node_name:
+                    if node_name == "writer" and event.get("name") == node_name:
+                        for token_event in writer_tokens(writer_section_orderer.flush()):
+                            yield token_event
                     label = _NODE_LABELS.get(node_name, {}).get("end", node_name)
                     yield StreamEvent(
                         type="node_end",
@@ -194,12 +264,18 @@ async def parse_stream_events(events: AsyncIterator[Any]) -> AsyncIterator[str]:
                     ).model_dump_json()
                     if node_name == active_node:
                         active_node = None
-                    if node_name == "writer":
+                    if node_name == "writer" and event.get("name") == node_name:
                         writer_token_sanitizer.reset()
+                        writer_section_orderer.reset()
 
             elif kind == "on_chat_model_stream":
                 chunk = event.get("data", {}).get("chunk")
-                if chunk is not None:
+                section = _writer_section(event)
+                if chunk is not None and section is not None:
+                    for text in _iter_token_texts(chunk):
+                        for token_event in writer_tokens(writer_section_orderer.feed(section, text)):
+                            yield token_event
+                elif chunk is not None:
                     for text in _iter_token_texts(chunk):
                         token_texts = (
                             writer_token_sanitizer.feed(text)
@@ -212,6 +288,12 @@ async def parse_stream_events(events: AsyncIterator[Any]) -> AsyncIterator[str]:
                                     type="token", data=token_text
                                 ).model_dump_json()
 
+            elif kind == "on_chat_model_end":
+                section = _writer_section(event)
+                if section is not None:
+                    for token_event in writer_tokens(writer_section_orderer.end(section)):
+                        yield token_event
+
     finally:
         # Best-effort cleanup: close the astream_events async iterator so that
         # LangGraph releases its internal resources when the producer finishes or
@@ -244,6 +326,14 @@ def _extract_node_name(event: dict) -> str | None:
     return node_name if node_name in _KNOWN_NODES else None
 
 
+def _writer_section(event: dict) -> int | None:
+    """Section index of a sectional writer call's event, None for any other event."""
+    metadata = event.get("metadata", {})
+    if metadata.get("langgraph_node") != "writer":
+        return None
+    return metadata.get(_WRITER_SECTION_KEY)
+
+
 def _matching_tag_suffix_length(text: str, tag: str) -> int:
     max_length = min(len(text), len(tag) - 1)
     for suffix_length in range(max_length, 0, -1):
@@ -8,10 +8,92 @@ class Settings(BaseSettings):
     article_db_path: str = "./data/articles.db"
     low_corpus_threshold: int = 10
     rag_top_k: int = 5
+    retrieval_mode: str = "concurrent"  # concurrent | overfetch (see two_pass_retrieve)
+    retrieval_overfetch_factor: int = 4
     max_blog_posts: int = 50
     allow_private_url_ingest: bool = False
     google_auth_method: str = "oauth"
     google_credentials_path: str = "./credentials.json"
+    # Google Drive sync (bond/corpus/sources/drive_sync.py)
+    drive_sync_db_path: str = "./data/drive_sync.db"
+    drive_download_workers: int = 4
+
+    # Bulk corpus ingestion (CorpusIngestor.ingest_many)
+    ingest_embed_batch_size: int = 256
+    ingest_chunk_workers: int = 4
+
+    # Background ingest jobs (bond/corpus/jobs.py)
+    ingest_job_db_path: str = "./data/ingest_jobs.db"
+    ingest_job_workers: int = 2
+    ingest_upload_dir: str = "./data/ingest_uploads"
+
+    # Document extraction (bond/corpus/sources/file_source.py); 0 workers = in-process
+    extract_workers: int = 2
+    extract_timeout_seconds: float = 120.0
+
+    # Blog scraping (bond/corpus/sources/blog_fetcher.py)
+    blog_fetch_workers: int = 8
+    blog_fetch_per_host: int = 2
+    blog_fetch_delay_seconds: float = 0.5
+    blog_fetch_timeout_seconds: float = 30.0
+    blog_extract_workers: int = 2  # 0 = extract in the fetch threads
+
+    # Embedding cache (bond/store/embedding_cache.py); empty path = memory only
+    embedding_cache_size: int = 2048
+    embedding_cache_path: str = ""
+
+    # Embedding model backend (bond/store/embeddings.py): torch | onnx | openvino
+    embedding_backend: str = "torch"
+    embedding_onnx_file: str = ""  # e.g. "onnx/model_qint8_avx512_vnni.onnx"
+    embedding_warm_up: bool = True
+
+    # Writer RAG exemplars: worker threads for retrieval
+    exemplar_retrieval_workers: int = 4
+
+    # FlashRank reranker (bond/corpus/reranker.py)
+    rerank_model: str = "ms-marco-MultiBERT-L-12"  # multilingual (incl. Polish)
+    rerank_cache_dir: str = "/tmp/flashrank"
+    rerank_candidates: int = 15  # candidates fetched from Chroma before reranking
+    rerank_score_cache_size: int = 4096
+    rerank_batch_window_ms: float = 5.0
+    rerank_max_batch_pairs: int = 64
+    rerank_preload: bool = True
+
+    # Pooled aiosqlite connections (bond/db/pool.py), opened by the API lifespan
+    sqlite_pool_size: int = 4
+    sqlite_statement_cache_size: int = 256
+    sqlite_busy_timeout_ms: int = 5000
+
+    # Exa search_cache in metadata_db_path (bond/db/search_cache.py)
+    search_cache_ttl_days: int = 7
+    search_cache_max_bytes: int = 64 * 1024 * 1024  # compressed payloads, LRU-evicted above this
+    search_cache_compression: str = "zlib"  # "zlib" | "zstd" (needs zstandard) | "none"
+    search_cache_zlib_level: int = 6
+    search_cache_sweep_interval_seconds: float = 3600.0
+    # Semantic tier (opt-in): reuse the nearest cached topic above this cosine similarity,
+    # only when its keywords and the numbers in its topic are the same
+    search_cache_semantic_enabled: bool = False
+    search_cache_semantic_threshold: float = 0.92
+    # Exa MCP session pool (bond/mcp/exa_pool.py), opened by the API lifespan
+    exa_mcp_url: str = "https://mcp.exa.ai/mcp"
+    exa_mcp_pool_size: int = 2
+    exa_mcp_max_concurrency: int = 6
+    exa_mcp_keepalive_seconds: float = 30.0
+    exa_mcp_connect_timeout_seconds: float = 15.0
+    exa_mcp_call_timeout_seconds: float = 60.0
+    # Deterministic LLM response cache (bond/llm.py, bond/db/llm_cache.py); temperature-0 calls only
+    llm_cache_enabled: bool = False
+    llm_cache_ttl_days: int = 7
+    llm_cache_max_bytes: int = 32 * 1024 * 1024
+    # Per call site (cache_site=...), effective only while llm_cache_enabled is set
+    llm_cache_sub_queries: bool = True
+    llm_cache_synthesis: bool = True
+    llm_cache_structure: bool = True
+    llm_cache_shadow_annotate: bool = True
+    # Cross-process coalescing of identical research requests (multi-worker deployments)
+    research_lease_enabled: bool = False
+    research_lease_ttl_seconds: float = 300.0
+    research_lease_poll_seconds: float = 1.0
 
     # Phase 2: Author Mode Backend
     checkpoint_db_path: str = "./data/bond_checkpoints.db"
@@ -19,6 +101,26 @@ class Settings(BaseSettings):
     research_model: str = "gpt-4o-mini"
     draft_model: str = "gpt-4o"
     min_word_count: int = 800
+    # Stream writer drafts and restart an attempt as soon as its H1, meta line or a forbidden
+    # stem fails for certain. Off by default: these checks are also auto-repaired after a
+    # complete draft, so a restart trades repair edits for a rewritten draft.
+    writer_stream_validation: bool = False
+    # Write the first draft as intro + one concurrent call per H2 of the approved outline.
+    # Faster for long articles; every call repeats the research context, so input tokens
+    # grow with the number of sections.
+    writer_sectional_enabled: bool = False
+    writer_section_concurrency: int = 4
+    # Opt-in: checkpoint-2 feedback that names specific sections regenerates only those
+    # sections and splices them back; feedback that cannot be mapped still revises the whole draft.
+    writer_targeted_revision: bool = False
+    # Fix a failed meta description, H1 or first-paragraph keyword check by rewriting just that
+    # block on research_model before the template-based repairs run. Global failures (word
+    # count) still regenerate the draft.
+    writer_block_repair_enabled: bool = False
+    # While checkpoint_1 waits for the editor, retrieve and rerank writer exemplars and fit the
+    # research context in the background (in-process, per thread). Costs retrieval work for
+    # sessions that are abandoned at checkpoint 1.
+    writer_prefetch_enabled: bool = False
     duplicate_threshold: float = 0.85
 
     # OpenAI API configuration
@@ -1,3 +1,5 @@
+from typing import Iterable, Iterator
+
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 # 1875 chars ≈ 500 tokens for Polish text (~3.75 chars/token average)
@@ -12,3 +14,29 @@ def chunk_article(text: str) -> list[str]:
     """Split article text into style-corpus chunks. Filters empty chunks."""
     chunks = _splitter.split_text(text)
     return [c for c in chunks if len(c.strip()) > 50]
+
+# Text buffered before splitting when chunking a stream of pages/paragraphs
+_STREAM_BUFFER_CHARS = 8 * 1875
+
+
+def chunk_stream(pieces: Iterable[str], separator: str = "\n\n") -> Iterator[str]:
+    """
+    Incremental chunk_article over a stream of text pieces (PDF pages, DOCX paragraphs).
+
+    Pieces are joined with ``separator`` and split whenever the buffer grows past
+    _STREAM_BUFFER_CHARS. The last chunk of each split may continue on the next
+    piece, so it is carried into the buffer instead of being emitted. Memory stays
+    bounded by the buffer rather than by the whole document.
+    """
+    buffer = ""
+    for piece in pieces:
+        buffer = f"{buffer}{separator}{piece}" if buffer else piece
+        if len(buffer) < _STREAM_BUFFER_CHARS:
+            continue
+        chunks = _splitter.split_text(buffer)
+        for chunk in chunks[:-1]:
+            if len(chunk.strip()) > 50:
+                yield chunk
+        buffer = chunks[-1] if chunks else ""
+    if buffer:
+        yield from chunk_article(buffer)
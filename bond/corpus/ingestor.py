@@ -1,16 +1,50 @@
+import hashlib
+import logging
+import multiprocessing
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator
+
+from bond.config import settings
 from bond.store.chroma import get_or_create_corpus_collection
-from bond.store.article_log import log_article
+from bond.store.article_log import delete_articles, find_articles, log_articles
 from bond.corpus.chunker import chunk_article
 
+log = logging.getLogger(__name__)
+
+# Articles pulled from the input iterable per chunk → embed → log round.
+_ARTICLE_WINDOW = 32
+# Below this many articles in a window, process-pool start-up costs more than it saves.
+_PROCESS_POOL_MIN_ARTICLES = 4
+
 
 def _section_type(chunk_index: int) -> str:
     """Return section label based on position within article."""
     return "wstęp" if chunk_index == 0 else "rozwinięcie"
 
 
+def _hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _article_hash(chunk_hashes: list[str]) -> str:
+    """Article-level hash over its chunk hashes (changes when the text or chunking changes)."""
+    return _hash_text("\n".join(chunk_hashes))
+
+
+def _iter_windows(articles: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    iterator = iter(articles)
+    while window := list(islice(iterator, size)):
+        yield window
+
+
 class CorpusIngestor:
+    def __init__(self) -> None:
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_failed = False
+
     def ingest(
         self,
         text: str,
@@ -20,34 +54,250 @@ class CorpusIngestor:
     ) -> dict:
         """
         Chunk text, embed into ChromaDB, log article to SQLite.
-        Returns: {"article_id": str, "chunks_added": int}
+        Returns: {"article_id": str, "chunks_added": int, "status": str}
 
         KONTRAKT-KRYTYCZNE: format ID chunka to "{uuid}_{index}".
         Skrypt migracyjny (migrate_add_metadata.py) parsuje indeks z tego sufiksu
         przez _parse_chunk_index(). Nie zmieniaj tego formatu bez aktualizacji tamtego skryptu.
         """
-        chunks = chunk_article(text)
-        if not chunks:
-            return {"article_id": "", "chunks_added": 0}
+        articles = [{"text": text, "title": title, "source_url": source_url}]
+        return self.ingest_many(articles, source_type=source_type)[0]
+
+    def ingest_chunks(
+        self,
+        chunks: list[str],
+        title: str,
+        source_type: str,  # "own" | "external"
+        source_url: str = "",
+    ) -> dict:
+        """ingest() for a document already split by chunk_stream (see file_source.extract_chunks)."""
+        articles = [{"chunks": chunks, "title": title, "source_url": source_url}]
+        return self.ingest_many(articles, source_type=source_type)[0]
+
+    def remove(self, article_ids: list[str]) -> None:
+        """Delete articles and all their chunks from ChromaDB and the article log."""
+        if not article_ids:
+            return
+        get_or_create_corpus_collection().delete(where={"article_id": {"$in": list(article_ids)}})
+        delete_articles(list(article_ids))
+
+    def ingest_many(
+        self,
+        articles: Iterable[dict],
+        source_type: str,  # "own" | "external"
+        *,
+        on_result: Callable[[dict, dict], None] | None = None,
+    ) -> list[dict]:
+        """
+        Bulk variant of ingest() for blog/Drive imports and backfills.
+
+        ``articles`` is any iterable of {"text", "title", "source_url"} dicts (with
+        "chunks" instead of "text" when already chunked) and is consumed lazily in
+        windows of _ARTICLE_WINDOW, so producers can stream articles in as they
+        are scraped. Per window: chunking runs in a process
+        pool, chunks are embedded and written to ChromaDB in batches of
+        ``settings.ingest_embed_batch_size`` and all articles are logged to SQLite
+        in a single transaction.
+
+        Re-imports are incremental: an article whose content hash is already in the
+        corpus is skipped ("unchanged", chunks_added=0); an article whose
+        source_url is known but whose text changed keeps its article_id and only
+        its changed chunks are re-embedded ("updated"); anything else is "added".
+        Articles too short to chunk come back as "empty".
+
+        Returns one {"article_id", "chunks_added", "status"} dict per input article,
+        in input order. ``on_result(article, result)`` is called for each article
+        once its window has been committed.
+        """
+        results: list[dict] = []
+        try:
+            for window in _iter_windows(articles, _ARTICLE_WINDOW):
+                window_results = self._ingest_window(window, source_type)
+                results.extend(window_results)
+                if on_result is not None:
+                    for article, result in zip(window, window_results):
+                        on_result(article, result)
+        finally:
+            self._shutdown_pool()
+        return results
 
-        article_id = str(uuid.uuid4())
+    def _ingest_window(self, window: list[dict], source_type: str) -> list[dict]:
+        # Articles may arrive pre-chunked (file extraction chunks page by page)
+        chunked: list[list[str] | None] = [article.get("chunks") for article in window]
+        pending = [i for i, chunks in enumerate(chunked) if chunks is None]
+        for i, chunks in zip(pending, self._chunk_texts([window[i]["text"] for i in pending])):
+            chunked[i] = chunks
+        chunk_hashes = [[_hash_text(chunk) for chunk in chunks] for chunks in chunked]
+        content_hashes = [_article_hash(hashes) if hashes else "" for hashes in chunk_hashes]
         now = datetime.now(timezone.utc).isoformat()
 
-        collection = get_or_create_corpus_collection()
-        ids = [f"{article_id}_{i}" for i in range(len(chunks))]
-        metadatas = [
-            {
-                "source_type": source_type,
-                "article_type": source_type,
-                "article_id": article_id,
-                "article_title": title,
-                "source_url": source_url,
-                "ingested_at": now,
-                "section_type": _section_type(i),
-            }
-            for i, _ in enumerate(chunks)
-        ]
-        collection.add(documents=chunks, metadatas=metadatas, ids=ids)
-        log_article(article_id, source_type, title, source_url, len(chunks))
-
-        return {"article_id": article_id, "chunks_added": len(chunks)}
+        # Known articles for this window: content hash → row, source_url → rows (newest first)
+        by_hash: dict[str, dict] = {}
+        by_url: dict[str, list[dict]] = {}
+        for row in find_articles(
+            [article.get("source_url", "") for article in window], content_hashes
+        ):
+            if row["content_hash"]:
+                by_hash.setdefault(row["content_hash"], row)
+            if row["source_url"]:
+                by_url.setdefault(row["source_url"], []).append(row)
+
+        results: list[dict] = []
+        chunk_entries: list[tuple[str, str, dict]] = []  # (id, document, metadata)
+        replaced_ids: list[str] = []
+        superseded_ids: list[str] = []
+        log_rows: list[tuple[str, str, str, str, int, str]] = []
+
+        for article, chunks, hashes, content_hash in zip(window, chunked, chunk_hashes, content_hashes):
+            if not chunks:
+                results.append({"article_id": "", "chunks_added": 0, "status": "empty"})
+                continue
+
+            if content_hash in by_hash:
+                results.append(
+                    {"article_id": by_hash[content_hash]["article_id"], "chunks_added": 0, "status": "unchanged"}
+                )
+                continue
+
+            title = article["title"]
+            source_url = article.get("source_url", "")
+            previous = by_url.get(source_url, []) if source_url else []
+            if previous:
+                # Changed article: keep its id; older duplicates of the same URL are dropped
+                article_id = previous[0]["article_id"]
+                replaced_ids.append(article_id)
+                superseded_ids.extend(row["article_id"] for row in previous[1:])
+                status = "updated"
+            else:
+                article_id = str(uuid.uuid4())
+                status = "added"
+
+            row = {"article_id": article_id, "source_url": source_url, "content_hash": content_hash}
+            by_hash[content_hash] = row
+            if source_url:
+                by_url[source_url] = [row]
+
+            for i, (chunk, chunk_hash) in enumerate(zip(chunks, hashes)):
+                chunk_entries.append(
+                    (
+                        f"{article_id}_{i}",
+                        chunk,
+                        {
+                            "source_type": source_type,
+                            "article_type": source_type,
+                            "article_id": article_id,
+                            "article_title": title,
+                            "source_url": source_url,
+                            "ingested_at": now,
+                            "section_type": _section_type(i),
+                            "content_hash": content_hash,
+                            "chunk_hash": chunk_hash,
+                        },
+                    )
+                )
+            log_rows.append((article_id, source_type, title, source_url, len(chunks), content_hash))
+            results.append({"article_id": article_id, "chunks_added": len(chunks), "status": status})
+
+        if chunk_entries or superseded_ids:
+            collection = get_or_create_corpus_collection()
+            self._write_chunks(collection, chunk_entries, replaced_ids, superseded_ids)
+            log_articles(log_rows)
+            delete_articles(superseded_ids)
+
+        return results
+
+    def _write_chunks(
+        self,
+        collection,
+        chunk_entries: list[tuple[str, str, dict]],
+        replaced_ids: list[str],
+        superseded_ids: list[str],
+    ) -> None:
+        """
+        Write a window's chunks to ChromaDB.
+
+        For re-ingested articles, chunks whose position and hash are unchanged only
+        get their metadata refreshed, moved chunks reuse their stored embedding,
+        and chunk IDs that no longer exist are deleted. Only new text is embedded.
+        """
+        old_hash_by_id: dict[str, str] = {}
+        embedding_by_hash: dict[str, Any] = {}
+        if replaced_ids:
+            old = collection.get(
+                where={"article_id": {"$in": replaced_ids}},
+                include=["metadatas", "embeddings"],
+            )
+            embeddings = old.get("embeddings")
+            if embeddings is None:
+                embeddings = [None] * len(old["ids"])
+            for chunk_id, metadata, embedding in zip(old["ids"], old["metadatas"], embeddings):
+                chunk_hash = (metadata or {}).get("chunk_hash", "")
+                old_hash_by_id[chunk_id] = chunk_hash
+                if chunk_hash and embedding is not None:
+                    embedding_by_hash.setdefault(chunk_hash, embedding)
+
+        unchanged: list[tuple[str, str, dict]] = []
+        reused: list[tuple[str, str, dict, Any]] = []
+        to_embed: list[tuple[str, str, dict]] = []
+        for chunk_id, document, metadata in chunk_entries:
+            chunk_hash = metadata["chunk_hash"]
+            if old_hash_by_id.get(chunk_id) == chunk_hash:
+                unchanged.append((chunk_id, document, metadata))
+            elif chunk_hash in embedding_by_hash:
+                reused.append((chunk_id, document, metadata, embedding_by_hash[chunk_hash]))
+            else:
+                to_embed.append((chunk_id, document, metadata))
+
+        batch_size = max(1, settings.ingest_embed_batch_size)
+        for start in range(0, len(to_embed), batch_size):
+            batch = to_embed[start : start + batch_size]
+            collection.upsert(
+                ids=[entry[0] for entry in batch],
+                documents=[entry[1] for entry in batch],
+                metadatas=[entry[2] for entry in batch],
+            )
+        if reused:
+            collection.upsert(
+                ids=[entry[0] for entry in reused],
+                documents=[entry[1] for entry in reused],
+                metadatas=[entry[2] for entry in reused],
+                embeddings=[entry[3] for entry in reused],
+            )
+        if unchanged:
+            collection.update(
+                ids=[entry[0] for entry in unchanged],
+                metadatas=[entry[2] for entry in unchanged],
+            )
+
+        new_ids = {entry[0] for entry in chunk_entries}
+        stale_ids = [chunk_id for chunk_id in old_hash_by_id if chunk_id not in new_ids]
+        if stale_ids:
+            collection.delete(ids=stale_ids)
+        if superseded_ids:
+            collection.delete(where={"article_id": {"$in": superseded_ids}})
+
+    def _chunk_texts(self, texts: list[str]) -> list[list[str]]:
+        """Chunk article texts, in a process pool when the window is large enough."""
+        workers = settings.ingest_chunk_workers
+        if workers <= 1 or len(texts) < _PROCESS_POOL_MIN_ARTICLES or self._pool_failed:
+            return [chunk_article(text) for text in texts]
+
+        try:
+            if self._pool is None:
+                # spawn: forking next to Chroma/tokenizer threads can deadlock the child
+                self._pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            chunksize = max(1, len(texts) // (workers * 2))
+            return list(self._pool.map(chunk_article, texts, chunksize=chunksize))
+        except Exception as exc:
+            log.warning("Chunking process pool unavailable (%s) — chunking in-process", exc)
+            self._pool_failed = True
+            self._shutdown_pool()
+            return [chunk_article(text) for text in texts]
+
+    def _shutdown_pool(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,351 @@
+"""Durable background ingest jobs.
+
+``POST /api/corpus/ingest/*?background=true`` stores a job row in SQLite
+(``settings.ingest_job_db_path``) and returns the job id at once. A bounded
+thread pool (``settings.ingest_job_workers``) runs the jobs and writes their
+progress back to the row, so ``GET /api/corpus/jobs/{id}`` can poll it and
+``/events`` can stream it over SSE. Synchronous requests use the same pool
+through ``run_inline``, so no ingest ever runs on the event loop.
+
+Cancellation is cooperative. The job's progress callback raises JobCancelled
+at the next article boundary. Jobs that were queued or running when the
+process stopped are re-queued by ``resume()`` at startup. Re-running an
+import is cheap, because the ingestor skips articles whose content hash is
+already logged.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any
+
+from bond.config import settings
+
+log = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TERMINAL_STATUSES = frozenset({SUCCEEDED, FAILED, CANCELLED})
+
+JobHandler = Callable[[dict, "JobProgress | None"], dict]
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS ingest_jobs (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    progress TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+)
+"""
+
+CREATE_INDEX = "CREATE INDEX IF NOT EXISTS idx_ingest_jobs_status ON ingest_jobs(status)"
+
+_handlers: dict[str, JobHandler] = {}
+
+
+def register_job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register the function that runs jobs of ``kind``: ``handler(payload, progress) -> result``."""
+    def decorator(handler: JobHandler) -> JobHandler:
+        _handlers[kind] = handler
+        return handler
+    return decorator
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once it has been cancelled."""
+
+
+class _JobInterrupted(Exception):
+    """Raised inside a running job when the process shuts down; the job stays resumable."""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _empty_progress() -> dict:
+    return {"articles_done": 0, "chunks_added": 0, "articles_unchanged": 0, "warnings": []}
+
+
+class JobStore:
+    """ingest_jobs table on one lock-guarded WAL connection (same pattern as article_log)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = os.path.abspath(path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.execute(CREATE_TABLE)
+            self.conn.execute(CREATE_INDEX)
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> dict:
+        return {
+            "job_id": row["job_id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "payload": json.loads(row["payload"]),
+            "progress": json.loads(row["progress"]),
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+
+    def create(self, kind: str, payload: dict) -> dict:
+        job_id = uuid.uuid4().hex
+        now = _now()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO ingest_jobs (job_id, kind, status, payload, progress, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, json.dumps(payload), json.dumps(_empty_progress()), now, now),
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> dict | None:
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM ingest_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def recent(self, limit: int = 50) -> list[dict]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT * FROM ingest_jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def unfinished(self) -> list[dict]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT * FROM ingest_jobs WHERE status IN (?, ?) ORDER BY created_at ASC",
+                (QUEUED, RUNNING),
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def update(self, job_id: str, *, only_if: tuple[str, ...] = (), **fields: Any) -> bool:
+        """Set columns on a job; with ``only_if``, only when its status is one of those. Returns whether it changed."""
+        assignments = {"updated_at": _now()}
+        for name, value in fields.items():
+            assignments[name] = json.dumps(value) if name in ("progress", "result") and value is not None else value
+        sql = f"UPDATE ingest_jobs SET {', '.join(f'{name} = ?' for name in assignments)} WHERE job_id = ?"
+        params = [*assignments.values(), job_id]
+        if only_if:
+            sql += f" AND status IN ({', '.join('?' * len(only_if))})"
+            params.extend(only_if)
+        with self.lock, self.conn:
+            return self.conn.execute(sql, params).rowcount > 0
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+
+class JobProgress:
+    """Progress sink handed to a job handler; ``record`` matches CorpusIngestor's on_result."""
+
+    def __init__(self, queue: "IngestJobQueue", job_id: str) -> None:
+        self._queue = queue
+        self.job_id = job_id
+        self.state = _empty_progress()
+        self._lock = threading.Lock()
+
+    def check(self) -> None:
+        """Raise if the job was cancelled or the process is stopping."""
+        if self._queue._stopping.is_set():
+            raise _JobInterrupted(self.job_id)
+        event = self._queue._cancel_events.get(self.job_id)
+        if event is not None and event.is_set():
+            raise JobCancelled(self.job_id)
+
+    def record(self, article: dict, result: dict) -> None:
+        with self._lock:
+            self.state["articles_done"] += 1
+            if result.get("status") == "unchanged":
+                self.state["articles_unchanged"] += 1
+            else:
+                self.state["chunks_added"] += result.get("chunks_added", 0)
+            snapshot = json.loads(json.dumps(self.state))
+        self._queue.store.update(self.job_id, progress=snapshot)
+        self.check()
+
+    def finish(self, warnings: list[str]) -> None:
+        with self._lock:
+            self.state["warnings"] = list(warnings)
+            snapshot = json.loads(json.dumps(self.state))
+        self._queue.store.update(self.job_id, progress=snapshot)
+
+
+class IngestJobQueue:
+    """Bounded worker pool over a JobStore."""
+
+    def __init__(self, db_path: str, workers: int) -> None:
+        self.db_path = db_path
+        self._store: JobStore | None = None
+        self.workers = max(1, workers)
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+        self._cancel_events: dict[str, threading.Event] = {}
+        self._stopping = threading.Event()
+
+    @property
+    def store(self) -> JobStore:
+        # Opened on first use, so inline-only use never creates the job database
+        if self._store is None:
+            with self._executor_lock:
+                if self._store is None:
+                    self._store = JobStore(self.db_path)
+        return self._store
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="ingest-job"
+                    )
+        return self._executor
+
+    def submit(self, kind: str, payload: dict) -> dict:
+        if kind not in _handlers:
+            raise KeyError(f"No ingest job handler registered for {kind!r}")
+        job = self.store.create(kind, payload)
+        self._schedule(job["job_id"])
+        return job
+
+    def _schedule(self, job_id: str) -> None:
+        self._cancel_events[job_id] = threading.Event()
+        self._get_executor().submit(self._run, job_id)
+
+    def _run(self, job_id: str) -> None:
+        if not self.store.update(job_id, only_if=(QUEUED,), status=RUNNING):
+            self._cleanup(job_id)
+            return
+        job = self.store.get(job_id)
+        progress = JobProgress(self, job_id)
+        try:
+            progress.check()
+            result = _handlers[job["kind"]](job["payload"], progress)
+            progress.finish(result.get("warnings", []))
+            outcome = {"only_if": (RUNNING,), "status": SUCCEEDED, "result": result}
+        except JobCancelled:
+            outcome = {"status": CANCELLED}
+        except _JobInterrupted:
+            self.store.update(job_id, status=QUEUED)
+            log.info("Ingest job %s interrupted by shutdown; it will resume on restart", job_id)
+            return
+        except Exception as exc:
+            log.error("Ingest job %s (%s) failed: %s", job_id, job["kind"], exc, exc_info=True)
+            outcome = {"status": FAILED, "error": str(exc)}
+        # Before the terminal status is written, so a finished job never leaves its upload behind
+        self._remove_upload(job)
+        self.store.update(job_id, **outcome)
+        self._cancel_events.pop(job_id, None)
+
+    @staticmethod
+    def _remove_upload(job: dict | None) -> None:
+        upload_path = (job or {}).get("payload", {}).get("upload_path")
+        if upload_path:
+            try:
+                os.remove(upload_path)
+            except OSError:
+                pass
+
+    def _cleanup(self, job_id: str) -> None:
+        self._cancel_events.pop(job_id, None)
+        job = self.store.get(job_id)
+        if job is not None and job["status"] in TERMINAL_STATUSES:
+            self._remove_upload(job)
+
+    async def run_inline(self, kind: str, payload: dict) -> dict:
+        """Run a handler on the worker pool without persisting a job (synchronous endpoints)."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), _handlers[kind], payload, None)
+
+    def get(self, job_id: str) -> dict | None:
+        return self.store.get(job_id)
+
+    def recent(self, limit: int = 50) -> list[dict]:
+        return self.store.recent(limit)
+
+    def cancel(self, job_id: str) -> dict | None:
+        """Cancel a queued job at once, or signal a running one to stop at its next article."""
+        if self.store.update(job_id, only_if=(QUEUED,), status=CANCELLED):
+            self._cleanup(job_id)
+        else:
+            event = self._cancel_events.get(job_id)
+            if event is not None:
+                event.set()
+        return self.store.get(job_id)
+
+    def resume(self) -> int:
+        """Re-queue jobs left queued or running by a previous process."""
+        jobs = self.store.unfinished()
+        for job in jobs:
+            self.store.update(job["job_id"], status=QUEUED)
+            self._schedule(job["job_id"])
+        if jobs:
+            log.info("Resumed %d unfinished ingest job(s)", len(jobs))
+        return len(jobs)
+
+    async def watch(self, job_id: str, interval: float = 0.5) -> AsyncIterator[dict]:
+        """Yield the job each time its status or progress changes, until it reaches a terminal status."""
+        last: tuple | None = None
+        while True:
+            job = await asyncio.to_thread(self.store.get, job_id)
+            if job is None:
+                return
+            marker = (job["status"], json.dumps(job["progress"], sort_keys=True))
+            if marker != last:
+                last = marker
+                yield job
+            if job["status"] in TERMINAL_STATUSES:
+                return
+            await asyncio.sleep(interval)
+
+    def shutdown(self) -> None:
+        """Stop workers; running jobs are returned to the queue for the next start."""
+        self._stopping.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        if self._store is not None:
+            self._store.close()
+
+
+_queue: IngestJobQueue | None = None
+_queue_lock = threading.Lock()
+
+
+def get_ingest_queue() -> IngestJobQueue:
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = IngestJobQueue(settings.ingest_job_db_path, settings.ingest_job_workers)
+    return _queue
+
+
+def shutdown_ingest_queue() -> None:
+    global _queue
+    with _queue_lock:
+        if _queue is not None:
+            _queue.shutdown()
+            _queue = None
@@ -0,0 +1,225 @@
+"""FlashRank cross-encoder reranking service.
+
+One process-wide RerankService owns the ONNX model (preloaded at API start),
+caches (query, passage) scores so checkpoint-2 regenerations do not re-score
+the same candidates, and micro-batches concurrent requests from different
+sessions into a single ONNX session run.
+
+Scoring reproduces flashrank's pairwise path (Ranker.rerank) on the ranker's
+own tokenizer and session, so scores are identical to calling Ranker.rerank.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from bond.config import settings
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingRequest:
+    pairs: list[list[str]]
+    future: Future = field(default_factory=Future)
+
+
+def _passage_id(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class RerankService:
+    """Cached, micro-batched FlashRank scoring. Thread-safe; methods block the caller."""
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: str,
+        *,
+        cache_size: int = 4096,
+        batch_window_ms: float = 5.0,
+        max_batch_pairs: int = 64,
+    ) -> None:
+        self.model_name = model_name
+        self.cache_dir = cache_dir
+        self._cache_size = max(0, cache_size)
+        self._batch_window = max(0.0, batch_window_ms) / 1000
+        self._max_batch_pairs = max(1, max_batch_pairs)
+
+        self._ranker = None
+        self._load_lock = threading.Lock()
+
+        self._scores: OrderedDict[tuple[str, str], float] = OrderedDict()
+        self._scores_lock = threading.Lock()
+
+        self._queue: list[_PendingRequest] = []
+        self._queue_cond = threading.Condition()
+        self._worker: threading.Thread | None = None
+
+        self.hits = 0
+        self.misses = 0
+        self.batches = 0
+        self.batched_requests = 0
+
+    # -- model --------------------------------------------------------------
+
+    def preload(self) -> None:
+        """Load (downloading on first run) the model so the first rerank does not pay for it."""
+        self._get_ranker()
+
+    def _get_ranker(self):
+        if self._ranker is None:
+            with self._load_lock:
+                if self._ranker is None:
+                    from flashrank import Ranker
+
+                    started = time.perf_counter()
+                    self._ranker = Ranker(model_name=self.model_name, cache_dir=self.cache_dir)
+                    log.info(
+                        "Loaded reranker %s in %.2fs", self.model_name, time.perf_counter() - started
+                    )
+        return self._ranker
+
+    def _run_model(self, pairs: list[list[str]]) -> np.ndarray:
+        ranker = self._get_ranker()
+        encoded = ranker.tokenizer.encode_batch(pairs)
+        input_ids = np.array([e.ids for e in encoded])
+        token_type_ids = np.array([e.type_ids for e in encoded])
+        attention_mask = np.array([e.attention_mask for e in encoded])
+
+        onnx_input = {
+            "input_ids": input_ids.astype(np.int64),
+            "attention_mask": attention_mask.astype(np.int64),
+        }
+        if not np.all(token_type_ids == 0):
+            onnx_input["token_type_ids"] = token_type_ids.astype(np.int64)
+
+        logits = ranker.session.run(None, onnx_input)[0]
+        if logits.shape[1] == 1:
+            return 1 / (1 + np.exp(-logits.flatten()))
+        exp_logits = np.exp(logits)
+        return exp_logits[:, 1] / np.sum(exp_logits, axis=1)
+
+    # -- micro-batching -----------------------------------------------------
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._batch_loop, name="rerank-batcher", daemon=True
+            )
+            self._worker.start()
+
+    def _batch_loop(self) -> None:
+        while True:
+            with self._queue_cond:
+                while not self._queue:
+                    self._queue_cond.wait()
+                # Give concurrent sessions a short window to join this batch
+                deadline = time.monotonic() + self._batch_window
+                while sum(len(r.pairs) for r in self._queue) < self._max_batch_pairs:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._queue_cond.wait(remaining)
+                batch: list[_PendingRequest] = []
+                batch_pairs = 0
+                while self._queue and (
+                    not batch or batch_pairs + len(self._queue[0].pairs) <= self._max_batch_pairs
+                ):
+                    request = self._queue.pop(0)
+                    batch.append(request)
+                    batch_pairs += len(request.pairs)
+
+            pairs = [pair for request in batch for pair in request.pairs]
+            try:
+                scores = self._run_model(pairs)
+            except Exception as exc:
+                for request in batch:
+                    request.future.set_exception(exc)
+                continue
+
+            self.batches += 1
+            self.batched_requests += len(batch)
+            offset = 0
+            for request in batch:
+                request.future.set_result(scores[offset : offset + len(request.pairs)].tolist())
+                offset += len(request.pairs)
+
+    def _score_pairs(self, pairs: list[list[str]]) -> list[float]:
+        request = _PendingRequest(pairs=pairs)
+        with self._queue_cond:
+            self._ensure_worker()
+            self._queue.append(request)
+            self._queue_cond.notify_all()
+        return request.future.result()
+
+    # -- public API ---------------------------------------------------------
+
+    def score(self, query: str, passages: list[str]) -> list[float]:
+        """Cross-encoder relevance of each passage to ``query`` (cached per pair)."""
+        keys = [(query, _passage_id(text)) for text in passages]
+        scores: list[float | None] = []
+        with self._scores_lock:
+            for key in keys:
+                cached = self._scores.get(key)
+                if cached is not None:
+                    self._scores.move_to_end(key)
+                    self.hits += 1
+                else:
+                    self.misses += 1
+                scores.append(cached)
+
+        missing = [i for i, value in enumerate(scores) if value is None]
+        if missing:
+            computed = self._score_pairs([[query, passages[i]] for i in missing])
+            with self._scores_lock:
+                for i, value in zip(missing, computed):
+                    scores[i] = value
+                    if self._cache_size:
+                        self._scores[keys[i]] = value
+                        self._scores.move_to_end(keys[i])
+                while len(self._scores) > self._cache_size:
+                    self._scores.popitem(last=False)
+        return scores
+
+    def rerank(self, query: str, candidates: list[dict], top_n: int) -> list[dict]:
+        """Return the ``top_n`` candidate dicts (by their 'text') in descending score order."""
+        scores = self.score(query, [candidate["text"] for candidate in candidates])
+        order = sorted(range(len(candidates)), key=lambda i: scores[i], reverse=True)
+        return [candidates[i] for i in order[:top_n]]
+
+    def stats(self) -> dict[str, int | bool]:
+        with self._scores_lock:
+            return {
+                "loaded": self._ranker is not None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "cached_scores": len(self._scores),
+                "batches": self.batches,
+                "batched_requests": self.batched_requests,
+            }
+
+
+_service: RerankService | None = None
+_service_lock = threading.Lock()
+
+
+def get_reranker() -> RerankService:
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = RerankService(
+                    settings.rerank_model,
+                    settings.rerank_cache_dir,
+                    cache_size=settings.rerank_score_cache_size,
+                    batch_window_ms=settings.rerank_batch_window_ms,
+                    max_batch_pairs=settings.rerank_max_batch_pairs,
+                )
+    return _service
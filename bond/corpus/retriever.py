@@ -22,6 +22,7 @@ from typing import Any
 from bond.config import settings
 from bond.models import SourceType
 from bond.store.chroma import get_or_create_corpus_collection
+from bond.store.embeddings import get_embedding_function
 
 logger = logging.getLogger(__name__)
 
@@ -42,28 +43,53 @@ def rerank(fragments: list[dict[str, Any]]) -> list[dict[str, Any]]:
 
 
 # ---------------------------------------------------------------------------
-# Low-level ChromaDB query helper
+# Low-level ChromaDB query helpers
 # ---------------------------------------------------------------------------
 
+def _sync_prepare_query(query: str) -> tuple[Any, int, list[float] | None]:
+    """Return (collection, count, query embedding), embedding the query exactly once."""
+    collection = get_or_create_corpus_collection()
+    if collection is None:
+        return None, 0, None
+    count = collection.count()
+    if count == 0:
+        return collection, 0, None
+    embedding = get_embedding_function().embed_query([query])[0]
+    return collection, count, embedding
+
+
 def _sync_query_collection(
     query: str,
     n: int,
     source_type: SourceType | None = None,
+    *,
+    collection: Any = None,
+    count: int | None = None,
+    query_embedding: list[float] | None = None,
 ) -> list[dict[str, Any]]:
-    """Synchronous ChromaDB query — intended to run inside asyncio.to_thread()."""
-    collection = get_or_create_corpus_collection()
+    """Synchronous ChromaDB query — intended to run inside asyncio.to_thread().
+
+    When ``collection``/``count``/``query_embedding`` come from
+    _sync_prepare_query() they are reused instead of being fetched again.
+    """
     if collection is None:
-        return []
+        collection = get_or_create_corpus_collection()
+        if collection is None:
+            return []
 
-    count = collection.count()
-    if count == 0:
+    if count is None:
+        count = collection.count()
+    if count == 0 or n <= 0:
         return []
 
     kwargs: dict[str, Any] = {
-        "query_texts": [query],
         "n_results": min(n, count),
         "include": ["documents", "metadatas", "distances"],
     }
+    if query_embedding is not None:
+        kwargs["query_embeddings"] = [query_embedding]
+    else:
+        kwargs["query_texts"] = [query]
     if source_type is not None:
         kwargs["where"] = {"source_type": source_type.value}
 
@@ -95,12 +121,29 @@ async def _query_collection(
     query: str,
     n: int,
     source_type: SourceType | None = None,
+    **prepared: Any,
 ) -> list[dict[str, Any]]:
     """Async wrapper: runs blocking ChromaDB query in a thread pool.
 
     Returns [] on error or when the collection is empty.
     """
-    return await asyncio.to_thread(_sync_query_collection, query, n, source_type)
+    return await asyncio.to_thread(_sync_query_collection, query, n, source_type, **prepared)
+
+
+def _fill_slots(
+    own_fragments: list[dict[str, Any]],
+    ext_fragments: list[dict[str, Any]],
+    n: int,
+) -> list[dict[str, Any]]:
+    """Apply the Pass 1 / Pass 2 / Fill rules to already-fetched candidates."""
+    if not own_fragments:
+        logger.info("retriever: no own_text fragments — falling back to external_blogger.")
+        return ext_fragments[:n]
+    if len(own_fragments) >= n:
+        return own_fragments[:n]
+    fill = ext_fragments[: n - len(own_fragments)]
+    logger.debug("retriever: fill — %d external_blogger fragment(s) appended.", len(fill))
+    return own_fragments + fill
 
 
 # ---------------------------------------------------------------------------
@@ -119,6 +162,13 @@ async def two_pass_retrieve(
 
     Own_text fragments always appear before external_blogger in the returned list.
 
+    The query is embedded and the collection counted once. With
+    ``settings.retrieval_mode`` "concurrent" (default) the own and external
+    queries run in parallel on that embedding; with "overfetch" a single
+    unfiltered query for ``n * retrieval_overfetch_factor`` candidates is
+    partitioned in memory, and the filtered queries are only issued when fewer
+    than ``n`` own_text fragments were among the candidates.
+
     Args:
         query: Embedding query string.
         n: Number of fragments to retrieve. Defaults to ``settings.rag_top_k``.
@@ -126,20 +176,42 @@ async def two_pass_retrieve(
     if n is None:
         n = settings.rag_top_k
 
-    own_fragments = await _query_collection(query, n=n, source_type=SourceType.OWN_TEXT)
-    logger.debug("retriever: Pass 1 — %d own_text fragment(s).", len(own_fragments))
-
-    if not own_fragments:
-        logger.info("retriever: no own_text fragments — falling back to external_blogger.")
-        ext_fragments = await _query_collection(query, n=n, source_type=SourceType.EXTERNAL_BLOGGER)
-        logger.debug("retriever: Pass 2 — %d external_blogger fragment(s).", len(ext_fragments))
-        return ext_fragments
-
-    if len(own_fragments) >= n:
-        return own_fragments[:n]
+    collection, count, embedding = await asyncio.to_thread(_sync_prepare_query, query)
+    if count == 0:
+        return []
+    prepared = {"collection": collection, "count": count, "query_embedding": embedding}
+
+    if settings.retrieval_mode == "overfetch":
+        own_fragments, ext_fragments = await _overfetch_partition(query, n, prepared)
+    else:
+        own_fragments, ext_fragments = await asyncio.gather(
+            _query_collection(query, n, SourceType.OWN_TEXT, **prepared),
+            _query_collection(query, n, SourceType.EXTERNAL_BLOGGER, **prepared),
+        )
+    logger.debug(
+        "retriever: %d own_text / %d external_blogger candidate(s).",
+        len(own_fragments),
+        len(ext_fragments),
+    )
+    return _fill_slots(own_fragments, ext_fragments, n)
 
-    fill_count = n - len(own_fragments)
-    ext_fragments = await _query_collection(query, n=fill_count, source_type=SourceType.EXTERNAL_BLOGGER)
-    logger.debug("retriever: fill — %d external_blogger fragment(s) appended.", len(ext_fragments))
 
-    return own_fragments + ext_fragments
+async def _overfetch_partition(
+    query: str,
+    n: int,
+    prepared: dict[str, Any],
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """One unfiltered query split by source_type; filtered queries only if own_text came up short."""
+    fetch_n = n * max(1, settings.retrieval_overfetch_factor)
+    candidates = await _query_collection(query, fetch_n, None, **prepared)
+    own = [f for f in candidates if f.get("source_type") == SourceType.OWN_TEXT]
+    external = [f for f in candidates if f.get("source_type") == SourceType.EXTERNAL_BLOGGER]
+
+    if len(own) >= n or len(candidates) >= prepared["count"]:
+        return own, external
+
+    # Own fragments may exist beyond the over-fetch window: fall back to filtered queries
+    return await asyncio.gather(
+        _query_collection(query, n, SourceType.OWN_TEXT, **prepared),
+        _query_collection(query, n, SourceType.EXTERNAL_BLOGGER, **prepared),
+    )
@@ -0,0 +1,282 @@
+"""Bounded-concurrency fetch-and-extract engine for blog imports.
+
+Downloads run in a thread pool with per-host connection limits and a politeness
+delay; ``trafilatura.extract`` runs in a separate process pool so HTML parsing
+does not compete with network I/O for the GIL. Results are yielded as soon as
+each post is extracted.
+
+Kept free of ChromaDB / ingestor imports: extraction workers are spawned
+processes that import this module.
+"""
+
+import json
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Iterator
+from urllib.parse import urljoin, urlsplit
+
+import requests
+import trafilatura
+
+from bond.config import settings
+from bond.security import UnsafeUrlError, validate_public_url
+
+log = logging.getLogger(__name__)
+
+_USER_AGENT = f"trafilatura/{trafilatura.__version__} (+https://github.com/adbar/trafilatura)"
+_MAX_REDIRECTS = 3
+# Same ceiling trafilatura.fetch_url applies to a single document.
+_MAX_RESPONSE_BYTES = 20_000_000
+
+# url -> conditional GET validators ({"etag": ..., "last_modified": ...}) of the
+# last successfully extracted version. Process-wide, like the DNS resolution cache.
+_VALIDATOR_CACHE: dict[str, dict[str, str]] = {}
+_VALIDATOR_LOCK = threading.Lock()
+
+_thread_local = threading.local()
+
+
+@dataclass
+class FetchedPost:
+    url: str
+    body: bytes | None  # None when the server answered 304 Not Modified
+    validators: dict[str, str]
+
+
+class _HostGate:
+    """Per-host concurrency limit plus minimum spacing between request starts."""
+
+    def __init__(self, max_connections: int, delay: float) -> None:
+        self._semaphore = threading.BoundedSemaphore(max(1, max_connections))
+        self._delay = max(0.0, delay)
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def __enter__(self) -> "_HostGate":
+        self._semaphore.acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self._delay
+        if start > now:
+            time.sleep(start - now)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._semaphore.release()
+
+
+def _get_session() -> requests.Session:
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers["User-Agent"] = _USER_AGENT
+        _thread_local.session = session
+    return session
+
+
+def _conditional_headers(url: str) -> dict[str, str]:
+    with _VALIDATOR_LOCK:
+        validators = _VALIDATOR_CACHE.get(url, {})
+    headers = {}
+    if "etag" in validators:
+        headers["If-None-Match"] = validators["etag"]
+    if "last_modified" in validators:
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def remember_validators(url: str, validators: dict[str, str]) -> None:
+    """Record validators so the next import of ``url`` can use a conditional GET."""
+    if validators:
+        with _VALIDATOR_LOCK:
+            _VALIDATOR_CACHE[url] = validators
+
+
+def fetch_post(url: str) -> FetchedPost | None:
+    """
+    GET ``url`` with conditional headers from the last import.
+
+    Redirects are followed manually so every hop goes through validate_public_url().
+    Returns None when the post could not be downloaded.
+    """
+    session = _get_session()
+    headers = _conditional_headers(url)
+    current = url
+
+    for _ in range(_MAX_REDIRECTS + 1):
+        with session.get(
+            current,
+            headers=headers,
+            timeout=settings.blog_fetch_timeout_seconds,
+            allow_redirects=False,
+            stream=True,
+        ) as response:
+            if response.is_redirect:
+                location = response.headers.get("Location", "")
+                try:
+                    current = validate_public_url(
+                        urljoin(current, location),
+                        allow_private=settings.allow_private_url_ingest,
+                    )
+                except UnsafeUrlError as e:
+                    log.warning("%s redirects to an unsafe URL (%s) — skipping", url, e)
+                    return None
+                continue
+
+            if response.status_code == 304:
+                return FetchedPost(url=url, body=None, validators={})
+            if response.status_code != 200:
+                log.warning("Could not fetch %s (HTTP %d) — skipping", url, response.status_code)
+                return None
+
+            body = bytearray()
+            for block in response.iter_content(chunk_size=65536):
+                body.extend(block)
+                if len(body) > _MAX_RESPONSE_BYTES:
+                    log.warning("%s exceeds %d bytes — skipping", url, _MAX_RESPONSE_BYTES)
+                    return None
+
+            validators = {}
+            if etag := response.headers.get("ETag"):
+                validators["etag"] = etag
+            if last_modified := response.headers.get("Last-Modified"):
+                validators["last_modified"] = last_modified
+            return FetchedPost(url=url, body=bytes(body), validators=validators)
+
+    log.warning("Too many redirects for %s — skipping", url)
+    return None
+
+
+def extract_post(body: bytes) -> dict | None:
+    """Run trafilatura on a downloaded page. Returns {"title", "text"} or None."""
+    raw = trafilatura.extract(body, output_format="json")
+    if raw is None:
+        return None
+    data = json.loads(raw)
+    return {"title": data.get("title") or "", "text": data.get("text", "")}
+
+
+class BlogFetcher:
+    """
+    Fetch and extract many blog posts concurrently.
+
+    Used as a context manager so the extraction process pool is torn down even
+    when the consumer stops iterating early.
+    """
+
+    def __init__(self) -> None:
+        self._gates: dict[str, _HostGate] = {}
+        self._gates_lock = threading.Lock()
+        self._fetch_pool: ThreadPoolExecutor | None = None
+        self._extract_pool: Executor | None = None
+        self.not_modified = 0
+
+    def __enter__(self) -> "BlogFetcher":
+        self._fetch_pool = ThreadPoolExecutor(
+            max_workers=max(1, settings.blog_fetch_workers),
+            thread_name_prefix="blog-fetch",
+        )
+        if settings.blog_extract_workers > 0:
+            # spawn: the parent may already hold Chroma/tokenizer threads
+            self._extract_pool = ProcessPoolExecutor(
+                max_workers=settings.blog_extract_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for pool in (self._fetch_pool, self._extract_pool):
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+        self._fetch_pool = None
+        self._extract_pool = None
+
+    def _gate_for(self, url: str) -> _HostGate:
+        host = urlsplit(url).netloc.lower()
+        with self._gates_lock:
+            gate = self._gates.get(host)
+            if gate is None:
+                gate = _HostGate(settings.blog_fetch_per_host, settings.blog_fetch_delay_seconds)
+                self._gates[host] = gate
+            return gate
+
+    def _fetch(self, url: str) -> FetchedPost | None:
+        with self._gate_for(url):
+            return fetch_post(url)
+
+    def _submit_extract(self, body: bytes) -> Future:
+        if self._extract_pool is not None:
+            try:
+                return self._extract_pool.submit(extract_post, body)
+            except Exception as e:
+                log.warning("Extraction process pool unavailable (%s) — extracting in threads", e)
+                self._drop_extract_pool()
+        return self._fetch_pool.submit(extract_post, body)
+
+    def _drop_extract_pool(self) -> None:
+        if self._extract_pool is not None:
+            self._extract_pool.shutdown(wait=False, cancel_futures=True)
+            self._extract_pool = None
+
+    def iter_posts(self, urls: list[str]) -> Iterator[tuple[int, dict]]:
+        """
+        Yield (index in ``urls``, {"url", "title", "text", "validators"}) in completion order.
+
+        Posts that fail, come back empty, or are unchanged since the last import
+        (HTTP 304) are logged and skipped; 304s are counted in ``not_modified``.
+        Validators are not remembered here: the caller does that once the post
+        has been stored, so a post that fails later is fetched in full next time.
+        """
+        if self._fetch_pool is None:
+            raise RuntimeError("BlogFetcher must be used as a context manager")
+
+        pending: dict[Future, tuple[str, int, FetchedPost | None]] = {
+            self._fetch_pool.submit(self._fetch, url): ("fetch", index, None)
+            for index, url in enumerate(urls)
+        }
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, index, fetched = pending.pop(future)
+                url = urls[index]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if stage == "extract" and isinstance(e, BrokenProcessPool):
+                        log.warning("Extraction process pool failed (%s) — extracting in threads", e)
+                        self._drop_extract_pool()
+                        pending[self._submit_extract(fetched.body)] = ("extract", index, fetched)
+                        continue
+                    log.warning("%s failed (%s: %s) — skipping", url, type(e).__name__, e)
+                    continue
+
+                if stage == "fetch":
+                    if result is None:
+                        continue
+                    if result.body is None:
+                        self.not_modified += 1
+                        log.info("%s not modified since last import — skipping", url)
+                        continue
+                    pending[self._submit_extract(result.body)] = ("extract", index, result)
+                    continue
+
+                if result is None:
+                    log.warning("No article content found at %s — skipping", url)
+                    continue
+                if not result["text"].strip():
+                    log.warning("Empty text extracted from %s — skipping", url)
+                    continue
+                yield index, {
+                    "url": url,
+                    "title": result["title"] or url,
+                    "text": result["text"],
+                    "validators": fetched.validators,
+                }
+
@@ -1,8 +1,10 @@
-"""Google Drive folder downloader using google-api-python-client v3."""
+"""Google Drive folder listing and downloads using google-api-python-client v3."""
 
 import io
 import logging
 import os
+from collections import deque
+from typing import Any, Callable, Iterator
 
 from google.auth.transport.requests import Request
 from google.oauth2 import service_account
@@ -12,8 +14,6 @@ from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseDownload
 
 from bond.config import settings
-from bond.corpus.sources.file_source import extract_text
-from bond.corpus.ingestor import CorpusIngestor
 from bond.models import DriveFileInfo
 
 log = logging.getLogger(__name__)
@@ -25,6 +25,10 @@ SUPPORTED_MIME_TYPES = {
     "text/plain": ".txt",
     "application/vnd.google-apps.document": ".txt",  # export as plain text
 }
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+DRIVE_FILE_FIELDS = "id, name, mimeType, modifiedTime, md5Checksum, parents, trashed"
+# Parents OR-ed into one files.list query while walking a tree
+_PARENTS_PER_QUERY = 20
 
 
 def build_drive_service():
@@ -54,29 +58,55 @@ def build_drive_service():
         return build("drive", "v3", credentials=creds)
 
 
-def list_folder_files(service, folder_id: str) -> list[DriveFileInfo]:
-    """List supported files in a Drive folder. Handles pagination up to 500 files."""
-    query = f"'{folder_id}' in parents and trashed=false"
-    files = []
+def _execute_pages(request_fn: Callable[[str | None], Any], items_key: str) -> Iterator[dict]:
     page_token = None
     while True:
-        params = {
-            "q": query,
-            "fields": "nextPageToken, files(id, name, mimeType)",
-            "pageSize": 100,
-        }
-        if page_token:
-            params["pageToken"] = page_token
-        response = service.files().list(**params).execute()
-        files.extend(response.get("files", []))
+        response = request_fn(page_token).execute()
+        yield from response.get(items_key, [])
         page_token = response.get("nextPageToken")
         if not page_token:
-            break
-    return [
-        DriveFileInfo(id=f["id"], name=f["name"], mime_type=f["mimeType"])
-        for f in files
-        if f["mimeType"] in SUPPORTED_MIME_TYPES
-    ]
+            return
+
+
+def walk_folder(service, folder_id: str) -> tuple[dict[str, str | None], list[dict]]:
+    """
+    Breadth-first walk of a folder tree. Returns ({dir_id: parent_id}, files)
+    where files are the supported, non-trashed files anywhere below ``folder_id``.
+    """
+    dirs: dict[str, str | None] = {folder_id: None}
+    files: list[dict] = []
+    pending = deque([folder_id])
+    while pending:
+        batch = [pending.popleft() for _ in range(min(_PARENTS_PER_QUERY, len(pending)))]
+        parents = " or ".join(f"'{dir_id}' in parents" for dir_id in batch)
+        query = f"({parents}) and trashed=false"
+
+        def _list(page_token, query=query):
+            params = {
+                "q": query,
+                "fields": f"nextPageToken, files({DRIVE_FILE_FIELDS})",
+                "pageSize": 1000,
+            }
+            if page_token:
+                params["pageToken"] = page_token
+            return service.files().list(**params)
+
+        for item in _execute_pages(_list, "files"):
+            parent = next((p for p in item.get("parents", []) if p in dirs), batch[0])
+            if item["mimeType"] == FOLDER_MIME_TYPE:
+                if item["id"] not in dirs:
+                    dirs[item["id"]] = parent
+                    pending.append(item["id"])
+            elif item["mimeType"] in SUPPORTED_MIME_TYPES:
+                # Keep only the parent inside the tree; it is what later syncs check
+                files.append({**item, "parents": [parent]})
+    return dirs, files
+
+
+def list_folder_files(service, folder_id: str) -> list[DriveFileInfo]:
+    """List supported files anywhere below a Drive folder (recursive)."""
+    _, files = walk_folder(service, folder_id)
+    return [DriveFileInfo(id=f["id"], name=f["name"], mime_type=f["mimeType"]) for f in files]
 
 
 def download_file(service, file_id: str, mime_type: str) -> bytes | None:
@@ -99,23 +129,35 @@ def download_file(service, file_id: str, mime_type: str) -> bytes | None:
         return None
 
 
-def ingest_drive_folder(folder_id: str, source_type: str) -> dict:
+def ingest_drive_folder(
+    folder_id: str,
+    source_type: str,
+    *,
+    full_resync: bool = False,
+    on_result=None,
+) -> dict:
     """
-    Download and ingest all supported files from a Drive folder.
-    Returns summary dict with articles_ingested, total_chunks, warnings.
+    Sync a Drive folder (recursively) into the corpus; see bond/corpus/sources/drive_sync.py.
+    The first call imports everything, later calls only what changed since the last sync.
+    Returns summary dict with articles_ingested, total_chunks, articles_deleted, warnings.
+    ``on_result(article, result)`` is called after each ingested file.
     """
+    from bond.corpus.sources.drive_sync import DriveSync
+
     try:
-        service = build_drive_service()
+        sync = DriveSync(build_drive_service)
     except Exception as e:
         return {
             "articles_ingested": 0,
             "total_chunks": 0,
+            "articles_unchanged": 0,
+            "articles_deleted": 0,
             "warnings": [f"Autoryzacja Google Drive nie powiodła się: {e}"],
         }
 
-    files = list_folder_files(service, folder_id)
+    result = sync.sync(folder_id, source_type, full=full_resync, on_result=on_result)
 
-    if not files:
+    if result["sync_mode"] == "full" and not result["files_changed"] and not sync.store.files(folder_id):
         # Per RESEARCH.md pitfall 4: show service account email for troubleshooting
         warning_msg = (
             f"Nie znaleziono obsługiwanych plików w folderze {folder_id}. "
@@ -123,46 +165,5 @@ def ingest_drive_folder(folder_id: str, source_type: str) -> dict:
             "Sprawdź GOOGLE_CREDENTIALS_PATH, aby znaleźć adres e-mail konta serwisowego."
         )
         log.warning("%s", warning_msg)
-        return {"articles_ingested": 0, "total_chunks": 0, "warnings": [warning_msg]}
-
-    log.info("Found %d supported files in Drive folder %s", len(files), folder_id)
-
-    ingestor = CorpusIngestor()
-    total_chunks = 0
-    ingested_count = 0
-    warnings = []
-
-    for f in files:
-        content = download_file(service, f.id, f.mime_type)
-        if content is None:
-            warnings.append(f"Nie udało się pobrać pliku {f.name} — plik został pominięty.")
-            continue
-
-        # Determine effective extension for file_source dispatch
-        ext = SUPPORTED_MIME_TYPES[f.mime_type].lstrip(".")
-        effective_name = f.name if "." in f.name else f"{f.name}.{ext}"
-
-        text = extract_text(content, effective_name)
-        if text is None:
-            warnings.append(f"Nie udało się odczytać pliku {f.name} — plik został pominięty.")
-            continue
-
-        result = ingestor.ingest(
-            text=text,
-            title=f.name,
-            source_type=source_type,
-            source_url=f"https://drive.google.com/file/d/{f.id}",
-        )
-        if result["chunks_added"] > 0:
-            total_chunks += result["chunks_added"]
-            ingested_count += 1
-        else:
-            warnings.append(
-                f"Plik {f.name} jest zbyt krótki, aby utworzyć fragmenty — plik został pominięty."
-            )
-
-    return {
-        "articles_ingested": ingested_count,
-        "total_chunks": total_chunks,
-        "warnings": warnings,
-    }
+        result["warnings"].append(warning_msg)
+    return result
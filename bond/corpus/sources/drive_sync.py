@@ -0,0 +1,456 @@
+"""Incremental Google Drive folder sync.
+
+The first sync of a folder walks it recursively and ingests every supported
+file. It records each file's modifiedTime/md5Checksum and the Changes API
+start page token in SQLite (``settings.drive_sync_db_path``). Later syncs
+read only the changes since that token:
+
+- new or modified files inside the folder tree are downloaded and re-ingested;
+- files that were trashed, deleted or moved out of the tree are removed from the corpus;
+- folders moved into the tree are walked, folders moved out are pruned;
+- files whose download or extraction failed are kept as pending and retried
+  by the next incremental sync (the Changes API will not report them again).
+
+Downloads and extraction run on a bounded thread pool
+(``settings.drive_download_workers``). Each worker gets its own service from
+``service_factory``, because googleapiclient services are not thread-safe.
+Extracted documents stream into CorpusIngestor.ingest_many as they complete.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterator
+
+from bond.config import settings
+from bond.corpus.ingestor import CorpusIngestor
+from bond.corpus.sources.drive_source import (
+    DRIVE_FILE_FIELDS,
+    FOLDER_MIME_TYPE,
+    SUPPORTED_MIME_TYPES,
+    download_file,
+    walk_folder,
+)
+from bond.corpus.sources.file_source import extract_chunks
+
+log = logging.getLogger(__name__)
+
+CREATE_TABLES = (
+    """
+    CREATE TABLE IF NOT EXISTS drive_sync_roots (
+        root_id TEXT PRIMARY KEY,
+        start_page_token TEXT,
+        synced_at TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS drive_sync_dirs (
+        root_id TEXT NOT NULL,
+        dir_id TEXT NOT NULL,
+        parent_id TEXT,
+        PRIMARY KEY (root_id, dir_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS drive_sync_files (
+        root_id TEXT NOT NULL,
+        file_id TEXT NOT NULL,
+        parent_id TEXT,
+        name TEXT,
+        mime_type TEXT,
+        modified_time TEXT,
+        md5 TEXT,
+        article_id TEXT DEFAULT '',
+        PRIMARY KEY (root_id, file_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS drive_sync_pending (
+        root_id TEXT NOT NULL,
+        file_id TEXT NOT NULL,
+        file_json TEXT NOT NULL,
+        PRIMARY KEY (root_id, file_id)
+    )
+    """,
+)
+
+
+def drive_file_url(file_id: str) -> str:
+    return f"https://drive.google.com/file/d/{file_id}"
+
+
+class DriveSyncStore:
+    """Sync bookkeeping on one lock-guarded WAL connection (same pattern as article_log)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = os.path.abspath(path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.RLock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            for statement in CREATE_TABLES:
+                self.conn.execute(statement)
+
+    def start_page_token(self, root_id: str) -> str | None:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT start_page_token FROM drive_sync_roots WHERE root_id = ?", (root_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def save_start_page_token(self, root_id: str, token: str) -> None:
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO drive_sync_roots (root_id, start_page_token, synced_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(root_id) DO UPDATE SET start_page_token = excluded.start_page_token, "
+                "synced_at = excluded.synced_at",
+                (root_id, token, datetime.now(timezone.utc).isoformat()),
+            )
+
+    def dirs(self, root_id: str) -> dict[str, str | None]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT dir_id, parent_id FROM drive_sync_dirs WHERE root_id = ?", (root_id,)
+            ).fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def replace_dirs(self, root_id: str, dirs: dict[str, str | None]) -> None:
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM drive_sync_dirs WHERE root_id = ?", (root_id,))
+            self.conn.executemany(
+                "INSERT INTO drive_sync_dirs (root_id, dir_id, parent_id) VALUES (?, ?, ?)",
+                [(root_id, dir_id, parent_id) for dir_id, parent_id in dirs.items()],
+            )
+
+    def files(self, root_id: str) -> dict[str, dict]:
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT * FROM drive_sync_files WHERE root_id = ?", (root_id,)
+            ).fetchall()
+        return {row["file_id"]: dict(row) for row in rows}
+
+    def record_file(self, root_id: str, file: dict, article_id: str) -> None:
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO drive_sync_files "
+                "(root_id, file_id, parent_id, name, mime_type, modified_time, md5, article_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    root_id,
+                    file["id"],
+                    (file.get("parents") or [None])[0],
+                    file.get("name"),
+                    file.get("mimeType"),
+                    file.get("modifiedTime"),
+                    file.get("md5Checksum"),
+                    article_id,
+                ),
+            )
+
+    def forget_files(self, root_id: str, file_ids: list[str]) -> None:
+        if not file_ids:
+            return
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "DELETE FROM drive_sync_files WHERE root_id = ? AND file_id = ?",
+                [(root_id, file_id) for file_id in file_ids],
+            )
+
+    def pending_files(self, root_id: str) -> dict[str, dict]:
+        """Files whose last download or extraction failed, as Drive file resources."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT file_id, file_json FROM drive_sync_pending WHERE root_id = ?", (root_id,)
+            ).fetchall()
+        return {row[0]: json.loads(row[1]) for row in rows}
+
+    def replace_pending(self, root_id: str, files: list[dict]) -> None:
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM drive_sync_pending WHERE root_id = ?", (root_id,))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO drive_sync_pending (root_id, file_id, file_json) VALUES (?, ?, ?)",
+                [(root_id, file["id"], json.dumps(file)) for file in files],
+            )
+
+    def articles_still_tracked(
+        self, root_id: str, file_ids: list[str], article_ids: list[str]
+    ) -> set[str]:
+        """Article ids that a file other than ``file_ids`` (in any root) still points at.
+
+        Identical files share one article, so it must survive while any of them is tracked.
+        """
+        if not article_ids:
+            return set()
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT DISTINCT article_id FROM drive_sync_files "
+                f"WHERE article_id IN ({', '.join('?' * len(article_ids))}) "
+                f"AND NOT (root_id = ? AND file_id IN ({', '.join('?' * len(file_ids))}))",
+                [*article_ids, root_id, *file_ids],
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+
+_store: DriveSyncStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_drive_sync_store() -> DriveSyncStore:
+    global _store
+    path = os.path.abspath(settings.drive_sync_db_path)
+    with _store_lock:
+        if _store is None or _store.path != path:
+            if _store is not None:
+                _store.close()
+            _store = DriveSyncStore(path)
+        return _store
+
+
+def _prune_dirs(dirs: dict[str, str | None], root_id: str) -> dict[str, str | None]:
+    """Drop dirs whose parent chain no longer reaches the root."""
+    kept: dict[str, str | None] = {root_id: None}
+    for dir_id in dirs:
+        chain: list[str] = []
+        current: str | None = dir_id
+        while current is not None and current not in kept and current not in chain:
+            chain.append(current)
+            current = dirs.get(current)
+        if current in kept:
+            kept.update({link: dirs[link] for link in chain})
+    return kept
+
+
+def _has_changed(tracked: dict | None, file: dict) -> bool:
+    if tracked is None:
+        return True
+    return (tracked["modified_time"], tracked["md5"]) != (file.get("modifiedTime"), file.get("md5Checksum"))
+
+
+class DriveSync:
+    def __init__(
+        self,
+        service_factory: Callable[[], Any],
+        store: DriveSyncStore | None = None,
+        workers: int | None = None,
+    ) -> None:
+        self._service_factory = service_factory
+        self.service = service_factory()
+        self.store = store or get_drive_sync_store()
+        self.workers = max(1, workers if workers is not None else settings.drive_download_workers)
+        self._local = threading.local()
+
+    # -- change detection ---------------------------------------------------
+
+    def _full_scan(self, root_id: str) -> tuple[str, list[dict], list[str]]:
+        # Token first, so edits made while walking show up in the next sync
+        token = self.service.changes().getStartPageToken().execute()["startPageToken"]
+        dirs, files = walk_folder(self.service, root_id)
+        tracked = self.store.files(root_id)
+        listed = {file["id"] for file in files}
+        self.store.replace_dirs(root_id, dirs)
+        candidates = [file for file in files if _has_changed(tracked.get(file["id"]), file)]
+        removed = [file_id for file_id in tracked if file_id not in listed]
+        return token, candidates, removed
+
+    def _incremental_scan(self, root_id: str, token: str) -> tuple[str, list[dict], list[str]]:
+        changes: list[dict] = []
+        new_token = token
+        page_token: str | None = token
+        while page_token:
+            response = self.service.changes().list(
+                pageToken=page_token,
+                fields=f"nextPageToken, newStartPageToken, changes(fileId, removed, file({DRIVE_FILE_FIELDS}))",
+                pageSize=1000,
+                includeRemoved=True,
+                spaces="drive",
+            ).execute()
+            changes.extend(response.get("changes", []))
+            page_token = response.get("nextPageToken")
+            new_token = response.get("newStartPageToken", new_token)
+
+        dirs = self.store.dirs(root_id)
+        tracked = self.store.files(root_id)
+        # Failed last time: retried unless a later change removed or moved them out
+        candidates: dict[str, dict] = self.store.pending_files(root_id)
+        removed: set[str] = set()
+
+        for change in changes:
+            file_id = change["fileId"]
+            file = change.get("file") or {}
+            gone = change.get("removed") or file.get("trashed")
+            parents = file.get("parents") or []
+            inside = next((p for p in parents if p in dirs), None)
+
+            if file.get("mimeType") == FOLDER_MIME_TYPE or (gone and file_id in dirs):
+                if file_id == root_id:
+                    continue
+                if not gone and inside is not None:
+                    if file_id not in dirs:
+                        # Folder moved or created inside the tree: pick up its whole subtree
+                        sub_dirs, sub_files = walk_folder(self.service, file_id)
+                        dirs.update(sub_dirs)
+                        dirs[file_id] = inside
+                        candidates.update({f["id"]: f for f in sub_files})
+                    else:
+                        dirs[file_id] = inside
+                else:
+                    dirs.pop(file_id, None)
+                continue
+
+            if gone or file.get("mimeType") not in SUPPORTED_MIME_TYPES or inside is None:
+                candidates.pop(file_id, None)
+                if file_id in tracked:
+                    removed.add(file_id)
+                continue
+            candidates[file_id] = {**file, "parents": [inside]}
+            removed.discard(file_id)
+
+        dirs = _prune_dirs(dirs, root_id)
+        self.store.replace_dirs(root_id, dirs)
+        changed: list[dict] = []
+        for file_id, file in candidates.items():
+            if file["parents"][0] not in dirs:
+                if file_id in tracked:
+                    removed.add(file_id)
+            elif _has_changed(tracked.get(file_id), file):
+                changed.append(file)
+        # Files left under a folder that moved out of the tree
+        for file_id, row in tracked.items():
+            if file_id not in candidates and row["parent_id"] not in dirs:
+                removed.add(file_id)
+        return new_token, changed, sorted(removed)
+
+    # -- download + ingest --------------------------------------------------
+
+    def _worker_service(self):
+        service = getattr(self._local, "service", None)
+        if service is None:
+            service = self._local.service = self._service_factory()
+        return service
+
+    def _fetch(self, file: dict) -> list[str] | None:
+        content = download_file(self._worker_service(), file["id"], file["mimeType"])
+        if content is None:
+            return None
+        name = file["name"]
+        ext = SUPPORTED_MIME_TYPES[file["mimeType"]].lstrip(".")
+        effective_name = name if "." in name else f"{name}.{ext}"
+        return extract_chunks(content, effective_name)
+
+    def _downloaded_articles(
+        self, files: list[dict], warnings: list[str], failed: list[dict]
+    ) -> Iterator[dict]:
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="drive-download")
+        try:
+            futures = {pool.submit(self._fetch, file): file for file in files}
+            for future in as_completed(futures):
+                file = futures[future]
+                try:
+                    chunks = future.result()
+                except Exception as exc:
+                    log.warning("Drive file %s failed: %s — skipping", file["id"], exc)
+                    chunks = None
+                if chunks is None:
+                    failed.append(file)
+                    warnings.append(
+                        f"Nie udało się pobrać lub odczytać pliku {file['name']} — "
+                        "plik zostanie pobrany ponownie przy następnej synchronizacji."
+                    )
+                    continue
+                yield {
+                    "chunks": chunks,
+                    "title": file["name"],
+                    "source_url": drive_file_url(file["id"]),
+                    "drive_file": file,
+                }
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _remove(self, root_id: str, file_ids: list[str]) -> int:
+        tracked = self.store.files(root_id)
+        article_ids = [tracked[f]["article_id"] for f in file_ids if f in tracked and tracked[f]["article_id"]]
+        shared = self.store.articles_still_tracked(root_id, file_ids, article_ids)
+        to_delete = [article_id for article_id in dict.fromkeys(article_ids) if article_id not in shared]
+        if to_delete:
+            CorpusIngestor().remove(to_delete)
+        self.store.forget_files(root_id, file_ids)
+        return len(to_delete)
+
+    def sync(
+        self,
+        folder_id: str,
+        source_type: str,
+        *,
+        full: bool = False,
+        on_result: Callable[[dict, dict], None] | None = None,
+    ) -> dict:
+        """Bring the corpus in line with ``folder_id``. Returns an ingest summary plus sync counters."""
+        token = None if full else self.store.start_page_token(folder_id)
+        if token is None:
+            mode = "full"
+            new_token, changed, removed = self._full_scan(folder_id)
+        else:
+            mode = "incremental"
+            new_token, changed, removed = self._incremental_scan(folder_id, token)
+        log.info(
+            "Drive sync (%s) of %s: %d changed, %d removed", mode, folder_id, len(changed), len(removed)
+        )
+
+        warnings: list[str] = []
+        failed: list[dict] = []
+        total_chunks = 0
+        ingested_count = 0
+        unchanged_count = 0
+
+        def _record(article: dict, result: dict) -> None:
+            nonlocal total_chunks, ingested_count, unchanged_count
+            file = article["drive_file"]
+            self.store.record_file(folder_id, file, result.get("article_id", ""))
+            if result.get("status") == "unchanged":
+                unchanged_count += 1
+            elif result["chunks_added"] > 0:
+                total_chunks += result["chunks_added"]
+                ingested_count += 1
+            else:
+                warnings.append(
+                    f"Plik {file['name']} jest zbyt krótki, aby utworzyć fragmenty — plik został pominięty."
+                )
+            if on_result is not None:
+                on_result(article, result)
+
+        if changed:
+            CorpusIngestor().ingest_many(
+                self._downloaded_articles(changed, warnings, failed),
+                source_type=source_type,
+                on_result=_record,
+            )
+        deleted_count = self._remove(folder_id, removed)
+        # Files that failed are not in the change feed after this token: keep them for the
+        # next incremental run. A full scan re-lists everything, so it replaces the list too.
+        self.store.replace_pending(folder_id, failed)
+        # Only after everything above succeeded: an interrupted sync re-reads the same changes
+        self.store.save_start_page_token(folder_id, new_token)
+
+        if unchanged_count:
+            warnings.append(f"Pominięto pliki bez zmian od ostatniego importu: {unchanged_count}.")
+        if deleted_count:
+            warnings.append(f"Usunięto z korpusu pliki usunięte lub przeniesione poza folder: {deleted_count}.")
+        return {
+            "articles_ingested": ingested_count,
+            "total_chunks": total_chunks,
+            "articles_unchanged": unchanged_count,
+            "articles_deleted": deleted_count,
+            "files_changed": len(changed),
+            "sync_mode": mode,
+            "warnings": warnings,
+        }
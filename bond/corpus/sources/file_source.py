@@ -1,5 +1,12 @@
 import io
 import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator
 
 try:
     import pymupdf
@@ -12,6 +19,9 @@ except ImportError:
 
 from docx import Document
 
+from bond.config import settings
+from bond.corpus.chunker import chunk_stream
+
 log = logging.getLogger(__name__)
 
 ALLOWED_EXTENSIONS = {"pdf", "docx", "txt"}
@@ -55,3 +65,142 @@ def extract_text(content: bytes, filename: str) -> str | None:
             log.warning("TXT decode failed for %s: %s — skipping", filename, e)
             return None
     return None
+
+
+# ---------------------------------------------------------------------------
+# Isolated extraction: page-by-page text → chunks, in a worker process
+# ---------------------------------------------------------------------------
+
+def _file_extension(filename: str) -> str:
+    return filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+
+
+def _iter_pdf_pages(source: str | bytes) -> Iterator[str]:
+    doc = pymupdf.open(source) if isinstance(source, str) else _open_pdf(source)
+    try:
+        for page in doc:
+            yield page.get_text()
+    finally:
+        doc.close()
+
+
+def _iter_docx_paragraphs(source: str | bytes) -> Iterator[str]:
+    doc = Document(source if isinstance(source, str) else io.BytesIO(source))
+    for paragraph in doc.paragraphs:
+        if paragraph.text.strip():
+            yield paragraph.text
+
+
+def _iter_txt_blocks(source: str | bytes, block_size: int = 1 << 20) -> Iterator[str]:
+    if isinstance(source, bytes):
+        yield source.decode("utf-8", errors="replace")
+        return
+    with open(source, encoding="utf-8", errors="replace") as f:
+        while block := f.read(block_size):
+            yield block
+
+
+_PIECE_READERS = {"pdf": _iter_pdf_pages, "docx": _iter_docx_paragraphs, "txt": _iter_txt_blocks}
+
+
+def _extract_chunks_worker(source: str | bytes, ext: str) -> list[str] | None:
+    """
+    Runs in the extraction process: stream pages/paragraphs straight into the chunker.
+    Returns None when the document has no text (or cannot be parsed), [] when it is too short to chunk.
+    """
+    saw_text = False
+
+    def _pieces() -> Iterator[str]:
+        nonlocal saw_text
+        for piece in _PIECE_READERS[ext](source):
+            if piece.strip():
+                saw_text = True
+            yield piece
+
+    separator = "" if ext == "txt" else "\n\n"
+    try:
+        chunks = list(chunk_stream(_pieces(), separator=separator))
+    except Exception as e:
+        log.warning("%s parse failed: %s — skipping", ext.upper(), e)
+        return None
+    return chunks if saw_text else None
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking next to Chroma/tokenizer threads can deadlock the child
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.extract_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Kill a pool whose worker is stuck; the next extraction starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_extract_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def extract_chunks(source: str | bytes, filename: str) -> list[str] | None:
+    """
+    Extract and chunk a document given as a file path or bytes.
+
+    PDF/DOCX/TXT text is read page by page (paragraph by paragraph for DOCX) and
+    fed into chunk_stream inside a process pool (``settings.extract_workers``;
+    0 = in-process), so a large or hostile document neither pins the API process
+    nor materialises its full text there. Documents that take longer than
+    ``settings.extract_timeout_seconds`` are abandoned and their worker killed.
+
+    Returns the chunks, [] for text too short to chunk, or None when the file is
+    oversize, unsupported, unreadable or timed out (logged as WARN).
+    """
+    size = len(source) if isinstance(source, bytes) else os.path.getsize(source)
+    if size > MAX_FILE_SIZE:
+        log.warning("%s exceeds 20MB limit — skipping", filename)
+        return None
+    ext = _file_extension(filename)
+    if ext not in ALLOWED_EXTENSIONS:
+        log.warning("Unsupported file type .%s in %s — skipping", ext, filename)
+        return None
+    if settings.extract_workers <= 0:
+        return _extract_chunks_worker(source, ext)
+
+    for attempt in range(2):
+        pool = _get_pool()
+        future = pool.submit(_extract_chunks_worker, source, ext)
+        try:
+            return future.result(timeout=settings.extract_timeout_seconds)
+        except FuturesTimeoutError:
+            log.warning(
+                "Extraction of %s exceeded %.0fs — skipping",
+                filename,
+                settings.extract_timeout_seconds,
+            )
+            _discard_pool(pool)
+            return None
+        except BrokenProcessPool:
+            # A sibling document's timeout killed this pool; retry once in a fresh one
+            _discard_pool(pool)
+            if attempt:
+                log.warning("Extraction worker for %s crashed — skipping", filename)
+    return None
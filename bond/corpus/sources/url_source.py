@@ -1,26 +1,20 @@
 """Blog URL scraper using trafilatura for article extraction."""
 
-import json
 import logging
+from typing import Iterator
 
-import trafilatura
 from trafilatura.sitemaps import sitemap_search
 
 from bond.config import settings
 from bond.corpus.ingestor import CorpusIngestor
+from bond.corpus.sources.blog_fetcher import BlogFetcher, remember_validators
 from bond.security import UnsafeUrlError, validate_public_url
 
 log = logging.getLogger(__name__)
 
 
-def scrape_blog(url: str) -> list[dict]:
-    """
-    Discover all post URLs via sitemap/feed, extract each article.
-    Returns list of {"url": str, "title": str, "text": str}.
-    Failures: skip and warn (per CONTEXT.md policy).
-    """
-    articles = []
-
+def _discover_post_urls(url: str) -> list[str]:
+    """Discover post URLs via sitemap/feed and drop unsafe ones, keeping sitemap order."""
     validated_url = validate_public_url(
         url,
         allow_private=settings.allow_private_url_ingest,
@@ -41,78 +35,120 @@ def scrape_blog(url: str) -> list[dict]:
 
     log.info("Scraping %d posts from %s", len(urls), validated_url)
 
+    safe_urls = []
     for post_url in urls:
         try:
-            safe_post_url = validate_public_url(
-                post_url,
-                allow_private=settings.allow_private_url_ingest,
+            safe_urls.append(
+                validate_public_url(
+                    post_url,
+                    allow_private=settings.allow_private_url_ingest,
+                )
             )
         except UnsafeUrlError as e:
             log.warning("%s rejected as unsafe URL (%s) — skipping", post_url, e)
-            continue
+    return safe_urls
 
-        try:
-            downloaded = trafilatura.fetch_url(safe_post_url)
-            if downloaded is None:
-                log.warning("Could not fetch %s — skipping", safe_post_url)
-                continue
-            raw = trafilatura.extract(downloaded, output_format="json")
-            if raw is None:
-                log.warning("No article content found at %s — skipping", safe_post_url)
-                continue
-            data = json.loads(raw)
-            text = data.get("text", "")
-            if not text.strip():
-                log.warning("Empty text extracted from %s — skipping", safe_post_url)
-                continue
-            articles.append(
-                {
-                    "url": safe_post_url,
-                    "title": data.get("title") or safe_post_url,
-                    "text": text,
-                }
-            )
-        except Exception as e:
-            log.warning("%s failed (%s: %s) — skipping", safe_post_url, type(e).__name__, e)
 
+def iter_blog_articles(url: str, stats: dict | None = None) -> Iterator[dict]:
+    """
+    Discover post URLs and yield {"url", "title", "text", "validators"} dicts as
+    soon as each post has been fetched and extracted (completion order, not
+    sitemap order). The caller passes "validators" to remember_validators()
+    once the article is stored.
+    Failures: skip and warn (per CONTEXT.md policy).
+
+    ``stats["not_modified"]`` is set to the number of posts skipped with HTTP 304.
+    """
+    post_urls = _discover_post_urls(url)
+    with BlogFetcher() as fetcher:
+        for _, article in fetcher.iter_posts(post_urls):
+            yield article
+        if fetcher.not_modified:
+            log.info("%d posts at %s unchanged since last import", fetcher.not_modified, url)
+        if stats is not None:
+            stats["not_modified"] = fetcher.not_modified
+
+
+def scrape_blog(url: str) -> list[dict]:
+    """
+    Discover all post URLs via sitemap/feed, extract each article.
+    Returns list of {"url": str, "title": str, "text": str} in sitemap order.
+    Failures: skip and warn (per CONTEXT.md policy).
+    """
+    post_urls = _discover_post_urls(url)
+    with BlogFetcher() as fetcher:
+        indexed = sorted(fetcher.iter_posts(post_urls), key=lambda item: item[0])
+    articles = []
+    for _, article in indexed:
+        validators = article.pop("validators")
+        remember_validators(article["url"], validators)
+        articles.append(article)
     return articles
 
 
-def ingest_blog(url: str, source_type: str) -> dict:
+def ingest_blog(url: str, source_type: str, *, on_result=None) -> dict:
     """
     Scrape blog and ingest all articles. Returns summary dict.
-    """
-    articles = scrape_blog(url)
-    if not articles:
-        log.warning("No articles extracted from %s", url)
-        return {
-            "articles_ingested": 0,
-            "total_chunks": 0,
-            "warnings": [f"Nie znaleziono artykułów pod adresem {url}."],
-        }
 
-    ingestor = CorpusIngestor()
+    Articles are handed to the ingestor while the remaining posts are still
+    being downloaded. ``on_result(article, result)`` is called after each one
+    (ingest-job progress; it may raise to stop the import).
+    """
     total_chunks = 0
     ingested_count = 0
+    unchanged_count = 0
+    seen_count = 0
     warnings = []
-
-    for article in articles:
-        result = ingestor.ingest(
-            text=article["text"],
-            title=article["title"],
-            source_type=source_type,
-            source_url=article["url"],
-        )
-        if result["chunks_added"] > 0:
+    fetch_stats = {"not_modified": 0}
+
+    def _record(article: dict, result: dict) -> None:
+        nonlocal total_chunks, ingested_count, unchanged_count, seen_count
+        seen_count += 1
+        if result.get("status") == "unchanged":
+            unchanged_count += 1
+        elif result["chunks_added"] > 0:
             total_chunks += result["chunks_added"]
             ingested_count += 1
         else:
             warnings.append(
-                f"Artykuł pod adresem {article['url']} jest zbyt krótki, aby utworzyć fragmenty."
+                f"Artykuł pod adresem {article['source_url']} jest zbyt krótki, aby utworzyć fragmenty."
             )
+        if result.get("status") == "unchanged" or result["chunks_added"] > 0:
+            # Only a stored post may be answered with 304 (and skipped) next time
+            remember_validators(article["source_url"], article.get("validators") or {})
+        if on_result is not None:
+            on_result(article, result)
+
+    ingestor = CorpusIngestor()
+    ingestor.ingest_many(
+        (
+            {
+                "text": article["text"],
+                "title": article["title"],
+                "source_url": article["url"],
+                "validators": article.get("validators") or {},
+            }
+            for article in iter_blog_articles(url, stats=fetch_stats)
+        ),
+        source_type=source_type,
+        on_result=_record,
+    )
+    unchanged_count += fetch_stats["not_modified"]
+
+    if not seen_count and not unchanged_count:
+        log.warning("No articles extracted from %s", url)
+        return {
+            "articles_ingested": 0,
+            "total_chunks": 0,
+            "warnings": [f"Nie znaleziono artykułów pod adresem {url}."],
+        }
+
+    if unchanged_count:
+        warnings.append(f"Pominięto artykuły bez zmian od ostatniego importu: {unchanged_count}.")
 
     return {
         "articles_ingested": ingested_count,
         "total_chunks": total_chunks,
+        "articles_unchanged": unchanged_count,
         "warnings": warnings,
     }
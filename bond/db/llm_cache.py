@@ -0,0 +1,173 @@
+"""
+bond/db/llm_cache.py — SQLite storage for the deterministic LLM response cache.
+
+Rows are keyed by ``cache_key`` (see ``bond.llm.ResponseCache``: a hash of
+the model parameters and the normalized prompt) and hold the serialized
+generations zlib-compressed, together with the token usage of the call that
+produced them, so hits can be reported as avoided cost.
+
+Like search_cache, entries expire after ``settings.llm_cache_ttl_days`` and
+``sweep_llm_cache`` evicts least-recently-used rows above
+``settings.llm_cache_max_bytes``. The table lives in metadata_db_path.
+"""
+
+import asyncio
+import logging
+import zlib
+from datetime import datetime, timedelta, timezone
+
+import aiosqlite
+
+from bond.config import settings
+from bond.db.pool import connection, register_migration
+
+log = logging.getLogger(__name__)
+
+_CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    cache_key     TEXT NOT NULL PRIMARY KEY,
+    site          TEXT NOT NULL,
+    model         TEXT NOT NULL,
+    payload       BLOB NOT NULL,
+    payload_size  INTEGER NOT NULL,
+    input_tokens  INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    cached_at     TEXT NOT NULL,
+    last_used_at  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_cached_at ON llm_cache(cached_at);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used_at ON llm_cache(last_used_at);
+"""
+
+# Same running-size eviction as search_cache._EVICT_LRU_SQL
+_EVICT_LRU_SQL = """
+DELETE FROM llm_cache WHERE cache_key IN (
+    SELECT cache_key FROM (
+        SELECT cache_key,
+               SUM(payload_size) OVER (ORDER BY last_used_at DESC, cache_key) AS running_size
+        FROM llm_cache
+    ) WHERE running_size > ?
+)
+"""
+
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "expired": 0,
+    "writes": 0,
+    "evicted_expired": 0,
+    "evicted_lru": 0,
+    "entries": 0,
+    "total_bytes": 0,
+    "last_sweep_at": None,
+}
+
+
+@register_migration
+async def _ensure_table(conn: aiosqlite.Connection) -> None:
+    await conn.executescript(_CREATE_TABLE_SQL)
+
+
+async def get_llm_response(cache_key: str) -> tuple[str, int, int] | None:
+    """Return (serialized generations, input_tokens, output_tokens), or None on miss or TTL expiry."""
+    async with connection(settings.metadata_db_path) as conn:
+        cursor = await conn.execute(
+            "SELECT payload, input_tokens, output_tokens, cached_at FROM llm_cache WHERE cache_key = ?",
+            (cache_key,),
+        )
+        row = await cursor.fetchone()
+        if row is None:
+            _stats["misses"] += 1
+            return None
+        payload, input_tokens, output_tokens, cached_at_str = row
+        now = datetime.now(timezone.utc)
+        if now - datetime.fromisoformat(cached_at_str) >= timedelta(days=settings.llm_cache_ttl_days):
+            _stats["expired"] += 1
+            return None
+        try:
+            generations = zlib.decompress(payload).decode("utf-8")
+        except zlib.error as exc:
+            _stats["misses"] += 1
+            log.warning("llm_cache: unreadable entry %.8s: %s", cache_key, exc)
+            return None
+        await conn.execute(
+            "UPDATE llm_cache SET last_used_at = ? WHERE cache_key = ?", (now.isoformat(), cache_key)
+        )
+        await conn.commit()
+    _stats["hits"] += 1
+    return generations, input_tokens, output_tokens
+
+
+async def save_llm_response(
+    cache_key: str,
+    site: str,
+    model: str,
+    generations: str,
+    input_tokens: int = 0,
+    output_tokens: int = 0,
+) -> None:
+    """Insert or replace a cached response (``generations`` is langchain_core.load.dumps output)."""
+    payload = zlib.compress(generations.encode("utf-8"), settings.search_cache_zlib_level)
+    now = datetime.now(timezone.utc).isoformat()
+    async with connection(settings.metadata_db_path) as conn:
+        await conn.execute(
+            "INSERT OR REPLACE INTO llm_cache "
+            "(cache_key, site, model, payload, payload_size, input_tokens, output_tokens, "
+            "cached_at, last_used_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (cache_key, site, model, payload, len(payload), input_tokens, output_tokens, now, now),
+        )
+        await conn.commit()
+    _stats["writes"] += 1
+
+
+async def clear_llm_cache(site: str | None = None) -> None:
+    async with connection(settings.metadata_db_path) as conn:
+        if site is None:
+            await conn.execute("DELETE FROM llm_cache")
+        else:
+            await conn.execute("DELETE FROM llm_cache WHERE site = ?", (site,))
+        await conn.commit()
+
+
+async def sweep_llm_cache() -> dict[str, int]:
+    """Delete expired entries, then evict LRU entries above the size cap. Returns what was removed."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.llm_cache_ttl_days)
+    async with connection(settings.metadata_db_path) as conn:
+        cursor = await conn.execute("DELETE FROM llm_cache WHERE cached_at < ?", (cutoff.isoformat(),))
+        expired = cursor.rowcount
+        cursor = await conn.execute(_EVICT_LRU_SQL, (settings.llm_cache_max_bytes,))
+        evicted = cursor.rowcount
+        await conn.commit()
+        cursor = await conn.execute("SELECT COUNT(*), COALESCE(SUM(payload_size), 0) FROM llm_cache")
+        entries, total_bytes = await cursor.fetchone()
+
+    _stats["evicted_expired"] += expired
+    _stats["evicted_lru"] += evicted
+    _stats["entries"] = entries
+    _stats["total_bytes"] = total_bytes
+    _stats["last_sweep_at"] = datetime.now(timezone.utc).isoformat()
+    if expired or evicted:
+        log.info(
+            "llm_cache: swept %d expired and %d LRU entries (%d entries, %d bytes left)",
+            expired,
+            evicted,
+            entries,
+            total_bytes,
+        )
+    return {"expired": expired, "evicted": evicted, "entries": entries, "total_bytes": total_bytes}
+
+
+async def run_llm_cache_sweeper(interval_seconds: float | None = None) -> None:
+    """Sweep now and then every ``interval_seconds`` until cancelled (started by the API lifespan)."""
+    interval = interval_seconds if interval_seconds is not None else settings.search_cache_sweep_interval_seconds
+    while True:
+        try:
+            await sweep_llm_cache()
+        except Exception as exc:
+            log.warning("llm_cache sweep failed: %s", exc)
+        await asyncio.sleep(interval)
+
+
+def get_llm_cache_storage_stats() -> dict:
+    """Hit/miss/eviction counters for this process; entries/total_bytes as of the last sweep."""
+    return {**_stats}
@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 import aiosqlite
 
 from bond.config import settings
+from bond.db.pool import connection, register_migration
 
 
 _TOKEN_COLUMNS: list[tuple[str, str]] = [
@@ -13,18 +14,21 @@ _TOKEN_COLUMNS: list[tuple[str, str]] = [
 ]
 
 
+_SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "schema.sql")
+with open(_SCHEMA_PATH) as _schema_file:
+    _SCHEMA_DDL = _schema_file.read()
+
+
+@register_migration
 async def _ensure_schema(conn: aiosqlite.Connection) -> None:
-    """Inicjalizuje schemat bazy danych (idempotentnie).
+    """Inicjalizuje schemat bazy danych (idempotentnie, raz na plik bazy — patrz bond.db.pool).
 
     Uruchamia DDL z schema.sql, a następnie próbuje dodać kolumny tokenów
     do istniejących tabel (migracja dla baz sprzed wersji z #15).
     SQLite nie obsługuje ADD COLUMN IF NOT EXISTS — błąd duplikatu kolumny
     jest ignorowany, co czyni operację idempotentną.
     """
-    schema_path = os.path.join(os.path.dirname(__file__), "schema.sql")
-    with open(schema_path) as f:
-        ddl = f.read()
-    await conn.executescript(ddl)
+    await conn.executescript(_SCHEMA_DDL)
 
     for col_name, col_def in _TOKEN_COLUMNS:
         try:
@@ -46,13 +50,8 @@ async def save_article_metadata(
     estimated_cost_usd: float = 0.0,
 ) -> int:
     """Wstawia rekord metadanych artykułu. Zwraca id nowego wiersza."""
-    os.makedirs(os.path.dirname(os.path.abspath(settings.metadata_db_path)), exist_ok=True)
     now = datetime.now(timezone.utc).isoformat()
-    async with aiosqlite.connect(
-        settings.metadata_db_path,
-        check_same_thread=False,
-    ) as conn:
-        await _ensure_schema(conn)
+    async with connection(settings.metadata_db_path) as conn:
         cursor = await conn.execute(
             "INSERT INTO metadata_log "
             "(thread_id, topic, published_date, mode, created_at, "
@@ -67,25 +66,14 @@ async def save_article_metadata(
 
 async def delete_article_metadata(row_id: int) -> None:
     """Usuwa rekord metadanych po row_id. Operacja jest idempotentna."""
-    os.makedirs(os.path.dirname(os.path.abspath(settings.metadata_db_path)), exist_ok=True)
-    async with aiosqlite.connect(
-        settings.metadata_db_path,
-        check_same_thread=False,
-    ) as conn:
-        await _ensure_schema(conn)
+    async with connection(settings.metadata_db_path) as conn:
         await conn.execute("DELETE FROM metadata_log WHERE id = ?", (row_id,))
         await conn.commit()
 
 
 async def get_recent_articles(limit: int = 50) -> list[dict]:
     """Zwraca ostatnie wpisy z metadata_log jako listę słowników."""
-    os.makedirs(os.path.dirname(os.path.abspath(settings.metadata_db_path)), exist_ok=True)
-    async with aiosqlite.connect(
-        settings.metadata_db_path,
-        check_same_thread=False,
-    ) as conn:
-        conn.row_factory = aiosqlite.Row
-        await _ensure_schema(conn)
+    async with connection(settings.metadata_db_path) as conn:
         cursor = await conn.execute(
             "SELECT * FROM metadata_log ORDER BY published_date DESC LIMIT ?",
             (limit,),
@@ -96,13 +84,7 @@ async def get_recent_articles(limit: int = 50) -> list[dict]:
 
 async def get_all_article_metadata() -> list[dict]:
     """Zwraca wszystkie rekordy metadanych potrzebne do walidacji/backfillu duplicate store."""
-    os.makedirs(os.path.dirname(os.path.abspath(settings.metadata_db_path)), exist_ok=True)
-    async with aiosqlite.connect(
-        settings.metadata_db_path,
-        check_same_thread=False,
-    ) as conn:
-        conn.row_factory = aiosqlite.Row
-        await _ensure_schema(conn)
+    async with connection(settings.metadata_db_path) as conn:
         cursor = await conn.execute(
             "SELECT id, thread_id, topic, published_date, mode "
             "FROM metadata_log ORDER BY id ASC"
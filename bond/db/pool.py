@@ -0,0 +1,186 @@
+"""Pooled aiosqlite access for the metadata database.
+
+The FastAPI lifespan opens one SqlitePool per database file (``sqlite_pools``).
+Its connections are created once and tuned with WAL, synchronous=NORMAL,
+busy_timeout and an in-memory temp store, and the registered migrations run
+once at startup. sqlite3's per-connection statement cache
+(``settings.sqlite_statement_cache_size``) keeps the modules' constant SQL
+prepared across calls.
+
+Outside the API (CLI harness, scripts, tests) no pool is open. In that case
+``connection(path)`` opens a short-lived connection with the same tuning, and
+migrations still run only once per database file per process.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+
+import aiosqlite
+
+from bond.config import settings
+
+log = logging.getLogger(__name__)
+
+Migration = Callable[[aiosqlite.Connection], Awaitable[None]]
+
+_MIGRATIONS: list[Migration] = []
+_applied: dict[str, set[Migration]] = {}
+_migration_locks: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Lock]] = {}
+
+
+def register_migration(migration: Migration) -> Migration:
+    """Register an idempotent schema migration, run once per database file. Usable as a decorator."""
+    if migration not in _MIGRATIONS:
+        _MIGRATIONS.append(migration)
+    return migration
+
+
+def _key(path: str) -> str:
+    return os.path.abspath(path)
+
+
+def _migration_lock(key: str) -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    entry = _migration_locks.get(key)
+    if entry is None or entry[0] is not loop:
+        entry = (loop, asyncio.Lock())
+        _migration_locks[key] = entry
+    return entry[1]
+
+
+async def _ensure_migrated(key: str, conn: aiosqlite.Connection) -> None:
+    applied = _applied.setdefault(key, set())
+    if all(migration in applied for migration in _MIGRATIONS):
+        return
+    async with _migration_lock(key):
+        for migration in list(_MIGRATIONS):
+            if migration in applied:
+                continue
+            await migration(conn)
+            await conn.commit()
+            applied.add(migration)
+
+
+async def _connect(key: str) -> aiosqlite.Connection:
+    os.makedirs(os.path.dirname(key), exist_ok=True)
+    conn = await aiosqlite.connect(
+        key,
+        check_same_thread=False,
+        cached_statements=settings.sqlite_statement_cache_size,
+    )
+    conn.row_factory = sqlite3.Row
+    await conn.execute("PRAGMA journal_mode=WAL")
+    await conn.execute("PRAGMA synchronous=NORMAL")
+    await conn.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    await conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+class SqlitePool:
+    """A fixed set of tuned aiosqlite connections to one database file."""
+
+    def __init__(self, path: str, size: int) -> None:
+        self.key = _key(path)
+        self.size = max(1, size)
+        self._idle: asyncio.Queue[aiosqlite.Connection] | None = None
+        self._connections: list[aiosqlite.Connection] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._idle is not None
+
+    def usable(self) -> bool:
+        """True when open and bound to the running event loop."""
+        try:
+            return self.is_open and self._loop is asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+
+    async def open(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        idle: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        try:
+            for _ in range(self.size):
+                conn = await _connect(self.key)
+                self._connections.append(conn)
+                idle.put_nowait(conn)
+            await _ensure_migrated(self.key, self._connections[0])
+        except BaseException:
+            await self.close()
+            raise
+        self._idle = idle
+        log.info("Opened SQLite pool for %s (%d connections)", self.key, self.size)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aiosqlite.Connection]:
+        if self._idle is None:
+            raise RuntimeError(f"SQLite pool for {self.key} is not open")
+        conn = await self._idle.get()
+        try:
+            await _ensure_migrated(self.key, conn)
+            yield conn
+        finally:
+            try:
+                if conn.in_transaction:
+                    await conn.rollback()
+            finally:
+                self._idle.put_nowait(conn)
+
+    async def close(self) -> None:
+        self._idle = None
+        connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                await conn.close()
+            except Exception as exc:
+                log.warning("Closing pooled SQLite connection to %s failed: %s", self.key, exc)
+
+
+_pools: dict[str, SqlitePool] = {}
+
+
+def get_pool(path: str) -> SqlitePool | None:
+    """The open pool for ``path`` in the running event loop, if any."""
+    pool = _pools.get(_key(path))
+    return pool if pool is not None and pool.usable() else None
+
+
+@asynccontextmanager
+async def sqlite_pools(*paths: str, size: int | None = None) -> AsyncIterator[None]:
+    """Open one pool per database file for the duration of the block (FastAPI lifespan)."""
+    opened: list[SqlitePool] = []
+    try:
+        for path in dict.fromkeys(_key(p) for p in paths):
+            pool = SqlitePool(path, settings.sqlite_pool_size if size is None else size)
+            await pool.open()
+            _pools[pool.key] = pool
+            opened.append(pool)
+        yield
+    finally:
+        for pool in opened:
+            if _pools.get(pool.key) is pool:
+                del _pools[pool.key]
+            await pool.close()
+
+
+@asynccontextmanager
+async def connection(path: str) -> AsyncIterator[aiosqlite.Connection]:
+    """Borrow a migrated connection to ``path``: pooled when the API is running, one-shot otherwise."""
+    pool = get_pool(path)
+    if pool is not None:
+        async with pool.acquire() as conn:
+            yield conn
+        return
+
+    key = _key(path)
+    conn = await _connect(key)
+    try:
+        await _ensure_migrated(key, conn)
+        yield conn
+    finally:
+        await conn.close()
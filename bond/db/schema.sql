@@ -16,11 +16,18 @@ CREATE TABLE IF NOT EXISTS metadata_log (
 -- Indexes for common query patterns
 CREATE INDEX IF NOT EXISTS idx_metadata_log_published_date ON metadata_log (published_date);
 
--- AUTH-11: Exa search result cache, scoped per (query_hash, thread_id) session
+-- AUTH-11: Exa search result cache, keyed by query_hash only (see bond/db/search_cache.py)
 CREATE TABLE IF NOT EXISTS search_cache (
-    query_hash   TEXT NOT NULL,
-    thread_id    TEXT NOT NULL,
-    results_json TEXT NOT NULL,
-    timestamp    TEXT NOT NULL,   -- ISO 8601 UTC, set at cache write time
-    PRIMARY KEY (query_hash, thread_id)
+    query_hash   TEXT NOT NULL PRIMARY KEY,
+    thread_id    TEXT,
+    payload      BLOB NOT NULL,    -- compressed results, codec given by format
+    format       INTEGER NOT NULL, -- 0 = raw UTF-8, 1 = zlib, 2 = zstd
+    payload_size INTEGER NOT NULL, -- len(payload), summed for the size cap
+    cached_at    TEXT NOT NULL,    -- ISO 8601 UTC, set at cache write time
+    last_used_at TEXT NOT NULL,    -- ISO 8601 UTC, refreshed on every hit (LRU)
+    semantic_text   TEXT,          -- normalized "topic | keywords" that was embedded
+    embedding       BLOB,          -- unit-length float32 vector for the semantic tier
+    embedding_model TEXT,
+    last_similarity REAL           -- cosine similarity of the last semantic reuse
 );
+-- Indexes on cached_at / last_used_at are created by search_cache.py after it migrates older shapes
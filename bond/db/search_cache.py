@@ -2,91 +2,206 @@
 bond/db/search_cache.py — SQLite-backed Exa search result cache.
 
 Cache entries are keyed by query_hash only (SHA-256 of topic + keywords),
-making results shareable across all sessions.  A TTL of _TTL_DAYS (7 days)
-ensures stale web data is refreshed automatically.
+making results shareable across all sessions.  A TTL of
+``settings.search_cache_ttl_days`` (7 days) ensures stale web data is
+refreshed automatically.
 
 thread_id is stored as a non-key column for audit/logging purposes.
 
-Migration: if the table was created with the old composite PK
-(query_hash, thread_id), it is dropped and recreated automatically on first
-use — old cached results are discarded (they are regeneratable).
+Payloads are stored compressed in a BLOB together with a format version
+(``FORMAT_*``), so the codec can change without invalidating older rows.
+``cached_at`` and ``last_used_at`` are indexed: ``sweep_search_cache`` deletes
+expired rows and then evicts least-recently-used rows until the compressed
+total fits ``settings.search_cache_max_bytes``. The API lifespan runs it
+periodically (``run_search_cache_sweeper``). SQLite reuses the freed pages, so
+the database file stops growing instead of shrinking.
+
+Semantic tier: rows can also carry an embedding of their normalized
+"topic | keywords" text (``semantic_text``). When the exact query_hash misses,
+``find_similar_result`` scans the live rows' embeddings with one matrix-vector
+product and reuses the nearest entry if its cosine similarity reaches
+``settings.search_cache_semantic_threshold``. The tier is opt-in
+(``settings.search_cache_semantic_enabled``), and only rows with the same keyword
+set and the same numbers in the topic are candidates, so "X 2025" never serves
+"X 2026". The similarity is recorded on the reused row and in the reuse statistics.
+
+``research_leases`` holds short-lived leases for multi-worker deployments: the
+worker holding a query_hash's lease runs the Exa research, the others poll the
+cache until its result lands (see ``acquire_research_lease``). Expired leases
+are taken over, so a crashed worker only delays the others by the lease TTL.
+
+Migrations (run once per database file by bond.db.pool):
+- the old composite PK (query_hash, thread_id) table is dropped and recreated
+  — old cached results are discarded (they are regeneratable);
+- the uncompressed ``results_json`` table is converted in place.
 """
 
 import asyncio
 import hashlib
 import logging
-import os
-from datetime import datetime, timezone
+import re
+import unicodedata
+import zlib
+from datetime import datetime, timedelta, timezone
 
 import aiosqlite
+import numpy as np
 
 from bond.config import settings
+from bond.db.pool import connection, register_migration
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 log = logging.getLogger(__name__)
 
-_TTL_DAYS = 7
+# Payload format versions stored in search_cache.format
+FORMAT_RAW = 0
+FORMAT_ZLIB = 1
+FORMAT_ZSTD = 2
+
+_COMPRESSION_FORMATS = {"none": FORMAT_RAW, "zlib": FORMAT_ZLIB, "zstd": FORMAT_ZSTD}
 
 _CREATE_TABLE_SQL = """
 CREATE TABLE IF NOT EXISTS search_cache (
     query_hash   TEXT NOT NULL PRIMARY KEY,
     thread_id    TEXT,
-    results_json TEXT NOT NULL,
-    cached_at    TEXT NOT NULL
+    payload      BLOB NOT NULL,
+    format       INTEGER NOT NULL,
+    payload_size INTEGER NOT NULL,
+    cached_at    TEXT NOT NULL,
+    last_used_at TEXT NOT NULL,
+    semantic_text   TEXT,
+    embedding       BLOB,
+    embedding_model TEXT,
+    last_similarity REAL
 );
+CREATE INDEX IF NOT EXISTS idx_search_cache_cached_at ON search_cache(cached_at);
+CREATE INDEX IF NOT EXISTS idx_search_cache_last_used_at ON search_cache(last_used_at);
 """
 
-_MIGRATE_TABLE_SQL = """
-DROP TABLE IF EXISTS search_cache;
-CREATE TABLE search_cache (
-    query_hash   TEXT NOT NULL PRIMARY KEY,
-    thread_id    TEXT,
-    results_json TEXT NOT NULL,
-    cached_at    TEXT NOT NULL
+_CREATE_LEASE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS research_leases (
+    query_hash TEXT NOT NULL PRIMARY KEY,
+    owner      TEXT NOT NULL,
+    expires_at TEXT NOT NULL
 );
 """
 
-# Ensure the data directory exists once at import time (sync, idempotent).
-os.makedirs(os.path.dirname(os.path.abspath(settings.metadata_db_path)), exist_ok=True)
+# Columns added after the compressed table shipped: (name, type)
+_SEMANTIC_COLUMNS = (
+    ("semantic_text", "TEXT"),
+    ("embedding", "BLOB"),
+    ("embedding_model", "TEXT"),
+    ("last_similarity", "REAL"),
+)
+
+_DROP_TABLE_SQL = "DROP TABLE IF EXISTS search_cache;"
+
+# Drops rows beyond the newest-used ones whose compressed sizes add up to the cap
+_EVICT_LRU_SQL = """
+DELETE FROM search_cache WHERE query_hash IN (
+    SELECT query_hash FROM (
+        SELECT query_hash,
+               SUM(payload_size) OVER (ORDER BY last_used_at DESC, query_hash) AS running_size
+        FROM search_cache
+    ) WHERE running_size > ?
+)
+"""
+
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "expired": 0,
+    "writes": 0,
+    "semantic_hits": 0,
+    "semantic_similarity_sum": 0.0,
+    "last_semantic_similarity": None,
+    "evicted_expired": 0,
+    "evicted_lru": 0,
+    "entries": 0,
+    "total_bytes": 0,
+    "last_sweep_at": None,
+}
+
 
-# One-shot table initialisation guard.
-_init_lock: asyncio.Lock | None = None
-_table_ready = False
+def _encode(text: str, fmt: int) -> bytes:
+    data = text.encode("utf-8")
+    if fmt == FORMAT_ZLIB:
+        return zlib.compress(data, settings.search_cache_zlib_level)
+    if fmt == FORMAT_ZSTD:
+        return zstandard.ZstdCompressor().compress(data)
+    return data
 
 
-def _get_lock() -> asyncio.Lock:
-    global _init_lock
-    if _init_lock is None:
-        _init_lock = asyncio.Lock()
-    return _init_lock
+def _decode(payload: bytes, fmt: int) -> str:
+    if fmt == FORMAT_ZLIB:
+        payload = zlib.decompress(payload)
+    elif fmt == FORMAT_ZSTD:
+        if zstandard is None:
+            raise ValueError("zstd-compressed entry but the zstandard package is not installed")
+        payload = zstandard.ZstdDecompressor().decompress(payload)
+    elif fmt != FORMAT_RAW:
+        raise ValueError(f"unknown search_cache payload format {fmt}")
+    return payload.decode("utf-8")
 
 
-async def _ensure_table_once(conn: aiosqlite.Connection) -> None:
-    """Create or migrate search_cache table exactly once per process lifetime."""
-    global _table_ready
-    if _table_ready:
+def _write_format() -> int:
+    fmt = _COMPRESSION_FORMATS.get(settings.search_cache_compression, FORMAT_ZLIB)
+    if fmt == FORMAT_ZSTD and zstandard is None:
+        log.warning("search_cache: zstandard not installed — falling back to zlib")
+        return FORMAT_ZLIB
+    return fmt
+
+
+@register_migration
+async def _ensure_table(conn: aiosqlite.Connection) -> None:
+    """Create or migrate the search_cache table (run once per database file by bond.db.pool)."""
+    cursor = await conn.execute("PRAGMA table_info(search_cache)")
+    cols = await cursor.fetchall()
+    # col[1] = column name, col[5] = pk order (>0 means part of PK)
+    if any(col[1] == "thread_id" and col[5] > 0 for col in cols):
+        await conn.executescript(_DROP_TABLE_SQL + _CREATE_TABLE_SQL)
+        log.info(
+            "search_cache: migrated from composite (query_hash, thread_id) PK "
+            "to query_hash-only PK; old entries discarded"
+        )
         return
-    async with _get_lock():
-        if _table_ready:
-            return
-        needs_migration = False
+
+    if any(col[1] == "results_json" for col in cols):
         cursor = await conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='search_cache'"
+            "SELECT query_hash, thread_id, results_json, cached_at FROM search_cache"
         )
-        if await cursor.fetchone():
-            cursor = await conn.execute("PRAGMA table_info(search_cache)")
-            cols = await cursor.fetchall()
-            # col[1] = column name, col[5] = pk order (>0 means part of PK)
-            needs_migration = any(col[1] == "thread_id" and col[5] > 0 for col in cols)
-
-        sql = _MIGRATE_TABLE_SQL if needs_migration else _CREATE_TABLE_SQL
-        await conn.executescript(sql)
-        await conn.commit()
-        if needs_migration:
-            log.info(
-                "search_cache: migrated from composite (query_hash, thread_id) PK "
-                "to query_hash-only PK; old entries discarded"
+        converted = []
+        for query_hash, thread_id, results_json, cached_at in await cursor.fetchall():
+            payload = zlib.compress(results_json.encode("utf-8"))
+            converted.append(
+                (query_hash, thread_id, payload, FORMAT_ZLIB, len(payload), cached_at, cached_at)
             )
-        _table_ready = True
+        await conn.execute("ALTER TABLE search_cache RENAME TO search_cache_uncompressed")
+        await conn.executescript(_CREATE_TABLE_SQL)
+        await conn.executemany(
+            "INSERT INTO search_cache "
+            "(query_hash, thread_id, payload, format, payload_size, cached_at, last_used_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            converted,
+        )
+        await conn.execute("DROP TABLE search_cache_uncompressed")
+        log.info("search_cache: compressed %d existing entries", len(converted))
+        return
+
+    await conn.executescript(_CREATE_TABLE_SQL)
+    existing = {col[1] for col in cols}
+    for name, sql_type in _SEMANTIC_COLUMNS:
+        if existing and name not in existing:
+            await conn.execute(f"ALTER TABLE search_cache ADD COLUMN {name} {sql_type}")
+
+
+@register_migration
+async def _ensure_lease_table(conn: aiosqlite.Connection) -> None:
+    await conn.executescript(_CREATE_LEASE_TABLE_SQL)
 
 
 def compute_query_hash(topic: str, keywords: list[str]) -> str:
@@ -95,51 +210,273 @@ def compute_query_hash(topic: str, keywords: list[str]) -> str:
     return hashlib.sha256(canonical.encode()).hexdigest()
 
 
+_PUNCTUATION_RE = re.compile(r"[^\w\s]+")
+_WHITESPACE_RE = re.compile(r"\s+")
+_NUMBER_RE = re.compile(r"\d+")
+
+
+def semantic_text(topic: str, keywords: list[str]) -> str:
+    """Text embedded for the semantic tier: case, punctuation and keyword order removed."""
+
+    def clean(text: str) -> str:
+        text = _PUNCTUATION_RE.sub(" ", unicodedata.normalize("NFC", text).casefold())
+        return _WHITESPACE_RE.sub(" ", text).strip()
+
+    cleaned_keywords = sorted(filter(None, (clean(keyword) for keyword in keywords)))
+    return f"{clean(topic)} | {', '.join(cleaned_keywords)}"
+
+
+def semantic_reuse_allowed(cached_text: str, topic_text: str) -> bool:
+    """
+    Guard on top of similarity: two semantic_text() values may share a search only
+    with the same normalized keyword set and the same numbers (years, counts) in the topic.
+    """
+    cached_topic, _, cached_keywords = cached_text.partition(" | ")
+    topic, _, keywords = topic_text.partition(" | ")
+    return cached_keywords == keywords and sorted(_NUMBER_RE.findall(cached_topic)) == sorted(
+        _NUMBER_RE.findall(topic)
+    )
+
+
+def _unit_vector(embedding) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32).ravel()
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
 async def get_cached_result(query_hash: str) -> str | None:
     """
     Return cached results for query_hash, or None on miss or TTL expiry.
 
-    TTL is _TTL_DAYS (7 days).  Expired entries are not deleted from the table
-    automatically — they are overwritten on the next save_cached_result call.
+    A hit refreshes the entry's last_used_at (LRU order for the size cap).
+    Expired entries are left for the sweeper or the next save_cached_result.
     """
-    async with aiosqlite.connect(settings.metadata_db_path) as conn:
-        await _ensure_table_once(conn)
+    async with connection(settings.metadata_db_path) as conn:
         cursor = await conn.execute(
-            "SELECT results_json, cached_at FROM search_cache WHERE query_hash = ?",
+            "SELECT payload, format, cached_at FROM search_cache WHERE query_hash = ?",
             (query_hash,),
         )
         row = await cursor.fetchone()
         if row is None:
+            _stats["misses"] += 1
             return None
-        results_json, cached_at_str = row
-        cached_at = datetime.fromisoformat(cached_at_str)
-        age = datetime.now(timezone.utc) - cached_at
-        if age.days >= _TTL_DAYS:
+        payload, fmt, cached_at_str = row
+        now = datetime.now(timezone.utc)
+        age = now - datetime.fromisoformat(cached_at_str)
+        if age.days >= settings.search_cache_ttl_days:
+            _stats["expired"] += 1
             log.debug(
                 "search_cache: TTL expired for hash %.8s (age %d days)",
                 query_hash,
                 age.days,
             )
             return None
+        try:
+            results = _decode(payload, fmt)
+        except (ValueError, zlib.error) as exc:
+            _stats["misses"] += 1
+            log.warning("search_cache: unreadable entry for hash %.8s: %s", query_hash, exc)
+            return None
+        await conn.execute(
+            "UPDATE search_cache SET last_used_at = ? WHERE query_hash = ?",
+            (now.isoformat(), query_hash),
+        )
+        await conn.commit()
+        _stats["hits"] += 1
         log.debug("search_cache: hit for hash %.8s (age %d days)", query_hash, age.days)
-        return results_json
+        return results
+
+
+async def find_similar_result(
+    embedding, embedding_model: str, threshold: float | None = None, *, topic_text: str | None = None
+) -> tuple[str, str, float] | None:
+    """
+    Semantic tier: nearest live entry by cosine similarity of topic embeddings.
+
+    Returns (results, query_hash, similarity) when the best match reaches
+    ``threshold`` (default ``settings.search_cache_semantic_threshold``), else None.
+    With ``topic_text`` (semantic_text() of the query), only entries that pass
+    semantic_reuse_allowed() are candidates.
+    """
+    threshold = settings.search_cache_semantic_threshold if threshold is None else threshold
+    query = _unit_vector(embedding)
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.search_cache_ttl_days)
+    async with connection(settings.metadata_db_path) as conn:
+        cursor = await conn.execute(
+            "SELECT query_hash, embedding, semantic_text FROM search_cache "
+            "WHERE embedding_model = ? AND embedding IS NOT NULL AND cached_at >= ?",
+            (embedding_model, cutoff.isoformat()),
+        )
+        rows = [
+            row
+            for row in await cursor.fetchall()
+            if len(row[1]) == query.nbytes
+            and (topic_text is None or semantic_reuse_allowed(row[2] or "", topic_text))
+        ]
+        if not rows:
+            return None
+        # Stored vectors are unit length, so one matrix-vector product gives every cosine similarity
+        matrix = np.frombuffer(b"".join(row[1] for row in rows), dtype=np.float32).reshape(len(rows), -1)
+        similarities = matrix @ query
+        best = int(np.argmax(similarities))
+        similarity = float(similarities[best])
+        if similarity < threshold:
+            return None
+        query_hash = rows[best][0]
+        cursor = await conn.execute(
+            "SELECT payload, format FROM search_cache WHERE query_hash = ?", (query_hash,)
+        )
+        row = await cursor.fetchone()
+        if row is None:
+            return None
+        try:
+            results = _decode(*row)
+        except (ValueError, zlib.error) as exc:
+            log.warning("search_cache: unreadable entry for hash %.8s: %s", query_hash, exc)
+            return None
+        await conn.execute(
+            "UPDATE search_cache SET last_used_at = ?, last_similarity = ? WHERE query_hash = ?",
+            (datetime.now(timezone.utc).isoformat(), similarity, query_hash),
+        )
+        await conn.commit()
+
+    _stats["semantic_hits"] += 1
+    _stats["semantic_similarity_sum"] += similarity
+    _stats["last_semantic_similarity"] = round(similarity, 4)
+    log.info("search_cache: semantic hit %.8s (similarity %.3f)", query_hash, similarity)
+    return results, query_hash, similarity
 
 
 async def save_cached_result(
     query_hash: str,
     results_json: str,
     thread_id: str = "",
+    *,
+    topic_text: str | None = None,
+    embedding=None,
+    embedding_model: str | None = None,
 ) -> None:
     """Insert or replace a cache entry keyed by query_hash only.
 
     thread_id is stored for audit logging but is not part of the lookup key.
+    ``topic_text``/``embedding``/``embedding_model`` index the entry for the semantic tier.
     """
+    fmt = _write_format()
+    payload = _encode(results_json, fmt)
+    vector = _unit_vector(embedding).tobytes() if embedding is not None else None
     now = datetime.now(timezone.utc).isoformat()
-    async with aiosqlite.connect(settings.metadata_db_path) as conn:
-        await _ensure_table_once(conn)
+    async with connection(settings.metadata_db_path) as conn:
         await conn.execute(
             "INSERT OR REPLACE INTO search_cache "
-            "(query_hash, thread_id, results_json, cached_at) VALUES (?, ?, ?, ?)",
-            (query_hash, thread_id or None, results_json, now),
+            "(query_hash, thread_id, payload, format, payload_size, cached_at, last_used_at, "
+            "semantic_text, embedding, embedding_model) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                query_hash,
+                thread_id or None,
+                payload,
+                fmt,
+                len(payload),
+                now,
+                now,
+                topic_text,
+                vector,
+                embedding_model if vector is not None else None,
+            ),
         )
         await conn.commit()
+    _stats["writes"] += 1
+
+
+async def acquire_research_lease(query_hash: str, owner: str, ttl_seconds: float) -> bool:
+    """Take (or renew) the research lease for query_hash. False while another owner's lease is live."""
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(seconds=ttl_seconds)
+    async with connection(settings.metadata_db_path) as conn:
+        await conn.execute(
+            "INSERT INTO research_leases (query_hash, owner, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(query_hash) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+            "WHERE research_leases.expires_at < ? OR research_leases.owner = excluded.owner",
+            (query_hash, owner, expires_at.isoformat(), now.isoformat()),
+        )
+        # Same write transaction as the upsert, so no other worker can interleave
+        cursor = await conn.execute(
+            "SELECT owner FROM research_leases WHERE query_hash = ?", (query_hash,)
+        )
+        row = await cursor.fetchone()
+        await conn.commit()
+    return row is not None and row[0] == owner
+
+
+async def release_research_lease(query_hash: str, owner: str) -> None:
+    async with connection(settings.metadata_db_path) as conn:
+        await conn.execute(
+            "DELETE FROM research_leases WHERE query_hash = ? AND owner = ?", (query_hash, owner)
+        )
+        await conn.commit()
+
+
+async def sweep_search_cache() -> dict[str, int]:
+    """Delete expired entries, then evict LRU entries above the size cap. Returns what was removed."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.search_cache_ttl_days)
+    async with connection(settings.metadata_db_path) as conn:
+        cursor = await conn.execute(
+            "DELETE FROM search_cache WHERE cached_at < ?", (cutoff.isoformat(),)
+        )
+        expired = cursor.rowcount
+        cursor = await conn.execute(_EVICT_LRU_SQL, (settings.search_cache_max_bytes,))
+        evicted = cursor.rowcount
+        await conn.execute(
+            "DELETE FROM research_leases WHERE expires_at < ?",
+            (datetime.now(timezone.utc).isoformat(),),
+        )
+        await conn.commit()
+        cursor = await conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(payload_size), 0) FROM search_cache"
+        )
+        entries, total_bytes = await cursor.fetchone()
+
+    _stats["evicted_expired"] += expired
+    _stats["evicted_lru"] += evicted
+    _stats["entries"] = entries
+    _stats["total_bytes"] = total_bytes
+    _stats["last_sweep_at"] = datetime.now(timezone.utc).isoformat()
+    if expired or evicted:
+        log.info(
+            "search_cache: swept %d expired and %d LRU entries (%d entries, %d bytes left)",
+            expired,
+            evicted,
+            entries,
+            total_bytes,
+        )
+    return {"expired": expired, "evicted": evicted, "entries": entries, "total_bytes": total_bytes}
+
+
+async def run_search_cache_sweeper(interval_seconds: float | None = None) -> None:
+    """Sweep now and then every ``interval_seconds`` until cancelled (started by the API lifespan)."""
+    interval = interval_seconds if interval_seconds is not None else settings.search_cache_sweep_interval_seconds
+    while True:
+        try:
+            await sweep_search_cache()
+        except Exception as exc:
+            log.warning("search_cache sweep failed: %s", exc)
+        await asyncio.sleep(interval)
+
+
+def get_search_cache_stats() -> dict:
+    """
+    Hit/miss/eviction counters for this process; entries/total_bytes as of the last sweep.
+
+    ``reuse_rate`` counts exact and semantic hits over all lookups; semantic hits
+    also count as exact misses.
+    """
+    stats = {**_stats}
+    lookups = stats["hits"] + stats["misses"] + stats["expired"]
+    similarity_sum = stats.pop("semantic_similarity_sum")
+    semantic_hits = stats["semantic_hits"]
+    return {
+        **stats,
+        "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+        "reuse_rate": round((stats["hits"] + semantic_hits) / lookups, 4) if lookups else 0.0,
+        "mean_semantic_similarity": round(similarity_sum / semantic_hits, 4) if semantic_hits else None,
+    }
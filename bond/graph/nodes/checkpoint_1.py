@@ -4,6 +4,7 @@ from pydantic import ValidationError
 from langgraph.types import interrupt, Command
 from langgraph.graph import END
 
+from bond.graph.nodes.writer import prefetch_writer_inputs
 from bond.graph.state import AuthorState
 from bond.schemas import CheckpointResponse
 
@@ -28,6 +29,9 @@ def checkpoint_1_node(state: AuthorState) -> dict | Command:
     On rejection: edited_structure + note are concatenated into cp1_feedback.
     structure_node reads cp1_feedback on its next run.
     On abort: returns Command(goto=END), terminating the pipeline immediately.
+
+    Before pausing it starts the writer prefetch for the shown outline (see
+    writer.prefetch_writer_inputs); re-running on resume does not repeat it.
     """
     cp1_iterations = state.get("cp1_iterations", 0)
 
@@ -50,6 +54,9 @@ def checkpoint_1_node(state: AuthorState) -> dict | Command:
             },
         )
 
+    # Writer inputs are prepared during the editor's review (no-op when disabled)
+    prefetch_writer_inputs(state)
+
     user_response = interrupt({
         "checkpoint": "checkpoint_1",
         "type": "approve_reject",
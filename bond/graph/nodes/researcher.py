@@ -1,25 +1,39 @@
 import asyncio
+import hashlib
 import logging
 import re
+from uuid import uuid4
 
-from langchain_mcp_adapters.client import MultiServerMCPClient
 from pydantic import BaseModel, field_validator
 
 from bond.config import settings
-from bond.db.search_cache import compute_query_hash, get_cached_result, save_cached_result
+from bond.db.search_cache import (
+    acquire_research_lease,
+    compute_query_hash,
+    find_similar_result,
+    get_cached_result,
+    release_research_lease,
+    save_cached_result,
+    semantic_text,
+)
 from bond.graph.state import AuthorState
-from bond.llm import estimate_cost_usd, get_research_llm
+from bond.llm import estimate_cost_usd, get_research_llm, response_usage
+from bond.mcp.exa_pool import call_exa_tool
 from bond.prompts.context import build_context_block
+from bond.singleflight import SingleFlight
+from bond.store.embeddings import get_embedding_function
 
 log = logging.getLogger(__name__)
 
-EXA_MCP_URL = "https://mcp.exa.ai/mcp"
 _MIN_SOURCES = 3
 _MAX_UNIQUE_SOURCES = 20
 
 # Matches any http/https URL (stops at whitespace or common closing punctuation).
 _URL_RE = re.compile(r"https?://[^\s\])\">'\,]+")
 
+# Coalesces identical research running concurrently in this process (Exa search and synthesis)
+_research_flight = SingleFlight()
+
 
 class ResearchQueries(BaseModel):
     """Exactly 3 Exa search queries covering different angles of the topic."""
@@ -87,22 +101,6 @@ class ResearchData(BaseModel):
         return "\n\n".join(parts)
 
 
-# Module-level tools cache — fetched once per process, reused across node calls.
-_exa_tools_cache: list | None = None
-
-
-async def _get_exa_tools() -> list:
-    """Fetch Exa MCP tools and cache them for the lifetime of the process."""
-    global _exa_tools_cache
-    if _exa_tools_cache is not None:
-        return _exa_tools_cache
-    client = MultiServerMCPClient(
-        {"exa": {"url": EXA_MCP_URL, "transport": "streamable_http"}}
-    )
-    _exa_tools_cache = await client.get_tools()
-    return _exa_tools_cache
-
-
 async def _generate_sub_queries(topic: str, keywords: list[str]) -> ResearchQueries:
     """Generate 3 diverse Exa queries (General, Stats, Case Study) via structured LLM output."""
     kw_str = ", ".join(keywords) if keywords else topic
@@ -115,7 +113,7 @@ Każde zapytanie musi pokrywać inny kąt:
 
 Zapytania pisz po polsku lub angielsku (wybierz język, który da lepsze wyniki). Każde zapytanie: 5-12 słów, precyzyjne, wyszukiwarkowo skuteczne."""
 
-    llm = get_research_llm(max_tokens=300, temperature=0)
+    llm = get_research_llm(max_tokens=300, temperature=0, cache_site="sub_queries")
     structured_llm = llm.with_structured_output(ResearchQueries)
     result: ResearchQueries = await structured_llm.ainvoke(prompt)
     log.info(
@@ -129,20 +127,13 @@ Zapytania pisz po polsku lub angielsku (wybierz język, który da lepsze wyniki)
 
 async def _call_exa_mcp(query: str, keywords: list[str], num_results: int = 8) -> str:
     """
-    Call Exa web_search_exa tool via MCP HTTP.
+    Call Exa web_search_exa tool via MCP HTTP (pooled session, see bond/mcp/exa_pool.py).
     Returns the raw formatted results string.
     """
     search_query = f"{query} {' '.join(keywords)}" if keywords else query
 
-    tools = await _get_exa_tools()
-    web_search = next((t for t in tools if t.name == "web_search_exa"), None)
-    if web_search is None:
-        available = [t.name for t in tools]
-        raise RuntimeError(
-            f"web_search_exa not found in Exa MCP. Available: {available}"
-        )
-    result = await web_search.ainvoke({"query": search_query, "numResults": num_results})
-    return result if isinstance(result, str) else str(result)
+    blocks = await call_exa_tool("web_search_exa", {"query": search_query, "numResults": num_results})
+    return "\n\n".join(block["text"] for block in blocks if block.get("type") == "text")
 
 
 def _deduplicate_sections(labeled_sections: list[tuple[str, str]]) -> tuple[str, int]:
@@ -223,7 +214,7 @@ Wyekstraktuj:
 - statystyki: lista 5-10 konkretnych danych liczbowych wyekstraktowanych ze źródeł (format: "N% / N mln / N lat — krótki kontekst")
 - zrodla: lista wszystkich unikalnych artykułów (każde: title, url, summary 1-2 zdania po polsku)"""
 
-    llm = get_research_llm(max_tokens=3000)
+    llm = get_research_llm(max_tokens=3000, cache_site="synthesis")
     structured_llm = llm.with_structured_output(ResearchData, include_raw=True)
     raw_output: dict = await structured_llm.ainvoke(prompt)
 
@@ -232,10 +223,8 @@ Wyekstraktuj:
     if data is None:
         raise ValueError(f"Structured synthesis failed to parse LLM output: {parsing_error}")
 
-    raw_response = raw_output.get("raw")
-    usage = (raw_response.usage_metadata or {}) if raw_response else {}
-    input_tokens = usage.get("input_tokens", 0)
-    output_tokens = usage.get("output_tokens", 0)
+    # Zero when the response came from the LLM response cache
+    input_tokens, output_tokens = response_usage(raw_output.get("raw"))
 
     log.info(
         "synthesis: %d facts, %d stats, %d sources",
@@ -246,6 +235,113 @@ Wyekstraktuj:
     return data, input_tokens, output_tokens
 
 
+async def _read_search_cache(query_hash: str) -> str | None:
+    try:
+        return await get_cached_result(query_hash)
+    except Exception as exc:
+        log.error("search_cache read failed, proceeding without cache: %s", exc)
+        return None
+
+
+async def _semantic_lookup(topic: str, keywords: list[str]) -> tuple[dict, str | None]:
+    """
+    Semantic search_cache tier: embed the normalized topic and reuse the nearest cached search.
+
+    Returns (index, results): ``index`` holds the save_cached_result kwargs that make a
+    new entry findable by later lookups; ``results`` is the reused search or None.
+    """
+    if not settings.search_cache_semantic_enabled:
+        return {}, None
+    text = semantic_text(topic, keywords)
+    try:
+        embedding_function = get_embedding_function()
+        embedding = (await asyncio.to_thread(embedding_function.embed_query, [text]))[0]
+    except Exception as exc:
+        log.warning("topic embedding failed, skipping semantic search_cache: %s", exc)
+        return {}, None
+
+    index = {"topic_text": text, "embedding": embedding, "embedding_model": embedding_function.model_name}
+    try:
+        match = await find_similar_result(embedding, embedding_function.model_name, topic_text=text)
+    except Exception as exc:
+        log.error("semantic search_cache read failed, proceeding without it: %s", exc)
+        return index, None
+    if match is None:
+        return index, None
+    results, matched_hash, similarity = match
+    log.info(
+        "research: reusing cached search %.8s for %r (similarity %.3f)", matched_hash, topic, similarity
+    )
+    return index, results
+
+
+async def _search_and_store(
+    topic: str, keywords: list[str], thread_id: str, query_hash: str, index: dict | None = None
+) -> str:
+    """Layer 3 — parallel multi-query Exa MCP calls (General / Stats / Case Study), then cache the result."""
+    sub_queries = await _generate_sub_queries(topic, keywords)
+    labels = ["General", "Stats", "Case Study"]
+    queries = sub_queries.as_list()
+    for label, query in zip(labels, queries):
+        log.info("exa search [%s]: %r", label, query)
+
+    sections: list[str] = await asyncio.gather(
+        *[_call_exa_mcp(q, keywords, num_results=8) for q in queries]
+    )
+    labeled = list(zip(labels, sections))
+    raw_results, unique_count = _deduplicate_sections(labeled)
+    log.info("exa parallel search complete: %d unique sources", unique_count)
+    try:
+        await save_cached_result(query_hash, raw_results, thread_id, **(index or {}))
+    except Exception as exc:
+        log.error("search_cache write failed (result not persisted): %s", exc)
+    return raw_results
+
+
+async def _fetch_raw_results(topic: str, keywords: list[str], thread_id: str, query_hash: str) -> str:
+    """
+    Layers 2-3: SQLite search_cache (exact, then semantic), then Exa.
+
+    With settings.research_lease_enabled, only the worker holding the query's
+    lease searches Exa; other workers poll the cache until its result lands
+    or the lease is released or expires, and then take over.
+    """
+    # Layer 2 — SQLite cross-session cache (keyed by query_hash only, TTL 7 days).
+    db_result = await _read_search_cache(query_hash)
+    if db_result is not None:
+        return db_result
+    # Layer 2b — nearest cached topic by embedding similarity
+    index, db_result = await _semantic_lookup(topic, keywords)
+    if db_result is not None:
+        return db_result
+    if not settings.research_lease_enabled:
+        return await _search_and_store(topic, keywords, thread_id, query_hash, index)
+
+    owner = uuid4().hex
+    try:
+        while not await acquire_research_lease(query_hash, owner, settings.research_lease_ttl_seconds):
+            await asyncio.sleep(settings.research_lease_poll_seconds)
+            db_result = await _read_search_cache(query_hash)
+            if db_result is not None:
+                log.info("research: reused another worker's result for hash %.8s", query_hash)
+                return db_result
+    except Exception as exc:
+        log.error("research lease unavailable, searching without it: %s", exc)
+        return await _search_and_store(topic, keywords, thread_id, query_hash, index)
+
+    try:
+        # The previous holder may have finished between the cache read and our lease
+        db_result = await _read_search_cache(query_hash)
+        if db_result is not None:
+            return db_result
+        return await _search_and_store(topic, keywords, thread_id, query_hash, index)
+    finally:
+        try:
+            await release_research_lease(query_hash, owner)
+        except Exception as exc:
+            log.warning("research lease release failed (expires on its own): %s", exc)
+
+
 async def researcher_node(state: AuthorState) -> dict:
     """
     Perform web research via Exa MCP.  Cache lookup order (AUTH-10 / AUTH-11):
@@ -253,8 +349,14 @@ async def researcher_node(state: AuthorState) -> dict:
     1. In-memory state cache  — avoids duplicate calls within the same graph run.
     2. SQLite search_cache    — avoids duplicate calls across re-runs in the same
                                 session (same thread_id).  Table: bond_metadata.db.
+                                On an exact miss, the semantically nearest cached
+                                topic is reused above the similarity threshold.
     3. Exa MCP API            — live search; result is written to both caches.
 
+    Concurrent requests for the same query_hash are coalesced (single-flight):
+    followers wait for the leader's search and, given the same context, its
+    synthesis instead of repeating the Exa and LLM calls.
+
     Returns updated search_cache (raw MCP results string, keyed by topic)
     and formatted research_report (Markdown).
 
@@ -273,41 +375,26 @@ async def researcher_node(state: AuthorState) -> dict:
         raw_results = cache[topic]
     else:
         query_hash = compute_query_hash(topic, keywords)
-
-        # Layer 2 — SQLite cross-session cache (keyed by query_hash only, TTL 7 days).
-        db_result: str | None = None
-        try:
-            db_result = await get_cached_result(query_hash)
-        except Exception as exc:
-            log.error("search_cache read failed, proceeding without cache: %s", exc)
-
-        if db_result is not None:
-            raw_results = db_result
-        else:
-            # Layer 3 — parallel multi-query Exa MCP calls (General / Stats / Case Study)
-            sub_queries = await _generate_sub_queries(topic, keywords)
-            labels = ["General", "Stats", "Case Study"]
-            queries = sub_queries.as_list()
-            for label, query in zip(labels, queries):
-                log.info("exa search [%s]: %r", label, query)
-
-            sections: list[str] = await asyncio.gather(
-                *[_call_exa_mcp(q, keywords, num_results=8) for q in queries]
-            )
-            labeled = list(zip(labels, sections))
-            raw_results, unique_count = _deduplicate_sections(labeled)
-            log.info("exa parallel search complete: %d unique sources", unique_count)
-            try:
-                await save_cached_result(query_hash, raw_results, thread_id)
-            except Exception as exc:
-                log.error("search_cache write failed (result not persisted): %s", exc)
+        # Concurrent sessions on the same brief share one cache lookup / Exa search
+        raw_results, shared = await _research_flight.do(
+            query_hash, lambda: _fetch_raw_results(topic, keywords, thread_id, query_hash)
+        )
+        if shared:
+            log.info("research: joined in-flight search for hash %.8s", query_hash)
 
         cache = {**cache, topic: raw_results}
 
     context_block = build_context_block(state.get("context_dynamic"))
-    research_data, input_tokens, output_tokens = await _synthesize_structured(
-        raw_results, topic, keywords, context_block
+    synthesis_key = hashlib.sha256(
+        "\0".join([topic, *keywords, context_block, raw_results]).encode()
+    ).hexdigest()
+    (research_data, input_tokens, output_tokens), shared = await _research_flight.do(
+        ("synthesis", synthesis_key),
+        lambda: _synthesize_structured(raw_results, topic, keywords, context_block),
     )
+    if shared:
+        # The leading session was billed for the call
+        input_tokens = output_tokens = 0
 
     source_count = len(research_data.zrodla)
     if source_count < _MIN_SOURCES:
@@ -259,7 +259,7 @@ async def shadow_annotate_node(state: BondState) -> dict:
         logger.info("shadow_annotate: re-run with user feedback — incorporating into prompt.")
 
     # Select LLM — temperature=0 for deterministic structured output
-    llm = get_draft_llm(max_tokens=4096, temperature=0)
+    llm = get_draft_llm(max_tokens=4096, temperature=0, cache_site="shadow_annotate")
 
     structured_llm = llm.with_structured_output(AnnotationResult)
 
@@ -4,7 +4,7 @@ from langchain_core.messages import HumanMessage
 
 from bond.config import settings
 from bond.graph.state import AuthorState
-from bond.llm import estimate_cost_usd, get_draft_llm
+from bond.llm import estimate_cost_usd, get_draft_llm, response_usage
 from bond.prompts.context import build_context_block
 from bond.prompts.research_context import select_research_context
 
@@ -70,12 +70,17 @@ async def structure_node(state: AuthorState) -> dict:
     Generate H1/H2/H3 heading structure from research_report.
     On regeneration, incorporates cp1_feedback (user-edited outline + note).
     """
-    llm = get_draft_llm(max_tokens=_STRUCTURE_MAX_OUTPUT_TOKENS, temperature=0)
     topic = state["topic"]
     keywords = state.get("keywords", [])
     primary_keyword = keywords[0] if keywords else topic
     research_report = state.get("research_report", "")
     cp1_feedback = state.get("cp1_feedback")
+    # Only the first pass is cached: regenerations must honour the user's feedback
+    llm = get_draft_llm(
+        max_tokens=_STRUCTURE_MAX_OUTPUT_TOKENS,
+        temperature=0,
+        cache_site=None if cp1_feedback else "structure",
+    )
     cp1_iterations = state.get("cp1_iterations", 0)
     context_block = build_context_block(state.get("context_dynamic"))
     research_context_selection = select_research_context(
@@ -117,9 +122,7 @@ async def structure_node(state: AuthorState) -> dict:
     response = await llm.ainvoke(prompt)
     heading_structure = response.content.strip()
 
-    usage = response.usage_metadata or {}
-    input_tokens = usage.get("input_tokens", 0)
-    output_tokens = usage.get("output_tokens", 0)
+    input_tokens, output_tokens = response_usage(response)
     call_cost = estimate_cost_usd(settings.draft_model, input_tokens, output_tokens)
 
     existing_research_tokens = state.get("tokens_used_research", 0)
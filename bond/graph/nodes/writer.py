@@ -1,9 +1,15 @@
+import asyncio
+import hashlib
+import json
 import logging
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import aclosing
+from dataclasses import dataclass
 from typing import Any, Literal, Optional
 
-import markdown as _md
-from bs4 import BeautifulSoup
 from pydantic import ValidationError
 
 from langchain_core.messages import HumanMessage, SystemMessage
@@ -18,36 +24,55 @@ from bond.graph.state import (
     DraftValidationDetails,
     DraftValidationFailure,
 )
-from bond.llm import estimate_cost_usd, get_draft_llm
+from bond.llm import estimate_cost_usd, get_draft_llm, get_research_llm
 from bond.prompts.context import build_context_block
-from bond.prompts.research_context import select_research_context
-from bond.prompts.writer import FORBIDDEN_WORD_STEMS, WRITER_SYSTEM_PROMPT
+from bond.prompts.research_context import (
+    prompt_token_counter,
+    render_structured_research_context,
+    select_research_context,
+)
+from bond.prompts.writer import (
+    WRITER_REPAIR_SYSTEM_PROMPT,
+    WRITER_SECTION_SYSTEM_PROMPT,
+    WRITER_SYSTEM_PROMPT,
+)
 from bond.schemas import CheckpointResponse
 from bond.store.article_log import get_article_count
 from bond.store.chroma import get_corpus_collection
+from bond.validation.draft import (
+    FORBIDDEN_WORD_RE,
+    META_PREFIX_RE,
+    DraftBlock,
+    DraftDocument,
+    DraftSection,
+    find_forbidden_stems,
+    split_sections,
+)
 
 log = logging.getLogger(__name__)
 
-_RERANK_FETCH_N = 15  # Candidates fetched before reranking
 _WRITER_MAX_OUTPUT_TOKENS = 4096
 _META_DESCRIPTION_MIN_LENGTH = 150
 _META_DESCRIPTION_MAX_LENGTH = 160
 _WORD_COUNT_BUFFER = 120
 
-# Module-level singleton — model loaded once per process
-_ranker = None
-
-
-def _get_ranker():
-    global _ranker
-    if _ranker is None:
-        from flashrank import Ranker
-
-        # ms-marco-MultiBERT-L-12 supports multilingual text (incl. Polish)
-        _ranker = Ranker(
-            model_name="ms-marco-MultiBERT-L-12", cache_dir="/tmp/flashrank"
-        )
-    return _ranker
+# Exemplar retrieval (Chroma query + embedding + FlashRank) runs off the event
+# loop in its own bounded pool. Cross-encoder runs from all sessions are
+# serialized and micro-batched by bond.corpus.reranker.
+_exemplar_executor: ThreadPoolExecutor | None = None
+_exemplar_executor_lock = threading.Lock()
+
+
+def _get_exemplar_executor() -> ThreadPoolExecutor:
+    global _exemplar_executor
+    if _exemplar_executor is None:
+        with _exemplar_executor_lock:
+            if _exemplar_executor is None:
+                _exemplar_executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.exemplar_retrieval_workers),
+                    thread_name_prefix="rag-exemplars",
+                )
+    return _exemplar_executor
 
 
 def _rerank(query: str, candidates: list[dict], top_n: int) -> list[dict]:
@@ -56,12 +81,9 @@ def _rerank(query: str, candidates: list[dict], top_n: int) -> list[dict]:
     Each candidate dict must contain a 'text' key. The original dict is
     returned (with all metadata preserved), sorted by cross-encoder score.
     """
-    from flashrank import RerankRequest
+    from bond.corpus.reranker import get_reranker
 
-    passages = [{"id": i, "text": c["text"]} for i, c in enumerate(candidates)]
-    request = RerankRequest(query=query, passages=passages)
-    ranked = _get_ranker().rerank(request)
-    return [candidates[r["id"]] for r in ranked[:top_n]]
+    return get_reranker().rerank(query, candidates, top_n)
 
 
 # ---------------------------------------------------------------------------
@@ -73,19 +95,24 @@ def _fetch_rag_exemplars(topic: str, n: int = 5) -> list[dict]:
     """
     Fetch style exemplar fragments from Phase 1 corpus.
 
-    1. Retrieves up to _RERANK_FETCH_N (15) candidates via cosine similarity,
+    1. Retrieves up to settings.rerank_candidates (15) candidates via cosine similarity,
        including section_type and article_type metadata.
        Prefers own_text source; falls back to all types if < 3 own-text results.
-    2. Reranks candidates with FlashRank cross-encoder (ms-marco-MultiBERT-L-12).
+    2. Reranks candidates with the FlashRank cross-encoder service
+       (bond.corpus.reranker, ms-marco-MultiBERT-L-12).
     3. Returns top n (default 5) dicts: {text, article_type, section_type}.
 
     Falls back to cosine-similarity order if reranking fails.
+    Blocking — writer_node calls it through _fetch_rag_exemplars_async().
     """
     collection = get_corpus_collection()
-    if collection is None or collection.count() == 0:
+    if collection is None:
+        return []
+    count = collection.count()
+    if count == 0:
         return []
 
-    fetch_n = min(_RERANK_FETCH_N, collection.count())
+    fetch_n = min(max(n, settings.rerank_candidates), count)
 
     def _to_dicts(docs: list, metas: list) -> list[dict]:
         return [
@@ -141,6 +168,12 @@ def _fetch_rag_exemplars(topic: str, n: int = 5) -> list[dict]:
         return candidates[:n]
 
 
+async def _fetch_rag_exemplars_async(topic: str, n: int = 5) -> list[dict]:
+    """Run _fetch_rag_exemplars on the bounded exemplar pool without blocking the loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_exemplar_executor(), _fetch_rag_exemplars, topic, n)
+
+
 # ---------------------------------------------------------------------------
 # Output cleanup
 # ---------------------------------------------------------------------------
@@ -173,97 +206,27 @@ def _clean_output(text: str) -> str:
 # ---------------------------------------------------------------------------
 
 
-def _parse_draft_to_soup(draft: str) -> BeautifulSoup:
-    """Parse Markdown draft to BeautifulSoup tree (understands fenced code blocks)."""
-    html = _md.markdown(draft, extensions=["fenced_code"])
-    return BeautifulSoup(html, "html.parser")
-
-
-def _count_body_words(soup: BeautifulSoup) -> int:
-    """Count body words, excluding heading and Meta-description nodes."""
-    soup_copy = BeautifulSoup(str(soup), "html.parser")
-    for tag in soup_copy.find_all(["h1", "h2", "h3", "h4", "h5", "h6"]):
-        tag.decompose()
-    for p in soup_copy.find_all("p"):
-        if re.match(r"^Meta[- ]?[Dd]escription", p.get_text().strip(), re.IGNORECASE):
-            p.decompose()
-    return len(soup_copy.get_text().split())
-
-
-def _check_forbidden_words(draft: str) -> list[str]:
-    """Return list of forbidden word stems found in draft (stem = catches all inflected forms)."""
-    draft_lower = draft.lower()
-    return [stem for stem in FORBIDDEN_WORD_STEMS if stem in draft_lower]
-
-
 def _normalize_match_text(text: str) -> str:
     """Normalize text for robust keyword matching across punctuation/casing differences."""
     normalized = re.sub(r"[^\w\s]", " ", text.lower(), flags=re.UNICODE)
     return re.sub(r"\s+", " ", normalized).strip()
 
 
-def _extract_meta_description(soup: BeautifulSoup) -> str:
-    """Extract the visible Meta-description line from rendered Markdown."""
-    for p in soup.find_all("p"):
-        paragraph = p.get_text().strip()
-        match = re.match(
-            r"^Meta[- ]?[Dd]escription[:\s]+(.+)", paragraph, re.IGNORECASE
-        )
-        if match:
-            return match.group(1).strip()
-    return ""
-
-
-def _extract_first_body_paragraph(soup: BeautifulSoup) -> str:
-    """Return the first real body paragraph, skipping the Meta-description line."""
-    for p in soup.find_all("p"):
-        paragraph = p.get_text().strip()
-        if not paragraph:
-            continue
-        if re.match(r"^Meta[- ]?[Dd]escription[:\s]+", paragraph, re.IGNORECASE):
-            continue
-        return paragraph
-    return ""
-
-
 def _recommended_body_word_target(min_words: int) -> int:
     """Return a buffered target so the validator still passes after model undercount drift."""
     return min_words + _WORD_COUNT_BUFFER
 
 
-def _split_markdown_blocks(text: str) -> list[str]:
-    return [block.strip() for block in re.split(r"\n\s*\n", text.strip()) if block.strip()]
-
-
-def _join_markdown_blocks(blocks: list[str]) -> str:
-    return "\n\n".join(blocks).strip()
-
-
-def _find_meta_block_index(blocks: list[str]) -> int | None:
-    for index, block in enumerate(blocks):
-        if re.match(r"^Meta[- ]?[Dd]escription[:\s]+", block, re.IGNORECASE):
-            return index
-    return None
+def _find_meta_block_index(document: DraftDocument) -> int | None:
+    return document.find(lambda block: block.is_meta)
 
 
-def _find_h1_block_index(blocks: list[str]) -> int | None:
-    for index, block in enumerate(blocks):
-        if block.startswith("# "):
-            return index
-    return None
+def _find_h1_block_index(document: DraftDocument) -> int | None:
+    return document.find(lambda block: block.is_h1)
 
 
-def _find_first_paragraph_block_index(blocks: list[str]) -> int | None:
-    for index, block in enumerate(blocks):
-        stripped = block.strip()
-        if not stripped:
-            continue
-        if stripped.startswith("#"):
-            continue
-        if re.match(r"^Meta[- ]?[Dd]escription[:\s]+", stripped, re.IGNORECASE):
-            continue
-        return index
-    return None
+def _find_first_paragraph_block_index(document: DraftDocument) -> int | None:
+    return document.find(lambda block: block.is_body_paragraph)
 
 
 def _normalize_inline_spacing(text: str) -> str:
@@ -288,21 +251,19 @@ def _strip_redundant_heading_prefix(existing_heading: str, primary_keyword: str)
     return f"{primary_keyword}: {heading_body}"
 
 
-def _ensure_h1_contains_keyword(markdown_text: str, primary_keyword: str) -> str:
-    blocks = _split_markdown_blocks(markdown_text)
-    if not blocks:
-        return markdown_text
+def _ensure_h1_contains_keyword(document: DraftDocument, primary_keyword: str) -> None:
+    if not len(document):
+        return
 
-    h1_index = _find_h1_block_index(blocks)
+    h1_index = _find_h1_block_index(document)
     if h1_index is None:
-        insert_at = 1 if _find_meta_block_index(blocks) == 0 else 0
-        blocks.insert(insert_at, f"# {primary_keyword}")
-        return _join_markdown_blocks(blocks)
+        insert_at = 1 if _find_meta_block_index(document) == 0 else 0
+        document.insert_block(insert_at, f"# {primary_keyword}")
+        return
 
-    heading = blocks[h1_index]
+    heading = document.blocks[h1_index].markdown.strip()
     if primary_keyword and _normalize_match_text(primary_keyword) not in _normalize_match_text(heading):
-        blocks[h1_index] = f"# {_strip_redundant_heading_prefix(heading, primary_keyword)}"
-    return _join_markdown_blocks(blocks)
+        document.replace_block(h1_index, f"# {_strip_redundant_heading_prefix(heading, primary_keyword)}")
 
 
 def _build_keyword_prefix(primary_keyword: str) -> str:
@@ -317,23 +278,22 @@ def _build_keyword_prefix(primary_keyword: str) -> str:
     )
 
 
-def _ensure_first_paragraph_contains_keyword(markdown_text: str, primary_keyword: str) -> str:
-    blocks = _split_markdown_blocks(markdown_text)
-    if not blocks or not primary_keyword:
-        return markdown_text
+def _ensure_first_paragraph_contains_keyword(document: DraftDocument, primary_keyword: str) -> None:
+    if not len(document) or not primary_keyword:
+        return
 
-    paragraph_index = _find_first_paragraph_block_index(blocks)
+    paragraph_index = _find_first_paragraph_block_index(document)
     if paragraph_index is None:
-        return markdown_text
+        return
 
-    paragraph = blocks[paragraph_index]
+    paragraph = document.blocks[paragraph_index].markdown.strip()
     if _normalize_match_text(primary_keyword) in _normalize_match_text(paragraph):
-        return markdown_text
+        return
 
-    blocks[paragraph_index] = _normalize_inline_spacing(
-        f"{_build_keyword_prefix(primary_keyword)} {paragraph}"
+    document.replace_block(
+        paragraph_index,
+        _normalize_inline_spacing(f"{_build_keyword_prefix(primary_keyword)} {paragraph}"),
     )
-    return _join_markdown_blocks(blocks)
 
 
 def _truncate_to_word_boundary(text: str, max_length: int) -> str:
@@ -360,26 +320,25 @@ def _extend_text_to_min_length(text: str, filler: str, min_length: int, max_leng
     return candidate
 
 
-def _ensure_meta_description_length(markdown_text: str) -> str:
-    blocks = _split_markdown_blocks(markdown_text)
-    if not blocks:
-        return markdown_text
+def _ensure_meta_description_length(document: DraftDocument) -> None:
+    if not len(document):
+        return
 
-    meta_index = _find_meta_block_index(blocks)
-    paragraph_index = _find_first_paragraph_block_index(blocks)
-    first_paragraph = blocks[paragraph_index] if paragraph_index is not None else ""
-
-    if meta_index is None:
-        meta_index = 0
-        blocks.insert(0, "Meta-description: ")
+    meta_index = _find_meta_block_index(document)
+    paragraph_index = _find_first_paragraph_block_index(document)
+    first_paragraph = (
+        document.blocks[paragraph_index].markdown.strip() if paragraph_index is not None else ""
+    )
 
-    existing_meta = re.sub(
-        r"^Meta[- ]?[Dd]escription[:\s]+", "", blocks[meta_index], flags=re.IGNORECASE
-    ).strip()
+    existing_meta = (
+        META_PREFIX_RE.sub("", document.blocks[meta_index].markdown.strip()).strip()
+        if meta_index is not None
+        else ""
+    )
     supplemental = _normalize_inline_spacing(first_paragraph)
     candidate = existing_meta or supplemental
     if not candidate:
-        return markdown_text
+        return
 
     if len(candidate) < _META_DESCRIPTION_MIN_LENGTH and supplemental:
         extra_source = supplemental
@@ -412,21 +371,21 @@ def _ensure_meta_description_length(markdown_text: str) -> str:
             _META_DESCRIPTION_MAX_LENGTH,
         )
 
-    blocks[meta_index] = f"Meta-description: {candidate}"
-    return _join_markdown_blocks(blocks)
+    if meta_index is None:
+        document.insert_block(0, f"Meta-description: {candidate}")
+    else:
+        document.replace_block(meta_index, f"Meta-description: {candidate}")
 
 
-def _remove_forbidden_words(markdown_text: str) -> str:
-    repaired = markdown_text
-    for stem in FORBIDDEN_WORD_STEMS:
-        repaired = re.sub(
-            rf"(?iu)\b\w*{re.escape(stem)}\w*\b",
-            "",
-            repaired,
-        )
-
-    lines = [_normalize_inline_spacing(line) if line.strip() else "" for line in repaired.splitlines()]
-    return "\n".join(lines).strip()
+def _remove_forbidden_words(document: DraftDocument) -> None:
+    """Drop words containing a forbidden stem; only blocks that contain one are rewritten."""
+    for index in reversed(range(len(document))):
+        block: DraftBlock = document.blocks[index]
+        if not block.forbidden_stems:
+            continue
+        repaired = FORBIDDEN_WORD_RE.sub("", block.markdown)
+        lines = [_normalize_inline_spacing(line) if line.strip() else "" for line in repaired.splitlines()]
+        document.replace_block(index, "\n".join(lines))
 
 
 def _lookup_research_items(
@@ -491,17 +450,16 @@ def _build_fallback_extension_paragraph(index: int) -> str:
 
 
 def _build_word_count_extension_paragraphs(
-    draft: str,
+    document: DraftDocument,
     research_data: dict[str, Any] | Any | None,
     min_words: int,
 ) -> list[str]:
-    current_word_count = _count_body_words(_parse_draft_to_soup(draft))
     target_word_count = min_words + 30
-    word_shortfall = max(target_word_count - current_word_count, 0)
+    word_shortfall = max(target_word_count - document.body_word_count, 0)
     if word_shortfall <= 0:
         return []
 
-    sentences = _extract_research_sentences(research_data, draft)
+    sentences = _extract_research_sentences(research_data, document.markdown)
     paragraphs: list[str] = []
     cursor = 0
     added_words = 0
@@ -554,19 +512,11 @@ def _build_word_count_extension_paragraphs(
 
 
 def _expand_draft_to_min_words(
-    markdown_text: str,
+    document: DraftDocument,
     research_data: dict[str, Any] | Any | None,
     min_words: int,
-) -> str:
-    extra_paragraphs = _build_word_count_extension_paragraphs(
-        markdown_text, research_data, min_words
-    )
-    if not extra_paragraphs:
-        return markdown_text
-
-    blocks = _split_markdown_blocks(markdown_text)
-    blocks.extend(extra_paragraphs)
-    return _join_markdown_blocks(blocks)
+) -> None:
+    document.extend(_build_word_count_extension_paragraphs(document, research_data, min_words))
 
 
 def _apply_validation_repairs(
@@ -578,40 +528,204 @@ def _apply_validation_repairs(
     research_data: dict[str, Any] | Any | None,
     allow_word_count_expansion: bool,
 ) -> str:
-    repaired = draft
     failure_codes = set(validation.get("failure_codes", []))
+    if not failure_codes:
+        return draft
+    # Parsed once; each repair replaces only the blocks it touches (see DraftDocument)
+    document = DraftDocument.from_markdown(draft)
 
     if "keyword_in_h1" in failure_codes:
-        repaired = _ensure_h1_contains_keyword(repaired, primary_keyword)
+        _ensure_h1_contains_keyword(document, primary_keyword)
     if "keyword_in_first_para" in failure_codes:
-        repaired = _ensure_first_paragraph_contains_keyword(repaired, primary_keyword)
+        _ensure_first_paragraph_contains_keyword(document, primary_keyword)
     if "no_forbidden_words" in failure_codes:
-        repaired = _remove_forbidden_words(repaired)
+        _remove_forbidden_words(document)
     if "meta_desc_length_ok" in failure_codes:
-        repaired = _ensure_meta_description_length(repaired)
+        _ensure_meta_description_length(document)
     if allow_word_count_expansion and "word_count_ok" in failure_codes:
-        repaired = _expand_draft_to_min_words(repaired, research_data, min_words)
-        repaired = _remove_forbidden_words(repaired)
-        repaired = _ensure_meta_description_length(repaired)
+        _expand_draft_to_min_words(document, research_data, min_words)
+        _remove_forbidden_words(document)
+        _ensure_meta_description_length(document)
+
+    return document.markdown
+
+
+# ---------------------------------------------------------------------------
+# Block repairs on the small model (settings.writer_block_repair_enabled)
+# ---------------------------------------------------------------------------
+
+# How each failed check is repaired: "block" rewrites the one block it concerns on the
+# small model, "deterministic" is left to _apply_validation_repairs, "global" needs a
+# regenerated draft (or, on the last attempt, the deterministic expansion).
+_FAILURE_REPAIR_SCOPE: dict[str, Literal["block", "deterministic", "global"]] = {
+    "keyword_in_h1": "block",
+    "keyword_in_first_para": "block",
+    "meta_desc_length_ok": "block",
+    "no_forbidden_words": "deterministic",
+    "word_count_ok": "global",
+}
+_BLOCK_REPAIR_MAX_TOKENS = 400
+# Event metadata marking block repair calls; bond/api/stream.py does not stream them
+WRITER_REPAIR_METADATA_KEY = "writer_repair"
+
 
-    return repaired
+def _block_repair_codes(failure_codes: list[str]) -> list[str]:
+    """Failed checks that a rewrite of a single block can fix, in report order."""
+    return [code for code in failure_codes if _FAILURE_REPAIR_SCOPE.get(code) == "block"]
+
+
+def _block_text(document: DraftDocument, index: int | None) -> str:
+    return document.blocks[index].markdown.strip() if index is not None else ""
+
+
+def _build_block_repair_prompt(
+    code: str, document: DraftDocument, primary_keyword: str
+) -> str | None:
+    """User prompt rewriting the block behind ``code``; None when there is nothing to rewrite."""
+    h1 = re.sub(r"^#\s*", "", _block_text(document, _find_h1_block_index(document))) or "brak"
+    first_paragraph = _block_text(document, _find_first_paragraph_block_index(document))
+
+    if code == "meta_desc_length_ok":
+        meta = META_PREFIX_RE.sub("", _block_text(document, _find_meta_block_index(document))).strip()
+        current = f"{meta} ({len(meta)} znaków)" if meta else "brak"
+        return f"""## ZADANIE
+Napisz meta description artykułu blogowego.
+
+## TYTUŁ ARTYKUŁU
+{h1}
+
+## WSTĘP ARTYKUŁU
+{first_paragraph or "brak"}
+
+## OBECNY OPIS
+{current}
+
+## WYMAGANIA
+1. Długość {_META_DESCRIPTION_MIN_LENGTH}-{_META_DESCRIPTION_MAX_LENGTH} znaków ze spacjami; celuj w 155
+2. Streszcza cały artykuł i naturalnie zawiera frazę "{primary_keyword}"
+3. Zwróć jedną linię z samą treścią opisu (bez prefiksu "Meta-description:")"""
+
+    if code == "keyword_in_h1":
+        return f"""## ZADANIE
+Popraw nagłówek H1 artykułu blogowego tak, aby zawierał główne słowo kluczowe.
+
+## OBECNY NAGŁÓWEK
+{h1}
+
+## WSTĘP ARTYKUŁU
+{first_paragraph or "brak"}
+
+## WYMAGANIA
+1. Nagłówek zawiera dokładnie frazę "{primary_keyword}", użytą naturalnie
+2. Zachowaj sens obecnego nagłówka
+3. Zwróć jedną linię w formacie "# Nagłówek" (H1 w Markdown)"""
+
+    if code == "keyword_in_first_para" and first_paragraph:
+        return f"""## ZADANIE
+Przepisz pierwszy akapit artykułu blogowego tak, aby zawierał główne słowo kluczowe.
+
+## TYTUŁ ARTYKUŁU
+{h1}
+
+## OBECNY AKAPIT
+{first_paragraph}
+
+## WYMAGANIA
+1. Akapit zawiera dokładnie frazę "{primary_keyword}", użytą naturalnie, bez cudzysłowów
+2. Zachowaj fakty, ton i podobną długość (około {len(first_paragraph.split())} słów)
+3. Zwróć jeden akapit, bez nagłówków"""
+    return None
+
+
+def _apply_block_repair(document: DraftDocument, code: str, text: str) -> None:
+    """Put the model's rewrite of the block behind ``code`` into the document."""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if not lines:
+        return
+    if code == "meta_desc_length_ok":
+        meta = META_PREFIX_RE.sub("", lines[0]).strip().strip('"„”')
+        index = _find_meta_block_index(document)
+        if index is None:
+            document.insert_block(0, f"Meta-description: {meta}")
+        else:
+            document.replace_block(index, f"Meta-description: {meta}")
+    elif code == "keyword_in_h1":
+        heading = f"# {lines[0].lstrip('#').strip()}"
+        index = _find_h1_block_index(document)
+        if index is None:
+            document.insert_block(1 if _find_meta_block_index(document) == 0 else 0, heading)
+        else:
+            document.replace_block(index, heading)
+    elif code == "keyword_in_first_para":
+        paragraph = _normalize_inline_spacing(
+            " ".join(line for line in lines if not line.startswith("#"))
+        )
+        index = _find_first_paragraph_block_index(document)
+        if index is not None and paragraph:
+            document.replace_block(index, paragraph)
+
+
+async def _repair_blocks(
+    draft: str,
+    failure_codes: list[str],
+    primary_keyword: str,
+) -> tuple[str, int, int]:
+    """Rewrite the blocks behind block-scoped failures with one small-model call each.
+
+    Calls run concurrently; other blocks are left untouched, and so is the block
+    behind a call that fails (the template repairs still run). Returns (draft,
+    input tokens, output tokens) — tokens are billed at settings.research_model.
+    """
+    document = DraftDocument.from_markdown(draft)
+    prompts = {
+        code: prompt
+        for code in _block_repair_codes(failure_codes)
+        if (prompt := _build_block_repair_prompt(code, document, primary_keyword)) is not None
+    }
+    if not prompts:
+        return draft, 0, 0
+
+    llm = get_research_llm(max_tokens=_BLOCK_REPAIR_MAX_TOKENS, temperature=0)
+    # One failed call (timeout, rate limit) must not cancel the others or lose the draft
+    responses = await asyncio.gather(
+        *(
+            llm.ainvoke(
+                [SystemMessage(content=WRITER_REPAIR_SYSTEM_PROMPT), HumanMessage(content=prompt)],
+                config={"metadata": {WRITER_REPAIR_METADATA_KEY: code}},
+            )
+            for code, prompt in prompts.items()
+        ),
+        return_exceptions=True,
+    )
+
+    input_tokens = output_tokens = 0
+    for code, response in zip(prompts, responses):
+        if isinstance(response, BaseException):
+            if not isinstance(response, Exception):
+                raise response
+            log.warning(
+                "Block repair %s failed (%s: %s) — block left unchanged", code, type(response).__name__, response
+            )
+            continue
+        usage = response.usage_metadata or {}
+        input_tokens += usage.get("input_tokens", 0)
+        output_tokens += usage.get("output_tokens", 0)
+        _apply_block_repair(document, code, _clean_output(response.content))
+    return document.markdown, input_tokens, output_tokens
 
 
 def _validate_draft(
     draft: str, primary_keyword: str, min_words: int
 ) -> DraftValidationDetails:
     """Check hard constraints and return a structured validation report."""
-    soup = _parse_draft_to_soup(draft)
-
-    h1 = soup.find("h1")
-    h1_text = h1.get_text().strip() if h1 else ""
-    first_para = _extract_first_body_paragraph(soup)
-    meta_desc = _extract_meta_description(soup)
+    measured = DraftDocument.from_markdown(draft).measure()
+    h1_text = measured.h1_text
+    first_para = measured.first_paragraph
 
     normalized_primary_keyword = _normalize_match_text(primary_keyword)
-    body_word_count = _count_body_words(soup)
-    forbidden_stems = _check_forbidden_words(draft)
-    meta_description_length = len(meta_desc)
+    body_word_count = measured.body_word_count
+    forbidden_stems = list(measured.forbidden_stems)
+    meta_description_length = len(measured.meta_description)
 
     checks: DraftValidationChecks = {
         "keyword_in_h1": bool(
@@ -775,6 +889,122 @@ Instrukcje naprawcze:
     )
 
 
+def _build_restart_instructions(validation: DraftValidationDetails) -> str:
+    """Instructions for a fresh attempt after the previous one was stopped mid-stream."""
+    failure_list = "\n".join(
+        f"- {failure['message']}" for failure in validation.get("failures", [])
+    )
+    repair_guidance = _build_validation_repair_guidance(validation)
+    return f"""Poprzednia wersja została odrzucona już w trakcie pisania, bo naruszała wymagania:
+{failure_list}
+
+Instrukcje naprawcze:
+{repair_guidance}"""
+
+
+# ---------------------------------------------------------------------------
+# Streaming validation (settings.writer_stream_validation)
+# ---------------------------------------------------------------------------
+
+
+def _chunk_text(chunk: Any) -> str:
+    content = chunk.content
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block.get("text", "")
+        for block in content
+        if isinstance(block, dict) and block.get("type") == "text"
+    )
+
+
+def _partial_draft_text(text: str) -> str:
+    """Cleaned prefix of a draft still being streamed; empty while a <thinking> block is open."""
+    text = _strip_thinking_tags(text)
+    if "<thinking>" in text:
+        return ""
+    return _strip_markdown_wrapper(text)
+
+
+def _definitive_failures(streamed_text: str, primary_keyword: str) -> list[str]:
+    """Failure codes the finished draft cannot escape, judged from the raw streamed prefix.
+
+    Only blocks already followed by a blank line are measured: the first H1 and
+    the first meta line are final once complete, and a forbidden stem that has
+    been written stays in the draft.
+    """
+    failure_codes: list[str] = []
+    complete_blocks = _partial_draft_text(streamed_text.rpartition("\n\n")[0])
+    if complete_blocks:
+        measured = DraftDocument.from_markdown(complete_blocks).measure()
+        normalized_primary_keyword = _normalize_match_text(primary_keyword)
+        if (
+            measured.h1_text
+            and normalized_primary_keyword
+            and normalized_primary_keyword not in _normalize_match_text(measured.h1_text)
+        ):
+            failure_codes.append("keyword_in_h1")
+        if measured.meta_description and not (
+            _META_DESCRIPTION_MIN_LENGTH
+            <= len(measured.meta_description)
+            <= _META_DESCRIPTION_MAX_LENGTH
+        ):
+            failure_codes.append("meta_desc_length_ok")
+    if find_forbidden_stems(_partial_draft_text(streamed_text)):
+        failure_codes.append("no_forbidden_words")
+    return failure_codes
+
+
+async def _stream_draft(
+    llm: Any, messages: list, primary_keyword: str
+) -> tuple[str, int, int, list[str]]:
+    """Stream one writer attempt, stopping at the first definitive validation failure.
+
+    Returns (raw output, input tokens, output tokens, failure codes that stopped
+    the stream — empty when the draft was generated to the end). Closing the
+    stream cancels the request, so an aborted attempt is only billed for what
+    was streamed; providers that report usage only at the end of a stream get
+    a local token estimate instead.
+    """
+    text = ""
+    input_tokens = output_tokens = 0
+    failure_codes: list[str] = []
+    async with aclosing(llm.astream(messages)) as stream:
+        async for chunk in stream:
+            piece = _chunk_text(chunk)
+            text += piece
+            usage = chunk.usage_metadata or {}
+            input_tokens += usage.get("input_tokens", 0)
+            output_tokens += usage.get("output_tokens", 0)
+            # Blocks and words only complete at a line break
+            if "\n" in piece:
+                failure_codes = _definitive_failures(text, primary_keyword)
+                if failure_codes:
+                    break
+
+    if failure_codes:
+        count_tokens = prompt_token_counter(llm)
+        input_tokens = input_tokens or count_tokens(messages)
+        output_tokens = output_tokens or count_tokens(text)
+    return text, input_tokens, output_tokens, failure_codes
+
+
+def _aborted_validation(
+    partial_draft: str, primary_keyword: str, min_words: int, failure_codes: list[str]
+) -> DraftValidationDetails:
+    """Validation report of an aborted attempt, limited to the checks that already failed for good."""
+    validation = _validate_draft(partial_draft, primary_keyword, min_words)
+    validation["passed"] = False
+    validation["checks"] = {
+        code: code not in failure_codes for code in validation["checks"]
+    }
+    validation["failure_codes"] = list(failure_codes)
+    validation["failures"] = [
+        failure for failure in validation["failures"] if failure["code"] in failure_codes
+    ]
+    return validation
+
+
 # ---------------------------------------------------------------------------
 # Prompt builder (user message only — system prompt is in bond/prompts/writer.py)
 # ---------------------------------------------------------------------------
@@ -788,6 +1018,25 @@ def _format_exemplar(ex: dict) -> str:
     return f"{label}\n{ex['text']}"
 
 
+def _build_exemplar_section(exemplars: list[dict]) -> str:
+    if not exemplars:
+        return ""
+    formatted = "\n\n---\n\n".join(_format_exemplar(e) for e in exemplars[:5])
+    return f"""
+## WZORCE STYLISTYCZNE (Few-Shot)
+
+Poniższe fragmenty pochodzą z korpusu stylistycznego. Każdy opatrzony jest etykietą [Typ: X | Sekcja: Y]:
+- **Typ**: "own" = artykuły autora (priorytet stylistyczny), "external" = artykuły zewnętrzne (wzorzec uzupełniający)
+- **Sekcja**: "wstęp" = fragment otwierający artykuł, "rozwinięcie" = fragment głównej części
+
+Przejmij ton, rytm zdań i sposób argumentacji — szczególnie z fragmentów "own". Nie kopiuj treści, adaptuj styl.
+
+{formatted}
+
+---
+"""
+
+
 def _build_writer_user_prompt(
     topic: str,
     keywords: list[str],
@@ -806,23 +1055,13 @@ def _build_writer_user_prompt(
     target_words = _recommended_body_word_target(min_words)
     max_target_words = target_words + 180
 
-    exemplar_section = ""
-    if exemplars:
-        formatted = "\n\n---\n\n".join(_format_exemplar(e) for e in exemplars[:5])
-        exemplar_section = f"""
-## WZORCE STYLISTYCZNE (Few-Shot)
-Poniższe fragmenty pochodzą z korpusu stylistycznego. Każdy opatrzony jest etykietą [Typ: X | Sekcja: Y]:
-- **Typ**: "own" = artykuły autora (priorytet stylistyczny), "external" = artykuły zewnętrzne (wzorzec uzupełniający)
-- **Sekcja**: "wstęp" = fragment otwierający artykuł, "rozwinięcie" = fragment głównej części
-
-Przejmij ton, rytm zdań i sposób argumentacji — szczególnie z fragmentów "own". Nie kopiuj treści, adaptuj styl.
-
-{formatted}
-
----
-"""
-
+    exemplar_section = _build_exemplar_section(exemplars)
     context_section = f"\n{context_block}\n" if context_block else ""
+    restart_section = (
+        f"\n## POPRAWKI WZGLĘDEM POPRZEDNIEJ PRÓBY\n{revision_instructions}\n"
+        if revision_instructions and not current_draft
+        else ""
+    )
 
     if revision_instructions and current_draft:
         feedback_heading = "FEEDBACK UŻYTKOWNIKA"
@@ -876,7 +1115,7 @@ Poboczne: {other_keywords}
 
 ## STRUKTURA NAGŁÓWKÓW (obowiązkowa)
 {heading_structure}
-
+{restart_section}
 ## RAPORT BADAWCZY
 {research_context}
 {exemplar_section}
@@ -889,6 +1128,610 @@ Poboczne: {other_keywords}
 6. Naturalne wplecenie słów kluczowych (bez keyword stuffing i bez komentarzy o SEO wewnątrz artykułu)"""
 
 
+# ---------------------------------------------------------------------------
+# Sectional drafting (settings.writer_sectional_enabled)
+# ---------------------------------------------------------------------------
+
+_OUTLINE_HEADING_RE = re.compile(r"^(#{1,3})\s+\S")
+# Share of the body word target written by the intro call
+_INTRO_WORD_SHARE = 0.12
+_INTRO_MIN_WORDS = 80
+# Event metadata tagging each section call; bond/api/stream.py re-orders tokens by it
+WRITER_SECTION_METADATA_KEY = "writer_section"
+
+
+@dataclass(frozen=True)
+class _OutlineSection:
+    heading: str  # the "## ..." line
+    outline: str  # heading line plus its H3 lines and notes, as approved
+
+
+def _parse_outline(heading_structure: str) -> tuple[str, list[_OutlineSection]]:
+    """Split an approved outline into its H1 line and its H2 sections.
+
+    H3 lines and free-text notes stay with the H2 they follow; anything before
+    the first H2 other than the H1 belongs to the intro and is dropped here.
+    """
+    h1_line = ""
+    sections: list[list[str]] = []
+    for line in heading_structure.splitlines():
+        stripped = line.strip()
+        heading = _OUTLINE_HEADING_RE.match(stripped)
+        if heading and len(heading.group(1)) == 1:
+            h1_line = h1_line or stripped
+        elif heading and len(heading.group(1)) == 2:
+            sections.append([stripped])
+        elif sections and stripped:
+            sections[-1].append(stripped)
+    return h1_line, [
+        _OutlineSection(heading=lines[0], outline="\n".join(lines)) for lines in sections
+    ]
+
+
+def _section_word_targets(min_words: int, section_count: int) -> tuple[int, int]:
+    """(intro words, words per H2 section) adding up to the buffered body target."""
+    target_words = _recommended_body_word_target(min_words)
+    intro_words = max(_INTRO_MIN_WORDS, round(target_words * _INTRO_WORD_SHARE))
+    per_section = -(-(target_words - intro_words) // max(section_count, 1))
+    return intro_words, per_section
+
+
+def _build_intro_prompt(
+    *,
+    topic: str,
+    keywords: list[str],
+    heading_structure: str,
+    h1_line: str,
+    research_context: str,
+    exemplars: list[dict],
+    intro_words: int,
+    context_block: str = "",
+) -> str:
+    primary_keyword = keywords[0] if keywords else topic
+    h1_line = h1_line or f"# {primary_keyword}"
+    context_section = f"\n{context_block}\n" if context_block else ""
+    return f"""## ZADANIE
+Napisz początek artykułu blogowego w Markdown: linię Meta-description, nagłówek H1 i wstęp.
+Sekcje H2 z konspektu piszą równolegle inni autorzy — nie pisz ich.
+{context_section}
+## TEMAT
+{topic}
+
+## SŁOWA KLUCZOWE
+Główne: {primary_keyword}
+
+## KONSPEKT CAŁEGO ARTYKUŁU (dla kontekstu)
+{heading_structure}
+
+## RAPORT BADAWCZY
+{research_context}
+{_build_exemplar_section(exemplars)}
+## WYMAGANIA (wszystkie obowiązkowe)
+1. Meta-description: JEDNA linia w formacie "Meta-description: [treść]" zawierająca dokładnie 150-160 znaków i streszczająca cały artykuł; celuj w 155 znaków
+2. Pod nią dokładnie ten nagłówek: {h1_line}
+3. Następnie wstęp: 1-2 pełne akapity, łącznie około {intro_words} słów; główne słowo kluczowe "{primary_keyword}" musi być w pierwszym akapicie, użyte naturalnie, bez cudzysłowów
+4. Zakończ po wstępie — bez nagłówków H2 i bez podsumowania artykułu"""
+
+
+def _build_section_prompt(
+    *,
+    topic: str,
+    keywords: list[str],
+    heading_structure: str,
+    section: _OutlineSection,
+    research_context: str,
+    exemplars: list[dict],
+    section_words: int,
+    context_block: str = "",
+) -> str:
+    primary_keyword = keywords[0] if keywords else topic
+    other_keywords = ", ".join(keywords[1:]) if len(keywords) > 1 else "brak"
+    context_section = f"\n{context_block}\n" if context_block else ""
+    return f"""## ZADANIE
+Napisz jedną sekcję artykułu blogowego w Markdown: sekcję "{section.heading}".
+{context_section}
+## TEMAT ARTYKUŁU
+{topic}
+
+## SŁOWA KLUCZOWE
+Główne: {primary_keyword}
+Poboczne: {other_keywords}
+
+## KONSPEKT CAŁEGO ARTYKUŁU (dla kontekstu — pisz tylko swoją sekcję)
+{heading_structure}
+
+## TWOJA SEKCJA
+{section.outline}
+
+## RAPORT BADAWCZY
+{research_context}
+{_build_exemplar_section(exemplars)}
+## WYMAGANIA (wszystkie obowiązkowe)
+1. Pierwsza linia odpowiedzi: {section.heading}
+2. Zachowaj nagłówki H3 (###) z konspektu tej sekcji w podanej kolejności; nie dodawaj innych nagłówków H2
+3. Około {section_words} słów treści; pod H2 co najmniej 2 pełne, merytoryczne akapity, pod każdym H3 co najmniej 1 pełny akapit
+4. Opieraj się na danych z raportu badawczego, które dotyczą tej sekcji; nie powtarzaj treści należących do innych sekcji konspektu
+5. Słowa kluczowe wplataj naturalnie tam, gdzie pasują (bez keyword stuffing i bez komentarzy o SEO)"""
+
+
+async def _generate_sectional_draft(
+    llm: Any,
+    *,
+    topic: str,
+    keywords: list[str],
+    heading_structure: str,
+    h1_line: str,
+    sections: list[_OutlineSection],
+    research_context: str,
+    exemplars: list[dict],
+    min_words: int,
+    context_block: str,
+) -> tuple[str, int, int]:
+    """Write the intro and every H2 section concurrently, then stitch them in outline order.
+
+    At most settings.writer_section_concurrency calls run at once. Returns
+    (draft, input tokens, output tokens).
+    """
+    intro_words, section_words = _section_word_targets(min_words, len(sections))
+    calls = [
+        (
+            WRITER_SYSTEM_PROMPT,
+            _build_intro_prompt(
+                topic=topic,
+                keywords=keywords,
+                heading_structure=heading_structure,
+                h1_line=h1_line,
+                research_context=research_context,
+                exemplars=exemplars,
+                intro_words=intro_words,
+                context_block=context_block,
+            ),
+        )
+    ] + [
+        (
+            WRITER_SECTION_SYSTEM_PROMPT,
+            _build_section_prompt(
+                topic=topic,
+                keywords=keywords,
+                heading_structure=heading_structure,
+                section=section,
+                research_context=research_context,
+                exemplars=exemplars,
+                section_words=section_words,
+                context_block=context_block,
+            ),
+        )
+        for section in sections
+    ]
+    # FIFO semaphore: calls start in outline order, so the intro streams first
+    semaphore = asyncio.Semaphore(max(1, settings.writer_section_concurrency))
+
+    async def _write(index: int, system_prompt: str, user_prompt: str):
+        async with semaphore:
+            return await llm.ainvoke(
+                [SystemMessage(content=system_prompt), HumanMessage(content=user_prompt)],
+                config={"metadata": {WRITER_SECTION_METADATA_KEY: index}},
+            )
+
+    async with asyncio.TaskGroup() as group:
+        tasks = [
+            group.create_task(_write(index, system_prompt, user_prompt))
+            for index, (system_prompt, user_prompt) in enumerate(calls)
+        ]
+
+    parts: list[str] = []
+    input_tokens = output_tokens = 0
+    for index, task in enumerate(tasks):
+        response = task.result()
+        usage = response.usage_metadata or {}
+        input_tokens += usage.get("input_tokens", 0)
+        output_tokens += usage.get("output_tokens", 0)
+        part = _clean_output(response.content)
+        if index and not part.startswith("## "):
+            part = f"{sections[index - 1].heading}\n\n{part}".strip()
+        parts.append(part)
+    return "\n\n".join(part for part in parts if part), input_tokens, output_tokens
+
+
+# ---------------------------------------------------------------------------
+# Targeted checkpoint-2 revision (settings.writer_targeted_revision)
+# ---------------------------------------------------------------------------
+
+# Feedback aimed at the article as a whole always revises the full draft
+_WHOLE_DRAFT_FEEDBACK_RE = re.compile(
+    r"\b(?:cał(?:y|ego|ym|ość|ości|a|ej|ą)|wszędzie|(?:wszystk|każd)\w*\s+(?:sekcj|rozdzia|częś)\w*)\b"
+)
+_INTRO_FEEDBACK_RE = re.compile(r"\b(?:wstęp\w*|wprowadzeni\w*|lead\w*|tytuł\w*|h1|meta)\b")
+_SECTION_WORD = r"(?:sekcj|rozdzia|częś|h2)\w*"
+_ORDINAL_WORDS = {
+    "pierwsz": 1,
+    "drug": 2,
+    "trzec": 3,
+    "czwart": 4,
+    "piąt": 5,
+    "szóst": 6,
+    "siódm": 7,
+    "ósm": 8,
+    "ostatni": -1,
+}
+_ORDINAL_WORD = r"(pierwsz|drug|trzec|czwart|piąt|szóst|siódm|ósm|ostatni)\w*"
+_SECTION_ORDINAL_RES = (
+    re.compile(rf"\b{_SECTION_WORD}\s+(?:nr\s+)?(\d{{1,2}})\b"),
+    re.compile(rf"\b{_SECTION_WORD}\s+{_ORDINAL_WORD}\b"),
+    re.compile(rf"\b{_ORDINAL_WORD}\s+{_SECTION_WORD}\b"),
+)
+_QUOTED_PHRASE_RE = re.compile(r"[\"'„“”«»‚‘’]([^\"'„“”«»‚‘’\n]{3,})[\"'„“”«»‚‘’]")
+# A quoted phrase this long may point into section text, not only at a heading
+_QUOTED_TEXT_MIN_LENGTH = 12
+_HEADING_STOPWORDS = frozenset(
+    {
+        "oraz", "jako", "czym", "jest", "które", "który", "która",
+        "jakie", "dlaczego", "kiedy", "gdzie", "czyli", "albo", "przez",
+    }
+)
+_HEADING_PREFIX_LENGTH = 5
+
+
+def _heading_word_prefixes(text: str, ignored: frozenset[str] = frozenset()) -> set[str]:
+    return {
+        word[:_HEADING_PREFIX_LENGTH]
+        for word in _normalize_match_text(text).split()
+        if len(word) >= 4
+        and word not in _HEADING_STOPWORDS
+        and word[:_HEADING_PREFIX_LENGTH] not in ignored
+    }
+
+
+def _target_sections(
+    feedback: str,
+    draft: str,
+    sections: list[DraftSection],
+    primary_keyword: str,
+) -> list[int] | None:
+    """Indices of the draft sections the checkpoint-2 feedback is about.
+
+    Returns None — revise the whole draft — when the feedback is about the whole
+    article, cannot be mapped to any section, or maps to every section.
+    """
+    h2_positions = [index for index, section in enumerate(sections) if section.heading]
+    if len(sections) < 2 or not h2_positions:
+        return None
+    normalized = _normalize_match_text(feedback)
+    if _WHOLE_DRAFT_FEEDBACK_RE.search(normalized):
+        return None
+
+    targets: set[int] = set()
+    if not sections[0].heading and _INTRO_FEEDBACK_RE.search(normalized):
+        targets.add(0)
+    for pattern in _SECTION_ORDINAL_RES:
+        for match in pattern.finditer(normalized):
+            value = match.group(1)
+            number = int(value) if value.isdigit() else _ORDINAL_WORDS[value]
+            if number == -1:
+                targets.add(h2_positions[-1])
+            elif 1 <= number <= len(h2_positions):
+                targets.add(h2_positions[number - 1])
+
+    quoted = [_normalize_match_text(phrase) for phrase in _QUOTED_PHRASE_RE.findall(feedback)]
+    feedback_words = _heading_word_prefixes(feedback)
+    keyword_words = _heading_word_prefixes(primary_keyword)
+    for index in h2_positions:
+        section = sections[index]
+        heading_text = _normalize_match_text(section.heading)
+        section_text = _normalize_match_text(draft[section.start : section.end])
+        if any(
+            phrase in heading_text
+            or (len(phrase) >= _QUOTED_TEXT_MIN_LENGTH and phrase in section_text)
+            for phrase in quoted
+            if phrase
+        ):
+            targets.add(index)
+            continue
+        heading_words = _heading_word_prefixes(section.heading, keyword_words)
+        # Most of the heading's distinctive words must appear in the feedback
+        required = max(1, -(-2 * len(heading_words) // 3))
+        if heading_words and len(heading_words & feedback_words) >= required:
+            targets.add(index)
+
+    if not targets or len(targets) == len(sections):
+        return None
+    return sorted(targets)
+
+
+def _draft_outline(draft: str) -> str:
+    return "\n".join(
+        line.strip() for line in draft.splitlines() if _OUTLINE_HEADING_RE.match(line.strip())
+    )
+
+
+def _build_section_revision_prompt(
+    *,
+    topic: str,
+    keywords: list[str],
+    feedback: str,
+    draft_outline: str,
+    section: DraftSection,
+    section_text: str,
+    research_context: str,
+    context_block: str = "",
+) -> str:
+    primary_keyword = keywords[0] if keywords else topic
+    other_keywords = ", ".join(keywords[1:]) if len(keywords) > 1 else "brak"
+    context_section = f"\n{context_block}\n" if context_block else ""
+    section_words = len(section_text.split())
+    if section.heading:
+        task = (
+            f'Popraw jedną sekcję artykułu blogowego: sekcję "{section.heading}". '
+            "Pozostałe sekcje zostają bez zmian."
+        )
+        requirements = f"""1. Pierwsza linia odpowiedzi: {section.heading}
+2. Zachowaj nagłówki H3 (###) tej sekcji, chyba że feedback wprost każe je zmienić; nie dodawaj innych nagłówków H2
+3. Zachowaj podobną długość (około {section_words} słów), chyba że feedback wymaga rozbudowy lub skrócenia
+4. Nie powtarzaj treści należących do innych sekcji artykułu"""
+    else:
+        task = "Popraw początek artykułu blogowego (Meta-description, H1 i wstęp). Sekcje H2 zostają bez zmian."
+        requirements = f"""1. Zachowaj linię w formacie "Meta-description: [treść]" o długości 150-160 znaków
+2. H1 (#) zawiera główne słowo kluczowe "{primary_keyword}"
+3. Główne słowo kluczowe występuje naturalnie w pierwszym akapicie wstępu
+4. Zachowaj podobną długość wstępu (około {section_words} słów) i zakończ po wstępie — bez nagłówków H2"""
+    return f"""## ZADANIE
+{task}
+{context_section}
+## TEMAT ARTYKUŁU
+{topic}
+
+## SŁOWA KLUCZOWE
+Główne: {primary_keyword}
+Poboczne: {other_keywords}
+
+## FEEDBACK UŻYTKOWNIKA
+{feedback}
+
+## STRUKTURA CAŁEGO ARTYKUŁU (dla kontekstu)
+{draft_outline}
+
+## OBECNA WERSJA FRAGMENTU
+{section_text.strip()}
+
+## DANE Z RAPORTU BADAWCZEGO
+{research_context}
+
+## WYMAGANIA (wszystkie obowiązkowe)
+{requirements}
+5. Zwróć wyłącznie poprawiony fragment w Markdown, bez komentarzy o wprowadzonych zmianach"""
+
+
+async def _revise_sections(
+    llm: Any,
+    *,
+    draft: str,
+    sections: list[DraftSection],
+    targets: list[int],
+    topic: str,
+    keywords: list[str],
+    feedback: str,
+    research_context: str,
+    context_block: str,
+) -> tuple[str, int, int]:
+    """Regenerate the targeted sections concurrently and splice them into the draft.
+
+    Untargeted spans are copied from the draft unchanged. Section calls are tagged
+    with their position in ``targets`` so the stream re-orders them like sectional
+    drafting. Returns (draft, input tokens, output tokens).
+    """
+    draft_outline = _draft_outline(draft)
+    semaphore = asyncio.Semaphore(max(1, settings.writer_section_concurrency))
+
+    async def _revise(order: int, section: DraftSection):
+        prompt = _build_section_revision_prompt(
+            topic=topic,
+            keywords=keywords,
+            feedback=feedback,
+            draft_outline=draft_outline,
+            section=section,
+            section_text=draft[section.start : section.end],
+            research_context=research_context,
+            context_block=context_block,
+        )
+        system_prompt = WRITER_SECTION_SYSTEM_PROMPT if section.heading else WRITER_SYSTEM_PROMPT
+        async with semaphore:
+            return await llm.ainvoke(
+                [SystemMessage(content=system_prompt), HumanMessage(content=prompt)],
+                config={"metadata": {WRITER_SECTION_METADATA_KEY: order}},
+            )
+
+    async with asyncio.TaskGroup() as group:
+        tasks = [
+            group.create_task(_revise(order, sections[index])) for order, index in enumerate(targets)
+        ]
+
+    replacements: dict[int, str] = {}
+    input_tokens = output_tokens = 0
+    for index, task in zip(targets, tasks):
+        response = task.result()
+        usage = response.usage_metadata or {}
+        input_tokens += usage.get("input_tokens", 0)
+        output_tokens += usage.get("output_tokens", 0)
+        section = sections[index]
+        part = _clean_output(response.content)
+        if section.heading and not part.startswith("## "):
+            part = f"{section.heading}\n\n{part}"
+        # Keep only the requested section if the model went on to write more
+        first = split_sections(part)[0]
+        part = part[: first.end].strip() if bool(first.heading) == bool(section.heading) else ""
+        if not part:
+            log.warning(
+                "Targeted revision returned no usable text for section %r; keeping the original",
+                section.heading or "intro",
+            )
+            continue
+        original = draft[section.start : section.end]
+        replacements[index] = part + original[len(original.rstrip()) :]
+
+    revised = "".join(
+        replacements.get(index, draft[section.start : section.end])
+        for index, section in enumerate(sections)
+    )
+    return revised, input_tokens, output_tokens
+
+
+# ---------------------------------------------------------------------------
+# Research context fitting and checkpoint-1 prefetch (settings.writer_prefetch_enabled)
+# ---------------------------------------------------------------------------
+
+
+def _select_writer_research_context(
+    llm: Any,
+    state: AuthorState,
+    context_block: str,
+    exemplars: list[dict],
+    first_variant_index: int = 0,
+):
+    """Richest research-context variant whose full writer prompt fits the model's input budget."""
+    return select_research_context(
+        llm=llm,
+        research_report=state.get("research_report", ""),
+        research_data=state.get("research_data"),
+        build_prompt_payload=lambda research_context: [
+            SystemMessage(content=WRITER_SYSTEM_PROMPT),
+            HumanMessage(
+                content=_build_writer_user_prompt(
+                    topic=state["topic"],
+                    keywords=state.get("keywords", []),
+                    heading_structure=state.get("heading_structure", ""),
+                    research_context=research_context,
+                    exemplars=exemplars,
+                    min_words=settings.min_word_count,
+                    context_block=context_block,
+                )
+            ),
+        ],
+        reserved_output_tokens=_WRITER_MAX_OUTPUT_TOKENS,
+        first_variant_index=first_variant_index,
+    )
+
+
+def _writer_inputs_fingerprint(state: AuthorState, context_block: str) -> str:
+    """Hash of the inputs the fitted research context depends on.
+
+    Whitespace in the outline is ignored; any other outline edit changes the hash.
+    """
+    payload = json.dumps(
+        [
+            state["topic"],
+            state.get("keywords", []),
+            " ".join(state.get("heading_structure", "").split()),
+            state.get("research_report", ""),
+            state.get("research_data"),
+            context_block,
+            settings.min_word_count,
+            settings.draft_model,
+        ],
+        default=str,
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class _PrefetchedInputs:
+    fingerprint: str
+    corpus_count: int
+    exemplars: list[dict]
+    research_context_selection: Any
+
+
+@dataclass(frozen=True)
+class _WriterPrefetch:
+    topic: str
+    fingerprint: str
+    future: Future  # resolves to _PrefetchedInputs
+
+
+# Latest prefetch per thread_id; abandoned sessions are evicted oldest first
+_WRITER_PREFETCH_MAX_THREADS = 32
+_writer_prefetches: OrderedDict[str, _WriterPrefetch] = OrderedDict()
+_writer_prefetch_lock = threading.Lock()
+
+
+def _compute_writer_prefetch(
+    state: AuthorState,
+    context_block: str,
+    fingerprint: str,
+    previous: Future | None,
+) -> _PrefetchedInputs:
+    exemplars = None
+    if previous is not None:
+        # Same topic, edited outline: retrieval and reranking are still valid
+        try:
+            exemplars = previous.result().exemplars
+        except Exception:
+            exemplars = None
+    if exemplars is None:
+        exemplars = _fetch_rag_exemplars(state["topic"], n=5)
+    llm = get_draft_llm(max_tokens=_WRITER_MAX_OUTPUT_TOKENS, temperature=0.7)
+    return _PrefetchedInputs(
+        fingerprint=fingerprint,
+        corpus_count=get_article_count(),
+        exemplars=exemplars,
+        research_context_selection=_select_writer_research_context(
+            llm, state, context_block, exemplars
+        ),
+    )
+
+
+def prefetch_writer_inputs(state: AuthorState) -> None:
+    """Start preparing writer_node's inputs while checkpoint_1 waits for the editor.
+
+    Exemplar retrieval and reranking, the corpus count and research-context
+    fitting run on the exemplar pool; writer_node picks the result up on resume.
+    Unchanged inputs are a no-op (checkpoint_1 re-runs on resume). After an
+    outline edit only the research context is fitted again; exemplars depend on
+    the topic alone and are reused.
+    """
+    thread_id = state.get("thread_id")
+    if not settings.writer_prefetch_enabled or not thread_id:
+        return
+    context_block = build_context_block(state.get("context_dynamic"))
+    fingerprint = _writer_inputs_fingerprint(state, context_block)
+    with _writer_prefetch_lock:
+        previous = _writer_prefetches.get(thread_id)
+        if previous is not None and previous.fingerprint == fingerprint:
+            return
+        reusable = previous.future if previous is not None and previous.topic == state["topic"] else None
+        future = _get_exemplar_executor().submit(
+            _compute_writer_prefetch, dict(state), context_block, fingerprint, reusable
+        )
+        _writer_prefetches[thread_id] = _WriterPrefetch(state["topic"], fingerprint, future)
+        _writer_prefetches.move_to_end(thread_id)
+        while len(_writer_prefetches) > _WRITER_PREFETCH_MAX_THREADS:
+            _, evicted = _writer_prefetches.popitem(last=False)
+            evicted.future.cancel()
+    log.info("Writer prefetch started for thread %s", thread_id)
+
+
+async def _take_writer_prefetch(state: AuthorState) -> _PrefetchedInputs | None:
+    """This thread's prefetched writer inputs, waiting for them if still running."""
+    thread_id = state.get("thread_id")
+    with _writer_prefetch_lock:
+        prefetch = _writer_prefetches.get(thread_id) if thread_id else None
+    if prefetch is None or prefetch.topic != state["topic"]:
+        return None
+    try:
+        return await asyncio.wrap_future(prefetch.future)
+    except Exception as exc:
+        log.warning("Writer prefetch failed for thread %s (%s); preparing inputs now", thread_id, exc)
+        return None
+
+
+def _discard_writer_prefetch(state: AuthorState) -> None:
+    thread_id = state.get("thread_id")
+    if thread_id:
+        with _writer_prefetch_lock:
+            _writer_prefetches.pop(thread_id, None)
+
+
 # ---------------------------------------------------------------------------
 # Writer node
 # ---------------------------------------------------------------------------
@@ -902,9 +1745,21 @@ async def writer_node(state: AuthorState) -> dict:
     - Checks RAG corpus count. If < settings.low_corpus_threshold, interrupts with
       a standard approve/reject warning payload and waits for user confirmation.
 
+    With settings.writer_prefetch_enabled, the corpus count, exemplars and fitted
+    research context come from checkpoint_1's prefetch (prefetch_writer_inputs).
+
     After corpus check:
     - Auto-retries up to 2 times if hard constraints fail (SEO or forbidden words).
-    - On cp2_feedback: targeted section revision (preserves unchanged sections).
+      With settings.writer_block_repair_enabled, a failed meta description, H1 or
+      first-paragraph keyword is first fixed by rewriting only that block on the
+      small model, so retries are left to failures the repairs cannot fix.
+      With settings.writer_stream_validation, an attempt whose H1, meta line or
+      forbidden stems already fail is stopped mid-stream and restarted.
+    - With settings.writer_sectional_enabled, the first fresh draft is written as
+      intro + one call per H2 of the approved outline, concurrently, then stitched.
+    - On cp2_feedback: with settings.writer_targeted_revision, feedback that maps to
+      specific sections regenerates only those and splices them back (unchanged
+      sections stay byte-identical); otherwise the whole draft is revised.
     """
     topic = state["topic"]
     keywords = state.get("keywords", [])
@@ -916,8 +1771,15 @@ async def writer_node(state: AuthorState) -> dict:
     current_draft = state.get("draft")  # for targeted revision
     min_words = settings.min_word_count
 
+    # Inputs prepared during the checkpoint_1 pause; revisions after checkpoint_2 find none
+    prefetched = await _take_writer_prefetch(state)
+
     # --- Low corpus gate ---
-    corpus_count = get_article_count()
+    corpus_count = (
+        prefetched.corpus_count
+        if prefetched is not None
+        else await asyncio.to_thread(get_article_count)
+    )
     if corpus_count < settings.low_corpus_threshold:
         warning_message = (
             f"Korpus zawiera tylko {corpus_count} artykułów "
@@ -942,6 +1804,7 @@ async def writer_node(state: AuthorState) -> dict:
             raise ValueError(f"Nieprawidłowa odpowiedź low_corpus: {exc}") from exc
 
         if response.action != "approve":
+            _discard_writer_prefetch(state)
             return Command(
                 goto=END,
                 update={
@@ -954,37 +1817,57 @@ async def writer_node(state: AuthorState) -> dict:
     # Select DRAFT_MODEL LLM (temperature 0.5–0.7 per COMMUNICATION_STYLE.md §3)
     llm = get_draft_llm(max_tokens=_WRITER_MAX_OUTPUT_TOKENS, temperature=0.7)
 
-    # Fetch RAG exemplars from Phase 1 corpus
-    exemplars = _fetch_rag_exemplars(topic, n=5)
     context_block = build_context_block(state.get("context_dynamic"))
-    research_context_selection = select_research_context(
-        llm=llm,
-        research_report=research_report,
-        research_data=state.get("research_data"),
-        build_prompt_payload=lambda research_context: [
-            SystemMessage(content=WRITER_SYSTEM_PROMPT),
-            HumanMessage(
-                content=_build_writer_user_prompt(
-                    topic=topic,
-                    keywords=keywords,
-                    heading_structure=heading_structure,
-                    research_context=research_context,
-                    exemplars=exemplars,
-                    min_words=min_words,
-                    context_block=context_block,
+    prompt_context: tuple[str, list[dict]] | None = None
+
+    async def _prepare_prompt_context() -> tuple[str, list[dict]]:
+        """Research context and exemplars for whole-draft prompts, prepared on first use."""
+        nonlocal prompt_context
+        if prompt_context is not None:
+            return prompt_context
+        if prefetched is not None and prefetched.fingerprint == _writer_inputs_fingerprint(
+            state, context_block
+        ):
+            research_context_selection = prefetched.research_context_selection
+            exemplars = prefetched.exemplars
+        elif prefetched is not None:
+            # The outline changed after the prefetch: exemplars still hold, the fit does not
+            exemplars = prefetched.exemplars
+            research_context_selection = await asyncio.to_thread(
+                _select_writer_research_context, llm, state, context_block, exemplars
+            )
+        else:
+            # Fetch RAG exemplars from Phase 1 corpus in the background
+            exemplar_task = asyncio.ensure_future(_fetch_rag_exemplars_async(topic, n=5))
+            # Token counting overlaps retrieval: select against the exemplar-free prompt
+            # first, then re-check from that variant once exemplars arrive. Exemplars only
+            # add tokens, so earlier (richer) variants cannot start fitting — the result
+            # equals a sequential selection.
+            try:
+                research_context_selection = await asyncio.to_thread(
+                    _select_writer_research_context, llm, state, context_block, []
                 )
-            ),
-        ],
-        reserved_output_tokens=_WRITER_MAX_OUTPUT_TOKENS,
-    )
-    research_context = research_context_selection.variant.content
-    if not research_context_selection.fit_found:
-        log.warning(
-            "Writer prompt exceeded available input budget even after compaction: %s > %s (variant=%s)",
-            research_context_selection.estimated_prompt_tokens,
-            research_context_selection.available_input_tokens,
-            research_context_selection.variant.kind,
-        )
+                exemplars = await exemplar_task
+            finally:
+                exemplar_task.cancel()
+            if exemplars:
+                research_context_selection = await asyncio.to_thread(
+                    _select_writer_research_context,
+                    llm,
+                    state,
+                    context_block,
+                    exemplars,
+                    research_context_selection.variant_index,
+                )
+        if not research_context_selection.fit_found:
+            log.warning(
+                "Writer prompt exceeded available input budget even after compaction: %s > %s (variant=%s)",
+                research_context_selection.estimated_prompt_tokens,
+                research_context_selection.available_input_tokens,
+                research_context_selection.variant.kind,
+            )
+        prompt_context = (research_context_selection.variant.content, exemplars)
+        return prompt_context
 
     # Generate draft with silent auto-retry (max 2 additional attempts = 3 total)
     draft = ""
@@ -1010,49 +1893,145 @@ async def writer_node(state: AuthorState) -> dict:
         "attempts": [],
     }
     max_attempts = 3
+    # Sectional mode writes the first fresh draft section by section; retries revise it whole
+    outline_h1, outline_sections = (
+        _parse_outline(heading_structure) if settings.writer_sectional_enabled else ("", [])
+    )
+    # Feedback about specific sections regenerates only those (first attempt only)
+    draft_sections = split_sections(current_draft or "")
+    revision_targets = (
+        _target_sections(cp2_feedback, current_draft, draft_sections, primary_keyword)
+        if settings.writer_targeted_revision and cp2_feedback and current_draft
+        else None
+    )
+    if revision_targets:
+        log.info(
+            "Writer targeted revision of %d/%d sections",
+            len(revision_targets),
+            len(draft_sections),
+        )
     total_draft_input_tokens = 0
     total_draft_output_tokens = 0
+    total_repair_input_tokens = 0
+    total_repair_output_tokens = 0
     attempt_summaries: list[DraftValidationAttempt] = []
+    aborted_codes: list[str] = []
     for attempt in range(max_attempts):
         revision_instructions = None
         revision_source: Literal["user", "validation", "user_and_validation"] | None = None
         revision_draft = None
+        # A stopped attempt left only a partial draft: redo its task with the failures spelled out
+        revises_current_draft = bool(cp2_feedback and current_draft)
 
-        if attempt == 0 and cp2_feedback and current_draft:
+        if attempt == 0 and revises_current_draft:
             revision_instructions = cp2_feedback
             revision_source = "user"
             revision_draft = current_draft
+        elif attempt > 0 and aborted_codes and not revises_current_draft:
+            revision_instructions = _build_restart_instructions(validation)
+            revision_source = "validation"
         elif attempt > 0 and draft:
             revision_instructions, revision_source = _build_revision_instructions(
                 validation,
                 cp2_feedback,
             )
-            revision_draft = draft
-
-        user_prompt = _build_writer_user_prompt(
-            topic=topic,
-            keywords=keywords,
-            heading_structure=heading_structure,
-            research_context=research_context,
-            exemplars=exemplars,
-            min_words=min_words,
-            context_block=context_block,
-            revision_instructions=revision_instructions,
-            current_draft=revision_draft,
-            revision_source=revision_source,
-        )
-        messages = [
-            SystemMessage(content=WRITER_SYSTEM_PROMPT),
-            HumanMessage(content=user_prompt),
-        ]
-        response = await llm.ainvoke(messages)
-        draft = _clean_output(response.content)
-
-        usage = response.usage_metadata or {}
-        total_draft_input_tokens += usage.get("input_tokens", 0)
-        total_draft_output_tokens += usage.get("output_tokens", 0)
+            revision_draft = current_draft if aborted_codes else draft
+
+        if attempt == 0 and revision_targets:
+            raw_output, input_tokens, output_tokens = await _revise_sections(
+                llm,
+                draft=current_draft,
+                sections=draft_sections,
+                targets=revision_targets,
+                topic=topic,
+                keywords=keywords,
+                feedback=cp2_feedback,
+                research_context=(
+                    render_structured_research_context(research_data, max_sources=0)
+                    or research_report
+                ),
+                context_block=context_block,
+            )
+            aborted_codes = []
+        else:
+            research_context, exemplars = await _prepare_prompt_context()
+            user_prompt = _build_writer_user_prompt(
+                topic=topic,
+                keywords=keywords,
+                heading_structure=heading_structure,
+                research_context=research_context,
+                exemplars=exemplars,
+                min_words=min_words,
+                context_block=context_block,
+                revision_instructions=revision_instructions,
+                current_draft=revision_draft,
+                revision_source=revision_source,
+            )
+            messages = [
+                SystemMessage(content=WRITER_SYSTEM_PROMPT),
+                HumanMessage(content=user_prompt),
+            ]
+            # The last attempt always runs to the end so there is a complete draft to repair
+            if attempt == 0 and outline_sections and not revises_current_draft:
+                raw_output, input_tokens, output_tokens = await _generate_sectional_draft(
+                    llm,
+                    topic=topic,
+                    keywords=keywords,
+                    heading_structure=heading_structure,
+                    h1_line=outline_h1,
+                    sections=outline_sections,
+                    research_context=research_context,
+                    exemplars=exemplars,
+                    min_words=min_words,
+                    context_block=context_block,
+                )
+                aborted_codes = []
+            elif settings.writer_stream_validation and attempt < max_attempts - 1:
+                raw_output, input_tokens, output_tokens, aborted_codes = await _stream_draft(
+                    llm, messages, primary_keyword
+                )
+            else:
+                response = await llm.ainvoke(messages)
+                usage = response.usage_metadata or {}
+                raw_output = response.content
+                input_tokens = usage.get("input_tokens", 0)
+                output_tokens = usage.get("output_tokens", 0)
+                aborted_codes = []
+        draft = _clean_output(raw_output)
+        total_draft_input_tokens += input_tokens
+        total_draft_output_tokens += output_tokens
+
+        if aborted_codes:
+            validation = _aborted_validation(draft, primary_keyword, min_words, aborted_codes)
+            attempt_summaries.append(
+                {
+                    "attempt_number": attempt + 1,
+                    "passed": False,
+                    "failed_codes": list(aborted_codes),
+                    "aborted_early": True,
+                }
+            )
+            validation["attempt_count"] = len(attempt_summaries)
+            validation["attempts"] = list(attempt_summaries)
+            log.warning(
+                "Writer attempt %d/%d stopped after %d output tokens: failed constraints: %s",
+                attempt + 1,
+                max_attempts,
+                output_tokens,
+                aborted_codes,
+            )
+            continue
 
         validation = _validate_draft(draft, primary_keyword, min_words)
+        # Block-scoped failures are rewritten on the small model first; whatever still
+        # fails falls through to the template-based repairs below
+        if settings.writer_block_repair_enabled and _block_repair_codes(validation["failure_codes"]):
+            draft, input_tokens, output_tokens = await _repair_blocks(
+                draft, validation["failure_codes"], primary_keyword
+            )
+            total_repair_input_tokens += input_tokens
+            total_repair_output_tokens += output_tokens
+            validation = _validate_draft(draft, primary_keyword, min_words)
         repaired_draft = _apply_validation_repairs(
             draft,
             validation,
@@ -1094,9 +2073,14 @@ async def writer_node(state: AuthorState) -> dict:
             validation["failure_codes"],
         )
 
+    _discard_writer_prefetch(state)
     call_cost = estimate_cost_usd(
         settings.draft_model, total_draft_input_tokens, total_draft_output_tokens
     )
+    if total_repair_input_tokens or total_repair_output_tokens:
+        call_cost += estimate_cost_usd(
+            settings.research_model, total_repair_input_tokens, total_repair_output_tokens
+        )
     existing_draft_tokens = state.get("tokens_used_draft", 0)
     existing_cost = state.get("estimated_cost_usd", 0.0)
 
@@ -1106,6 +2090,8 @@ async def writer_node(state: AuthorState) -> dict:
         "draft_validation_details": validation,
         "tokens_used_draft": existing_draft_tokens
         + total_draft_input_tokens
-        + total_draft_output_tokens,
+        + total_draft_output_tokens
+        + total_repair_input_tokens
+        + total_repair_output_tokens,
         "estimated_cost_usd": existing_cost + call_cost,
     }
@@ -26,6 +26,7 @@ class DraftValidationAttempt(TypedDict):
     attempt_number: int
     passed: bool
     failed_codes: list[str]
+    aborted_early: NotRequired[bool]  # generation stopped mid-stream (settings.writer_stream_validation)
 
 
 class DraftValidationChecks(TypedDict):
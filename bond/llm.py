@@ -10,13 +10,42 @@ Usage:
     llm = get_research_llm(max_tokens=800)       # override for lightweight calls
     llm = get_draft_llm(temperature=0.7)         # creative draft generation
     llm = get_draft_llm(temperature=0)           # deterministic (structured output)
+
+Deterministic response cache (opt-in, ``settings.llm_cache_enabled``):
+
+    llm = get_research_llm(max_tokens=300, temperature=0, cache_site="sub_queries")
+
+Temperature-0 calls made with a ``cache_site`` whose ``settings.llm_cache_<site>``
+flag is on go through ``ResponseCache``: responses are stored in SQLite
+(bond/db/llm_cache.py) keyed by the model parameters and the normalized prompt,
+so retries and re-runs of an identical prompt are served locally. Use
+``response_usage`` for token accounting — cached responses were not billed.
 """
 
+import hashlib
+import logging
+import unicodedata
+import warnings
+from collections.abc import Sequence
+from typing import Any
+
 from langchain_anthropic import ChatAnthropic
+from langchain_core._api import LangChainBetaWarning
+from langchain_core.caches import BaseCache
 from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import Generation
 from langchain_openai import ChatOpenAI
 
 from bond.config import settings
+from bond.db.llm_cache import (
+    clear_llm_cache,
+    get_llm_cache_storage_stats,
+    get_llm_response,
+    save_llm_response,
+)
+
+log = logging.getLogger(__name__)
 
 # Default token budgets per role — overridable via kwargs
 _RESEARCH_MAX_TOKENS = 2500
@@ -49,7 +78,150 @@ def estimate_cost_usd(model: str, input_tokens: int, output_tokens: int) -> floa
     return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
 
 
-def _build_llm(model: str, tokens: int, temperature: float) -> BaseChatModel:
+# response_metadata flag set on messages served from ResponseCache
+CACHE_HIT_KEY = "bond_cache_hit"
+
+# Per call site: {"hits", "tokens_avoided", "cost_avoided_usd", "writes", "tokens_paid", "cost_paid_usd"}
+_cache_usage: dict[str, dict[str, float]] = {}
+
+
+def _site_usage(site: str) -> dict[str, float]:
+    return _cache_usage.setdefault(
+        site,
+        {
+            "hits": 0,
+            "tokens_avoided": 0,
+            "cost_avoided_usd": 0.0,
+            "writes": 0,
+            "tokens_paid": 0,
+            "cost_paid_usd": 0.0,
+        },
+    )
+
+
+class ResponseCache(BaseCache):
+    """LangChain response cache for one call site and model, persisted in bond/db/llm_cache.py.
+
+    The key hashes LangChain's ``llm_string`` (model, temperature, max_tokens,
+    bound tools / structured-output schema) together with the serialized prompt
+    after Unicode NFC normalization. Only the async API is backed by SQLite:
+    graph nodes call ``ainvoke``, and synchronous calls simply miss. Storage
+    errors never fail the LLM call — they are logged and treated as a miss.
+    """
+
+    def __init__(self, site: str, model: str) -> None:
+        self.site = site
+        self.model = model
+
+    @staticmethod
+    def cache_key(prompt: str, llm_string: str) -> str:
+        normalized = unicodedata.normalize("NFC", prompt)
+        return hashlib.sha256(f"{llm_string}\0{normalized}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Sequence[Generation] | None:
+        return None
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        pass
+
+    def clear(self, **kwargs: Any) -> None:
+        pass
+
+    async def alookup(self, prompt: str, llm_string: str) -> Sequence[Generation] | None:
+        try:
+            row = await get_llm_response(self.cache_key(prompt, llm_string))
+            if row is None:
+                return None
+            serialized, input_tokens, output_tokens = row
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", LangChainBetaWarning)
+                generations = loads(serialized, allowed_objects="core")
+        except Exception as exc:
+            log.warning("llm_cache: lookup failed for %s (%s) — calling the model", self.site, exc)
+            return None
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            if message is not None:
+                message.response_metadata = {**message.response_metadata, CACHE_HIT_KEY: True}
+        usage = _site_usage(self.site)
+        usage["hits"] += 1
+        usage["tokens_avoided"] += input_tokens + output_tokens
+        usage["cost_avoided_usd"] += estimate_cost_usd(self.model, input_tokens, output_tokens)
+        log.info(
+            "llm_cache: %s hit (%s) — %d tokens not re-billed", self.site, self.model, input_tokens + output_tokens
+        )
+        return generations
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        input_tokens = output_tokens = 0
+        for generation in return_val:
+            tokens = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+            input_tokens += tokens.get("input_tokens", 0)
+            output_tokens += tokens.get("output_tokens", 0)
+        try:
+            await save_llm_response(
+                self.cache_key(prompt, llm_string),
+                self.site,
+                self.model,
+                dumps(list(return_val)),
+                input_tokens,
+                output_tokens,
+            )
+        except Exception as exc:
+            log.warning("llm_cache: store failed for %s (%s)", self.site, exc)
+            return
+        usage = _site_usage(self.site)
+        usage["writes"] += 1
+        usage["tokens_paid"] += input_tokens + output_tokens
+        usage["cost_paid_usd"] += estimate_cost_usd(self.model, input_tokens, output_tokens)
+
+    async def aclear(self, **kwargs: Any) -> None:
+        await clear_llm_cache(self.site)
+
+
+def response_cache(site: str | None, model: str, temperature: float) -> ResponseCache | None:
+    """The ResponseCache for a call site, or None when caching is off for it.
+
+    Only temperature-0 calls are cached, and only while both
+    ``settings.llm_cache_enabled`` and ``settings.llm_cache_<site>`` are set.
+    """
+    if not site or temperature != 0 or not settings.llm_cache_enabled:
+        return None
+    if not getattr(settings, f"llm_cache_{site}", False):
+        return None
+    return ResponseCache(site, model)
+
+
+def response_usage(message: Any) -> tuple[int, int]:
+    """Billed (input_tokens, output_tokens) of an LLM response; (0, 0) when served from the cache."""
+    if message is None or (getattr(message, "response_metadata", None) or {}).get(CACHE_HIT_KEY):
+        return 0, 0
+    usage = getattr(message, "usage_metadata", None) or {}
+    return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+
+
+def get_llm_cache_stats() -> dict:
+    """Storage counters plus per-site avoided vs paid tokens and cost for this process."""
+    sites = {
+        site: {
+            **usage,
+            "cost_avoided_usd": round(usage["cost_avoided_usd"], 6),
+            "cost_paid_usd": round(usage["cost_paid_usd"], 6),
+        }
+        for site, usage in _cache_usage.items()
+    }
+    return {
+        "enabled": settings.llm_cache_enabled,
+        **get_llm_cache_storage_stats(),
+        "tokens_avoided": sum(usage["tokens_avoided"] for usage in _cache_usage.values()),
+        "cost_avoided_usd": round(sum(usage["cost_avoided_usd"] for usage in _cache_usage.values()), 6),
+        "sites": sites,
+    }
+
+
+def _build_llm(
+    model: str, tokens: int, temperature: float, cache_site: str | None = None
+) -> BaseChatModel:
     """Instantiate the correct LLM class based on model name."""
     kwargs = dict(
         model=model,
@@ -58,6 +230,9 @@ def _build_llm(model: str, tokens: int, temperature: float) -> BaseChatModel:
         timeout=float(settings.openai_timeout),
         max_retries=settings.openai_max_retries,
     )
+    cache = response_cache(cache_site, model, temperature)
+    if cache is not None:
+        kwargs["cache"] = cache
     if "claude" in model.lower():
         if settings.anthropic_api_key:
             kwargs["api_key"] = settings.anthropic_api_key
@@ -70,6 +245,7 @@ def _build_llm(model: str, tokens: int, temperature: float) -> BaseChatModel:
 def get_research_llm(
     max_tokens: int | None = None,
     temperature: float = 0,
+    cache_site: str | None = None,
 ) -> BaseChatModel:
     """Return an LLM configured for research and analysis tasks.
 
@@ -80,14 +256,16 @@ def get_research_llm(
     Args:
         max_tokens: Override the default token budget (default: 2500).
         temperature: Sampling temperature (default: 0 — deterministic).
+        cache_site: Call-site name for the response cache (see ``response_cache``).
     """
     tokens = max_tokens if max_tokens is not None else _RESEARCH_MAX_TOKENS
-    return _build_llm(settings.research_model, tokens, temperature)
+    return _build_llm(settings.research_model, tokens, temperature, cache_site)
 
 
 def get_draft_llm(
     max_tokens: int | None = None,
     temperature: float = 0.7,
+    cache_site: str | None = None,
 ) -> BaseChatModel:
     """Return an LLM configured for draft generation tasks.
 
@@ -98,8 +276,9 @@ def get_draft_llm(
         max_tokens: Override the default token budget (default: 4096).
         temperature: Sampling temperature (default: 0.7 — creative drafts).
                      Pass 0 for deterministic structured-output calls.
+        cache_site: Call-site name for the response cache (see ``response_cache``).
     """
     tokens = max_tokens if max_tokens is not None else _DRAFT_MAX_TOKENS
-    primary = _build_llm(settings.draft_model, tokens, temperature)
-    fallback = _build_llm(settings.research_model, tokens, temperature)
+    primary = _build_llm(settings.draft_model, tokens, temperature, cache_site)
+    fallback = _build_llm(settings.research_model, tokens, temperature, cache_site)
     return primary.with_fallbacks([fallback])
@@ -1,8 +1,8 @@
 """Google Drive MCP server.
 
 Exposes two tools to Claude Code / LangGraph agents:
-- list_drive_folder  — list supported files in a Drive folder
-- drive_ingest       — download and ingest a folder into the corpus
+- list_drive_folder  — list supported files in a Drive folder and its subfolders
+- drive_ingest       — sync a folder into the corpus (only changes after the first run)
 """
 
 import asyncio
@@ -21,7 +21,7 @@ mcp = FastMCP("bond-drive")
 
 @mcp.tool()
 async def list_drive_folder(folder_id: str) -> list[DriveFileInfo]:
-    """List all supported files (PDF, DOCX, TXT, Google Docs) in a Google Drive folder.
+    """List all supported files (PDF, DOCX, TXT, Google Docs) in a Google Drive folder and its subfolders.
 
     Args:
         folder_id: The Google Drive folder ID (from the folder URL).
@@ -35,19 +35,28 @@ async def list_drive_folder(folder_id: str) -> list[DriveFileInfo]:
 
 @mcp.tool()
 async def drive_ingest(
-    folder_id: str, source_type: SourceType = SourceType.OWN_TEXT
+    folder_id: str,
+    source_type: SourceType = SourceType.OWN_TEXT,
+    full_resync: bool = False,
 ) -> dict:
-    """Download and ingest all supported files from a Google Drive folder into the corpus.
+    """Sync all supported files from a Google Drive folder (recursively) into the corpus.
+
+    The first call imports everything; later calls download only files added or
+    modified since the previous sync and remove deleted ones from the corpus.
 
     Args:
         folder_id:   The Google Drive folder ID (from the folder URL).
         source_type: 'own' for the author's own articles, 'external' for reference texts.
+        full_resync: Walk the whole folder again instead of reading the change feed.
 
     Returns:
-        Dict with articles_ingested, total_chunks, and warnings list.
+        Dict with articles_ingested, total_chunks, articles_deleted, and warnings list.
     """
     return await asyncio.to_thread(
-        ingest_drive_folder, folder_id=folder_id, source_type=source_type.value
+        ingest_drive_folder,
+        folder_id=folder_id,
+        source_type=source_type.value,
+        full_resync=full_resync,
     )
 
 
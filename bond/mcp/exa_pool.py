@@ -0,0 +1,318 @@
+"""Long-lived Exa MCP client sessions.
+
+Calling Exa through MultiServerMCPClient opens a new streamable-HTTP session
+(connect + initialize handshake) for every tool call. ExaMcpPool instead keeps
+``settings.exa_mcp_pool_size`` initialized sessions open for the lifetime of the
+API process:
+
+- each session is owned by a background task, because the MCP client's anyio
+  streams must be opened and closed in the same task; calls from any task are
+  multiplexed over the open session;
+- idle sessions are pinged every ``settings.exa_mcp_keepalive_seconds``; a
+  failed ping or a transport error during a call tears the session down and
+  its task reconnects with exponential backoff; a call that hit a broken
+  session is retried once on another one;
+- at most ``settings.exa_mcp_max_concurrency`` tool calls run at once.
+
+The FastAPI lifespan opens the shared pool (``exa_mcp_pool``). Without it
+(CLI harness, scripts) ``call_exa_tool`` uses a one-session pool per call, as
+before. ``bond/mcp/exa_standin.py`` is a local stand-in server for offline runs.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import Any
+
+import httpx
+from mcp import ClientSession
+from mcp.client.streamable_http import streamable_http_client
+from mcp.shared._httpx_utils import create_mcp_http_client
+from mcp.shared.exceptions import McpError
+
+from bond.config import settings
+
+log = logging.getLogger(__name__)
+
+_RECONNECT_BACKOFF_MIN = 0.5
+_RECONNECT_BACKOFF_MAX = 30.0
+# HTTP read timeout for the server's SSE streams (MCP SDK default); tool calls use call_timeout
+_SSE_READ_TIMEOUT = 300.0
+
+
+class ExaToolError(RuntimeError):
+    """The MCP tool ran but reported an error (CallToolResult.isError)."""
+
+
+def _describe(exc: BaseException) -> str:
+    """The first leaf error: anyio task groups wrap transport failures in exception groups."""
+    while isinstance(exc, BaseExceptionGroup) and exc.exceptions:
+        exc = exc.exceptions[0]
+    return f"{type(exc).__name__}: {exc}"
+
+
+def _content_blocks(result) -> list[dict[str, Any]]:
+    """MCP content → the {"type": "text", "text": ...} blocks langchain-mcp-adapters produced."""
+    blocks: list[dict[str, Any]] = []
+    for content in result.content:
+        if getattr(content, "type", None) == "text":
+            blocks.append({"type": "text", "text": content.text})
+        else:
+            blocks.append(content.model_dump(exclude_none=True))
+    return blocks
+
+
+class _PooledSession:
+    """One initialized MCP session, kept open (and reopened) by its own task."""
+
+    def __init__(self, pool: "ExaMcpPool", index: int) -> None:
+        self.pool = pool
+        self.index = index
+        self.session: ClientSession | None = None
+        self.in_flight = 0
+        self._broken = asyncio.Event()
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.session is not None and not self._broken.is_set()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name=f"exa-mcp-session-{self.index}")
+
+    def mark_broken(self) -> None:
+        self._broken.set()
+
+    def wake(self) -> None:
+        """Cut a reconnect backoff short (a caller is waiting for a session)."""
+        self._wake.set()
+
+    async def call_tool(self, name: str, arguments: dict[str, Any]):
+        """call_tool that fails fast when the session dies instead of waiting out the read timeout."""
+        call = asyncio.ensure_future(self.session.call_tool(name, arguments))
+        broken = asyncio.ensure_future(self._broken.wait())
+        try:
+            await asyncio.wait({call, broken}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            broken.cancel()
+            if not call.done():
+                call.cancel()
+            await asyncio.gather(call, broken, return_exceptions=True)
+        if call.cancelled():
+            raise ConnectionError(f"Exa MCP session {self.index} closed during the call")
+        return call.result()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        pool = self.pool
+        backoff = _RECONNECT_BACKOFF_MIN
+        while True:
+            try:
+                http_client = create_mcp_http_client(
+                    timeout=httpx.Timeout(pool.connect_timeout, read=_SSE_READ_TIMEOUT)
+                )
+                async with http_client, streamable_http_client(pool.url, http_client=http_client) as streams:
+                    read, write, _ = streams
+                    async with ClientSession(
+                        read, write, read_timeout_seconds=timedelta(seconds=pool.call_timeout)
+                    ) as session:
+                        await asyncio.wait_for(session.initialize(), pool.connect_timeout)
+                        pool._stats["connects"] += 1
+                        self._broken.clear()
+                        self.session = session
+                        await pool._notify()
+                        backoff = _RECONNECT_BACKOFF_MIN
+                        await self._keep_alive(session)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                pool._stats["connect_failures"] += 1
+                log.warning(
+                    "Exa MCP session %d failed (%s) — reconnecting in %.1fs", self.index, _describe(exc), backoff
+                )
+            finally:
+                self.session = None
+                self._broken.set()
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), backoff)
+            except asyncio.TimeoutError:
+                pass
+            backoff = min(backoff * 2, _RECONNECT_BACKOFF_MAX)
+
+    async def _keep_alive(self, session: ClientSession) -> None:
+        """Return when the session is marked broken or an idle ping fails."""
+        while True:
+            try:
+                await asyncio.wait_for(self._broken.wait(), self.pool.keepalive_seconds)
+                return
+            except asyncio.TimeoutError:
+                pass
+            if self.in_flight:
+                continue
+            try:
+                await asyncio.wait_for(session.send_ping(), self.pool.connect_timeout)
+            except Exception as exc:
+                self.pool._stats["keepalive_failures"] += 1
+                log.info("Exa MCP keep-alive ping failed on session %d (%s)", self.index, exc)
+                return
+
+
+class ExaMcpPool:
+    def __init__(
+        self,
+        url: str | None = None,
+        *,
+        size: int | None = None,
+        max_concurrency: int | None = None,
+        keepalive_seconds: float | None = None,
+        connect_timeout: float | None = None,
+        call_timeout: float | None = None,
+    ) -> None:
+        self.url = url or settings.exa_mcp_url
+        self.size = max(1, size if size is not None else settings.exa_mcp_pool_size)
+        self.max_concurrency = max(
+            1, max_concurrency if max_concurrency is not None else settings.exa_mcp_max_concurrency
+        )
+        self.keepalive_seconds = keepalive_seconds or settings.exa_mcp_keepalive_seconds
+        self.connect_timeout = connect_timeout or settings.exa_mcp_connect_timeout_seconds
+        self.call_timeout = call_timeout or settings.exa_mcp_call_timeout_seconds
+        self._sessions: list[_PooledSession] = []
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._changed = asyncio.Condition()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stats = {
+            "calls": 0,
+            "call_failures": 0,
+            "retries": 0,
+            "connects": 0,
+            "connect_failures": 0,
+            "keepalive_failures": 0,
+        }
+
+    def usable(self) -> bool:
+        try:
+            return bool(self._sessions) and self._loop is asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+
+    async def start(self) -> None:
+        """Start the session tasks; they connect in the background, so startup never waits on Exa."""
+        self._loop = asyncio.get_running_loop()
+        self._sessions = [_PooledSession(self, i) for i in range(self.size)]
+        for pooled in self._sessions:
+            pooled.start()
+
+    async def close(self) -> None:
+        sessions, self._sessions = self._sessions, []
+        await asyncio.gather(*(pooled.stop() for pooled in sessions))
+
+    async def _notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def _ready_session(self, exclude: _PooledSession | None = None) -> _PooledSession:
+        def pick() -> _PooledSession | None:
+            ready = [s for s in self._sessions if s.ready and s is not exclude]
+            if not ready and exclude is not None and exclude.ready:
+                ready = [exclude]
+            return min(ready, key=lambda s: s.in_flight) if ready else None
+
+        pooled = pick()
+        if pooled is not None:
+            return pooled
+        for waiting in self._sessions:
+            waiting.wake()
+        async with self._changed:
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait_for(lambda: pick() is not None), self.connect_timeout
+                )
+            except asyncio.TimeoutError:
+                raise ConnectionError(f"No Exa MCP session available at {self.url}") from None
+        return pick()
+
+    async def call_tool(self, name: str, arguments: dict[str, Any]) -> list[dict[str, Any]]:
+        """Call an MCP tool on the least busy open session. Returns its content blocks."""
+        async with self._semaphore:
+            self._stats["calls"] += 1
+            failed: _PooledSession | None = None
+            for attempt in range(2):
+                pooled = await self._ready_session(exclude=failed)
+                pooled.in_flight += 1
+                try:
+                    result = await pooled.call_tool(name, arguments)
+                except McpError:
+                    raise
+                except Exception as exc:
+                    # Transport failure: reconnect that session and retry once on another
+                    self._stats["call_failures"] += 1
+                    pooled.mark_broken()
+                    if attempt:
+                        raise
+                    log.info("Exa MCP call failed on session %d (%s) — retrying", pooled.index, exc)
+                    self._stats["retries"] += 1
+                    failed = pooled
+                    continue
+                finally:
+                    pooled.in_flight -= 1
+                blocks = _content_blocks(result)
+                if result.isError:
+                    raise ExaToolError(" ".join(block.get("text", "") for block in blocks) or name)
+                return blocks
+        raise AssertionError("unreachable")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self._stats,
+            "sessions": len(self._sessions),
+            "ready_sessions": sum(1 for s in self._sessions if s.ready),
+            "in_flight": sum(s.in_flight for s in self._sessions),
+            "max_concurrency": self.max_concurrency,
+        }
+
+
+_pool: ExaMcpPool | None = None
+
+
+def get_exa_pool() -> ExaMcpPool | None:
+    """The lifespan's pool in the running event loop, if any."""
+    return _pool if _pool is not None and _pool.usable() else None
+
+
+@asynccontextmanager
+async def exa_mcp_pool(**kwargs: Any) -> AsyncIterator[ExaMcpPool]:
+    """Open the shared Exa MCP pool for the duration of the block (FastAPI lifespan, batch scripts)."""
+    global _pool
+    pool = ExaMcpPool(**kwargs)
+    await pool.start()
+    previous, _pool = _pool, pool
+    try:
+        yield pool
+    finally:
+        _pool = previous
+        await pool.close()
+
+
+async def call_exa_tool(name: str, arguments: dict[str, Any]) -> list[dict[str, Any]]:
+    """Call an Exa MCP tool: on the shared pool when open, else on a one-off session."""
+    pool = get_exa_pool()
+    if pool is not None:
+        return await pool.call_tool(name, arguments)
+    one_off = ExaMcpPool(size=1)
+    await one_off.start()
+    try:
+        return await one_off.call_tool(name, arguments)
+    finally:
+        await one_off.close()
+
+
+def get_exa_pool_stats() -> dict[str, Any] | None:
+    return _pool.stats() if _pool is not None else None
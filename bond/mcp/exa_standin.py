@@ -0,0 +1,131 @@
+"""Local stand-in for the Exa MCP server.
+
+Serves a ``web_search_exa`` tool over streamable HTTP with canned results in
+Exa's text format and configurable latency. It counts session handshakes and
+tool calls (and the peak number running at once), so the session pool's latency and reconnect behaviour can be
+checked offline:
+
+    python -m bond.mcp.exa_standin --port 8765 --latency-ms 300
+    EXA_MCP_URL=http://127.0.0.1:8765/mcp uv run uvicorn bond.api.main:app
+"""
+
+import argparse
+import asyncio
+import re
+import socket
+import threading
+import time
+
+import uvicorn
+from mcp.server.fastmcp import FastMCP
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "wynik"
+
+
+def build_standin(latency_ms: float = 0.0, counters: dict[str, int] | None = None) -> FastMCP:
+    counters = counters if counters is not None else {}
+    mcp = FastMCP("exa-standin")
+
+    @mcp.tool()
+    async def web_search_exa(query: str, numResults: int = 8) -> str:
+        """Canned Exa-style search results for ``query``."""
+        counters["calls"] = counters.get("calls", 0) + 1
+        counters["active"] = counters.get("active", 0) + 1
+        counters["max_active"] = max(counters.get("max_active", 0), counters["active"])
+        try:
+            if latency_ms:
+                await asyncio.sleep(latency_ms / 1000)
+        finally:
+            counters["active"] -= 1
+        slug = _slug(query)
+        return "\n\n".join(
+            f"Title: {query} — wynik {i}\n"
+            f"URL: https://example.com/{slug}/{i}\n"
+            "Published: N/A\n"
+            "Author: N/A\n"
+            "Highlights:\n"
+            f"Przykładowy opis wyniku {i} dla zapytania {query}."
+            for i in range(1, numResults + 1)
+        )
+
+    return mcp
+
+
+class _HandshakeCounter:
+    """ASGI wrapper counting requests that open a new MCP session (no mcp-session-id yet)."""
+
+    def __init__(self, app, counters: dict[str, int]) -> None:
+        self.app = app
+        self.counters = counters
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "POST":
+            headers = dict(scope["headers"])
+            if b"mcp-session-id" not in headers:
+                self.counters["handshakes"] = self.counters.get("handshakes", 0) + 1
+        await self.app(scope, receive, send)
+
+
+class StandinServer:
+    """Runs the stand-in on a background thread; ``stop()``/``start()`` simulate an outage."""
+
+    def __init__(self, port: int = 0, latency_ms: float = 0.0) -> None:
+        self.port = port or self._free_port()
+        self.latency_ms = latency_ms
+        self.counters: dict[str, int] = {"calls": 0, "handshakes": 0, "active": 0, "max_active": 0}
+        self._server: uvicorn.Server | None = None
+        self._thread: threading.Thread | None = None
+
+    @staticmethod
+    def _free_port() -> int:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/mcp"
+
+    def start(self) -> "StandinServer":
+        app = _HandshakeCounter(
+            build_standin(self.latency_ms, self.counters).streamable_http_app(), self.counters
+        )
+        config = uvicorn.Config(
+            app,
+            host="127.0.0.1",
+            port=self.port,
+            log_level="warning",
+            lifespan="on",
+            # open SSE streams would otherwise hold a simulated outage open
+            timeout_graceful_shutdown=0.5,
+        )
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, name="exa-standin", daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Exa stand-in server did not start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.should_exit = True
+            self._thread.join(timeout=10)
+            self._server = None
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in for the Exa MCP server.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every search.")
+    args = parser.parse_args(argv)
+    mcp = build_standin(args.latency_ms)
+    uvicorn.run(mcp.streamable_http_app(), host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
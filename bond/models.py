@@ -29,12 +29,14 @@ class IngestUrlRequest(BaseModel):
 class IngestDriveRequest(BaseModel):
     folder_id: str
     source_type: SourceType
+    full_resync: bool = False
 
 
 class BatchIngestResult(BaseModel):
     articles_ingested: int
     total_chunks: int
     source_type: str
+    articles_unchanged: int = 0
     warnings: list[str] = []
 
 
@@ -49,5 +51,26 @@ class DriveIngestResult(BaseModel):
     articles_ingested: int
     total_chunks: int
     source_type: str
+    articles_unchanged: int = 0
+    articles_deleted: int = 0
     files: list[DriveFileInfo] = []
     warnings: list[str] = []
+
+
+class IngestJobProgress(BaseModel):
+    articles_done: int = 0
+    chunks_added: int = 0
+    articles_unchanged: int = 0
+    warnings: list[str] = []
+
+
+class IngestJob(BaseModel):
+    """Background ingest job (bond/corpus/jobs.py) as returned by /api/corpus/jobs."""
+    job_id: str
+    kind: str
+    status: str
+    progress: IngestJobProgress
+    result: dict | None = None
+    error: str | None = None
+    created_at: str
+    updated_at: str
@@ -1,8 +1,23 @@
 from __future__ import annotations
 
+import hashlib
+import logging
+import math
+import threading
+from collections import OrderedDict
+from bisect import bisect_right
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate
 from typing import Any, Callable, Mapping, Sequence
 
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+log = logging.getLogger(__name__)
+
 DEFAULT_MAX_INPUT_TOKENS = 8192
 DEFAULT_SAFETY_MARGIN_TOKENS = 400
 RESEARCH_CONTEXT_OMISSION_MARKER = (
@@ -10,6 +25,16 @@ RESEARCH_CONTEXT_OMISSION_MARKER = (
     "Fakty i statystyki zachowano w całości.]"
 )
 
+# Local tokenizer: o200k_base for unknown OpenAI models; Claude counts are
+# approximated with cl100k_base and scaled up to stay on the safe side
+_DEFAULT_ENCODING = "o200k_base"
+_LOCAL_TOKEN_RATIO = 1.2
+# Memoized counts of source lines and static prompt parts, keyed by digest so
+# the cache never keeps the (often multi-KB) texts alive
+_TOKEN_COUNT_CACHE_SIZE = 4096
+_token_counts: OrderedDict[tuple[Any, bytes], int] = OrderedDict()
+_token_counts_lock = threading.Lock()
+
 PromptPayload = str | Sequence[Any]
 PromptPayloadBuilder = Callable[[str], PromptPayload]
 
@@ -34,58 +59,69 @@ class ResearchContextSelection:
     estimated_prompt_tokens: int
     available_input_tokens: int
     fit_found: bool
+    variant_index: int = 0
 
 
 def iter_research_context_variants(
     research_report: str,
     research_data: Mapping[str, Any] | Any | None,
 ) -> tuple[ResearchContextVariant, ...]:
-    report = research_report.strip()
-    sources = _normalize_sources(_lookup(research_data, "zrodla", []))
-
-    variants: list[ResearchContextVariant] = []
-    seen_contents: set[str] = set()
-
-    if report:
-        variants.append(
-            ResearchContextVariant(
-                kind="full_report",
-                content=report,
-                source_count=len(sources),
+    """Render every variant, richest first. select_research_context renders only the ones it probes."""
+    context = ResearchContextFitter(research_report, research_data)
+    return tuple(context.variant(index) for index in range(context.variant_count))
+
+
+class ResearchContextFitter:
+    """Research context variants for one (report, research_data), rendered on demand.
+
+    Variant order (the ``variant_index`` of a selection): the full report when
+    present, then the structured context with all sources down to none. Facts
+    and statistics are kept in every structured variant.
+    """
+
+    def __init__(
+        self,
+        research_report: str,
+        research_data: Mapping[str, Any] | Any | None,
+    ) -> None:
+        self.report = research_report.strip()
+        self.research_data = research_data
+        self.sources = _normalize_sources(_lookup(research_data, "zrodla", []))
+        self.structured_offset = 1 if self.report else 0
+        self.has_structured = bool(render_structured_research_context(research_data, max_sources=0))
+        structured_count = len(self.sources) + 1 if self.has_structured else 0
+        self.variant_count = max(self.structured_offset + structured_count, 1)
+
+    def source_count(self, index: int) -> int:
+        if index < self.structured_offset:
+            return len(self.sources)
+        return len(self.sources) - (index - self.structured_offset)
+
+    def index_for_source_count(self, source_count: int) -> int:
+        return self.structured_offset + len(self.sources) - source_count
+
+    def source_lines(self) -> list[str]:
+        return [_render_source_line(index, source) for index, source in enumerate(self.sources, start=1)]
+
+    def variant(self, index: int) -> ResearchContextVariant:
+        if not self.report and not self.has_structured:
+            return ResearchContextVariant(kind="empty", content="", source_count=0)
+        if index < self.structured_offset:
+            return ResearchContextVariant(
+                kind="full_report", content=self.report, source_count=len(self.sources)
             )
-        )
-        seen_contents.add(report)
-
-    total_sources = len(sources)
-    for source_limit in range(total_sources, -1, -1):
-        kind = (
-            "structured_all_sources"
-            if source_limit == total_sources
-            else "structured_reduced_sources"
-        )
+        source_limit = self.source_count(index)
         if source_limit == 0:
             kind = "structured_core_only"
-
-        content = render_structured_research_context(
-            research_data,
-            max_sources=source_limit,
-        )
-        if not content or content in seen_contents:
-            continue
-
-        variants.append(
-            ResearchContextVariant(
-                kind=kind,
-                content=content,
-                source_count=source_limit,
-            )
+        elif source_limit == len(self.sources):
+            kind = "structured_all_sources"
+        else:
+            kind = "structured_reduced_sources"
+        return ResearchContextVariant(
+            kind=kind,
+            content=render_structured_research_context(self.research_data, max_sources=source_limit),
+            source_count=source_limit,
         )
-        seen_contents.add(content)
-
-    if variants:
-        return tuple(variants)
-
-    return (ResearchContextVariant(kind="empty", content="", source_count=0),)
 
 
 def render_structured_research_context(
@@ -110,8 +146,7 @@ def render_structured_research_context(
         sections.append("### Statystyki\n" + "\n".join(f"- {stat}" for stat in stats))
 
     source_lines = [
-        f"{index}. {source.title} | {source.url} | {source.summary}"
-        for index, source in enumerate(kept_sources, start=1)
+        _render_source_line(index, source) for index, source in enumerate(kept_sources, start=1)
     ]
     if omitted_sources:
         source_lines.append(
@@ -133,33 +168,120 @@ def select_research_context(
     build_prompt_payload: PromptPayloadBuilder,
     reserved_output_tokens: int | None = None,
     safety_margin_tokens: int = DEFAULT_SAFETY_MARGIN_TOKENS,
+    first_variant_index: int = 0,
 ) -> ResearchContextSelection:
-    variants = iter_research_context_variants(research_report, research_data)
+    """Pick the richest research context variant whose prompt fits the model's input budget.
+
+    Prompt size only grows with the number of sources, so the structured
+    variants are searched (exponential + binary search) instead of counted
+    one by one. With a local tokenizer the search starts from an estimate:
+    the core-only prompt plus prefix sums of the per-source token counts, each
+    source tokenized once and memoized per encoding. Every decision is still
+    made on an exact count of the rendered prompt.
+    """
+    context = ResearchContextFitter(research_report, research_data)
     available_input_tokens = get_available_input_tokens(
         llm,
         reserved_output_tokens=reserved_output_tokens,
         safety_margin_tokens=safety_margin_tokens,
     )
+    count_tokens = prompt_token_counter(llm)
+    counts: dict[int, int] = {}
+
+    def count(index: int) -> int:
+        if index not in counts:
+            counts[index] = count_tokens(build_prompt_payload(context.variant(index).content))
+        return counts[index]
+
+    def fits(index: int) -> bool:
+        return count(index) <= available_input_tokens
+
+    last_index = context.variant_count - 1
+    # first_variant_index skips variants already known not to fit, e.g. when a
+    # selection made for a smaller prompt is re-checked after the prompt grew.
+    start = min(max(first_variant_index, 0), last_index)
+    selected_index: int | None = None
+    if start < context.structured_offset and fits(start):
+        selected_index = start
+    elif context.has_structured:
+        low = max(start, context.structured_offset)
+        selected_index = _first_fitting(
+            low, last_index, fits, _estimate_first_fitting(context, llm, low, count, available_input_tokens)
+        )
 
-    selected_variant = variants[-1]
-    selected_tokens = 0
-    fit_found = False
-
-    for variant in variants:
-        prompt_payload = build_prompt_payload(variant.content)
-        token_count = count_prompt_tokens(llm, prompt_payload)
-        selected_variant = variant
-        selected_tokens = token_count
-        if token_count <= available_input_tokens:
-            fit_found = True
-            break
-
+    fit_found = selected_index is not None
+    if selected_index is None:
+        selected_index = last_index
     return ResearchContextSelection(
-        variant=selected_variant,
-        estimated_prompt_tokens=selected_tokens,
+        variant=context.variant(selected_index),
+        estimated_prompt_tokens=count(selected_index),
         available_input_tokens=available_input_tokens,
         fit_found=fit_found,
+        variant_index=selected_index,
+    )
+
+
+def _estimate_first_fitting(
+    context: ResearchContextFitter,
+    llm: Any,
+    low: int,
+    count: Callable[[int], int],
+    available_input_tokens: int,
+) -> int | None:
+    """Index where the search starts: core-only prompt + prefix sums of source tokens, or None."""
+    encoding = _local_encoding(llm)
+    if encoding is None or not context.sources:
+        return None
+    core_index = context.index_for_source_count(0)
+    budget = available_input_tokens - count(core_index)
+    if budget < 0:
+        return core_index
+    prefix_sums = list(
+        accumulate(_count_part_tokens(encoding, line) + 1 for line in context.source_lines())
     )
+    source_count = bisect_right(prefix_sums, budget)
+    return max(context.index_for_source_count(source_count), low)
+
+
+def _first_fitting(
+    low: int,
+    high: int,
+    fits: Callable[[int], bool],
+    guess: int | None = None,
+) -> int | None:
+    """Smallest index in [low, high] that fits, given that fitting is monotone in the index.
+
+    Gallops away from ``guess`` (default: the midpoint) in doubling steps, then
+    bisects the bracket, so a good guess costs two or three probes.
+    """
+    if low > high:
+        return None
+    probe = (low + high) // 2 if guess is None else min(max(guess, low), high)
+    if fits(probe):
+        fitting, step = probe, 1
+        while fitting - step >= low and fits(fitting - step):
+            fitting -= step
+            step *= 2
+        not_fitting = max(fitting - step, low - 1)
+    else:
+        not_fitting, step = probe, 1
+        while not_fitting + step <= high and not fits(not_fitting + step):
+            not_fitting += step
+            step *= 2
+        if not_fitting + step > high:
+            if not_fitting == high or not fits(high):
+                return None
+            fitting = high
+        else:
+            fitting = not_fitting + step
+    # Invariant: not_fitting does not fit (or is below low), fitting fits
+    while fitting - not_fitting > 1:
+        middle = (fitting + not_fitting) // 2
+        if fits(middle):
+            fitting = middle
+        else:
+            not_fitting = middle
+    return fitting
 
 
 def get_available_input_tokens(
@@ -189,6 +311,15 @@ def get_model_max_input_tokens(llm: Any) -> int:
     return DEFAULT_MAX_INPUT_TOKENS
 
 
+def prompt_token_counter(llm: Any) -> Callable[[PromptPayload], int]:
+    """Token counter for ``llm``'s prompts: the local tokenizer when available, else the model's own."""
+    encoding = _local_encoding(llm)
+    if encoding is None:
+        return lambda prompt_payload: count_prompt_tokens(llm, prompt_payload)
+    ratio = _LOCAL_TOKEN_RATIO if _is_anthropic_model(_model_name(llm)) else 1.0
+    return lambda prompt_payload: math.ceil(_count_payload_tokens(encoding, prompt_payload) * ratio)
+
+
 def count_prompt_tokens(llm: Any, prompt_payload: PromptPayload) -> int:
     if isinstance(prompt_payload, str):
         if hasattr(llm, "get_num_tokens"):
@@ -213,6 +344,84 @@ def count_prompt_tokens(llm: Any, prompt_payload: PromptPayload) -> int:
     return _approximate_token_count(prompt_text)
 
 
+def _model_name(llm: Any) -> str | None:
+    for candidate in _iter_model_candidates(llm):
+        name = getattr(candidate, "model_name", None) or getattr(candidate, "model", None)
+        if isinstance(name, str) and name:
+            return name
+    return None
+
+
+def _is_anthropic_model(model_name: str | None) -> bool:
+    return bool(model_name) and "claude" in model_name.lower()
+
+
+def _local_encoding(llm: Any) -> Any | None:
+    """tiktoken encoding for the (primary) model; Claude models use cl100k_base scaled by _LOCAL_TOKEN_RATIO."""
+    model_name = _model_name(llm)
+    if model_name is None:
+        return None
+    if _is_anthropic_model(model_name):
+        return _load_encoding("cl100k_base")
+    return _load_encoding(_encoding_name_for_model(model_name))
+
+
+def _encoding_name_for_model(model_name: str) -> str:
+    if tiktoken is None:
+        return _DEFAULT_ENCODING
+    try:
+        return tiktoken.encoding_for_model(model_name).name
+    except KeyError:
+        return _DEFAULT_ENCODING
+
+
+@lru_cache(maxsize=None)
+def _load_encoding(encoding_name: str) -> Any | None:
+    """Load once per process; None (model-side counting) if tiktoken or its BPE file is unavailable."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as exc:
+        log.warning("Local tokenizer %s unavailable (%s) — counting tokens via the model", encoding_name, exc)
+        return None
+
+
+def _count_text_tokens(encoding: Any, text: str) -> int:
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _count_part_tokens(encoding: Any, text: str) -> int:
+    """_count_text_tokens for text that repeats across probes (a source line, a system prompt), memoized."""
+    key = (getattr(encoding, "name", id(encoding)), hashlib.blake2b(text.encode(), digest_size=16).digest())
+    with _token_counts_lock:
+        count = _token_counts.get(key)
+        if count is not None:
+            _token_counts.move_to_end(key)
+            return count
+    count = _count_text_tokens(encoding, text)
+    with _token_counts_lock:
+        _token_counts[key] = count
+        if len(_token_counts) > _TOKEN_COUNT_CACHE_SIZE:
+            _token_counts.popitem(last=False)
+    return count
+
+
+def _count_payload_tokens(encoding: Any, prompt_payload: PromptPayload) -> int:
+    """Exact count of an assembled prompt; only its system messages go through the memo."""
+    if isinstance(prompt_payload, str):
+        return _count_text_tokens(encoding, prompt_payload)
+    # Chat formatting overhead per message and per reply, as in OpenAI's counting guide
+    total = 3
+    for message in prompt_payload:
+        content = str(getattr(message, "content", message))
+        if getattr(message, "type", None) == "system":
+            total += 4 + _count_part_tokens(encoding, content)
+        else:
+            total += 4 + _count_text_tokens(encoding, content)
+    return total
+
+
 def _iter_model_candidates(llm: Any) -> list[Any]:
     candidates = [llm]
     runnable = getattr(llm, "runnable", None)
@@ -267,6 +476,10 @@ def _normalize_sources(value: Any) -> tuple[ResearchSource, ...]:
     return tuple(normalized)
 
 
+def _render_source_line(index: int, source: ResearchSource) -> str:
+    return f"{index}. {source.title} | {source.url} | {source.summary}"
+
+
 def _stringify_prompt_payload(prompt_payload: Sequence[Any]) -> str:
     parts: list[str] = []
     for message in prompt_payload:
@@ -0,0 +1,66 @@
+"""
+In-process single-flight: concurrent callers with the same key share one call.
+
+The first caller for a key (the leader) runs the coroutine. Callers that arrive
+while it is in flight (followers) await the leader's result instead of repeating
+the work. A leader's exception is re-raised in every follower. If the leader is
+cancelled, one of its followers takes over. Keys are forgotten as soon as the
+call finishes, so this is coalescing, not caching.
+
+Used by the researcher node to coalesce identical research requests (see
+bond/graph/nodes/researcher.py); cross-process coalescing uses the SQLite
+lease in bond/db/search_cache.py.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self._stats = {"leaders": 0, "followers": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Run ``fn()`` once per in-flight ``key``. Returns (result, shared), shared=True for followers."""
+        loop = asyncio.get_running_loop()
+        while True:
+            future = self._calls.get(key)
+            # Futures from another event loop (e.g. a finished CLI run) cannot be awaited here
+            if future is None or future.done() or future.get_loop() is not loop:
+                break
+            self._stats["followers"] += 1
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    continue  # the leader was cancelled, not us: take over
+                raise
+
+        future = loop.create_future()
+        self._calls[key] = future
+        self._stats["leaders"] += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved: having no followers is not an error
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> dict[str, int]:
+        return {**self._stats, "in_flight": self.in_flight()}
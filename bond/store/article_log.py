@@ -1,5 +1,6 @@
 import os
 import sqlite3
+import threading
 from datetime import datetime, timezone
 from bond.config import settings
 
@@ -10,54 +11,231 @@ CREATE TABLE IF NOT EXISTS corpus_articles (
     title TEXT,
     source_url TEXT DEFAULT '',
     chunk_count INTEGER DEFAULT 0,
-    ingested_at TEXT
+    ingested_at TEXT,
+    content_hash TEXT DEFAULT ''
 )
 """
 
-def _get_conn() -> sqlite3.Connection:
-    os.makedirs(os.path.dirname(os.path.abspath(settings.article_db_path)), exist_ok=True)
-    conn = sqlite3.connect(settings.article_db_path)
-    conn.execute(CREATE_TABLE)
-    conn.commit()
-    return conn
-
-def log_article(article_id: str, source_type: str, title: str, source_url: str, chunk_count: int) -> None:
-    conn = _get_conn()
-    conn.execute(
-        "INSERT OR REPLACE INTO corpus_articles (article_id, source_type, title, source_url, chunk_count, ingested_at) VALUES (?, ?, ?, ?, ?, ?)",
-        (article_id, source_type, title, source_url, chunk_count, datetime.now(timezone.utc).isoformat()),
+CREATE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_corpus_articles_source_url ON corpus_articles(source_url)",
+    "CREATE INDEX IF NOT EXISTS idx_corpus_articles_content_hash ON corpus_articles(content_hash)",
+)
+
+CREATE_STATS = (
+    # Single-row aggregate kept in sync by triggers, so counts never scan the table
+    """
+    CREATE TABLE IF NOT EXISTS corpus_stats (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        article_count INTEGER NOT NULL DEFAULT 0,
+        chunk_count INTEGER NOT NULL DEFAULT 0
     )
-    conn.commit()
-    conn.close()
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS corpus_stats_insert AFTER INSERT ON corpus_articles BEGIN
+        UPDATE corpus_stats
+        SET article_count = article_count + 1,
+            chunk_count = chunk_count + COALESCE(NEW.chunk_count, 0)
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS corpus_stats_delete AFTER DELETE ON corpus_articles BEGIN
+        UPDATE corpus_stats
+        SET article_count = article_count - 1,
+            chunk_count = chunk_count - COALESCE(OLD.chunk_count, 0)
+        WHERE id = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS corpus_stats_update AFTER UPDATE OF chunk_count ON corpus_articles BEGIN
+        UPDATE corpus_stats
+        SET chunk_count = chunk_count - COALESCE(OLD.chunk_count, 0) + COALESCE(NEW.chunk_count, 0)
+        WHERE id = 1;
+    END
+    """,
+)
 
-def get_article_count() -> int:
-    conn = _get_conn()
-    count = conn.execute("SELECT COUNT(*) FROM corpus_articles").fetchone()[0]
-    conn.close()
-    return count
+# Upsert rather than INSERT OR REPLACE: REPLACE's implicit delete skips delete triggers
+UPSERT_ARTICLE = (
+    "INSERT INTO corpus_articles "
+    "(article_id, source_type, title, source_url, chunk_count, content_hash, ingested_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(article_id) DO UPDATE SET "
+    "source_type = excluded.source_type, title = excluded.title, source_url = excluded.source_url, "
+    "chunk_count = excluded.chunk_count, content_hash = excluded.content_hash, "
+    "ingested_at = excluded.ingested_at"
+)
 
-def get_chunk_count() -> int:
-    conn = _get_conn()
-    count = conn.execute("SELECT SUM(chunk_count) FROM corpus_articles").fetchone()[0] or 0
-    conn.close()
-    return count
+SELECT_ARTICLES = (
+    "SELECT article_id, title, source_type, source_url, chunk_count, ingested_at "
+    "FROM corpus_articles ORDER BY ingested_at DESC"
+)
 
 
-def get_articles() -> list[dict]:
-    conn = _get_conn()
-    rows = conn.execute(
-        "SELECT article_id, title, source_type, source_url, chunk_count, ingested_at "
-        "FROM corpus_articles ORDER BY ingested_at DESC"
-    ).fetchall()
-    conn.close()
+class _ArticleDb:
+    """
+    One shared connection per database file, guarded by a lock so it can be
+    used from the API's worker threads. The schema, indexes and stats triggers
+    are created once when the connection opens; WAL keeps readers off the
+    writer's back.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        with self.conn:
+            self._create_schema()
+
+    def _create_schema(self) -> None:
+        conn = self.conn
+        conn.execute(CREATE_TABLE)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(corpus_articles)")}
+        if "content_hash" not in columns:
+            # Migration: rows ingested before content hashing get '' and are re-hashed on next import
+            conn.execute("ALTER TABLE corpus_articles ADD COLUMN content_hash TEXT DEFAULT ''")
+        for statement in CREATE_INDEXES:
+            conn.execute(statement)
+        for statement in CREATE_STATS:
+            conn.execute(statement)
+        # Backfill the stats row for databases created before it existed
+        conn.execute(
+            "INSERT OR IGNORE INTO corpus_stats (id, article_count, chunk_count) "
+            "SELECT 1, COUNT(*), COALESCE(SUM(chunk_count), 0) FROM corpus_articles"
+        )
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+
+_db: _ArticleDb | None = None
+_db_lock = threading.Lock()
+
+
+def _get_db() -> _ArticleDb:
+    global _db
+    path = os.path.abspath(settings.article_db_path)
+    db = _db
+    if db is not None and db.path == path:
+        return db
+    with _db_lock:
+        if _db is None or _db.path != path:
+            if _db is not None:
+                _db.close()
+            _db = _ArticleDb(path)
+        return _db
+
+
+def close_article_db() -> None:
+    """Close the shared connection (API shutdown); the next call reopens it."""
+    global _db
+    with _db_lock:
+        if _db is not None:
+            _db.close()
+            _db = None
+
+def log_article(
+    article_id: str,
+    source_type: str,
+    title: str,
+    source_url: str,
+    chunk_count: int,
+    content_hash: str = "",
+) -> None:
+    log_articles([(article_id, source_type, title, source_url, chunk_count, content_hash)])
+
+def log_articles(rows: list[tuple[str, str, str, str, int, str]]) -> None:
+    """Log many (article_id, source_type, title, source_url, chunk_count, content_hash) rows in one transaction."""
+    if not rows:
+        return
+    now = datetime.now(timezone.utc).isoformat()
+    db = _get_db()
+    with db.lock, db.conn:
+        db.conn.executemany(UPSERT_ARTICLE, [(*row, now) for row in rows])
+
+def find_articles(source_urls: list[str], content_hashes: list[str]) -> list[dict]:
+    """
+    Return logged articles whose source_url or content_hash matches, newest first.
+    Used by the ingestor to recognise re-imports.
+    """
+    source_urls = [url for url in source_urls if url]
+    content_hashes = [value for value in content_hashes if value]
+    if not source_urls and not content_hashes:
+        return []
+    url_marks = ", ".join("?" * len(source_urls)) or "NULL"
+    hash_marks = ", ".join("?" * len(content_hashes)) or "NULL"
+    db = _get_db()
+    with db.lock:
+        rows = db.conn.execute(
+            "SELECT article_id, source_url, content_hash FROM corpus_articles "
+            f"WHERE source_url IN ({url_marks}) OR content_hash IN ({hash_marks}) "
+            "ORDER BY ingested_at DESC",
+            [*source_urls, *content_hashes],
+        ).fetchall()
     return [
-        {
-            "article_id": row[0],
-            "title": row[1] or row[0],
-            "source_type": row[2],
-            "source_url": row[3] or "",
-            "chunk_count": row[4] or 0,
-            "ingested_at": row[5],
-        }
+        {"article_id": row[0], "source_url": row[1] or "", "content_hash": row[2] or ""}
         for row in rows
     ]
+
+def delete_articles(article_ids: list[str]) -> None:
+    if not article_ids:
+        return
+    db = _get_db()
+    with db.lock, db.conn:
+        db.conn.execute(
+            f"DELETE FROM corpus_articles WHERE article_id IN ({', '.join('?' * len(article_ids))})",
+            article_ids,
+        )
+
+def get_corpus_stats() -> dict[str, int]:
+    """Article and chunk totals from the trigger-maintained stats row (no table scan)."""
+    db = _get_db()
+    with db.lock:
+        row = db.conn.execute(
+            "SELECT article_count, chunk_count FROM corpus_stats WHERE id = 1"
+        ).fetchone()
+    return {"article_count": row[0], "chunk_count": row[1]}
+
+def get_article_count() -> int:
+    return get_corpus_stats()["article_count"]
+
+def get_chunk_count() -> int:
+    return get_corpus_stats()["chunk_count"]
+
+
+def _article_dict(row: tuple) -> dict:
+    return {
+        "article_id": row[0],
+        "title": row[1] or row[0],
+        "source_type": row[2],
+        "source_url": row[3] or "",
+        "chunk_count": row[4] or 0,
+        "ingested_at": row[5],
+    }
+
+
+def get_articles() -> list[dict]:
+    db = _get_db()
+    with db.lock:
+        rows = db.conn.execute(SELECT_ARTICLES).fetchall()
+    return [_article_dict(row) for row in rows]
+
+
+def get_corpus_snapshot() -> dict:
+    """Stats and the article list read together under one lock, for /api/corpus/status."""
+    db = _get_db()
+    with db.lock:
+        stats = db.conn.execute(
+            "SELECT article_count, chunk_count FROM corpus_stats WHERE id = 1"
+        ).fetchone()
+        rows = db.conn.execute(SELECT_ARTICLES).fetchall()
+    return {
+        "article_count": stats[0],
+        "chunk_count": stats[1],
+        "documents": [_article_dict(row) for row in rows],
+    }
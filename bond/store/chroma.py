@@ -1,9 +1,9 @@
 from typing import Any
 
 import chromadb
-from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
 
 from bond.config import settings
+from bond.store.embeddings import get_embedding_function
 
 _client: Any = None
 _collection: Any = None
@@ -28,10 +28,7 @@ def get_or_create_corpus_collection():
     global _collection
     if _collection is None:
         client = get_chroma_client()
-        ef = SentenceTransformerEmbeddingFunction(
-            model_name="paraphrase-multilingual-MiniLM-L12-v2",
-            device="cpu",
-        )
+        ef = get_embedding_function()
         _collection = client.get_or_create_collection(
             name="bond_style_corpus_v1",
             embedding_function=ef,
@@ -53,10 +50,7 @@ def get_or_create_metadata_collection():
     global _metadata_collection
     if _metadata_collection is None:
         client = get_chroma_client()
-        ef = SentenceTransformerEmbeddingFunction(
-            model_name="paraphrase-multilingual-MiniLM-L12-v2",
-            device="cpu",
-        )
+        ef = get_embedding_function()
         _metadata_collection = client.get_or_create_collection(
             name="bond_metadata_log_v1",
             embedding_function=ef,
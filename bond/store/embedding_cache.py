@@ -0,0 +1,244 @@
+"""Process-wide cache of text embeddings shared by every Chroma collection.
+
+The same topic string is embedded by duplicate_check, the writer's exemplar
+queries, two_pass_retrieve and save_metadata within one run. Wrapping the
+collection embedding function with CachedEmbeddingFunction makes all of those
+callers share one vector per (model identity, normalized text). The identity
+includes the backend and ONNX file, since their vectors differ from torch's.
+
+Two tiers: an in-memory LRU bounded by ``settings.embedding_cache_size`` and an
+optional SQLite file (``settings.embedding_cache_path``) that survives restarts.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings, Space
+from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
+
+from bond.config import settings
+
+log = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_DISK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    cache_key TEXT PRIMARY KEY,
+    model_name TEXT NOT NULL,
+    dim INTEGER NOT NULL,
+    vector BLOB NOT NULL
+)
+"""
+
+
+def normalize_text(text: str) -> str:
+    """Cache-key normalization: NFC, collapsed whitespace. Case is preserved (the model is cased)."""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def embedding_identity(model_name: str, backend: str = "torch", onnx_file: str = "") -> str:
+    """Cache identity of an embedding function: model, backend and quantized export."""
+    return f"{model_name}|{backend}|{onnx_file}"
+
+
+def _cache_key(model_name: str, text: str) -> str:
+    return hashlib.sha256(f"{model_name}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Thread-safe two-tier (LRU memory + optional SQLite) embedding store."""
+
+    def __init__(self, max_entries: int, disk_path: str = "") -> None:
+        self._max_entries = max(0, max_entries)
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk: sqlite3.Connection | None = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if disk_path:
+            self._open_disk(disk_path)
+
+    def _open_disk(self, path: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_DISK_SCHEMA)
+            conn.commit()
+            self._disk = conn
+        except sqlite3.Error as e:
+            log.warning("Embedding disk cache unavailable at %s (%s) — memory only", path, e)
+
+    def get(self, key: str) -> np.ndarray | None:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vector
+            if self._disk is not None:
+                row = self._disk.execute(
+                    "SELECT dim, vector FROM embedding_cache WHERE cache_key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    vector = np.frombuffer(row[1], dtype=np.float32).reshape(row[0])
+                    self._remember(key, vector)
+                    self.disk_hits += 1
+                    return vector
+            self.misses += 1
+            return None
+
+    def peek(self, key: str) -> np.ndarray | None:
+        """Memory-tier lookup that does not touch counters, LRU order or disk."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: str, model_name: str, vector: Any) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        array.setflags(write=False)
+        with self._lock:
+            self._remember(key, array)
+            if self._disk is not None:
+                with self._disk:
+                    self._disk.execute(
+                        "INSERT OR REPLACE INTO embedding_cache (cache_key, model_name, dim, vector) "
+                        "VALUES (?, ?, ?, ?)",
+                        (key, model_name, array.shape[0], array.tobytes()),
+                    )
+        return array
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        if self._max_entries == 0:
+            return
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+
+_cache: EmbeddingCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = EmbeddingCache(settings.embedding_cache_size, settings.embedding_cache_path)
+    return _cache
+
+
+def get_embedding_cache_stats() -> dict[str, int]:
+    return get_embedding_cache().stats()
+
+
+class CachedEmbeddingFunction(EmbeddingFunction[Documents]):
+    """
+    Caching wrapper around a SentenceTransformerEmbeddingFunction.
+
+    Queries (``embed_query``, used by ``collection.query(query_texts=...)``) are
+    read from and written to the cache. Documents (``__call__``, used by
+    add/upsert) are only looked up, so bulk ingestion does not flush the LRU
+    with corpus chunks but upserting an already-queried topic is free.
+
+    Reports the wrapped function's name and config, so collections persisted
+    with the plain sentence_transformer function open unchanged.
+
+    ``model_name`` is the identity used for cache keys and the stored
+    model_name column (see ``embedding_identity``); it defaults to the wrapped
+    function's model name.
+    """
+
+    def __init__(
+        self,
+        inner: EmbeddingFunction[Documents],
+        cache: EmbeddingCache | None = None,
+        *,
+        model_name: str | None = None,
+    ) -> None:
+        self._inner = inner
+        self._cache = cache
+        self.model_name = model_name or getattr(inner, "model_name", type(inner).__name__)
+
+    @property
+    def cache(self) -> EmbeddingCache:
+        return self._cache or get_embedding_cache()
+
+    def _embed(self, input: Documents, *, store: bool) -> Embeddings:
+        cache = self.cache
+        keys = [_cache_key(self.model_name, text) for text in input]
+        lookup = cache.get if store else cache.peek
+        vectors: list[np.ndarray | None] = [lookup(key) for key in keys]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            computed = self._inner([input[i] for i in missing])
+            for i, vector in zip(missing, computed):
+                if store:
+                    vectors[i] = cache.put(keys[i], self.model_name, vector)
+                else:
+                    vectors[i] = np.asarray(vector, dtype=np.float32)
+        return vectors
+
+    def __call__(self, input: Documents) -> Embeddings:
+        return self._embed(input, store=False)
+
+    def embed_query(self, input: Documents) -> Embeddings:
+        return self._embed(input, store=True)
+
+    @staticmethod
+    def name() -> str:
+        return SentenceTransformerEmbeddingFunction.name()
+
+    def default_space(self) -> Space:
+        return self._inner.default_space()
+
+    def supported_spaces(self) -> list[Space]:
+        return self._inner.supported_spaces()
+
+    @staticmethod
+    def build_from_config(config: dict[str, Any]) -> "CachedEmbeddingFunction":
+        kwargs = config.get("kwargs") or {}
+        return CachedEmbeddingFunction(
+            SentenceTransformerEmbeddingFunction.build_from_config(config),
+            model_name=embedding_identity(
+                config.get("model_name", ""),
+                kwargs.get("backend", "torch"),
+                (kwargs.get("model_kwargs") or {}).get("file_name", ""),
+            ),
+        )
+
+    def get_config(self) -> dict[str, Any]:
+        return self._inner.get_config()
+
+    def validate_config_update(self, old_config: dict[str, Any], new_config: dict[str, Any]) -> None:
+        self._inner.validate_config_update(old_config, new_config)
+
+    @staticmethod
+    def validate_config(config: dict[str, Any]) -> None:
+        SentenceTransformerEmbeddingFunction.validate_config(config)
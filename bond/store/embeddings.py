@@ -0,0 +1,118 @@
+"""Embedding-provider registry: one embedding function per (model, backend) per process.
+
+Both Chroma collections and the validation tools get their embedding function
+from here, so the MiniLM weights are loaded once and can be warmed up at API
+start instead of on the first request.
+
+Backends (``settings.embedding_backend``) are the ones sentence-transformers
+supports: "torch" (default), "onnx" and "openvino". With "onnx",
+``settings.embedding_onnx_file`` can select a quantized export such as
+"onnx/model_qint8_avx512_vnni.onnx". Quantized vectors differ slightly from
+the torch ones, so switch backends together with a corpus re-index.
+"""
+
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+from typing import Any
+
+from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
+
+from bond.config import settings
+from bond.store.embedding_cache import CachedEmbeddingFunction, embedding_identity
+
+log = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
+_WARM_UP_TEXT = "Rozgrzewka modelu embeddingów."
+
+_registry: dict[tuple[str, str, str], CachedEmbeddingFunction] = {}
+_load_seconds: dict[tuple[str, str, str], float] = {}
+_registry_lock = threading.Lock()
+
+
+def _backend_kwargs() -> dict[str, Any]:
+    backend = settings.embedding_backend
+    if backend == "torch":
+        return {}
+    kwargs: dict[str, Any] = {"backend": backend}
+    if settings.embedding_onnx_file:
+        kwargs["model_kwargs"] = {"file_name": settings.embedding_onnx_file}
+    return kwargs
+
+
+def get_embedding_function(model_name: str = EMBEDDING_MODEL) -> CachedEmbeddingFunction:
+    """Return the shared, cache-wrapped embedding function for ``model_name``."""
+    key = (model_name, settings.embedding_backend, settings.embedding_onnx_file)
+    ef = _registry.get(key)
+    if ef is not None:
+        return ef
+    with _registry_lock:
+        ef = _registry.get(key)
+        if ef is None:
+            started = time.perf_counter()
+            ef = CachedEmbeddingFunction(
+                SentenceTransformerEmbeddingFunction(
+                    model_name=model_name,
+                    device="cpu",
+                    **_backend_kwargs(),
+                ),
+                model_name=embedding_identity(*key),
+            )
+            _load_seconds[key] = time.perf_counter() - started
+            log.info(
+                "Loaded embedding model %s (%s backend) in %.2fs",
+                model_name,
+                settings.embedding_backend,
+                _load_seconds[key],
+            )
+            _registry[key] = ef
+    return ef
+
+
+def resident_memory_mb() -> float | None:
+    """Current RSS of this process in MiB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except (AttributeError, ValueError):
+        return None
+    # ru_maxrss is bytes on macOS, KiB elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def warm_up_embeddings(model_name: str = EMBEDDING_MODEL) -> dict[str, Any]:
+    """Load the model and run one inference so the first request does not pay for it."""
+    rss_before = resident_memory_mb()
+    ef = get_embedding_function(model_name)
+    started = time.perf_counter()
+    ef([_WARM_UP_TEXT])
+    report = get_embedding_report()
+    report["warm_up_seconds"] = round(time.perf_counter() - started, 3)
+    if rss_before is not None and report["rss_mb"] is not None:
+        report["rss_delta_mb"] = round(report["rss_mb"] - rss_before, 1)
+    log.info("Embedding warm-up finished: %s", report)
+    return report
+
+
+def get_embedding_report() -> dict[str, Any]:
+    """Loaded models, their load times and the process RSS."""
+    rss = resident_memory_mb()
+    return {
+        "backend": settings.embedding_backend,
+        "models": [
+            {"model": model, "backend": backend, "load_seconds": round(seconds, 3)}
+            for (model, backend, _), seconds in _load_seconds.items()
+        ],
+        "pid": os.getpid(),
+        "rss_mb": round(rss, 1) if rss is not None else None,
+    }
@@ -0,0 +1,547 @@
+"""Single-pass validation engine for writer drafts.
+
+``DraftDocument`` parses a Markdown draft once into blocks (blank-line
+separated, fenced code kept whole) and each block into elements — headings,
+paragraphs and other visible text (list items, code, quotes) — with the text
+python-markdown + BeautifulSoup would render for them. Per-block facts (body
+word count, forbidden stems) are computed when the block is parsed, and
+parsed blocks are memoized by their Markdown, so:
+
+- ``measure`` aggregates everything the five writer checks need in one pass
+  over the blocks;
+- a repair that replaces one block (``replace_block``) only parses that block,
+  and re-validating the repaired draft reuses every untouched block.
+
+List looseness and item continuations depend on the neighbouring blocks, so
+``DraftDocument`` applies them when it walks the blocks, not when one is parsed.
+
+Forbidden stems are found with one compiled pattern over the lower-cased
+text instead of one substring scan per stem.
+
+``reference_measurements`` is the original markdown → BeautifulSoup path. The
+tests and scripts/benchmark_draft_validation.py compare the engine with it.
+"""
+
+from __future__ import annotations
+
+import html
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from bond.prompts.writer import FORBIDDEN_WORD_STEMS
+
+META_PREFIX_RE = re.compile(r"^Meta[- ]?[Dd]escription[:\s]+", re.IGNORECASE)
+META_LINE_RE = re.compile(r"^Meta[- ]?[Dd]escription[:\s]+(.+)", re.IGNORECASE)
+# Body word count skips paragraphs that merely start like a meta line
+_META_BODY_RE = re.compile(r"^Meta[- ]?[Dd]escription", re.IGNORECASE)
+
+# Longest stems first, so a stem that extends another one is not shadowed
+_STEM_ALTERNATION = "|".join(
+    re.escape(stem) for stem in sorted(FORBIDDEN_WORD_STEMS, key=len, reverse=True)
+)
+# Zero-width lookahead reports every stem occurrence, including overlapping ones
+FORBIDDEN_STEM_RE = re.compile(f"(?=({_STEM_ALTERNATION}))")
+# Whole words containing any forbidden stem (used by the writer's repair)
+FORBIDDEN_WORD_RE = re.compile(rf"(?iu)\b\w*(?:{_STEM_ALTERNATION})\w*\b")
+_STEM_ORDER = {stem: index for index, stem in enumerate(FORBIDDEN_WORD_STEMS)}
+
+_BLANK_LINE_RE = re.compile(r"^\s*$")
+_FENCE_RE = re.compile(r"^[ ]{0,3}(`{3,}|~{3,})")
+# Block-level patterns, mirroring python-markdown's block processors
+_ATX_HEADING_RE = re.compile(r"^(#{1,6})(.*?)#*[ \t]*$", re.MULTILINE)
+# The lookahead keeps the non-blank check linear (a lazy "*?\S" backtracks per line start)
+_SETEXT_HEADING_RE = re.compile(r"^(?=[^\n]*\S)([^\n]*)\n(=+|-+)[ ]*$", re.MULTILINE)
+_HR_RE = re.compile(r"^[ ]{0,3}(?:(?:-+[ ]{0,2}){3,}|(?:_+[ ]{0,2}){3,}|(?:\*+[ ]{0,2}){3,})[ ]*$", re.MULTILINE)
+_H2_LINE_RE = re.compile(r"^##[ \t]+\S")
+_LIST_ITEM_RE = re.compile(r"^[ ]{0,3}(?:\d+\.|[*+-])[ ]+(.*)$", re.MULTILINE)
+_QUOTE_RE = re.compile(r"^[ ]{0,3}>[ ]?", re.MULTILINE)
+_INDENTED_CODE_RE = re.compile(r"^(?: {4}|\t)")
+_INDENT_RE = re.compile(r"^(?: {4}|\t)", re.MULTILINE)
+# Raw HTML and reference definitions are left to python-markdown (see _rendered_elements)
+_HTML_BLOCK_TAGS = (
+    "address|article|aside|blockquote|canvas|details|div|dl|fieldset|figcaption|figure|footer|"
+    "form|h[1-6]|header|hgroup|hr|iframe|main|nav|noscript|ol|p|pre|script|section|style|table|ul|video"
+)
+_HTML_BLOCK_START_RE = re.compile(rf"^[ ]{{0,3}}<({_HTML_BLOCK_TAGS})(?=[\s/>])", re.IGNORECASE)
+_RAW_HTML_RE = re.compile(rf"<!--|^[ ]{{0,3}}</?(?:{_HTML_BLOCK_TAGS})(?=[\s/>])", re.IGNORECASE | re.MULTILINE)
+_REFERENCE_DEF_RE = re.compile(r"^[ ]{0,3}\[([^\]]+)\]:[ \t]*\S.*$", re.MULTILINE)
+# Inline markup removed to get the visible text
+_LINK_TARGET = r"\((?:[^()\n]|\([^()\n]*\))*\)"  # one level of nested parentheses, as in URLs
+_IMAGE_RE = re.compile(rf"!\[[^\]]*\]{_LINK_TARGET}")
+_LINK_RE = re.compile(rf"\[([^\]]*)\]{_LINK_TARGET}")
+_AUTOLINK_RE = re.compile(r"<((?:https?|ftp)://[^>\s]+|[^>\s@]+@[^>\s]+)>")
+_HTML_TAG_RE = re.compile(r"</?[A-Za-z][^>]*>")
+_CODE_SPAN_RE = re.compile(r"(?<!\\)(`+)(.+?)(?<!`)\1(?!`)", re.DOTALL)
+_STRONG_STAR_RE = re.compile(r"\*\*(?=\S)(.+?)(?<=\S)\*\*", re.DOTALL)
+# Underscores only emphasize at word boundaries (foo__bar__baz stays as is)
+_STRONG_UNDERSCORE_RE = re.compile(r"(?<!\w)__(?=\S)(.+?)(?<=\S)__(?!\w)", re.DOTALL)
+_EM_STAR_RE = re.compile(r"\*(?=\S)(.+?)(?<=\S)\*", re.DOTALL)
+_EM_UNDERSCORE_RE = re.compile(r"(?<!\w)_(?=\S)(.+?)(?<=\S)_(?!\w)", re.DOTALL)
+_ESCAPE_RE = re.compile(r"\\([\\`*_{}\[\]()#+\-.!>])")
+_HARD_BREAK_RE = re.compile(r"[ ]{2,}\n")
+# Code spans and escaped characters are stashed behind placeholders (as python-markdown
+# does) so the emphasis and tag patterns never see them
+_STASH_RE = re.compile("\x02(\\d+)\x03")
+
+
+@dataclass(frozen=True, slots=True)
+class DraftElement:
+    kind: str  # "heading" | "paragraph" | "item" (tight list item) | "text" (code, ...): body words, not a <p>
+    text: str
+    level: int = 0  # heading level, or list nesting depth of an item
+
+
+@dataclass(frozen=True, slots=True)
+class DraftBlock:
+    markdown: str
+    elements: tuple[DraftElement, ...]
+    body_words: int
+    forbidden_stems: frozenset[str]
+    # Reference definitions ("[1]: https://..."): links in other blocks may use them
+    definitions: tuple[str, ...] = ()
+    # An indented block right after a list continues its last item instead of being code
+    continuation: DraftBlock | None = None
+
+    @property
+    def opens_list(self) -> bool:
+        return bool(self.elements) and self.elements[0].kind == "item"
+
+    @property
+    def ends_in_list(self) -> bool:
+        return bool(self.elements) and self.elements[-1].kind == "item"
+
+    @property
+    def is_meta(self) -> bool:
+        return bool(META_PREFIX_RE.match(self.markdown.lstrip()))
+
+    @property
+    def is_h1(self) -> bool:
+        return self.markdown.lstrip().startswith("# ")
+
+    @property
+    def is_body_paragraph(self) -> bool:
+        """First-paragraph candidate for the repairs: not a heading and not the meta line."""
+        return not self.markdown.lstrip().startswith("#") and not self.is_meta
+
+
+@dataclass(frozen=True, slots=True)
+class DraftMeasurements:
+    h1_text: str
+    first_paragraph: str
+    meta_description: str
+    body_word_count: int
+    forbidden_stems: list[str]
+
+
+def find_forbidden_stems(text: str) -> list[str]:
+    """Forbidden stems occurring in ``text``, in FORBIDDEN_WORD_STEMS order."""
+    found = {match.group(1) for match in FORBIDDEN_STEM_RE.finditer(text.lower())}
+    return sorted(found, key=_STEM_ORDER.__getitem__)
+
+
+def split_blocks(markdown_text: str) -> list[str]:
+    """Blank-line separated blocks (indentation kept).
+
+    A fenced code block stays one block, and so does raw HTML (a comment or a
+    block-level tag) that spans blank lines before it is closed.
+    """
+    blocks: list[str] = []
+    current: list[str] = []
+    fence: str | None = None
+    html: tuple[str, int] | None = None  # open raw HTML region: (tag or "--", depth)
+
+    def flush() -> None:
+        block = "\n".join(current).rstrip()
+        if block.strip():
+            blocks.append(block)
+        current.clear()
+
+    # Not stripped: a leading indented block is code, as in python-markdown
+    for line in markdown_text.split("\n"):
+        match = _FENCE_RE.match(line)
+        if html is not None:
+            current.append(line)
+            html = _open_html_region(line, html)
+        elif fence is not None:
+            current.append(line)
+            if match and match.group(1)[0] == fence[0] and len(match.group(1)) >= len(fence):
+                fence = None
+                flush()
+        elif match:
+            flush()
+            fence = match.group(1)
+            current.append(line)
+        elif _BLANK_LINE_RE.match(line):
+            flush()
+        else:
+            current.append(line)
+            html = _open_html_region(line)
+    flush()
+    return blocks
+
+
+def _open_html_region(line: str, region: tuple[str, int] | None = None) -> tuple[str, int] | None:
+    """Raw HTML region still open after ``line`` (None once it is closed, or if none was opened)."""
+    if region is None:
+        comment = line.rfind("<!--")
+        if comment != -1 and "-->" not in line[comment:]:
+            return ("--", 1)
+        start = _HTML_BLOCK_START_RE.match(line)
+        if start is None:
+            return None
+        region = (start.group(1).lower(), 0)
+    tag, depth = region
+    if tag == "--":
+        return None if "-->" in line else region
+    lowered = line.lower()
+    depth += len(re.findall(rf"<{tag}(?=[\s/>])", lowered)) - lowered.count(f"</{tag}>")
+    return (tag, depth) if depth > 0 else None
+
+
+@dataclass(frozen=True)
+class DraftSection:
+    """Character span of one H2 section; the part before the first H2 has heading ``""``."""
+
+    heading: str
+    start: int
+    end: int
+
+
+def split_sections(markdown_text: str) -> list[DraftSection]:
+    """Split a draft at its ATX H2 lines (outside fenced code), keeping exact offsets.
+
+    Spans cover the whole text, so slicing and re-joining them is lossless.
+    """
+    sections: list[DraftSection] = []
+    heading, start, offset = "", 0, 0
+    fence: str | None = None
+    for line in markdown_text.splitlines(keepends=True):
+        match = _FENCE_RE.match(line)
+        if fence is not None:
+            if match and match.group(1)[0] == fence[0] and len(match.group(1)) >= len(fence):
+                fence = None
+        elif match:
+            fence = match.group(1)
+        elif _H2_LINE_RE.match(line):
+            if offset or heading:
+                sections.append(DraftSection(heading, start, offset))
+            heading, start = line.strip(), offset
+        offset += len(line)
+    sections.append(DraftSection(heading, start, len(markdown_text)))
+    return sections
+
+
+def join_blocks(blocks: list[str]) -> str:
+    return "\n\n".join(block.strip("\n") for block in blocks if block.strip())
+
+
+def inline_text(markdown_text: str) -> str:
+    """Visible text of inline Markdown (emphasis, code spans, links and tags removed)."""
+    stash: list[str] = []
+
+    def _stash(literal: str) -> str:
+        stash.append(literal)
+        return f"\x02{len(stash) - 1}\x03"
+
+    text = _CODE_SPAN_RE.sub(lambda match: _stash(match.group(2).strip()), markdown_text)
+    text = _ESCAPE_RE.sub(lambda match: _stash(match.group(1)), text)
+    text = _HARD_BREAK_RE.sub("\n", text)
+    text = _IMAGE_RE.sub("", text)
+    text = _LINK_RE.sub(r"\1", text)
+    text = _AUTOLINK_RE.sub(r"\1", text)
+    text = _HTML_TAG_RE.sub("", text)
+    text = _STRONG_STAR_RE.sub(r"\1", text)
+    text = _STRONG_UNDERSCORE_RE.sub(r"\1", text)
+    text = _EM_STAR_RE.sub(r"\1", text)
+    text = _EM_UNDERSCORE_RE.sub(r"\1", text)
+    text = html.unescape(text)
+    return _STASH_RE.sub(lambda match: stash[int(match.group(1))], text)
+
+
+def _parse_elements(block: str) -> list[DraftElement]:
+    """Elements of one block, in python-markdown's block processor order."""
+    if not block.strip():
+        return []
+    fence = _FENCE_RE.match(block)
+    if fence:
+        lines = block.split("\n")[1:]
+        if lines and _FENCE_RE.match(lines[-1]):
+            lines = lines[:-1]
+        return [DraftElement("text", "\n".join(lines))]
+    if _INDENTED_CODE_RE.match(block):
+        return [DraftElement("text", block)]
+
+    heading = _ATX_HEADING_RE.search(block)
+    if heading:
+        element = DraftElement("heading", inline_text(heading.group(2)).strip(), len(heading.group(1)))
+        return (
+            _parse_elements(block[: heading.start()].strip("\n"))
+            + [element]
+            + _parse_elements(block[heading.end() :].strip("\n"))
+        )
+    setext = _SETEXT_HEADING_RE.search(block)
+    if setext:
+        level = 1 if setext.group(2).startswith("=") else 2
+        element = DraftElement("heading", inline_text(setext.group(1)).strip(), level)
+        return (
+            _parse_elements(block[: setext.start()].strip("\n"))
+            + [element]
+            + _parse_elements(block[setext.end() :].strip("\n"))
+        )
+    rule = _HR_RE.search(block)
+    if rule:
+        return _parse_elements(block[: rule.start()].strip("\n")) + _parse_elements(
+            block[rule.end() :].strip("\n")
+        )
+    if _LIST_ITEM_RE.match(block):
+        items: list[list] = []  # [text, nesting level]
+        for line in block.split("\n"):
+            # Indented markers open nested items, which render as list items too
+            item = _LIST_ITEM_RE.match(line.lstrip())
+            if item:
+                items.append([item.group(1), 1 if _INDENTED_CODE_RE.match(line) else 0])
+            elif items:
+                items[-1][0] += "\n" + line.strip()
+        elements = []
+        for text, level in items:
+            heading = _ATX_HEADING_RE.match(text)
+            if heading:  # "- # Tytuł" renders a heading inside the item
+                elements.append(DraftElement("heading", inline_text(heading.group(2)).strip(), len(heading.group(1))))
+            else:
+                elements.append(DraftElement("item", inline_text(text).strip(), level))
+        return elements
+    quote = _QUOTE_RE.search(block)
+    if quote:
+        inner = _QUOTE_RE.sub("", block[quote.start() :])
+        # A list inside the quote is not a sibling a following list could join
+        quoted = [
+            DraftElement("text", element.text) if element.kind == "item" else element
+            for element in _parse_elements(inner.strip())
+        ]
+        return _parse_elements(block[: quote.start()].strip("\n")) + quoted
+    return [DraftElement("paragraph", inline_text(block).strip())]
+
+
+def _count_body_words(elements: list[DraftElement]) -> int:
+    words = 0
+    for element in elements:
+        if element.kind == "heading":
+            continue
+        if element.kind == "paragraph" and _META_BODY_RE.match(element.text):
+            continue
+        words += len(element.text.split())
+    return words
+
+
+@lru_cache(maxsize=1024)
+def parse_block(markdown_text: str) -> DraftBlock:
+    """Parse one block (memoized: blocks are immutable and repeat across repair attempts)."""
+    definitions = tuple(match.group(0) for match in _REFERENCE_DEF_RE.finditer(markdown_text))
+    if definitions or _RAW_HTML_RE.search(markdown_text):
+        elements = list(_rendered_elements(markdown_text))
+    else:
+        elements = _parse_elements(markdown_text)
+    continuation = None
+    if _INDENTED_CODE_RE.match(markdown_text):
+        continuation = parse_block(_INDENT_RE.sub("", markdown_text))
+    return DraftBlock(
+        markdown=markdown_text,
+        elements=tuple(elements),
+        body_words=_count_body_words(elements),
+        forbidden_stems=frozenset(find_forbidden_stems(markdown_text)),
+        definitions=definitions,
+        continuation=continuation,
+    )
+
+
+_RENDERED_TAGS = ["h1", "h2", "h3", "h4", "h5", "h6", "p"]
+
+
+def _render_soup(markdown_text: str):
+    import markdown
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(markdown.markdown(markdown_text, extensions=["fenced_code"]), "html.parser")
+
+
+@lru_cache(maxsize=256)
+def _rendered_elements(markdown_text: str) -> tuple[DraftElement, ...]:
+    """Elements of a block the engine does not model (raw HTML, reference links), from python-markdown."""
+    soup = _render_soup(markdown_text)
+    tags = soup.find_all(_RENDERED_TAGS)
+    elements = [
+        DraftElement("paragraph", tag.get_text().strip())
+        if tag.name == "p"
+        else DraftElement("heading", tag.get_text().strip(), int(tag.name[1]))
+        for tag in tags
+    ]
+    # Text outside headings and paragraphs (list items, HTML blocks) still counts as body words
+    for tag in tags:
+        tag.decompose()
+    rest = soup.get_text().strip()
+    if rest:
+        elements.append(DraftElement("text", rest))
+    return tuple(elements)
+
+
+def _uses_reference(markdown_text: str, labels: frozenset[str]) -> bool:
+    lowered = markdown_text.lower()
+    return any(f"[{label}]" in lowered for label in labels)
+
+
+def _loosen(placed: list[tuple[DraftBlock, list[DraftElement]]], item: DraftElement | None) -> None:
+    """Render ``item``, the last top-level item of the last placed block, as a paragraph."""
+    if item is None or not item.text:
+        return
+    elements = placed[-1][1]
+    for index in range(len(elements) - 1, -1, -1):
+        if elements[index] is item:
+            elements[index] = DraftElement("paragraph", item.text)
+            return
+
+
+class DraftDocument:
+    """A draft as a list of parsed blocks; edits re-parse only the blocks they touch."""
+
+    def __init__(self, blocks: list[DraftBlock]) -> None:
+        self.blocks = blocks
+
+    @classmethod
+    def from_markdown(cls, markdown_text: str) -> DraftDocument:
+        return cls([parse_block(block) for block in split_blocks(markdown_text)])
+
+    @property
+    def markdown(self) -> str:
+        return join_blocks([block.markdown for block in self.blocks])
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def find(self, predicate) -> int | None:
+        for index, block in enumerate(self.blocks):
+            if predicate(block):
+                return index
+        return None
+
+    def replace_block(self, index: int, markdown_text: str) -> None:
+        """Replace one block; the new text may split into several blocks or none."""
+        self.blocks[index : index + 1] = [parse_block(block) for block in split_blocks(markdown_text)]
+
+    def insert_block(self, index: int, markdown_text: str) -> None:
+        self.blocks[index:index] = [parse_block(block) for block in split_blocks(markdown_text)]
+
+    def extend(self, markdown_blocks: list[str]) -> None:
+        for markdown_text in markdown_blocks:
+            self.insert_block(len(self.blocks), markdown_text)
+
+    def _elements_in_context(self) -> list[tuple[DraftBlock, list[DraftElement]]]:
+        """Each block's elements with the list context python-markdown applies across blocks.
+
+        An indented block after a list continues its last item (see
+        ``DraftBlock.continuation``), and a list separated from the previous one
+        by a blank line joins it as a loose list: the last item before the blank
+        line and the first item after it are rendered as paragraphs.
+        """
+        definitions = [definition for block in self.blocks for definition in block.definitions]
+        labels = frozenset(_REFERENCE_DEF_RE.match(definition).group(1).lower() for definition in definitions)
+        placed: list[tuple[DraftBlock, list[DraftElement]]] = []
+        in_list = False
+        last_item: DraftElement | None = None  # tight item that closes the previous block
+        for block in self.blocks:
+            if in_list and block.continuation is not None:
+                block = block.continuation
+                elements = list(block.elements)
+                _loosen(placed, last_item)
+                last_item = None
+                placed.append((block, elements))
+                continue
+            elements = list(block.elements)
+            if labels and _uses_reference(block.markdown, labels):
+                # Reference links resolve against definitions anywhere in the draft
+                elements = list(_rendered_elements("\n\n".join([block.markdown, *definitions])))
+            if in_list and block.opens_list:
+                _loosen(placed, last_item)
+                if elements[0].text:
+                    elements[0] = DraftElement("paragraph", elements[0].text)
+            placed.append((block, elements))
+            in_list = block.ends_in_list
+            # The previous list's last item is its last top-level one (nested items live inside it)
+            last_item = None
+            for element in reversed(elements if in_list else []):
+                if element.kind != "item":
+                    break
+                if element.level == 0:
+                    last_item = element
+                    break
+        return placed
+
+    @property
+    def body_word_count(self) -> int:
+        return self.measure().body_word_count
+
+    def measure(self) -> DraftMeasurements:
+        """Everything the writer's five checks need, in one pass over the blocks."""
+        h1_text: str | None = None
+        first_paragraph = ""
+        meta_description = ""
+        body_word_count = 0
+        stems: set[str] = set()
+        for block, elements in self._elements_in_context():
+            if list(block.elements) == elements:
+                body_word_count += block.body_words
+            else:
+                body_word_count += _count_body_words(elements)
+            stems |= block.forbidden_stems
+            for element in elements:
+                if element.kind == "heading":
+                    if element.level == 1 and h1_text is None:
+                        h1_text = element.text
+                elif element.kind == "paragraph":
+                    if not meta_description:
+                        meta = META_LINE_RE.match(element.text)
+                        if meta:
+                            meta_description = meta.group(1).strip()
+                    if not first_paragraph and element.text and not META_PREFIX_RE.match(element.text):
+                        first_paragraph = element.text
+        return DraftMeasurements(
+            h1_text=h1_text or "",
+            first_paragraph=first_paragraph,
+            meta_description=meta_description,
+            body_word_count=body_word_count,
+            forbidden_stems=sorted(stems, key=_STEM_ORDER.__getitem__),
+        )
+
+
+def reference_measurements(draft: str) -> DraftMeasurements:
+    """The original validator: render to HTML with python-markdown and walk a BeautifulSoup tree."""
+    from bs4 import BeautifulSoup
+
+    soup = _render_soup(draft)
+    h1 = soup.find("h1")
+
+    meta_description = ""
+    first_paragraph = ""
+    for p in soup.find_all("p"):
+        paragraph = p.get_text().strip()
+        meta = META_LINE_RE.match(paragraph)
+        if meta and not meta_description:
+            meta_description = meta.group(1).strip()
+        if paragraph and not first_paragraph and not META_PREFIX_RE.match(paragraph):
+            first_paragraph = paragraph
+
+    body = BeautifulSoup(str(soup), "html.parser")
+    for tag in body.find_all(["h1", "h2", "h3", "h4", "h5", "h6"]):
+        tag.decompose()
+    for p in body.find_all("p"):
+        if _META_BODY_RE.match(p.get_text().strip()):
+            p.decompose()
+
+    draft_lower = draft.lower()
+    return DraftMeasurements(
+        h1_text=h1.get_text().strip() if h1 else "",
+        first_paragraph=first_paragraph,
+        meta_description=meta_description,
+        body_word_count=len(body.get_text().split()),
+        forbidden_stems=[stem for stem in FORBIDDEN_WORD_STEMS if stem in draft_lower],
+    )
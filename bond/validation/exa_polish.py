@@ -302,15 +302,10 @@ def evaluate_case(
 
 
 async def _run_query(query: ValidationQuery, *, num_results: int) -> tuple[list[dict[str, Any]], str | None]:
-    from bond.graph.nodes.researcher import _get_exa_tools
-
-    tools = await _get_exa_tools()
-    web_search = next((tool for tool in tools if tool.name == "web_search_exa"), None)
-    if web_search is None:
-        raise RuntimeError("web_search_exa not found in Exa MCP tool list")
+    from bond.mcp.exa_pool import call_exa_tool
 
     try:
-        raw = await web_search.ainvoke({"query": query.text, "numResults": num_results})
+        raw = await call_exa_tool("web_search_exa", {"query": query.text, "numResults": num_results})
     except Exception as exc:  # pragma: no cover - exercised in live runs
         return [], str(exc)
 
@@ -360,9 +355,13 @@ async def run_validation(
     cases: Iterable[ValidationCase],
     num_results: int,
 ) -> list[CaseValidationResult]:
+    from bond.mcp.exa_pool import exa_mcp_pool
+
     results: list[CaseValidationResult] = []
-    for case in cases:
-        results.append(await run_case(case, num_results=num_results))
+    # One set of Exa MCP sessions for the whole run instead of a handshake per query
+    async with exa_mcp_pool():
+        for case in cases:
+            results.append(await run_case(case, num_results=num_results))
     return results
 
 
@@ -8,18 +8,16 @@ import time
 from collections import defaultdict
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
-from functools import lru_cache
 from pathlib import Path
 from typing import Sequence
 
 import numpy as np
-from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
 
 from bond.config import settings
 from bond.store.article_log import get_article_count, get_articles, get_chunk_count
+from bond.store.embeddings import get_embedding_function
 from bond.store.chroma import get_or_create_corpus_collection, get_or_create_metadata_collection
 
-_EMBEDDING_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
 _DEFAULT_TOP_K = 5
 _LOW_CORPUS_STABLE_OVERLAP = 0.8
 _LOW_CORPUS_STABLE_TOP1 = 0.8
@@ -162,18 +160,10 @@ def _safe_split_chunk_id(chunk_id: str) -> tuple[str, int]:
         return chunk_id, 0
 
 
-@lru_cache(maxsize=1)
-def _get_embedding_function() -> SentenceTransformerEmbeddingFunction:
-    return SentenceTransformerEmbeddingFunction(
-        model_name=_EMBEDDING_MODEL,
-        device="cpu",
-    )
-
-
 def _normalized_embeddings(texts: Sequence[str]) -> np.ndarray:
     if not texts:
         return np.zeros((0, 0), dtype=float)
-    embeddings = np.asarray(_get_embedding_function()(list(texts)), dtype=float)
+    embeddings = np.asarray(get_embedding_function()(list(texts)), dtype=float)
     norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
     return embeddings / np.clip(norms, 1e-12, None)
 
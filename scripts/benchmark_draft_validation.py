@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Benchmark writer draft validation on realistic ~1500-word drafts.
+
+Compares, per draft:
+  - reference: markdown → BeautifulSoup parse plus one regex scan per stem
+               (the pre-engine code path, ``reference_measurements``)
+  - cold:      DraftDocument.from_markdown().measure() with an empty block cache
+  - warm:      the same draft again (re-validation after a rejected attempt)
+  - repair:    one-block repair on a parsed document, then measure() — the
+               writer's validate → repair → re-validate round
+
+Every engine result is checked against the reference before timing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bond.validation.draft import DraftDocument, parse_block, reference_measurements
+
+_SENTENCES = [
+    "Zespoły redakcyjne coraz częściej mierzą wpływ treści na sprzedaż, a nie tylko ruch na stronie.",
+    "W praktyce oznacza to stałe porównywanie danych z **CRM** z danymi z analityki.",
+    "Najlepsze wyniki dają krótkie cykle: hipoteza, publikacja, pomiar i korekta planu.",
+    "Dobrze opisany proces skraca czas wdrożenia nowych autorów o kilka tygodni.",
+    "Warto pamiętać, że *jakość danych wejściowych* decyduje o trafności rekomendacji.",
+    "Raport z [badania rynku](https://example.com/raport) pokazuje wyraźny wzrost budżetów.",
+    "Automatyzacja nie zastępuje redaktora, ale zdejmuje z niego żmudne sprawdzanie faktów.",
+    "Kluczowe wskaźniki to czas do publikacji, udział powracających czytelników i konwersja.",
+    "Firmy, które łączą te dane, szybciej rezygnują z formatów bez efektu biznesowego.",
+    "Przykładem jest `checklista` publikacji, która wymusza sprawdzenie źródeł przed wysyłką.",
+]
+_LIST_ITEMS = [
+    "zdefiniuj cel biznesowy artykułu",
+    "wybierz jedną grupę odbiorców",
+    "sprawdź dane w co najmniej dwóch źródłach",
+    "zaplanuj pomiar po publikacji",
+]
+
+
+def _paragraph(rng: random.Random, sentences: int) -> str:
+    return " ".join(rng.choice(_SENTENCES) for _ in range(sentences))
+
+
+def build_draft(seed: int, target_words: int = 1500) -> str:
+    rng = random.Random(seed)
+    blocks = [
+        "Meta-description: Jak mierzyć skuteczność treści eksperckich i łączyć dane z analityki "
+        "z wynikami sprzedaży w zespole redakcyjnym.",
+        "# Jak mierzyć skuteczność treści eksperckich",
+        _paragraph(rng, 4),
+    ]
+    words = sum(len(block.split()) for block in blocks)
+    section = 1
+    while words < target_words:
+        section_blocks = [f"## Sekcja {section}: wnioski z praktyki", _paragraph(rng, rng.randint(4, 7))]
+        if section % 2:
+            section_blocks.append("\n".join(f"- {item}" for item in rng.sample(_LIST_ITEMS, 3)))
+        if section % 3 == 0:
+            section_blocks.append(f"> {rng.choice(_SENTENCES)}")
+        section_blocks.append(_paragraph(rng, rng.randint(3, 6)))
+        blocks.extend(section_blocks)
+        words += sum(len(block.split()) for block in section_blocks)
+        section += 1
+    return "\n\n".join(blocks)
+
+
+def _timed(fn, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def _cold_measure(draft: str):
+    parse_block.cache_clear()
+    return DraftDocument.from_markdown(draft).measure()
+
+
+def _repair_round(document: DraftDocument, index: int) -> None:
+    original = document.blocks[index].markdown
+    document.replace_block(index, f"Treść artykułu skuteczność treści eksperckich. {original}")
+    document.measure()
+    document.replace_block(index, original)
+
+
+def _measure_draft(seed: int, repeats: int) -> dict:
+    """One row of the benchmark; a function of its own so the timed closures bind the draft."""
+    draft = build_draft(seed)
+    reference = reference_measurements(draft)
+    if _cold_measure(draft) != reference:
+        raise AssertionError(f"engine result differs from the reference for draft {seed}")
+
+    document = DraftDocument.from_markdown(draft)
+    paragraph_index = document.find(lambda block: block.is_body_paragraph)
+    return {
+        "draft": seed,
+        "words": reference.body_word_count,
+        "blocks": len(document),
+        "reference_ms": round(_timed(lambda: reference_measurements(draft), repeats), 3),
+        "cold_ms": round(_timed(lambda: _cold_measure(draft), repeats), 3),
+        "warm_ms": round(_timed(lambda: DraftDocument.from_markdown(draft).measure(), repeats), 3),
+        "repair_ms": round(_timed(lambda: _repair_round(document, paragraph_index), repeats), 3),
+    }
+
+
+def run_benchmark(drafts: int, repeats: int) -> list[dict]:
+    return [_measure_draft(seed, repeats) for seed in range(drafts)]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--drafts", type=int, default=5, help="Number of generated drafts.")
+    parser.add_argument("--repeats", type=int, default=20, help="Runs per measurement (median).")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    rows = run_benchmark(args.drafts, args.repeats)
+    print(json.dumps(rows, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
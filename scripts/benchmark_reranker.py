@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Benchmark FlashRank rerank latency against candidate count.
+
+Compares, for each candidate count:
+  - cold:      direct flashrank Ranker.rerank (the pre-service code path)
+  - service:   RerankService with an empty score cache
+  - cached:    the same request again (checkpoint-2 regeneration case)
+  - batched:   N concurrent sessions through the micro-batcher, per request
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bond.config import settings
+from bond.corpus.reranker import RerankService
+
+_QUERY = "jak pisać angażujące wstępy do artykułów blogowych"
+_PASSAGE = (
+    "Fragment {index}: dobry wstęp od razu mówi czytelnikowi, co zyska z lektury, "
+    "i zawiera konkretny przykład z praktyki redakcyjnej numer {index}."
+)
+
+
+def _candidates(count: int, salt: str = "") -> list[dict]:
+    return [{"text": _PASSAGE.format(index=f"{salt}{i}")} for i in range(count)]
+
+
+def _timed(fn, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def _measure(service: RerankService, ranker, count: int, repeats: int, sessions: int) -> dict:
+    """One row of the benchmark; a function of its own so the timed closures bind ``count``."""
+    from flashrank import RerankRequest
+
+    candidates = _candidates(count)
+
+    cold_ms = _timed(
+        lambda: ranker.rerank(
+            RerankRequest(
+                query=_QUERY,
+                passages=[{"id": i, "text": c["text"]} for i, c in enumerate(candidates)],
+            )
+        ),
+        repeats,
+    )
+
+    uncached = iter(range(repeats * 2))
+    service_ms = _timed(
+        lambda: service.rerank(_QUERY, _candidates(count, salt=f"s{next(uncached)}-"), top_n=5),
+        repeats,
+    )
+
+    service.rerank(_QUERY, candidates, top_n=5)
+    cached_ms = _timed(lambda: service.rerank(_QUERY, candidates, top_n=5), repeats)
+
+    def _concurrent_round(round_index: int = 0) -> None:
+        with ThreadPoolExecutor(max_workers=sessions) as pool:
+            list(
+                pool.map(
+                    lambda s: service.rerank(f"{_QUERY} {round_index}-{s}", _candidates(count), top_n=5),
+                    range(sessions),
+                )
+            )
+
+    rounds = iter(range(repeats * 2))
+    batched_ms = _timed(lambda: _concurrent_round(next(rounds)), repeats) / sessions
+
+    return {
+        "candidates": count,
+        "cold_ms": round(cold_ms, 2),
+        "service_ms": round(service_ms, 2),
+        "cached_ms": round(cached_ms, 3),
+        "batched_ms_per_request": round(batched_ms, 2),
+    }
+
+
+def run_benchmark(counts: list[int], repeats: int, sessions: int) -> list[dict]:
+    service = RerankService(settings.rerank_model, settings.rerank_cache_dir, cache_size=100_000)
+    service.preload()
+    ranker = service._get_ranker()
+
+    rows = [_measure(service, ranker, count, repeats, sessions) for count in counts]
+    rows.append({"stats": service.stats()})
+    return rows
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--counts",
+        type=lambda value: [int(part) for part in value.split(",")],
+        default=[5, 10, 15, 30, 50],
+        help="Comma-separated candidate counts.",
+    )
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per measurement (median).")
+    parser.add_argument("--sessions", type=int, default=4, help="Concurrent sessions for the batched case.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    rows = run_benchmark(args.counts, args.repeats, args.sessions)
+    print(json.dumps(rows, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,3 +1,4 @@
+import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
@@ -12,7 +13,7 @@ def _build_client() -> TestClient:
 
 def test_ingest_file_returns_warning_payload_when_file_cannot_be_read(monkeypatch):
     client = _build_client()
-    monkeypatch.setattr("bond.api.routes.corpus.extract_text", lambda content, filename: None)
+    monkeypatch.setattr("bond.api.routes.corpus.extract_chunks", lambda source, filename: None)
 
     response = client.post(
         "/api/corpus/ingest/file",
@@ -36,14 +37,16 @@ def test_ingest_file_returns_positive_chunks_when_ingest_succeeds(monkeypatch):
     client = _build_client()
     captured: dict[str, str] = {}
 
-    monkeypatch.setattr(
-        "bond.api.routes.corpus.extract_text",
-        lambda content, filename: "To jest poprawnie odczytany tekst.",
-    )
+    def fake_extract_chunks(source: str, filename: str) -> list[str]:
+        with open(source, "rb") as f:
+            captured["upload"] = f.read()
+        return ["To jest poprawnie odczytany tekst."]
+
+    monkeypatch.setattr("bond.api.routes.corpus.extract_chunks", fake_extract_chunks)
 
     class DummyIngestor:
-        def ingest(self, *, text: str, title: str, source_type: str, source_url: str) -> dict:
-            captured["text"] = text
+        def ingest_chunks(self, *, chunks: list[str], title: str, source_type: str, source_url: str) -> dict:
+            captured["chunks"] = chunks
             captured["title"] = title
             captured["source_type"] = source_type
             captured["source_url"] = source_url
@@ -69,8 +72,27 @@ def test_ingest_file_returns_positive_chunks_when_ingest_succeeds(monkeypatch):
         "warnings": [],
     }
     assert captured == {
-        "text": "To jest poprawnie odczytany tekst.",
+        "upload": b"Zawartosc raportu",
+        "chunks": ["To jest poprawnie odczytany tekst."],
         "title": "Raport kwartalny",
         "source_type": "external",
         "source_url": "",
     }
+
+
+def test_ingest_file_rejects_oversize_upload_before_extraction(monkeypatch):
+    client = _build_client()
+    monkeypatch.setattr("bond.api.routes.corpus.MAX_FILE_SIZE", 1024)
+    monkeypatch.setattr(
+        "bond.api.routes.corpus.extract_chunks",
+        lambda source, filename: pytest.fail("oversize upload must not be extracted"),
+    )
+
+    response = client.post(
+        "/api/corpus/ingest/file",
+        data={"source_type": "own"},
+        files={"file": ("big.txt", b"x" * 4096, "text/plain")},
+    )
+
+    assert response.status_code == 413
+    assert response.json()["detail"].startswith("Plik big.txt przekracza limit")
@@ -6,7 +6,7 @@ from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from bond.api.routes.corpus import router
-from bond.corpus.sources import text_source, url_source
+from bond.corpus.sources import blog_fetcher, text_source, url_source
 
 
 @pytest.fixture(autouse=True)
@@ -127,6 +127,7 @@ def test_ingest_url_allows_public_https_url(client, monkeypatch):
         "articles_ingested": 2,
         "total_chunks": 14,
         "source_type": "external",
+        "articles_unchanged": 0,
         "warnings": ["one article skipped"],
     }
     assert captured == {
@@ -136,9 +137,10 @@ def test_ingest_url_allows_public_https_url(client, monkeypatch):
 
 
 def test_corpus_status_returns_polish_low_corpus_warning(client, monkeypatch):
-    monkeypatch.setattr("bond.api.routes.corpus.get_article_count", lambda: 2)
-    monkeypatch.setattr("bond.api.routes.corpus.get_chunk_count", lambda: 8)
-    monkeypatch.setattr("bond.api.routes.corpus.get_articles", lambda: [])
+    monkeypatch.setattr(
+        "bond.api.routes.corpus.get_corpus_snapshot",
+        lambda: {"article_count": 2, "chunk_count": 8, "documents": []},
+    )
     monkeypatch.setattr("bond.api.routes.corpus.settings.low_corpus_threshold", 4)
 
     response = client.get("/api/corpus/status")
@@ -151,7 +153,7 @@ def test_corpus_status_returns_polish_low_corpus_warning(client, monkeypatch):
 
 
 def test_ingest_blog_returns_polish_warning_when_no_articles(monkeypatch):
-    monkeypatch.setattr(url_source, "scrape_blog", lambda url: [])
+    monkeypatch.setattr(url_source, "iter_blog_articles", lambda url, stats=None: iter([]))
 
     result = url_source.ingest_blog("https://public.example", "external")
 
@@ -165,22 +167,29 @@ def test_ingest_blog_returns_polish_warning_when_no_articles(monkeypatch):
 def test_ingest_blog_returns_polish_warning_for_short_article(monkeypatch):
     monkeypatch.setattr(
         url_source,
-        "scrape_blog",
-        lambda url: [
-            {
-                "url": "https://public.example/post-1",
-                "title": "Za krótki wpis",
-                "text": "Krótki tekst",
-            }
-        ],
+        "iter_blog_articles",
+        lambda url, stats=None: iter(
+            [
+                {
+                    "url": "https://public.example/post-1",
+                    "title": "Za krótki wpis",
+                    "text": "Krótki tekst",
+                }
+            ]
+        ),
     )
 
     class DummyIngestor:
-        def ingest(self, *, text: str, title: str, source_type: str, source_url: str) -> dict:
-            return {
-                "article_id": "article-1",
-                "chunks_added": 0,
-            }
+        def ingest_many(self, articles, source_type: str, *, on_result=None) -> list[dict]:
+            results = []
+            for article in articles:
+                result = {
+                    "article_id": "article-1",
+                    "chunks_added": 0,
+                }
+                on_result(article, result)
+                results.append(result)
+            return results
 
     monkeypatch.setattr(url_source, "CorpusIngestor", DummyIngestor)
 
@@ -189,6 +198,7 @@ def test_ingest_blog_returns_polish_warning_for_short_article(monkeypatch):
     assert result == {
         "articles_ingested": 0,
         "total_chunks": 0,
+        "articles_unchanged": 0,
         "warnings": [
             "Artykuł pod adresem https://public.example/post-1 jest zbyt krótki, aby utworzyć fragmenty."
         ],
@@ -237,28 +247,33 @@ def test_scrape_blog_skips_discovered_unsafe_urls(monkeypatch):
         ],
     )
 
+    monkeypatch.setattr(blog_fetcher.settings, "blog_extract_workers", 0)
+
     fetched: list[str] = []
 
-    def fake_fetch_url(url: str):
+    def fake_fetch_post(url: str):
         fetched.append(url)
-        return {"url": url}
+        return blog_fetcher.FetchedPost(url=url, body=url.encode(), validators={})
 
     def fake_extract(downloaded, output_format: str = "json"):
         assert output_format == "json"
         return json.dumps(
             {
-                "title": f"Tytul {downloaded['url']}",
+                "title": f"Tytul {downloaded.decode()}",
                 "text": "To jest dluzszy tekst artykulu do testu.",
             }
         )
 
-    monkeypatch.setattr(url_source.trafilatura, "fetch_url", fake_fetch_url)
-    monkeypatch.setattr(url_source.trafilatura, "extract", fake_extract)
+    monkeypatch.setattr(blog_fetcher, "fetch_post", fake_fetch_post)
+    monkeypatch.setattr(blog_fetcher.trafilatura, "extract", fake_extract)
 
     articles = url_source.scrape_blog("https://public.example")
 
-    assert fetched == [
+    assert sorted(fetched) == [
+        "https://public.example/post-1",
+        "https://public.example/post-2",
+    ]
+    assert [article["url"] for article in articles] == [
         "https://public.example/post-1",
         "https://public.example/post-2",
     ]
-    assert [article["url"] for article in articles] == fetched
@@ -272,3 +272,61 @@ async def test_parse_stream_events_ignores_other_events():
     
     assert len(results) == 1
     assert results[0] == {"type": "token", "data": "Valid"}
+
+
+@pytest.mark.asyncio
+async def test_parse_stream_events_serializes_concurrent_writer_sections():
+    def section_event(kind: str, section: int, content: str = "") -> dict[str, Any]:
+        event = {"event": kind, "metadata": {"langgraph_node": "writer", "writer_section": section}}
+        if kind == "on_chat_model_stream":
+            event["data"] = {"chunk": MockAIMessageChunk(content=content)}
+        return event
+
+    events = [
+        {"event": "on_chain_start", "metadata": {"langgraph_node": "writer"}, "name": "writer"},
+        section_event("on_chain_start", 0),
+        section_event("on_chat_model_stream", 0, "Wstęp "),
+        section_event("on_chain_start", 1),
+        section_event("on_chat_model_stream", 2, "## Trzecia"),
+        section_event("on_chat_model_stream", 1, "## Druga"),
+        section_event("on_chat_model_stream", 0, "cd."),
+        section_event("on_chat_model_end", 2),
+        section_event("on_chat_model_end", 0),
+        section_event("on_chat_model_stream", 1, " treść"),
+        section_event("on_chat_model_end", 1),
+        section_event("on_chain_end", 1),
+        {"event": "on_chain_end", "metadata": {"langgraph_node": "writer"}, "name": "writer"},
+    ]
+
+    stream = mock_event_stream(events)
+    results = [json.loads(r) async for r in parse_stream_events(stream)]
+
+    assert token_payloads(results) == ["Wstęp ", "cd.", "\n\n## Druga", " treść", "\n\n## Trzecia"]
+    lifecycle = [event["type"] for event in results if event["type"] in ("node_start", "node_end")]
+    assert lifecycle == ["node_start", "node_end"]
+    assert results[-1]["type"] == "node_end"
+
+
+@pytest.mark.asyncio
+async def test_parse_stream_events_drops_writer_block_repair_tokens():
+    repair_metadata = {"langgraph_node": "writer", "writer_repair": "meta_desc_length_ok"}
+    events = [
+        {"event": "on_chain_start", "metadata": {"langgraph_node": "writer"}, "name": "writer"},
+        {
+            "event": "on_chat_model_stream",
+            "metadata": {"langgraph_node": "writer"},
+            "data": {"chunk": MockAIMessageChunk(content="Draft")},
+        },
+        {
+            "event": "on_chat_model_stream",
+            "metadata": repair_metadata,
+            "data": {"chunk": MockAIMessageChunk(content="Nowy opis")},
+        },
+        {"event": "on_chat_model_end", "metadata": repair_metadata},
+        {"event": "on_chain_end", "metadata": {"langgraph_node": "writer"}, "name": "writer"},
+    ]
+
+    stream = mock_event_stream(events)
+    results = [json.loads(r) async for r in parse_stream_events(stream)]
+
+    assert token_payloads(results) == ["Draft"]
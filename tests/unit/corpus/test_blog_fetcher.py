@@ -0,0 +1,217 @@
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from bond.corpus.sources import blog_fetcher, url_source
+
+_POSTS = {
+    f"/post-{i}": (
+        f"<html><head><title>Wpis {i}</title></head><body><article>"
+        f"<h1>Wpis {i}</h1>"
+        + "".join(
+            f"<p>Akapit {j} wpisu numer {i} opisuje szczegółowo temat testowy, "
+            f"aby ekstraktor uznał go za pełnoprawną treść artykułu.</p>"
+            for j in range(6)
+        )
+        + "</article></body></html>"
+    )
+    for i in range(1, 5)
+}
+
+
+class _FakeBlog:
+    """Local stand-in for a blog: sitemap, posts with ETags, in-flight tracking."""
+
+    def __init__(self):
+        self.requests: list[tuple[str, str | None]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+
+@pytest.fixture
+def fake_blog():
+    state = _FakeBlog()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            base = f"http://127.0.0.1:{self.server.server_address[1]}"
+            if self.path == "/sitemap.xml":
+                urls = "".join(f"<url><loc>{base}{path}</loc></url>" for path in _POSTS)
+                urls += f"<url><loc>{base}/moved</loc></url>"
+                body = (
+                    '<?xml version="1.0" encoding="UTF-8"?>'
+                    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                    f"{urls}</urlset>"
+                ).encode()
+                self._reply(200, body, {"Content-Type": "application/xml"})
+                return
+
+            with state.lock:
+                state.requests.append((self.path, self.headers.get("If-None-Match")))
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+            try:
+                time.sleep(0.05)
+                if self.path == "/moved":
+                    self._reply(301, b"", {"Location": "/post-1"})
+                elif self.path in _POSTS:
+                    etag = f'"{self.path}-v1"'
+                    if self.headers.get("If-None-Match") == etag:
+                        self._reply(304, b"", {"ETag": etag})
+                    else:
+                        body = _POSTS[self.path].encode()
+                        self._reply(200, body, {"Content-Type": "text/html; charset=utf-8", "ETag": etag})
+                else:
+                    self._reply(404, b"", {})
+            finally:
+                with state.lock:
+                    state.in_flight -= 1
+
+        def _reply(self, status, body, headers):
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        yield state
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _local_sitemap_search(url: str) -> list[str]:
+    # trafilatura's sitemap_search refuses IP hosts, so read the stand-in's sitemap directly
+    xml = requests.get(url, timeout=5).text
+    return re.findall(r"<loc>(.*?)</loc>", xml)
+
+
+@pytest.fixture(autouse=True)
+def fetcher_settings(monkeypatch):
+    monkeypatch.setattr(blog_fetcher.settings, "allow_private_url_ingest", True)
+    monkeypatch.setattr(blog_fetcher.settings, "max_blog_posts", 10)
+    monkeypatch.setattr(blog_fetcher.settings, "blog_fetch_workers", 8)
+    monkeypatch.setattr(blog_fetcher.settings, "blog_fetch_per_host", 2)
+    monkeypatch.setattr(blog_fetcher.settings, "blog_fetch_delay_seconds", 0.0)
+    monkeypatch.setattr(blog_fetcher.settings, "blog_extract_workers", 0)
+    blog_fetcher._VALIDATOR_CACHE.clear()
+    yield
+    blog_fetcher._VALIDATOR_CACHE.clear()
+
+
+def test_scrape_blog_fetches_sitemap_posts_concurrently_within_host_limit(fake_blog, monkeypatch):
+    monkeypatch.setattr(url_source, "sitemap_search", _local_sitemap_search)
+
+    articles = url_source.scrape_blog(fake_blog.base_url + "/sitemap.xml")
+
+    assert [article["url"] for article in articles] == [
+        *(fake_blog.base_url + path for path in _POSTS),
+        fake_blog.base_url + "/moved",
+    ]
+    assert "Akapit 0 wpisu numer 1" in articles[0]["text"]
+    # redirect followed to the post it points at
+    assert "wpisu numer 1" in articles[-1]["text"]
+    assert fake_blog.max_in_flight == 2
+
+
+def test_conditional_get_skips_posts_unchanged_since_last_import(fake_blog, monkeypatch):
+    monkeypatch.setattr(url_source, "sitemap_search", lambda url: [fake_blog.base_url + p for p in _POSTS])
+
+    first = url_source.scrape_blog(fake_blog.base_url)
+    fake_blog.requests.clear()
+    second = url_source.scrape_blog(fake_blog.base_url)
+
+    assert len(first) == len(_POSTS)
+    assert second == []
+    assert sorted(fake_blog.requests) == sorted((path, f'"{path}-v1"') for path in _POSTS)
+
+
+def test_iter_blog_articles_streams_into_ingestor_before_fetching_finishes(fake_blog, monkeypatch):
+    monkeypatch.setattr(url_source, "sitemap_search", lambda url: [fake_blog.base_url + p for p in _POSTS])
+    monkeypatch.setattr(blog_fetcher.settings, "blog_fetch_per_host", 1)
+    seen_requests: list[int] = []
+
+    class RecordingIngestor:
+        def ingest_many(self, articles, source_type, *, on_result=None):
+            results = []
+            for article in articles:
+                seen_requests.append(len(fake_blog.requests))
+                result = {"article_id": article["source_url"], "chunks_added": 1}
+                on_result(article, result)
+                results.append(result)
+            return results
+
+    monkeypatch.setattr(url_source, "CorpusIngestor", RecordingIngestor)
+
+    summary = url_source.ingest_blog(fake_blog.base_url, "external")
+
+    assert summary == {
+        "articles_ingested": 4,
+        "total_chunks": 4,
+        "articles_unchanged": 0,
+        "warnings": [],
+    }
+    # the first article reached the ingestor before every post had been requested
+    assert seen_requests[0] < len(_POSTS)
+
+
+class _StoringIngestor:
+    """ingest_many stand-in that reports posts at ``failing`` URLs as failed (raises)."""
+
+    failing: set[str] = set()
+
+    def ingest_many(self, articles, source_type, *, on_result=None):
+        results = []
+        for article in articles:
+            if article["source_url"] in self.failing:
+                raise RuntimeError("chroma unavailable")
+            result = {"article_id": article["source_url"], "chunks_added": 1, "status": "added"}
+            on_result(article, result)
+            results.append(result)
+        return results
+
+
+def test_reimporting_unchanged_blog_reports_posts_as_unchanged(fake_blog, monkeypatch):
+    monkeypatch.setattr(url_source, "sitemap_search", lambda url: [fake_blog.base_url + p for p in _POSTS])
+    monkeypatch.setattr(url_source, "CorpusIngestor", _StoringIngestor)
+    _StoringIngestor.failing = set()
+
+    url_source.ingest_blog(fake_blog.base_url, "external")
+    summary = url_source.ingest_blog(fake_blog.base_url, "external")
+
+    assert summary == {
+        "articles_ingested": 0,
+        "total_chunks": 0,
+        "articles_unchanged": len(_POSTS),
+        "warnings": [f"Pominięto artykuły bez zmian od ostatniego importu: {len(_POSTS)}."],
+    }
+
+
+def test_post_whose_ingest_failed_is_fetched_in_full_next_time(fake_blog, monkeypatch):
+    monkeypatch.setattr(url_source, "sitemap_search", lambda url: [fake_blog.base_url + "/post-1"])
+    monkeypatch.setattr(url_source, "CorpusIngestor", _StoringIngestor)
+    _StoringIngestor.failing = {fake_blog.base_url + "/post-1"}
+
+    with pytest.raises(RuntimeError):
+        url_source.ingest_blog(fake_blog.base_url, "external")
+
+    _StoringIngestor.failing = set()
+    fake_blog.requests.clear()
+    summary = url_source.ingest_blog(fake_blog.base_url, "external")
+
+    assert fake_blog.requests == [("/post-1", None)]
+    assert summary["articles_ingested"] == 1
@@ -0,0 +1,226 @@
+import re
+
+import pytest
+
+from bond.corpus.sources import drive_sync, file_source
+from bond.corpus.sources.drive_source import FOLDER_MIME_TYPE
+
+_TEXT = "Akapit o redagowaniu tekstów na blogu firmowym, z przykładami i wnioskami. " * 6
+
+
+class _Request:
+    def __init__(self, response):
+        self._response = response
+
+    def execute(self):
+        return self._response
+
+
+class FakeDrive:
+    """files().list / changes() stand-in over an in-memory {id: file} tree."""
+
+    def __init__(self):
+        self.items: dict[str, dict] = {}
+        self.pending_changes: list[dict] = []
+        self.token = 1
+
+    def add(self, file_id, name, parent, *, mime="text/plain", modified="1"):
+        self.items[file_id] = {
+            "id": file_id,
+            "name": name,
+            "mimeType": mime,
+            "parents": [parent],
+            "modifiedTime": modified,
+            "md5Checksum": f"md5-{file_id}-{modified}",
+            "trashed": False,
+        }
+
+    def change(self, file_id, *, removed=False, **fields):
+        if removed:
+            self.items.pop(file_id, None)
+            self.pending_changes.append({"fileId": file_id, "removed": True})
+            return
+        self.items[file_id].update(fields)
+        self.pending_changes.append({"fileId": file_id, "file": dict(self.items[file_id])})
+
+    def files(self):
+        return self
+
+    def list(self, **params):
+        parents = set(re.findall(r"'([^']+)' in parents", params["q"]))
+        matches = [
+            f for f in self.items.values() if not f["trashed"] and parents & set(f["parents"])
+        ]
+        return _Request({"files": matches})
+
+    def changes(self):
+        drive = self
+
+        class _Changes:
+            def getStartPageToken(self):
+                return _Request({"startPageToken": str(drive.token)})
+
+            def list(self, pageToken, **params):
+                changes, drive.pending_changes = drive.pending_changes, []
+                drive.token += 1
+                return _Request({"changes": changes, "newStartPageToken": str(drive.token)})
+
+        return _Changes()
+
+
+class FakeIngestor:
+    ingested: list[str] = []
+    removed: list[str] = []
+
+    def ingest_many(self, articles, source_type, *, on_result=None):
+        results = []
+        for article in articles:
+            FakeIngestor.ingested.append(article["title"])
+            result = {"article_id": f"art-{article['drive_file']['id']}", "chunks_added": 1, "status": "added"}
+            on_result(article, result)
+            results.append(result)
+        return results
+
+    def remove(self, article_ids):
+        FakeIngestor.removed.extend(article_ids)
+
+
+@pytest.fixture
+def drive(tmp_path, monkeypatch):
+    service = FakeDrive()
+    service.add("root", "Blog", None, mime=FOLDER_MIME_TYPE)
+    service.add("sub", "2024", "root", mime=FOLDER_MIME_TYPE)
+    service.add("a", "a.txt", "root")
+    service.add("b", "b.txt", "sub")
+    service.add("img", "foto.png", "root", mime="image/png")
+    monkeypatch.setattr(
+        drive_sync, "download_file", lambda svc, file_id, mime: f"{file_id}: {_TEXT}".encode()
+    )
+    monkeypatch.setattr(drive_sync, "CorpusIngestor", FakeIngestor)
+    monkeypatch.setattr(file_source.settings, "extract_workers", 0)
+    FakeIngestor.ingested = []
+    FakeIngestor.removed = []
+
+    store = drive_sync.DriveSyncStore(str(tmp_path / "drive_sync.db"))
+    yield service, drive_sync.DriveSync(lambda: service, store=store, workers=2)
+    store.close()
+
+
+def test_first_sync_walks_subfolders_and_stores_token(drive):
+    service, sync = drive
+
+    result = sync.sync("root", "own")
+
+    assert result["sync_mode"] == "full"
+    assert result["articles_ingested"] == 2
+    assert sorted(FakeIngestor.ingested) == ["a.txt", "b.txt"]
+    assert sync.store.start_page_token("root") == "1"
+    assert set(sync.store.files("root")) == {"a", "b"}
+
+
+def test_incremental_sync_downloads_only_modified_and_new_files(drive):
+    service, sync = drive
+    sync.sync("root", "own")
+    FakeIngestor.ingested = []
+
+    service.change("b", modifiedTime="2")
+    service.add("c", "c.txt", "sub")
+    service.change("c")
+
+    result = sync.sync("root", "own")
+
+    assert result["sync_mode"] == "incremental"
+    assert sorted(FakeIngestor.ingested) == ["b.txt", "c.txt"]
+    assert result["articles_deleted"] == 0
+    assert sync.store.start_page_token("root") == "2"
+    assert sync.sync("root", "own")["files_changed"] == 0
+
+
+def test_trashed_and_moved_out_files_and_folders_are_removed(drive):
+    service, sync = drive
+    service.add("c", "c.txt", "sub")
+    sync.sync("root", "own")
+
+    service.change("a", trashed=True)
+    service.change("sub", parents=["elsewhere"])
+
+    result = sync.sync("root", "own")
+
+    assert result["articles_deleted"] == 3
+    assert sorted(FakeIngestor.removed) == ["art-a", "art-b", "art-c"]
+    assert sync.store.files("root") == {}
+    assert sync.store.dirs("root") == {"root": None}
+
+
+def test_full_resync_removes_files_missing_from_listing(drive):
+    service, sync = drive
+    sync.sync("root", "own")
+    del service.items["a"]
+
+    result = sync.sync("root", "own", full=True)
+
+    assert result["sync_mode"] == "full"
+    assert result["files_changed"] == 0
+    assert FakeIngestor.removed == ["art-a"]
+
+
+def test_failed_download_is_retried_by_the_next_incremental_sync(drive, monkeypatch):
+    service, sync = drive
+    sync.sync("root", "own")
+    FakeIngestor.ingested = []
+
+    service.add("c", "c.txt", "sub")
+    service.change("c")
+
+    def flaky_download(svc, file_id, mime):
+        if file_id == "c":
+            raise OSError("connection reset")
+        return f"{file_id}: {_TEXT}".encode()
+
+    monkeypatch.setattr(drive_sync, "download_file", flaky_download)
+    result = sync.sync("root", "own")
+
+    assert result["articles_ingested"] == 0
+    assert any("c.txt" in warning for warning in result["warnings"])
+    assert "c" not in sync.store.files("root")
+
+    monkeypatch.setattr(
+        drive_sync, "download_file", lambda svc, file_id, mime: f"{file_id}: {_TEXT}".encode()
+    )
+    result = sync.sync("root", "own")
+
+    assert result["sync_mode"] == "incremental"
+    assert FakeIngestor.ingested == ["c.txt"]
+    assert "c" in sync.store.files("root")
+    assert sync.store.pending_files("root") == {}
+
+
+def test_removing_one_of_two_identical_files_keeps_the_shared_article(drive, monkeypatch):
+    service, sync = drive
+    service.add("a2", "a-kopia.txt", "root")
+
+    class DedupingIngestor(FakeIngestor):
+        def ingest_many(self, articles, source_type, *, on_result=None):
+            for article in articles:
+                FakeIngestor.ingested.append(article["title"])
+                # Same content as "a": the ingestor reports it unchanged under a's article
+                file_id = "a" if article["drive_file"]["id"] == "a2" else article["drive_file"]["id"]
+                status = "unchanged" if file_id != article["drive_file"]["id"] else "added"
+                on_result(article, {"article_id": f"art-{file_id}", "chunks_added": 1, "status": status})
+
+    monkeypatch.setattr(drive_sync, "CorpusIngestor", DedupingIngestor)
+    sync.sync("root", "own")
+    assert sync.store.files("root")["a2"]["article_id"] == "art-a"
+
+    service.change("a2", trashed=True)
+    result = sync.sync("root", "own")
+
+    assert result["articles_deleted"] == 0
+    assert FakeIngestor.removed == []
+    assert set(sync.store.files("root")) == {"a", "b"}
+
+    service.change("a", trashed=True)
+    result = sync.sync("root", "own")
+
+    assert result["articles_deleted"] == 1
+    assert FakeIngestor.removed == ["art-a"]
@@ -0,0 +1,82 @@
+import io
+
+import pymupdf
+import pytest
+from docx import Document
+
+from bond.corpus.chunker import chunk_article, chunk_stream
+from bond.corpus.sources import file_source
+
+_PARAGRAPH = (
+    "Akapit {index} opisuje szczegółowo proces redakcyjny, od pierwszego szkicu "
+    "po publikację, z przykładami z praktyki zespołu numer {index}."
+)
+
+
+def _pdf_bytes(pages: int) -> bytes:
+    doc = pymupdf.open()
+    for page_index in range(pages):
+        page = doc.new_page()
+        text = "\n".join(_PARAGRAPH.format(index=f"{page_index}-{i}") for i in range(6))
+        page.insert_textbox(pymupdf.Rect(40, 40, 560, 800), text, fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture(autouse=True)
+def in_process_extraction(monkeypatch):
+    monkeypatch.setattr(file_source.settings, "extract_workers", 0)
+    yield
+    file_source.shutdown_extract_pool()
+
+
+def test_chunk_stream_matches_chunk_article_and_covers_long_documents():
+    short = [_PARAGRAPH.format(index=i) for i in range(3)]
+    assert list(chunk_stream(short)) == chunk_article("\n\n".join(short))
+
+    pieces = [_PARAGRAPH.format(index=i) for i in range(400)]
+    chunks = list(chunk_stream(pieces))
+    streamed_text = "".join(chunks)
+    assert all(len(chunk) <= 1875 for chunk in chunks)
+    assert all(_PARAGRAPH.format(index=i) in streamed_text for i in range(400))
+
+
+def test_extract_chunks_reads_pdf_pages_and_docx_from_path(tmp_path):
+    pdf_path = tmp_path / "raport.pdf"
+    pdf_path.write_bytes(_pdf_bytes(3))
+    docx = Document()
+    for i in range(4):
+        docx.add_paragraph(_PARAGRAPH.format(index=i))
+    buffer = io.BytesIO()
+    docx.save(buffer)
+
+    pdf_chunks = file_source.extract_chunks(str(pdf_path), "raport.pdf")
+    docx_chunks = file_source.extract_chunks(buffer.getvalue(), "notatki.docx")
+
+    assert pdf_chunks and "Akapit 2-5" in "".join(pdf_chunks)
+    assert docx_chunks and "Akapit 3" in "".join(docx_chunks)
+    assert file_source.extract_chunks(b"%PDF-1.4 broken", "zepsuty.pdf") is None
+    assert file_source.extract_chunks(b"krotki", "krotki.txt") == []
+
+
+def test_extract_chunks_rejects_oversize_before_parsing(monkeypatch):
+    monkeypatch.setattr(file_source, "MAX_FILE_SIZE", 10)
+    monkeypatch.setattr(
+        file_source, "_extract_chunks_worker", lambda *args: pytest.fail("must not parse")
+    )
+
+    assert file_source.extract_chunks(b"x" * 11, "big.txt") is None
+
+
+def test_process_pool_extraction_times_out_and_recovers(monkeypatch):
+    monkeypatch.setattr(file_source.settings, "extract_workers", 1)
+    pdf = _pdf_bytes(2)
+
+    # a fresh spawn worker cannot even start within 1 ms
+    monkeypatch.setattr(file_source.settings, "extract_timeout_seconds", 0.001)
+    assert file_source.extract_chunks(pdf, "wolny.pdf") is None
+
+    monkeypatch.setattr(file_source.settings, "extract_timeout_seconds", 60.0)
+    chunks = file_source.extract_chunks(pdf, "raport.pdf")
+    assert chunks and "Akapit 1-5" in "".join(chunks)
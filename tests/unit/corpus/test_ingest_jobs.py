@@ -0,0 +1,152 @@
+import json
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from bond.api.routes.corpus import router
+from bond.corpus import jobs
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    job_queue = jobs.IngestJobQueue(str(tmp_path / "jobs.db"), workers=2)
+    monkeypatch.setattr(jobs, "_queue", job_queue)
+    monkeypatch.setattr("bond.api.routes.corpus.settings.allow_private_url_ingest", True)
+    yield job_queue
+    job_queue.shutdown()
+
+
+@pytest.fixture
+def client(queue):
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def _wait_for(queue, job_id, statuses=jobs.TERMINAL_STATUSES, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} stuck in {queue.get(job_id)['status']}")
+
+
+def _fake_ingest_blog(articles: int, gate: threading.Event | None = None):
+    def fake(url, source_type, *, on_result=None):
+        for i in range(articles):
+            if gate is not None and i == 1:
+                gate.wait(5)
+            on_result({"source_url": f"{url}/{i}"}, {"chunks_added": 2, "status": "added"})
+        return {"articles_ingested": articles, "total_chunks": 2 * articles, "warnings": []}
+    return fake
+
+
+def test_background_url_ingest_returns_job_and_reports_progress(client, queue, monkeypatch):
+    monkeypatch.setattr("bond.api.routes.corpus.ingest_blog", _fake_ingest_blog(3))
+
+    response = client.post(
+        "/api/corpus/ingest/url?background=true",
+        json={"url": "http://127.0.0.1/blog", "source_type": "external"},
+    )
+
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    _wait_for(queue, job_id)
+
+    job = client.get(f"/api/corpus/jobs/{job_id}").json()
+    assert job["status"] == "succeeded"
+    assert job["progress"] == {
+        "articles_done": 3,
+        "chunks_added": 6,
+        "articles_unchanged": 0,
+        "warnings": [],
+    }
+    assert job["result"]["total_chunks"] == 6
+    assert [j["job_id"] for j in client.get("/api/corpus/jobs").json()] == [job_id]
+
+
+def test_cancel_stops_running_job_at_next_article(client, queue, monkeypatch):
+    gate = threading.Event()
+    monkeypatch.setattr("bond.api.routes.corpus.ingest_blog", _fake_ingest_blog(5, gate))
+
+    job_id = client.post(
+        "/api/corpus/ingest/url?background=true",
+        json={"url": "http://127.0.0.1/blog", "source_type": "external"},
+    ).json()["job_id"]
+    _wait_for(queue, job_id, statuses={"running"})
+
+    assert client.post(f"/api/corpus/jobs/{job_id}/cancel").status_code == 200
+    gate.set()
+    job = _wait_for(queue, job_id)
+
+    assert job["status"] == "cancelled"
+    assert job["progress"]["articles_done"] == 2
+
+
+def test_unfinished_jobs_resume_after_restart(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "jobs.db")
+    store = jobs.JobStore(db_path)
+    job = store.create("text", {"text": "Treść", "title": "Tytuł", "source_type": "own"})
+    # the previous process died mid-run
+    store.update(job["job_id"], status=jobs.RUNNING)
+    store.close()
+    monkeypatch.setattr(
+        "bond.api.routes.corpus.ingest_text",
+        lambda text, source_type, title: {"article_id": "a1", "chunks_added": 4, "status": "added"},
+    )
+
+    restarted = jobs.IngestJobQueue(db_path, workers=1)
+    try:
+        assert restarted.resume() == 1
+        finished = _wait_for(restarted, job["job_id"])
+    finally:
+        restarted.shutdown()
+
+    assert finished["status"] == "succeeded"
+    assert finished["result"]["article_id"] == "a1"
+    assert finished["progress"]["chunks_added"] == 4
+
+
+def test_job_events_stream_progress_until_done(client, queue, monkeypatch):
+    monkeypatch.setattr("bond.api.routes.corpus.ingest_blog", _fake_ingest_blog(2))
+    job_id = client.post(
+        "/api/corpus/ingest/url?background=true",
+        json={"url": "http://127.0.0.1/blog", "source_type": "external"},
+    ).json()["job_id"]
+
+    with client.stream("GET", f"/api/corpus/jobs/{job_id}/events") as response:
+        body = "".join(response.iter_text())
+
+    events = [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+    assert events[-1]["status"] == "succeeded"
+    assert events[-1]["progress"]["articles_done"] == 2
+    assert client.get("/api/corpus/jobs/missing").status_code == 404
+
+
+def test_background_file_upload_is_spooled_and_removed(client, queue, tmp_path, monkeypatch):
+    upload_dir = tmp_path / "uploads"
+    monkeypatch.setattr("bond.api.routes.corpus.settings.ingest_upload_dir", str(upload_dir))
+    seen: list[bytes] = []
+
+    def fake_extract(source, filename):
+        with open(source, "rb") as f:
+            seen.append(f.read())
+        return None
+
+    monkeypatch.setattr("bond.api.routes.corpus.extract_chunks", fake_extract)
+
+    job_id = client.post(
+        "/api/corpus/ingest/file?background=true",
+        data={"source_type": "own"},
+        files={"file": ("notes.txt", b"abc", "text/plain")},
+    ).json()["job_id"]
+    job = _wait_for(queue, job_id)
+
+    assert job["status"] == "succeeded"
+    assert seen == [b"abc"]
+    assert list(upload_dir.iterdir()) == []
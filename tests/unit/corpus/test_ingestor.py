@@ -0,0 +1,193 @@
+from bond.corpus import ingestor as ingestor_module
+from bond.corpus.ingestor import CorpusIngestor
+from bond.store import article_log
+
+
+class FakeCollection:
+    """In-memory stand-in for the Chroma corpus collection; "embeds" by counting."""
+
+    def __init__(self):
+        self.add_calls: list[dict] = []
+        self.rows: dict[str, dict] = {}
+        self.embedded: list[str] = []
+
+    def upsert(self, *, documents, metadatas, ids, embeddings=None):
+        if embeddings is None:
+            self.add_calls.append({"documents": documents, "metadatas": metadatas, "ids": ids})
+            self.embedded.extend(documents)
+            embeddings = [f"emb:{document}" for document in documents]
+        for chunk_id, document, metadata, embedding in zip(ids, documents, metadatas, embeddings):
+            self.rows[chunk_id] = {"document": document, "metadata": metadata, "embedding": embedding}
+
+    def update(self, *, ids, metadatas):
+        for chunk_id, metadata in zip(ids, metadatas):
+            self.rows[chunk_id]["metadata"] = metadata
+
+    def get(self, *, where, include):
+        wanted = set(where["article_id"]["$in"])
+        ids = [chunk_id for chunk_id, row in self.rows.items() if row["metadata"]["article_id"] in wanted]
+        return {
+            "ids": ids,
+            "metadatas": [self.rows[chunk_id]["metadata"] for chunk_id in ids],
+            "embeddings": [self.rows[chunk_id]["embedding"] for chunk_id in ids],
+        }
+
+    def delete(self, *, ids=None, where=None):
+        if where is not None:
+            wanted = set(where["article_id"]["$in"])
+            ids = [chunk_id for chunk_id, row in self.rows.items() if row["metadata"]["article_id"] in wanted]
+        for chunk_id in ids:
+            self.rows.pop(chunk_id, None)
+
+
+def _install_fakes(monkeypatch, chunks_by_text: dict[str, list[str]]):
+    collection = FakeCollection()
+    logged: list[list[tuple]] = []
+    monkeypatch.setattr(ingestor_module, "get_or_create_corpus_collection", lambda: collection)
+    monkeypatch.setattr(ingestor_module, "log_articles", lambda rows: logged.append(list(rows)))
+    monkeypatch.setattr(ingestor_module, "find_articles", lambda urls, hashes: [])
+    monkeypatch.setattr(ingestor_module, "delete_articles", lambda ids: None)
+    monkeypatch.setattr(ingestor_module, "chunk_article", lambda text: chunks_by_text[text])
+    monkeypatch.setattr(ingestor_module.settings, "ingest_chunk_workers", 0)
+    return collection, logged
+
+
+def test_ingest_many_batches_chroma_writes_and_logs_in_one_transaction(monkeypatch):
+    chunks_by_text = {
+        "A": ["a0", "a1", "a2"],
+        "B": [],
+        "C": ["c0", "c1"],
+    }
+    collection, logged = _install_fakes(monkeypatch, chunks_by_text)
+    monkeypatch.setattr(ingestor_module.settings, "ingest_embed_batch_size", 2)
+
+    results = CorpusIngestor().ingest_many(
+        [
+            {"text": "A", "title": "Artykuł A", "source_url": "https://example.com/a"},
+            {"text": "B", "title": "Artykuł B", "source_url": "https://example.com/b"},
+            {"text": "C", "title": "Artykuł C", "source_url": ""},
+        ],
+        source_type="own",
+    )
+
+    assert [r["chunks_added"] for r in results] == [3, 0, 2]
+    assert results[1]["article_id"] == ""
+    assert [len(call["documents"]) for call in collection.add_calls] == [2, 2, 1]
+
+    all_ids = [chunk_id for call in collection.add_calls for chunk_id in call["ids"]]
+    a_id, c_id = results[0]["article_id"], results[2]["article_id"]
+    assert all_ids == [f"{a_id}_0", f"{a_id}_1", f"{a_id}_2", f"{c_id}_0", f"{c_id}_1"]
+
+    all_metas = [meta for call in collection.add_calls for meta in call["metadatas"]]
+    assert [meta["section_type"] for meta in all_metas] == [
+        "wstęp",
+        "rozwinięcie",
+        "rozwinięcie",
+        "wstęp",
+        "rozwinięcie",
+    ]
+
+    assert len(logged) == 1
+    assert [(row[0], row[2], row[4]) for row in logged[0]] == [
+        (a_id, "Artykuł A", 3),
+        (c_id, "Artykuł C", 2),
+    ]
+
+
+def test_ingest_many_consumes_iterables_lazily_and_reports_each_article(monkeypatch):
+    monkeypatch.setattr(ingestor_module, "_ARTICLE_WINDOW", 2)
+    texts = [f"T{i}" for i in range(5)]
+    collection, logged = _install_fakes(monkeypatch, {t: [f"{t}-chunk"] for t in texts})
+
+    produced: list[str] = []
+    reported: list[str] = []
+
+    def articles():
+        for text in texts:
+            produced.append(text)
+            yield {"text": text, "title": text, "source_url": ""}
+
+    def on_result(article, result):
+        # each window is committed before the next one is pulled from the producer
+        assert len(produced) <= len(reported) + 2
+        reported.append(article["title"])
+
+    results = CorpusIngestor().ingest_many(articles(), source_type="external", on_result=on_result)
+
+    assert reported == texts
+    assert len(results) == 5
+    assert len(logged) == 3
+
+
+def test_ingest_delegates_to_bulk_path(monkeypatch):
+    collection, logged = _install_fakes(monkeypatch, {"tekst": ["jeden", "dwa"]})
+
+    result = CorpusIngestor().ingest(text="tekst", title="Tytuł", source_type="own")
+
+    assert result["chunks_added"] == 2
+    assert collection.add_calls[0]["ids"] == [f"{result['article_id']}_0", f"{result['article_id']}_1"]
+    assert logged[0][0][1:5] == ("own", "Tytuł", "", 2)
+    assert result["status"] == "added"
+
+
+def test_reingest_skips_unchanged_and_replaces_only_changed_chunks(monkeypatch, tmp_path):
+    chunks_by_text = {
+        "v1": ["wstęp", "środek", "koniec"],
+        "v2": ["nowy wstęp", "wstęp", "środek"],
+        "inny": ["zupełnie inny tekst"],
+    }
+    collection, _ = _install_fakes(monkeypatch, chunks_by_text)
+    monkeypatch.setattr(article_log.settings, "article_db_path", str(tmp_path / "articles.db"))
+    for name in ("log_articles", "find_articles", "delete_articles"):
+        monkeypatch.setattr(ingestor_module, name, getattr(article_log, name))
+
+    url = "https://example.com/wpis"
+    first = CorpusIngestor().ingest(text="v1", title="Wpis", source_type="external", source_url=url)
+    again = CorpusIngestor().ingest(text="v1", title="Wpis", source_type="external", source_url=url)
+    copy_without_url = CorpusIngestor().ingest(text="v1", title="Kopia", source_type="external")
+
+    assert first["status"] == "added"
+    assert again == {"article_id": first["article_id"], "chunks_added": 0, "status": "unchanged"}
+    assert copy_without_url["status"] == "unchanged"
+    assert collection.embedded == ["wstęp", "środek", "koniec"]
+
+    collection.embedded.clear()
+    changed = CorpusIngestor().ingest(text="v2", title="Wpis", source_type="external", source_url=url)
+
+    article_id = first["article_id"]
+    assert changed == {"article_id": article_id, "chunks_added": 3, "status": "updated"}
+    # only the genuinely new chunk is embedded; moved chunks reuse stored vectors
+    assert collection.embedded == ["nowy wstęp"]
+    assert sorted(collection.rows) == [f"{article_id}_0", f"{article_id}_1", f"{article_id}_2"]
+    assert [collection.rows[f"{article_id}_{i}"]["document"] for i in range(3)] == chunks_by_text["v2"]
+    assert collection.rows[f"{article_id}_1"]["embedding"] == "emb:wstęp"
+    assert collection.rows[f"{article_id}_1"]["metadata"]["section_type"] == "rozwinięcie"
+
+    articles = article_log.get_articles()
+    assert len(articles) == 1
+    assert article_log.get_chunk_count() == 3
+
+
+def test_reingest_collapses_legacy_duplicates_of_same_url(monkeypatch, tmp_path):
+    collection, _ = _install_fakes(monkeypatch, {"tekst": ["jeden", "dwa"], "krótki": ["jeden"]})
+    monkeypatch.setattr(article_log.settings, "article_db_path", str(tmp_path / "articles.db"))
+    for name in ("log_articles", "find_articles", "delete_articles"):
+        monkeypatch.setattr(ingestor_module, name, getattr(article_log, name))
+
+    url = "https://example.com/wpis"
+    # two copies ingested before content hashing existed
+    for legacy_id in ("old-a", "old-b"):
+        article_log.log_article(legacy_id, "external", "Wpis", url, 2)
+        collection.upsert(
+            ids=[f"{legacy_id}_0", f"{legacy_id}_1"],
+            documents=["jeden", "dwa"],
+            metadatas=[{"article_id": legacy_id}, {"article_id": legacy_id}],
+        )
+    collection.embedded.clear()
+
+    result = CorpusIngestor().ingest(text="krótki", title="Wpis", source_type="external", source_url=url)
+
+    assert result["status"] == "updated"
+    kept = result["article_id"]
+    assert sorted(collection.rows) == [f"{kept}_0"]
+    assert [row["article_id"] for row in article_log.get_articles()] == [kept]
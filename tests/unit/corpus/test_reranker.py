@@ -0,0 +1,75 @@
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from bond.corpus.reranker import RerankService
+
+
+class FakeRanker:
+    """Tokenizer/session stand-in: the logit of a pair is its passage length."""
+
+    def __init__(self):
+        self.batch_sizes: list[int] = []
+        self.tokenizer = SimpleNamespace(encode_batch=self._encode_batch)
+        self.session = SimpleNamespace(run=self._run)
+
+    def _encode_batch(self, pairs):
+        return [
+            SimpleNamespace(ids=[len(passage)], type_ids=[0], attention_mask=[1])
+            for _, passage in pairs
+        ]
+
+    def _run(self, _outputs, onnx_input):
+        self.batch_sizes.append(len(onnx_input["input_ids"]))
+        return [onnx_input["input_ids"].astype(np.float32) / 10]
+
+
+def _service(**kwargs) -> tuple[RerankService, FakeRanker]:
+    service = RerankService("fake-model", "/tmp/unused", **kwargs)
+    ranker = FakeRanker()
+    service._ranker = ranker
+    return service, ranker
+
+
+def test_rerank_orders_by_score_and_reuses_cached_pairs():
+    service, ranker = _service(batch_window_ms=0)
+    candidates = [{"text": "aa", "id": 1}, {"text": "aaaa", "id": 2}, {"text": "a", "id": 3}]
+
+    first = service.rerank("temat", candidates, top_n=2)
+    second = service.rerank("temat", candidates + [{"text": "aaa", "id": 4}], top_n=2)
+
+    assert [c["id"] for c in first] == [2, 1]
+    assert [c["id"] for c in second] == [2, 4]
+    # the regeneration only scores the one new passage
+    assert ranker.batch_sizes == [3, 1]
+    assert service.stats()["hits"] == 3
+
+
+def test_scores_match_flashrank_sigmoid():
+    service, _ = _service(batch_window_ms=0)
+
+    scores = service.score("temat", ["a" * 10])
+
+    assert scores[0] == pytest.approx(1 / (1 + np.exp(-1.0)))
+
+
+def test_concurrent_sessions_are_micro_batched_into_one_model_run():
+    service, ranker = _service(batch_window_ms=200, max_batch_pairs=64)
+    barrier = threading.Barrier(4)
+    results: dict[int, list[float]] = {}
+
+    def session(index: int) -> None:
+        barrier.wait()
+        results[index] = service.score(f"temat {index}", ["x" * (index + 1), "y" * 10])
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert ranker.batch_sizes == [8]
+    assert service.stats()["batches"] == 1
+    assert results[2][0] < results[2][1]
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from bond.corpus import retriever
+
+
+class FakeEmbeddingFunction:
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def embed_query(self, input):
+        self.calls.append(list(input))
+        return [np.array([1.0, 0.0], dtype=np.float32)]
+
+
+class FakeCollection:
+    """Rows sorted by distance; honours n_results and a source_type where filter."""
+
+    def __init__(self, rows: list[tuple[str, str, float]]):
+        self.rows = sorted(rows, key=lambda row: row[2])
+        self.queries: list[dict] = []
+        self.count_calls = 0
+
+    def count(self):
+        self.count_calls += 1
+        return len(self.rows)
+
+    def query(self, *, n_results, include, query_embeddings=None, query_texts=None, where=None):
+        self.queries.append({"n_results": n_results, "where": where, "texts": query_texts})
+        rows = [row for row in self.rows if where is None or row[1] == where["source_type"]]
+        rows = rows[:n_results]
+        return {
+            "documents": [[row[0] for row in rows]],
+            "metadatas": [[{"source_type": row[1]} for row in rows]],
+            "distances": [[row[2] for row in rows]],
+        }
+
+
+@pytest.fixture
+def install(monkeypatch):
+    def _install(rows, mode="concurrent"):
+        collection = FakeCollection(rows)
+        ef = FakeEmbeddingFunction()
+        monkeypatch.setattr(retriever, "get_or_create_corpus_collection", lambda: collection)
+        monkeypatch.setattr(retriever, "get_embedding_function", lambda: ef)
+        monkeypatch.setattr(retriever.settings, "retrieval_mode", mode)
+        monkeypatch.setattr(retriever.settings, "retrieval_overfetch_factor", 2)
+        return collection, ef
+
+    return _install
+
+
+MIXED = [
+    ("ext-1", "external", 0.05),
+    ("own-1", "own", 0.10),
+    ("ext-2", "external", 0.15),
+    ("own-2", "own", 0.20),
+    ("ext-3", "external", 0.25),
+    ("ext-4", "external", 0.30),
+]
+
+
+@pytest.mark.parametrize("mode", ["concurrent", "overfetch"])
+async def test_fill_keeps_own_before_external_and_embeds_once(install, mode):
+    collection, ef = install(MIXED, mode)
+
+    fragments = await retriever.two_pass_retrieve("zapytanie", n=4)
+
+    assert [f["text"] for f in fragments] == ["own-1", "own-2", "ext-1", "ext-2"]
+    assert retriever.rerank(fragments) == fragments
+    assert ef.calls == [["zapytanie"]]
+    assert collection.count_calls == 1
+    assert all(query["texts"] is None for query in collection.queries)
+
+
+@pytest.mark.parametrize("mode", ["concurrent", "overfetch"])
+async def test_external_fallback_when_no_own_fragments(install, mode):
+    install([row for row in MIXED if row[1] == "external"], mode)
+
+    fragments = await retriever.two_pass_retrieve("zapytanie", n=3)
+
+    assert [f["text"] for f in fragments] == ["ext-1", "ext-2", "ext-3"]
+
+
+async def test_overfetch_uses_single_query_when_own_fills_all_slots(install):
+    rows = [(f"own-{i}", "own", 0.1 * i) for i in range(1, 5)] + [("ext-1", "external", 0.9)]
+    collection, _ = install(rows, "overfetch")
+
+    fragments = await retriever.two_pass_retrieve("zapytanie", n=2)
+
+    assert [f["text"] for f in fragments] == ["own-1", "own-2"]
+    assert collection.queries == [{"n_results": 4, "where": None, "texts": None}]
+
+
+async def test_empty_collection_skips_embedding(install):
+    collection, ef = install([])
+
+    assert await retriever.two_pass_retrieve("zapytanie", n=3) == []
+    assert ef.calls == []
+    assert collection.queries == []
@@ -0,0 +1,94 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from bond import llm
+from bond.config import settings
+from bond.db import llm_cache
+
+
+class CountingChatModel(BaseChatModel):
+    """Deterministic chat model that counts how often it is really called."""
+
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "counting"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        message = AIMessage(
+            content=f"odpowiedź na: {messages[-1].content}",
+            usage_metadata={"input_tokens": 1000, "output_tokens": 200, "total_tokens": 1200},
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+@pytest.fixture
+def cache_settings(tmp_path, monkeypatch):
+    fake = settings.model_copy(
+        update={
+            "metadata_db_path": str(tmp_path / "llm_cache.db"),
+            "llm_cache_enabled": True,
+            "llm_cache_ttl_days": 7,
+            "llm_cache_shadow_annotate": False,
+        }
+    )
+    monkeypatch.setattr("bond.db.llm_cache.settings", fake)
+    monkeypatch.setattr("bond.llm.settings", fake)
+    monkeypatch.setattr(llm_cache, "_stats", {**llm_cache._stats, "hits": 0, "misses": 0, "writes": 0})
+    monkeypatch.setattr(llm, "_cache_usage", {})
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_identical_prompt_is_served_from_cache_and_not_billed(cache_settings):
+    model = CountingChatModel(cache=llm.ResponseCache("synthesis", "gpt-4o-mini"))
+
+    first = await model.ainvoke("Temat: automatyzacja redakcji")
+    second = await model.ainvoke("Temat: automatyzacja redakcji")
+    other = await model.ainvoke("Temat: inny")
+
+    assert model.calls == 2
+    assert second.content == first.content
+    assert llm.response_usage(first) == (1000, 200)
+    assert llm.response_usage(second) == (0, 0)
+    assert llm.response_usage(other) == (1000, 200)
+    stats = llm.get_llm_cache_stats()
+    assert (stats["hits"], stats["writes"]) == (1, 2)
+    assert stats["tokens_avoided"] == 1200
+    assert stats["sites"]["synthesis"]["tokens_paid"] == 2400
+    assert stats["cost_avoided_usd"] == pytest.approx(llm.estimate_cost_usd("gpt-4o-mini", 1000, 200))
+
+
+def test_cache_is_opt_in_per_site_and_temperature_zero_only(cache_settings, monkeypatch):
+    assert isinstance(llm.response_cache("structure", "gpt-4o", 0), llm.ResponseCache)
+    assert llm.response_cache("structure", "gpt-4o", 0.7) is None
+    assert llm.response_cache(None, "gpt-4o", 0) is None
+    assert llm.response_cache("shadow_annotate", "gpt-4o", 0) is None
+
+    monkeypatch.setattr(cache_settings, "llm_cache_enabled", False)
+    assert llm.response_cache("structure", "gpt-4o", 0) is None
+
+
+@pytest.mark.asyncio
+async def test_sweep_drops_expired_then_least_recently_used(cache_settings, monkeypatch):
+    for key in ("old", "a", "b", "c"):
+        await llm_cache.save_llm_response(key, "structure", "gpt-4o", "x" * 5000)
+    stamp = (datetime.now(timezone.utc) - timedelta(days=8)).isoformat()
+    with sqlite3.connect(cache_settings.metadata_db_path) as conn:
+        conn.execute("UPDATE llm_cache SET cached_at = ? WHERE cache_key = 'old'", (stamp,))
+        size = conn.execute("SELECT payload_size FROM llm_cache WHERE cache_key = 'a'").fetchone()[0]
+    assert await llm_cache.get_llm_response("old") is None
+    assert await llm_cache.get_llm_response("a") is not None  # most recently used
+
+    monkeypatch.setattr(cache_settings, "llm_cache_max_bytes", 2 * size)
+    result = await llm_cache.sweep_llm_cache()
+
+    assert (result["expired"], result["evicted"], result["entries"]) == (1, 1, 2)
+    assert await llm_cache.get_llm_response("a") is not None
@@ -0,0 +1,137 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from bond.config import settings
+from bond.db import search_cache
+
+
+@pytest.fixture
+def cache_db(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "search_cache.db")
+    monkeypatch.setattr(
+        "bond.db.search_cache.settings",
+        settings.model_copy(update={"metadata_db_path": db_path, "search_cache_ttl_days": 7}),
+    )
+    monkeypatch.setattr(
+        search_cache,
+        "_stats",
+        {
+            **search_cache._stats,
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "semantic_hits": 0,
+            "semantic_similarity_sum": 0.0,
+        },
+    )
+    return db_path
+
+
+def _age_entry(db_path: str, query_hash: str, days: int) -> None:
+    stamp = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "UPDATE search_cache SET cached_at = ?, last_used_at = ? WHERE query_hash = ?",
+            (stamp, stamp, query_hash),
+        )
+
+
+@pytest.mark.asyncio
+async def test_payload_is_stored_compressed_and_counted(cache_db):
+    results = "## Źródło\n" + "Exa markdown z wynikami wyszukiwania. " * 200
+
+    await search_cache.save_cached_result("h1", results, "t1")
+
+    assert await search_cache.get_cached_result("h1") == results
+    assert await search_cache.get_cached_result("missing") is None
+    with sqlite3.connect(cache_db) as conn:
+        payload, fmt, size = conn.execute(
+            "SELECT payload, format, payload_size FROM search_cache WHERE query_hash = 'h1'"
+        ).fetchone()
+    assert fmt == search_cache.FORMAT_ZLIB
+    assert size == len(payload) < len(results.encode("utf-8")) // 10
+    stats = search_cache.get_search_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_sweeper_drops_expired_rows_then_evicts_least_recently_used(cache_db, monkeypatch):
+    for name in ("old", "a", "b", "c"):
+        await search_cache.save_cached_result(name, f"{name} " * 50)
+    _age_entry(cache_db, "old", days=8)
+    _age_entry(cache_db, "a", days=3)
+    _age_entry(cache_db, "b", days=2)
+    assert await search_cache.get_cached_result("a") is not None  # a becomes most recently used
+
+    with sqlite3.connect(cache_db) as conn:
+        sizes = dict(conn.execute("SELECT query_hash, payload_size FROM search_cache").fetchall())
+    monkeypatch.setattr(search_cache.settings, "search_cache_max_bytes", sizes["a"] + sizes["c"])
+
+    swept = await search_cache.sweep_search_cache()
+
+    assert swept["expired"] == 1
+    assert swept["evicted"] == 1
+    with sqlite3.connect(cache_db) as conn:
+        left = {row[0] for row in conn.execute("SELECT query_hash FROM search_cache")}
+    assert left == {"a", "c"}
+    assert search_cache.get_search_cache_stats()["total_bytes"] == sizes["a"] + sizes["c"]
+
+
+@pytest.mark.asyncio
+async def test_uncompressed_table_is_converted_in_place(cache_db):
+    cached_at = datetime.now(timezone.utc).isoformat()
+    with sqlite3.connect(cache_db) as conn:
+        conn.execute(
+            "CREATE TABLE search_cache (query_hash TEXT NOT NULL PRIMARY KEY, thread_id TEXT, "
+            "results_json TEXT NOT NULL, cached_at TEXT NOT NULL)"
+        )
+        conn.execute("INSERT INTO search_cache VALUES ('h', 't', '{\"r\": 1}', ?)", (cached_at,))
+
+    assert await search_cache.get_cached_result("h") == '{"r": 1}'
+    with sqlite3.connect(cache_db) as conn:
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(search_cache)")}
+    assert "idx_search_cache_cached_at" in indexes
+
+
+def test_semantic_text_ignores_case_punctuation_and_keyword_order():
+    assert search_cache.semantic_text("Jak wdrożyć AI w redakcji?", ["SEO", "automatyzacja"]) == (
+        search_cache.semantic_text("jak wdrożyć AI w redakcji", ["Automatyzacja", "seo"])
+    )
+
+
+@pytest.mark.asyncio
+async def test_semantic_lookup_reuses_nearest_entry_above_threshold(cache_db):
+    await search_cache.save_cached_result(
+        "h-ai", "wyniki o AI", topic_text="ai", embedding=[1.0, 0.0, 0.0], embedding_model="m"
+    )
+    await search_cache.save_cached_result(
+        "h-seo", "wyniki o SEO", topic_text="seo", embedding=[0.0, 2.0, 0.0], embedding_model="m"
+    )
+    await search_cache.save_cached_result("h-plain", "bez embeddingu")
+
+    assert await search_cache.get_cached_result("other-hash") is None
+    match = await search_cache.find_similar_result([0.1, 0.99, 0.0], "m", threshold=0.9)
+    assert match[:2] == ("wyniki o SEO", "h-seo")
+    assert match[2] == pytest.approx(0.995, abs=1e-3)
+    assert await search_cache.find_similar_result([0.7, 0.7, 0.1], "m", threshold=0.9) is None
+    assert await search_cache.find_similar_result([0.0, 1.0, 0.0], "other-model", threshold=0.5) is None
+
+    with sqlite3.connect(cache_db) as conn:
+        recorded = conn.execute(
+            "SELECT last_similarity FROM search_cache WHERE query_hash = 'h-seo'"
+        ).fetchone()[0]
+    assert recorded == pytest.approx(match[2])
+    stats = search_cache.get_search_cache_stats()
+    assert stats["semantic_hits"] == 1
+    assert stats["reuse_rate"] == 1.0
+    assert stats["mean_semantic_similarity"] == pytest.approx(match[2], abs=1e-4)
+
+
+def test_semantic_reuse_requires_same_keywords_and_numbers():
+    text = search_cache.semantic_text
+    assert search_cache.semantic_reuse_allowed(text("Trendy SEO 2025", ["SEO"]), text("trendy seo 2025!", ["seo"]))
+    assert not search_cache.semantic_reuse_allowed(text("Trendy SEO 2025", ["SEO"]), text("Trendy SEO 2026", ["SEO"]))
+    assert not search_cache.semantic_reuse_allowed(text("Trendy SEO", ["SEO"]), text("Trendy SEO", ["SEO", "AI"]))
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from bond.config import settings
+from bond.db import metadata_log, pool, search_cache
+
+
+@pytest.fixture
+def metadata_db(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "pooled_metadata.db")
+    fake_settings = type("S", (), {"metadata_db_path": db_path})()
+    monkeypatch.setattr("bond.db.metadata_log.settings", fake_settings)
+    monkeypatch.setattr(
+        "bond.db.search_cache.settings", settings.model_copy(update={"metadata_db_path": db_path})
+    )
+    return db_path
+
+
+@pytest.mark.asyncio
+async def test_pool_runs_migrations_once_and_reuses_tuned_connections(metadata_db, monkeypatch):
+    calls: list[str] = []
+
+    async def counting_migration(conn):
+        calls.append("run")
+
+    monkeypatch.setattr(pool, "_MIGRATIONS", [*pool._MIGRATIONS, counting_migration])
+
+    async with pool.sqlite_pools(metadata_db, size=2):
+        open_pool = pool.get_pool(metadata_db)
+        assert open_pool is not None
+
+        row_ids = await asyncio.gather(
+            *(metadata_log.save_article_metadata(f"t{i}", f"Temat {i}") for i in range(6))
+        )
+        query_hash = search_cache.compute_query_hash("Temat", ["a"])
+        await search_cache.save_cached_result(query_hash, '{"r": 1}', "t0")
+
+        assert sorted(row_ids) == list(range(1, 7))
+        assert await search_cache.get_cached_result(query_hash) == '{"r": 1}'
+        assert len(await metadata_log.get_recent_articles(limit=10)) == 6
+        assert calls == ["run"]
+
+        async with open_pool.acquire() as conn:
+            cursor = await conn.execute("PRAGMA journal_mode")
+            assert (await cursor.fetchone())[0] == "wal"
+        assert len(open_pool._connections) == 2
+
+    assert pool.get_pool(metadata_db) is None
+    # outside the lifespan calls fall back to one-shot connections, still without re-migrating
+    assert len(await metadata_log.get_recent_articles(limit=10)) == 6
+    assert calls == ["run"]
+
+
+@pytest.mark.asyncio
+async def test_failed_operation_does_not_leave_pooled_transaction_open(metadata_db):
+    async with pool.sqlite_pools(metadata_db, size=1):
+        with pytest.raises(RuntimeError):
+            async with pool.connection(metadata_db) as conn:
+                await conn.execute(
+                    "INSERT INTO metadata_log (thread_id, topic, published_date, created_at) "
+                    "VALUES ('t', 'x', 'd', 'd')"
+                )
+                raise RuntimeError("boom")
+
+        assert await metadata_log.get_recent_articles(limit=10) == []
+
+
+@pytest.mark.asyncio
+async def test_legacy_search_cache_table_is_migrated(metadata_db):
+    import sqlite3
+
+    with sqlite3.connect(metadata_db) as conn:
+        conn.execute(
+            "CREATE TABLE search_cache (query_hash TEXT NOT NULL, thread_id TEXT NOT NULL, "
+            "results_json TEXT NOT NULL, timestamp TEXT NOT NULL, PRIMARY KEY (query_hash, thread_id))"
+        )
+
+    await search_cache.save_cached_result("h", "[]", "t")
+
+    assert await search_cache.get_cached_result("h") == "[]"
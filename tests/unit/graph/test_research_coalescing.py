@@ -0,0 +1,214 @@
+import asyncio
+
+import pytest
+
+from bond.config import settings
+from bond.db import search_cache
+from bond.graph.nodes import researcher
+from bond.singleflight import SingleFlight
+
+
+def _research_data():
+    return researcher.ResearchData(
+        fakty=["Fakt"],
+        statystyki=["50% — udział"],
+        zrodla=[
+            researcher.SourceItem(title=f"Źródło {i}", url=f"https://example.com/{i}", summary="Opis")
+            for i in range(3)
+        ],
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_research_runs_exa_and_synthesis_once(monkeypatch):
+    calls = {"queries": 0, "exa": 0, "synthesis": 0, "saved": 0}
+
+    async def fake_sub_queries(topic, keywords):
+        calls["queries"] += 1
+        await asyncio.sleep(0.05)
+        return researcher.ResearchQueries(general="a", stats="b", case_study="c")
+
+    async def fake_exa(query, keywords, num_results=8):
+        calls["exa"] += 1
+        return f"1. Wynik {query}\nhttps://example.com/{query}\n"
+
+    async def fake_synthesize(raw_results, topic, keywords, context_block=""):
+        calls["synthesis"] += 1
+        await asyncio.sleep(0.05)
+        return _research_data(), 100, 50
+
+    async def fake_save(query_hash, results, thread_id=""):
+        calls["saved"] += 1
+
+    async def miss(query_hash):
+        return None
+
+    async def semantic_miss(topic, keywords):
+        return {}, None
+
+    monkeypatch.setattr(researcher, "_generate_sub_queries", fake_sub_queries)
+    monkeypatch.setattr(researcher, "_call_exa_mcp", fake_exa)
+    monkeypatch.setattr(researcher, "_synthesize_structured", fake_synthesize)
+    monkeypatch.setattr(researcher, "get_cached_result", miss)
+    monkeypatch.setattr(researcher, "_semantic_lookup", semantic_miss)
+    monkeypatch.setattr(researcher, "save_cached_result", fake_save)
+
+    states = [
+        {"topic": "Automatyzacja redakcji", "keywords": ["AI"], "thread_id": f"t{i}"}
+        for i in range(3)
+    ]
+    results = await asyncio.gather(*(researcher.researcher_node(state) for state in states))
+
+    assert calls == {"queries": 1, "exa": 3, "synthesis": 1, "saved": 1}
+    assert len({r["research_report"] for r in results}) == 1
+    assert sorted(r["tokens_used_research"] for r in results) == [0, 0, 150]
+    assert researcher._research_flight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_singleflight_shares_errors_and_recovers_from_cancelled_leader():
+    flight = SingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("exa down")
+
+    outcomes = await asyncio.gather(flight.do("k", boom), flight.do("k", boom), return_exceptions=True)
+    assert [type(o) for o in outcomes] == [RuntimeError, RuntimeError]
+
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(10)
+
+    async def fast():
+        return "ok"
+
+    leader = asyncio.create_task(flight.do("k", slow))
+    await started.wait()
+    follower = asyncio.create_task(flight.do("k", fast))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == ("ok", False)
+    assert flight.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_lease_follower_waits_for_other_workers_result(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "lease.db")
+    monkeypatch.setattr(
+        "bond.db.search_cache.settings", settings.model_copy(update={"metadata_db_path": db_path})
+    )
+    monkeypatch.setattr(researcher.settings, "research_lease_enabled", True)
+    monkeypatch.setattr(researcher.settings, "search_cache_semantic_enabled", False)
+    monkeypatch.setattr(researcher.settings, "research_lease_poll_seconds", 0.01)
+
+    async def must_not_search(*args):
+        pytest.fail("follower must not search Exa")
+
+    monkeypatch.setattr(researcher, "_search_and_store", must_not_search)
+    query_hash = search_cache.compute_query_hash("Temat", ["a"])
+    assert await search_cache.acquire_research_lease(query_hash, "other-worker", 60)
+    assert not await search_cache.acquire_research_lease(query_hash, "me", 60)
+
+    async def other_worker_finishes():
+        await asyncio.sleep(0.05)
+        await search_cache.save_cached_result(query_hash, "wyniki innego procesu")
+        await search_cache.release_research_lease(query_hash, "other-worker")
+
+    result, _ = await asyncio.gather(
+        researcher._fetch_raw_results("Temat", ["a"], "t1", query_hash), other_worker_finishes()
+    )
+
+    assert result == "wyniki innego procesu"
+    # an expired lease is taken over
+    assert await search_cache.acquire_research_lease(query_hash, "crashed", -1)
+    assert await search_cache.acquire_research_lease(query_hash, "me", 60)
+
+
+@pytest.mark.asyncio
+async def test_cosmetic_topic_variant_reuses_cached_search(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "semantic.db")
+    monkeypatch.setattr(
+        "bond.db.search_cache.settings", settings.model_copy(update={"metadata_db_path": db_path})
+    )
+    monkeypatch.setattr(researcher.settings, "search_cache_semantic_enabled", True)
+
+    class FakeEmbeddings:
+        model_name = "fake"
+
+        def embed_query(self, texts):
+            # identical vectors for texts that normalize the same way
+            return [[float(len(texts[0])), 1.0]]
+
+    monkeypatch.setattr(researcher, "get_embedding_function", lambda: FakeEmbeddings())
+    searches: list[str] = []
+
+    async def fake_search(topic, keywords, thread_id, query_hash, index=None):
+        searches.append(topic)
+        await search_cache.save_cached_result(query_hash, f"wyniki: {topic}", thread_id, **index)
+        return f"wyniki: {topic}"
+
+    monkeypatch.setattr(researcher, "_search_and_store", fake_search)
+
+    first = "Marketing treści w B2B"
+    variant = "marketing treści w b2b?"
+    for topic in (first, variant):
+        await researcher._fetch_raw_results(topic, ["SEO"], "t", search_cache.compute_query_hash(topic, ["SEO"]))
+
+    assert searches == [first]
+
+
+@pytest.mark.asyncio
+async def test_near_miss_topics_only_reuse_above_threshold_with_same_keywords_and_numbers(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "near-miss.db")
+    monkeypatch.setattr(
+        "bond.db.search_cache.settings", settings.model_copy(update={"metadata_db_path": db_path})
+    )
+    assert type(settings).model_fields["search_cache_semantic_enabled"].default is False
+    monkeypatch.setattr(researcher.settings, "search_cache_semantic_enabled", True)
+    monkeypatch.setattr(researcher.settings, "search_cache_semantic_threshold", 0.92)
+
+    vectors = {
+        "zalety marketingu treści w 2025": [1.0, 0.0],
+        "wady marketingu treści w 2025": [0.85, 0.53],  # cosine ≈ 0.85, below the threshold
+        "zalety content marketingu w 2025": [0.98, 0.2],  # cosine ≈ 0.98, above it
+        "zalety marketingu treści w 2026": [1.0, 0.0],  # identical vector, different year
+    }
+
+    class FakeEmbeddings:
+        model_name = "fake"
+
+        def embed_query(self, texts):
+            return [vectors[texts[0].split(" | ")[0]]]
+
+    monkeypatch.setattr(researcher, "get_embedding_function", lambda: FakeEmbeddings())
+    searches: list[tuple[str, tuple[str, ...]]] = []
+
+    async def fake_search(topic, keywords, thread_id, query_hash, index=None):
+        searches.append((topic, tuple(keywords)))
+        await search_cache.save_cached_result(query_hash, f"wyniki: {topic}", thread_id, **index)
+        return f"wyniki: {topic}"
+
+    monkeypatch.setattr(researcher, "_search_and_store", fake_search)
+
+    async def research(topic, keywords):
+        return await researcher._fetch_raw_results(
+            topic, keywords, "t", search_cache.compute_query_hash(topic, keywords)
+        )
+
+    seed = "Zalety marketingu treści w 2025"
+    await research(seed, ["SEO"])
+    assert await research("Wady marketingu treści w 2025", ["SEO"]) == "wyniki: Wady marketingu treści w 2025"
+    assert await research("Zalety content marketingu w 2025", ["SEO"]) == f"wyniki: {seed}"
+    assert await research("Zalety content marketingu w 2025", ["SEO", "B2B"]) != f"wyniki: {seed}"
+    assert await research("Zalety marketingu treści w 2026", ["SEO"]) != f"wyniki: {seed}"
+
+    assert [topic for topic, _ in searches] == [
+        seed,
+        "Wady marketingu treści w 2025",
+        "Zalety content marketingu w 2025",
+        "Zalety marketingu treści w 2026",
+    ]
@@ -1,8 +1,10 @@
 import sys
 from pathlib import Path
+from types import SimpleNamespace
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
+from bond.prompts import research_context
 from bond.prompts.research_context import (
     RESEARCH_CONTEXT_OMISSION_MARKER,
     iter_research_context_variants,
@@ -80,3 +82,111 @@ def test_final_fallback_uses_explicit_omission_marker_instead_of_raw_substring()
     assert RESEARCH_CONTEXT_OMISSION_MARKER in final_variant.content
     assert "REPORT_TAIL_SENTINEL" not in final_variant.content
     assert "SUMMARY_TAIL" not in final_variant.content
+
+
+class _WordEncoding:
+    """Local-tokenizer stand-in: one token per whitespace-separated word."""
+
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, text, disallowed_special=()):
+        self.encoded += 1
+        return text.split()
+
+
+def _many_sources_data(count: int) -> dict:
+    data = _research_data()
+    data["zrodla"] = [
+        {"title": f"Źródło {i}", "url": f"https://example.com/{i}", "summary": "opis " * (i % 7 + 3)}
+        for i in range(1, count + 1)
+    ]
+    return data
+
+
+def _linear_selection(report, data, budget, token_counter):
+    for index, variant in enumerate(iter_research_context_variants(report, data)):
+        if token_counter(variant.content) <= budget:
+            return index
+    return None
+
+
+def test_selection_matches_linear_scan_with_few_token_counts(monkeypatch):
+    encoding = _WordEncoding()
+    monkeypatch.setattr(research_context, "_local_encoding", lambda llm: encoding)
+    report = "Raport " * 2000
+    data = _many_sources_data(40)
+    llm = SimpleNamespace(max_tokens=0)
+
+    def words(prompt):
+        return len(f"Nagłówek promptu.\n{prompt}".split())
+
+    for budget in (20, 60, 150, 320, 700, 5000):
+        monkeypatch.setattr(
+            research_context, "get_available_input_tokens", lambda *args, budget=budget, **kwargs: budget
+        )
+        counted: list[str] = []
+
+        def build(research_context_text):
+            counted.append(research_context_text)
+            return f"Nagłówek promptu.\n{research_context_text}"
+
+        selection = research_context.select_research_context(
+            llm=llm, research_report=report, research_data=data, build_prompt_payload=build
+        )
+
+        expected = _linear_selection(report, data, budget, words)
+        assert selection.fit_found is (expected is not None)
+        if expected is not None:
+            assert selection.variant_index == expected
+        assert len(set(counted)) <= 6  # of 42 variants
+
+
+def test_selection_without_local_tokenizer_uses_model_counter(monkeypatch):
+    monkeypatch.setattr(research_context, "_local_encoding", lambda llm: None)
+    data = _many_sources_data(12)
+    calls: list[str] = []
+
+    def count(text):
+        calls.append(text)
+        return len(text.split())
+
+    llm = SimpleNamespace(max_tokens=0, get_num_tokens=count)
+    monkeypatch.setattr(research_context, "get_available_input_tokens", lambda *args, **kwargs: 110)
+
+    selection = research_context.select_research_context(
+        llm=llm, research_report="", research_data=data, build_prompt_payload=lambda text: text
+    )
+
+    assert selection.variant_index == _linear_selection("", data, 110, lambda text: len(text.split()))
+    assert len(calls) < 13
+
+
+def test_token_memo_keeps_digests_of_parts_not_assembled_prompts(monkeypatch):
+    encoding = _WordEncoding()
+    monkeypatch.setattr(research_context, "_local_encoding", lambda llm: encoding)
+    monkeypatch.setattr(research_context, "get_available_input_tokens", lambda *args, **kwargs: 300)
+    monkeypatch.setattr(research_context, "_token_counts", research_context.OrderedDict())
+    system_prompt = SimpleNamespace(type="system", content="Instrukcja systemowa " * 50)
+    data = _many_sources_data(40)
+
+    def build(research_context_text):
+        return [system_prompt, SimpleNamespace(type="human", content=research_context_text)]
+
+    research_context.select_research_context(
+        llm=SimpleNamespace(max_tokens=0), research_report="", research_data=data, build_prompt_payload=build
+    )
+    memo = research_context._token_counts
+    size = len(memo)
+    encoded = encoding.encoded
+
+    # 40 source lines + the system prompt; keys are digests, never prompt text
+    assert size == 41
+    assert all(isinstance(digest, bytes) and len(digest) == 16 for _, digest in memo)
+
+    research_context.select_research_context(
+        llm=SimpleNamespace(max_tokens=0), research_report="", research_data=data, build_prompt_payload=build
+    )
+    assert len(memo) == size
+    # second run re-encodes only the assembled human prompts it probes
+    assert encoding.encoded - encoded < 10
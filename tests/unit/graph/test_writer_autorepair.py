@@ -253,3 +253,73 @@ async def test_writer_successful_first_pass_skips_autorepair_prompt(monkeypatch)
     assert "FEEDBACK I WYMAGANE POPRAWKI" not in first_prompt
     assert result["draft_validated"] is True
     assert result["draft_validation_details"]["attempt_count"] == 1
+
+
+class FakeStreamingDraftModel(FakeDraftModel):
+    def __init__(self, streams: list[list[str]]):
+        super().__init__([])
+        self.streams = streams
+        self.consumed: list[int] = []
+
+    async def astream(self, messages):
+        index = len(self.invocations)
+        self.invocations.append(messages)
+        self.consumed.append(0)
+        chunks = self.streams[index]
+        for position, piece in enumerate(chunks):
+            self.consumed[index] += 1
+            last = position == len(chunks) - 1
+            yield SimpleNamespace(
+                content=piece,
+                usage_metadata={"input_tokens": 10, "output_tokens": 20} if last else None,
+            )
+
+
+@pytest.mark.asyncio
+async def test_streaming_validation_stops_attempt_and_restarts_with_failures(monkeypatch):
+    meta = "Meta-description: " + ("AI marketing w praktyce firm " * 6)[:155].rstrip()
+    body = "AI marketing pomaga zespołom planować kampanie na podstawie danych. " * 4
+    fake_llm = FakeStreamingDraftModel(
+        [
+            [f"{meta}\n\n", "# Tytuł bez frazy\n", "\n", body, "\n\n## Sekcja\n\n", body],
+            [f"{meta}\n\n", "# AI marketing w firmie\n\n", body, "\n\n## Sekcja\n\n", body],
+        ]
+    )
+    monkeypatch.setattr(
+        writer,
+        "settings",
+        writer.settings.model_copy(update={"writer_stream_validation": True, "min_word_count": 20}),
+    )
+    monkeypatch.setattr(writer, "get_article_count", lambda: writer.settings.low_corpus_threshold)
+    monkeypatch.setattr(writer, "get_draft_llm", lambda **kwargs: fake_llm)
+    monkeypatch.setattr(writer, "_fetch_rag_exemplars", lambda topic, n=5: [])
+    monkeypatch.setattr(writer, "build_context_block", lambda context: "")
+    monkeypatch.setattr(writer, "estimate_cost_usd", lambda *args, **kwargs: 0.25)
+
+    result = await writer.writer_node(
+        {
+            "topic": "Temat testowy",
+            "keywords": ["AI marketing"],
+            "heading_structure": "# H1\n## H2",
+            "research_report": "Raport",
+        }
+    )
+
+    assert fake_llm.consumed == [3, 5]
+    second_prompt = fake_llm.invocations[1][1].content
+    assert "POPRAWKI WZGLĘDEM POPRZEDNIEJ PRÓBY" in second_prompt
+    assert 'H1 musi zawierać główne słowo kluczowe "AI marketing".' in second_prompt
+    assert "OBECNY DRAFT" not in second_prompt
+    assert result["draft_validated"] is True
+    assert result["draft"].startswith(meta)
+    assert result["draft_validation_details"]["attempts"] == [
+        {
+            "attempt_number": 1,
+            "passed": False,
+            "failed_codes": ["keyword_in_h1"],
+            "aborted_early": True,
+        },
+        {"attempt_number": 2, "passed": True, "failed_codes": []},
+    ]
+    # Aborted attempt: local estimate (100 + 100); completed attempt: reported usage
+    assert result["tokens_used_draft"] == 230
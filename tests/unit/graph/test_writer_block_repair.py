@@ -0,0 +1,145 @@
+import importlib
+import sys
+import types
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+fake_langchain_anthropic = types.ModuleType("langchain_anthropic")
+fake_langchain_anthropic.ChatAnthropic = object
+sys.modules.setdefault("langchain_anthropic", fake_langchain_anthropic)
+
+fake_langchain_openai = types.ModuleType("langchain_openai")
+fake_langchain_openai.ChatOpenAI = object
+sys.modules.setdefault("langchain_openai", fake_langchain_openai)
+
+fake_chroma = types.ModuleType("bond.store.chroma")
+fake_chroma.get_corpus_collection = lambda: None
+sys.modules.setdefault("bond.store.chroma", fake_chroma)
+
+sys.modules.pop("bond.graph.nodes.writer", None)
+writer = importlib.import_module("bond.graph.nodes.writer")
+
+_BODY = ("AI marketing pozwala małej firmie planować kampanie na podstawie danych sprzedażowych. " * 3).strip()
+_SECTION = f"## Od czego zacząć\n\n{_BODY}"
+_DRAFT = f"Meta-description: Za krótki opis.\n\n# Marketing w małej firmie\n\n{_BODY}\n\n{_SECTION}"
+_NEW_META = ("Jak AI marketing pomaga małej firmie planować kampanie na podstawie danych sprzedażowych " * 2)[:155].rstrip()
+
+
+class FakeModel:
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls: list[tuple[dict, str]] = []
+        self.max_tokens = 4096
+        self.runnable = SimpleNamespace(profile={"max_input_tokens": 30_000})
+        self.fallbacks = []
+
+    def get_num_tokens_from_messages(self, messages) -> int:
+        return 100
+
+    def get_num_tokens(self, text: str) -> int:
+        return 100
+
+    async def ainvoke(self, messages, config=None):
+        metadata = (config or {}).get("metadata", {})
+        self.calls.append((metadata, messages[1].content))
+        content = self.responses(metadata)
+        return SimpleNamespace(content=content, usage_metadata={"input_tokens": 10, "output_tokens": 20})
+
+
+def test_block_repair_codes_keep_global_failures_for_regeneration():
+    codes = ["word_count_ok", "meta_desc_length_ok", "no_forbidden_words", "keyword_in_h1"]
+    assert writer._block_repair_codes(codes) == ["meta_desc_length_ok", "keyword_in_h1"]
+
+
+@pytest.mark.asyncio
+async def test_local_failures_are_fixed_block_by_block_on_the_small_model(monkeypatch):
+    draft_llm = FakeModel(lambda metadata: _DRAFT)
+    repair_llm = FakeModel(
+        lambda metadata: {
+            "meta_desc_length_ok": f"Meta-description: {_NEW_META}",
+            "keyword_in_h1": "# AI marketing w małej firmie",
+        }[metadata["writer_repair"]]
+    )
+    costs = []
+    monkeypatch.setattr(
+        writer,
+        "settings",
+        writer.settings.model_copy(update={"writer_block_repair_enabled": True, "min_word_count": 40}),
+    )
+    monkeypatch.setattr(writer, "get_article_count", lambda: writer.settings.low_corpus_threshold)
+    monkeypatch.setattr(writer, "get_draft_llm", lambda **kwargs: draft_llm)
+    monkeypatch.setattr(writer, "get_research_llm", lambda **kwargs: repair_llm)
+    monkeypatch.setattr(writer, "_fetch_rag_exemplars", lambda topic, n=5: [])
+    monkeypatch.setattr(writer, "build_context_block", lambda context: "")
+    monkeypatch.setattr(
+        writer,
+        "estimate_cost_usd",
+        lambda model, input_tokens, output_tokens: costs.append((model, input_tokens, output_tokens)) or 0.25,
+    )
+
+    result = await writer.writer_node(
+        {
+            "topic": "Marketing w małej firmie",
+            "keywords": ["AI marketing"],
+            "heading_structure": "# H1\n## Od czego zacząć",
+            "research_report": "Raport",
+        }
+    )
+
+    assert len(draft_llm.calls) == 1
+    assert sorted(metadata["writer_repair"] for metadata, _ in repair_llm.calls) == [
+        "keyword_in_h1",
+        "meta_desc_length_ok",
+    ]
+    assert all(_SECTION not in prompt for _, prompt in repair_llm.calls)
+    assert result["draft"] == f"Meta-description: {_NEW_META}\n\n# AI marketing w małej firmie\n\n{_BODY}\n\n{_SECTION}"
+    assert result["draft_validated"] is True
+    assert result["draft_validation_details"]["attempt_count"] == 1
+    assert result["tokens_used_draft"] == 3 * 30
+    assert costs == [
+        (writer.settings.draft_model, 10, 20),
+        (writer.settings.research_model, 20, 40),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failed_repair_call_leaves_its_block_to_the_template_repairs(monkeypatch):
+    def respond(metadata):
+        if metadata.get("writer_repair") == "keyword_in_h1":
+            raise TimeoutError("small model timed out")
+        if "writer_repair" in metadata:
+            return f"Meta-description: {_NEW_META}"
+        return _DRAFT
+
+    draft_llm = FakeModel(respond)
+    repair_llm = FakeModel(respond)
+    monkeypatch.setattr(
+        writer,
+        "settings",
+        writer.settings.model_copy(update={"writer_block_repair_enabled": True, "min_word_count": 40}),
+    )
+    monkeypatch.setattr(writer, "get_article_count", lambda: writer.settings.low_corpus_threshold)
+    monkeypatch.setattr(writer, "get_draft_llm", lambda **kwargs: draft_llm)
+    monkeypatch.setattr(writer, "get_research_llm", lambda **kwargs: repair_llm)
+    monkeypatch.setattr(writer, "_fetch_rag_exemplars", lambda topic, n=5: [])
+    monkeypatch.setattr(writer, "build_context_block", lambda context: "")
+    monkeypatch.setattr(writer, "estimate_cost_usd", lambda *args, **kwargs: 0.25)
+
+    result = await writer.writer_node(
+        {
+            "topic": "Marketing w małej firmie",
+            "keywords": ["AI marketing"],
+            "heading_structure": "# H1\n## Od czego zacząć",
+            "research_report": "Raport",
+        }
+    )
+
+    assert len(draft_llm.calls) == 1
+    assert result["draft"].startswith(f"Meta-description: {_NEW_META}\n\n")
+    # the H1 the small model failed to rewrite is fixed by the template repair instead
+    assert result["draft_validated"] is True
+    assert result["draft_validation_details"]["attempt_count"] == 1
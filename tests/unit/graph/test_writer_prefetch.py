@@ -0,0 +1,137 @@
+import importlib
+import sys
+import types
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+fake_langchain_anthropic = types.ModuleType("langchain_anthropic")
+fake_langchain_anthropic.ChatAnthropic = object
+sys.modules.setdefault("langchain_anthropic", fake_langchain_anthropic)
+
+fake_langchain_openai = types.ModuleType("langchain_openai")
+fake_langchain_openai.ChatOpenAI = object
+sys.modules.setdefault("langchain_openai", fake_langchain_openai)
+
+fake_chroma = types.ModuleType("bond.store.chroma")
+fake_chroma.get_corpus_collection = lambda: None
+sys.modules.setdefault("bond.store.chroma", fake_chroma)
+
+sys.modules.pop("bond.graph.nodes.writer", None)
+writer = importlib.import_module("bond.graph.nodes.writer")
+
+_BODY = ("AI marketing pozwala małej firmie planować kampanie na podstawie danych sprzedażowych. " * 3).strip()
+_META = "Meta-description: " + ("AI marketing w małej firmie krok po kroku " * 5)[:155].rstrip()
+_DRAFT = f"{_META}\n\n# AI marketing w małej firmie\n\n{_BODY}\n\n## Od czego zacząć\n\n{_BODY}"
+_EXEMPLAR = {"article_type": "poradnik", "section_type": "wstęp", "text": "Fragment wzorcowego artykułu o kampaniach."}
+
+
+class FakeDraftModel:
+    def __init__(self):
+        self.prompts: list[str] = []
+        self.max_tokens = 4096
+        self.runnable = SimpleNamespace(profile={"max_input_tokens": 30_000})
+        self.fallbacks = []
+
+    def get_num_tokens_from_messages(self, messages) -> int:
+        return 100
+
+    def get_num_tokens(self, text: str) -> int:
+        return 100
+
+    async def ainvoke(self, messages, config=None):
+        self.prompts.append(messages[1].content)
+        return SimpleNamespace(content=_DRAFT, usage_metadata={"input_tokens": 10, "output_tokens": 20})
+
+
+def _state(outline: str) -> dict:
+    return {
+        "thread_id": "prefetch-thread",
+        "topic": "AI marketing w małej firmie",
+        "keywords": ["AI marketing"],
+        "heading_structure": outline,
+        "research_report": "Raport",
+    }
+
+
+@pytest.fixture
+def prefetch_env(monkeypatch):
+    calls = {"exemplars": 0, "corpus": 0, "selections": 0}
+    fake_llm = FakeDraftModel()
+
+    def fetch_exemplars(topic, n=5):
+        calls["exemplars"] += 1
+        return [_EXEMPLAR]
+
+    def article_count():
+        calls["corpus"] += 1
+        return writer.settings.low_corpus_threshold
+
+    select = writer._select_writer_research_context
+
+    def counting_select(*args, **kwargs):
+        calls["selections"] += 1
+        return select(*args, **kwargs)
+
+    monkeypatch.setattr(
+        writer,
+        "settings",
+        writer.settings.model_copy(update={"writer_prefetch_enabled": True, "min_word_count": 40}),
+    )
+    monkeypatch.setattr(writer, "get_article_count", article_count)
+    monkeypatch.setattr(writer, "get_draft_llm", lambda **kwargs: fake_llm)
+    monkeypatch.setattr(writer, "_fetch_rag_exemplars", fetch_exemplars)
+    monkeypatch.setattr(writer, "_select_writer_research_context", counting_select)
+    monkeypatch.setattr(writer, "build_context_block", lambda context: "")
+    monkeypatch.setattr(writer, "estimate_cost_usd", lambda *args, **kwargs: 0.25)
+    yield calls, fake_llm
+    writer._writer_prefetches.clear()
+
+
+def test_fingerprint_ignores_outline_whitespace_only():
+    outline = "# H1\n## Od czego zacząć\n## Narzędzia"
+    base = writer._writer_inputs_fingerprint(_state(outline), "")
+
+    assert writer._writer_inputs_fingerprint(_state("# H1\n\n##  Od czego zacząć \n## Narzędzia\n"), "") == base
+    assert writer._writer_inputs_fingerprint(_state("# H1\n## Od czego zacząć\n## Koszty"), "") != base
+
+
+@pytest.mark.asyncio
+async def test_writer_consumes_inputs_prefetched_during_checkpoint_1(prefetch_env):
+    calls, fake_llm = prefetch_env
+    state = _state("# AI marketing w małej firmie\n## Od czego zacząć")
+
+    writer.prefetch_writer_inputs(state)
+    writer.prefetch_writer_inputs(state)  # checkpoint_1 re-runs on resume
+    writer._writer_prefetches[state["thread_id"]].future.result(timeout=5)
+    assert calls == {"exemplars": 1, "corpus": 1, "selections": 1}
+
+    result = await writer.writer_node(state)
+
+    assert calls == {"exemplars": 1, "corpus": 1, "selections": 1}
+    assert _EXEMPLAR["text"] in fake_llm.prompts[0]
+    assert result["draft_validated"] is True
+    assert state["thread_id"] not in writer._writer_prefetches
+
+
+@pytest.mark.asyncio
+async def test_outline_edit_refits_research_context_but_keeps_exemplars(prefetch_env):
+    calls, fake_llm = prefetch_env
+    first = _state("# AI marketing w małej firmie\n## Od czego zacząć")
+    edited = _state("# AI marketing w małej firmie\n## Od czego zacząć\n## Jak mierzyć efekty")
+
+    writer.prefetch_writer_inputs(first)
+    writer.prefetch_writer_inputs(edited)  # rejected at checkpoint 1, new outline shown
+    writer._writer_prefetches[edited["thread_id"]].future.result(timeout=5)
+    assert calls["exemplars"] == 1
+    assert calls["selections"] == 2
+
+    # The prefetch no longer matches this outline: only its research-context fit is redone
+    await writer.writer_node(first)
+
+    assert calls["exemplars"] == 1
+    assert calls["selections"] == 3
+    assert "## Jak mierzyć efekty" not in fake_llm.prompts[0]
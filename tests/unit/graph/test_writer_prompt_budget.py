@@ -251,3 +251,69 @@ async def test_writer_low_corpus_reject_still_short_circuits_before_budgeting(
         "draft_validated": False,
         "draft_validation_details": None,
     }
+
+
+@pytest.mark.asyncio
+async def test_writer_rechecks_budget_with_exemplars_fetched_off_the_event_loop(
+    monkeypatch,
+):
+    import asyncio
+    import time
+
+    def token_counter(payload) -> int:
+        text = _payload_text(payload)
+        tokens = 140
+        if "EXEMPLAR_SENTINEL" in text:
+            tokens += 30
+        for marker in ("Źródło 1", "Źródło 2", "Źródło 3"):
+            if marker in text:
+                tokens += 25
+        return tokens
+
+    fake_llm = FakeDraftModel(max_input_tokens=4_696, token_counter=token_counter)
+
+    def slow_exemplars(topic, n=5):
+        time.sleep(0.2)  # blocking Chroma + FlashRank stand-in
+        return [{"text": "EXEMPLAR_SENTINEL", "article_type": "own", "section_type": "wstęp"}]
+
+    monkeypatch.setattr(
+        writer,
+        "get_article_count",
+        lambda: writer.settings.low_corpus_threshold,
+    )
+    monkeypatch.setattr(writer, "get_draft_llm", lambda **kwargs: fake_llm)
+    monkeypatch.setattr(writer, "_fetch_rag_exemplars", slow_exemplars)
+    monkeypatch.setattr(writer, "build_context_block", lambda context: "")
+    monkeypatch.setattr(
+        writer, "_validate_draft", lambda draft, keyword, min_words: _valid_report(keyword, min_words)
+    )
+    monkeypatch.setattr(writer, "estimate_cost_usd", lambda *args, **kwargs: 0.25)
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    try:
+        await writer.writer_node(
+            {
+                "topic": "Temat",
+                "keywords": ["fraza"],
+                "heading_structure": "# H1\n## H2",
+                "research_report": "",
+                "research_data": _research_data(),
+            }
+        )
+    finally:
+        ticker_task.cancel()
+
+    human_message = fake_llm.invocations[0][1].content
+    assert ticks >= 5
+    assert "EXEMPLAR_SENTINEL" in human_message
+    # 2 sources fit without exemplars (190 <= 200) but not with them (220)
+    assert "Źródło 1" in human_message
+    assert "Źródło 2" not in human_message
@@ -0,0 +1,126 @@
+import asyncio
+import importlib
+import sys
+import types
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+fake_langchain_anthropic = types.ModuleType("langchain_anthropic")
+fake_langchain_anthropic.ChatAnthropic = object
+sys.modules.setdefault("langchain_anthropic", fake_langchain_anthropic)
+
+fake_langchain_openai = types.ModuleType("langchain_openai")
+fake_langchain_openai.ChatOpenAI = object
+sys.modules.setdefault("langchain_openai", fake_langchain_openai)
+
+fake_chroma = types.ModuleType("bond.store.chroma")
+fake_chroma.get_corpus_collection = lambda: None
+sys.modules.setdefault("bond.store.chroma", fake_chroma)
+
+sys.modules.pop("bond.graph.nodes.writer", None)
+writer = importlib.import_module("bond.graph.nodes.writer")
+
+_OUTLINE = """# AI marketing w małej firmie
+
+## Od czego zacząć
+### Audyt danych
+Uwaga redaktora: krótko.
+
+## Narzędzia i koszty
+
+## Jak mierzyć efekty"""
+
+_META = "Meta-description: " + ("AI marketing w małej firmie krok po kroku " * 5)[:155].rstrip()
+_BODY = "AI marketing pozwala małej firmie planować kampanie na podstawie danych sprzedażowych. " * 3
+
+
+class FakeSectionModel:
+    def __init__(self, delays: dict[int, float]):
+        self.delays = delays
+        self.calls: list[tuple[int, str, str]] = []
+        self.running = 0
+        self.max_running = 0
+        self.max_tokens = 4096
+        self.runnable = SimpleNamespace(profile={"max_input_tokens": 30_000})
+        self.fallbacks = []
+
+    def get_num_tokens_from_messages(self, messages) -> int:
+        return 100
+
+    def get_num_tokens(self, text: str) -> int:
+        return 100
+
+    async def ainvoke(self, messages, config=None):
+        section = config["metadata"]["writer_section"]
+        self.calls.append((section, messages[0].content, messages[1].content))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(self.delays.get(section, 0))
+        self.running -= 1
+        if section == 0:
+            content = f"{_META}\n\n# AI marketing w małej firmie\n\n{_BODY}"
+        else:
+            heading = [line for line in _OUTLINE.splitlines() if line.startswith("## ")][section - 1]
+            # Section 2 forgets its heading; the stitcher restores it
+            content = _BODY if section == 2 else f"{heading}\n\n{_BODY}"
+        return SimpleNamespace(content=content, usage_metadata={"input_tokens": 10, "output_tokens": 20})
+
+
+def test_parse_outline_keeps_h3_and_notes_with_their_section():
+    h1_line, sections = writer._parse_outline(_OUTLINE)
+
+    assert h1_line == "# AI marketing w małej firmie"
+    assert [section.heading for section in sections] == [
+        "## Od czego zacząć",
+        "## Narzędzia i koszty",
+        "## Jak mierzyć efekty",
+    ]
+    assert sections[0].outline == "## Od czego zacząć\n### Audyt danych\nUwaga redaktora: krótko."
+
+
+@pytest.mark.asyncio
+async def test_sectional_mode_writes_sections_concurrently_and_stitches_in_outline_order(monkeypatch):
+    fake_llm = FakeSectionModel(delays={0: 0.03, 1: 0.02, 2: 0.0, 3: 0.01})
+    monkeypatch.setattr(
+        writer,
+        "settings",
+        writer.settings.model_copy(
+            update={"writer_sectional_enabled": True, "writer_section_concurrency": 2, "min_word_count": 40}
+        ),
+    )
+    monkeypatch.setattr(writer, "get_article_count", lambda: writer.settings.low_corpus_threshold)
+    monkeypatch.setattr(writer, "get_draft_llm", lambda **kwargs: fake_llm)
+    monkeypatch.setattr(writer, "_fetch_rag_exemplars", lambda topic, n=5: [])
+    monkeypatch.setattr(writer, "build_context_block", lambda context: "")
+    monkeypatch.setattr(writer, "estimate_cost_usd", lambda *args, **kwargs: 0.25)
+
+    result = await writer.writer_node(
+        {
+            "topic": "AI marketing w małej firmie",
+            "keywords": ["AI marketing"],
+            "heading_structure": _OUTLINE,
+            "research_report": "Raport",
+        }
+    )
+
+    assert sorted(call[0] for call in fake_llm.calls) == [0, 1, 2, 3]
+    assert fake_llm.max_running == 2
+    prompts = {section: (system, user) for section, system, user in fake_llm.calls}
+    assert prompts[0][0] == writer.WRITER_SYSTEM_PROMPT
+    assert prompts[1][0] == writer.WRITER_SECTION_SYSTEM_PROMPT
+    assert "Pierwsza linia odpowiedzi: ## Od czego zacząć" in prompts[1][1]
+    assert "### Audyt danych" in prompts[1][1]
+
+    draft = result["draft"]
+    positions = [
+        draft.index(marker)
+        for marker in ("Meta-description:", "# AI marketing", "## Od czego", "## Narzędzia", "## Jak mierzyć")
+    ]
+    assert positions == sorted(positions)
+    assert result["draft_validated"] is True
+    assert result["draft_validation_details"]["attempt_count"] == 1
+    assert result["tokens_used_draft"] == 4 * 30
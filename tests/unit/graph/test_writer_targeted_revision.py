@@ -0,0 +1,153 @@
+import importlib
+import sys
+import types
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+fake_langchain_anthropic = types.ModuleType("langchain_anthropic")
+fake_langchain_anthropic.ChatAnthropic = object
+sys.modules.setdefault("langchain_anthropic", fake_langchain_anthropic)
+
+fake_langchain_openai = types.ModuleType("langchain_openai")
+fake_langchain_openai.ChatOpenAI = object
+sys.modules.setdefault("langchain_openai", fake_langchain_openai)
+
+fake_chroma = types.ModuleType("bond.store.chroma")
+fake_chroma.get_corpus_collection = lambda: None
+sys.modules.setdefault("bond.store.chroma", fake_chroma)
+
+sys.modules.pop("bond.graph.nodes.writer", None)
+writer = importlib.import_module("bond.graph.nodes.writer")
+
+_META = "Meta-description: " + ("AI marketing w małej firmie krok po kroku " * 5)[:155].rstrip()
+_BODY = ("AI marketing pozwala małej firmie planować kampanie na podstawie danych sprzedażowych. " * 3).strip()
+
+_DRAFT = f"""{_META}
+
+# AI marketing w małej firmie
+
+{_BODY}
+
+## Od czego zacząć
+
+{_BODY}
+
+### Audyt danych
+
+{_BODY}
+
+## Narzędzia i koszty
+
+{_BODY}
+
+```text
+## to nie jest nagłówek
+```
+
+## Jak mierzyć efekty
+
+{_BODY}"""
+
+
+class FakeRevisionModel:
+    def __init__(self):
+        self.calls: list[tuple[int, str, str]] = []
+        self.max_tokens = 4096
+        self.runnable = SimpleNamespace(profile={"max_input_tokens": 30_000})
+        self.fallbacks = []
+
+    def get_num_tokens_from_messages(self, messages) -> int:
+        return 100
+
+    def get_num_tokens(self, text: str) -> int:
+        return 100
+
+    async def ainvoke(self, messages, config=None):
+        self.calls.append((config["metadata"]["writer_section"], messages[0].content, messages[1].content))
+        # The model drops the heading and runs on into an extra H2; both are corrected
+        content = f"Nowa treść z cenami narzędzi. {_BODY}\n\n## Dodatkowa sekcja\n\nNie powinna trafić do draftu."
+        return SimpleNamespace(content=content, usage_metadata={"input_tokens": 10, "output_tokens": 20})
+
+
+def test_split_sections_is_lossless_and_ignores_fenced_headings():
+    sections = writer.split_sections(_DRAFT)
+
+    assert [section.heading for section in sections] == [
+        "",
+        "## Od czego zacząć",
+        "## Narzędzia i koszty",
+        "## Jak mierzyć efekty",
+    ]
+    assert "".join(_DRAFT[section.start : section.end] for section in sections) == _DRAFT
+
+
+@pytest.mark.parametrize(
+    ("feedback", "expected"),
+    [
+        ('Sekcja "Narzędzia i koszty" jest zbyt ogólna, dodaj ceny.', [2]),
+        ("Rozwiń narzędzia i podaj koszty wdrożenia.", [2]),
+        ("Druga sekcja jest za krótka, a wstęp zbyt długi.", [0, 2]),
+        ("Sekcja 3: dodaj przykłady wskaźników.", [3]),
+        ("W ostatniej sekcji brakuje liczb.", [3]),
+        ("Cały tekst jest zbyt formalny, popraw narzędzia.", None),
+        ("Dodaj więcej konkretów.", None),
+        ("Popraw wstęp, zacznij od, narzędzi i kosztów, a potem rozwiń jak mierzyć efekty i od czego zacząć.", None),
+    ],
+)
+def test_target_sections_maps_feedback_to_sections(feedback, expected):
+    sections = writer.split_sections(_DRAFT)
+    assert writer._target_sections(feedback, _DRAFT, sections, "AI marketing") == expected
+
+
+@pytest.mark.asyncio
+async def test_targeted_revision_regenerates_only_the_named_section(monkeypatch):
+    fake_llm = FakeRevisionModel()
+    monkeypatch.setattr(
+        writer,
+        "settings",
+        writer.settings.model_copy(update={"writer_targeted_revision": True, "min_word_count": 40}),
+    )
+    monkeypatch.setattr(writer, "get_article_count", lambda: writer.settings.low_corpus_threshold)
+    monkeypatch.setattr(writer, "get_draft_llm", lambda **kwargs: fake_llm)
+    monkeypatch.setattr(
+        writer,
+        "_fetch_rag_exemplars",
+        lambda topic, n=5: pytest.fail("targeted revision must not retrieve exemplars"),
+    )
+    monkeypatch.setattr(writer, "build_context_block", lambda context: "")
+    monkeypatch.setattr(writer, "estimate_cost_usd", lambda *args, **kwargs: 0.25)
+
+    result = await writer.writer_node(
+        {
+            "topic": "AI marketing w małej firmie",
+            "keywords": ["AI marketing"],
+            "heading_structure": "# AI marketing w małej firmie",
+            "research_report": "Raport",
+            "draft": _DRAFT,
+            "cp2_feedback": 'Sekcja "Narzędzia i koszty" jest zbyt ogólna, dodaj ceny.',
+        }
+    )
+
+    assert len(fake_llm.calls) == 1
+    order, system_prompt, user_prompt = fake_llm.calls[0]
+    assert order == 0
+    assert system_prompt == writer.WRITER_SECTION_SYSTEM_PROMPT
+    assert "Pierwsza linia odpowiedzi: ## Narzędzia i koszty" in user_prompt
+    assert "## Jak mierzyć efekty" in user_prompt  # outline of the whole draft
+    assert "WZORCE STYLISTYCZNE" not in user_prompt
+
+    draft = result["draft"]
+    old = writer.split_sections(_DRAFT)
+    new = writer.split_sections(draft)
+    assert [section.heading for section in new] == [section.heading for section in old]
+    for before, after in zip(old, new):
+        if before.heading != "## Narzędzia i koszty":
+            assert draft[after.start : after.end] == _DRAFT[before.start : before.end]
+    assert "Nowa treść z cenami narzędzi." in draft
+    assert "Dodatkowa sekcja" not in draft
+    assert result["draft_validated"] is True
+    assert result["tokens_used_draft"] == 30
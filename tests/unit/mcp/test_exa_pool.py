@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from bond.graph.nodes import researcher
+from bond.mcp import exa_pool
+from bond.mcp.exa_standin import StandinServer
+
+
+@pytest.fixture
+def standin():
+    server = StandinServer(latency_ms=50).start()
+    yield server
+    server.stop()
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_sessions_and_caps_concurrency(standin):
+    async with exa_pool.exa_mcp_pool(url=standin.url, size=2, max_concurrency=3) as pool:
+        results = await asyncio.gather(
+            *(
+                exa_pool.call_exa_tool("web_search_exa", {"query": f"zapytanie {i}", "numResults": 2})
+                for i in range(9)
+            )
+        )
+
+        assert results[4][0]["type"] == "text"
+        assert "URL: https://example.com/zapytanie-4/2" in results[4][0]["text"]
+        assert standin.counters["calls"] == 9
+        assert standin.counters["handshakes"] == 2
+        assert standin.counters["max_active"] <= 3
+        assert pool.stats()["ready_sessions"] == 2
+
+    assert exa_pool.get_exa_pool() is None
+
+
+@pytest.mark.asyncio
+async def test_pool_reconnects_after_server_outage(standin):
+    async with exa_pool.exa_mcp_pool(url=standin.url, size=1, connect_timeout=1.0, call_timeout=5.0) as pool:
+        await pool.call_tool("web_search_exa", {"query": "przed", "numResults": 1})
+
+        await asyncio.to_thread(standin.stop)
+        with pytest.raises(ConnectionError):
+            await pool.call_tool("web_search_exa", {"query": "awaria", "numResults": 1})
+
+        standin.start()
+        blocks = await pool.call_tool("web_search_exa", {"query": "po", "numResults": 1})
+
+        assert "po — wynik 1" in blocks[0]["text"]
+        assert pool.stats()["connects"] == 2
+
+
+@pytest.mark.asyncio
+async def test_researcher_call_without_lifespan_uses_one_off_session(standin, monkeypatch):
+    monkeypatch.setattr(exa_pool.settings, "exa_mcp_url", standin.url)
+
+    text = await researcher._call_exa_mcp("content marketing", ["B2B"], num_results=3)
+
+    assert text.count("Title: content marketing B2B") == 3
+    assert standin.counters["handshakes"] == 1
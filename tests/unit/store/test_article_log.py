@@ -0,0 +1,62 @@
+import sqlite3
+import threading
+
+import pytest
+
+from bond.store import article_log
+
+
+@pytest.fixture
+def article_db(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "articles.db")
+    monkeypatch.setattr(article_log.settings, "article_db_path", db_path)
+    yield db_path
+    article_log.close_article_db()
+
+
+def test_stats_row_tracks_batched_inserts_updates_and_deletes(article_db):
+    article_log.log_articles(
+        [
+            ("a", "own", "A", "https://example.com/a", 3, "ha"),
+            ("b", "own", "B", "", 4, "hb"),
+            ("c", "external", "C", "", 5, "hc"),
+        ]
+    )
+    article_log.log_article("b", "own", "B v2", "", 1, "hb2")
+    article_log.delete_articles(["c"])
+
+    assert article_log.get_corpus_stats() == {"article_count": 2, "chunk_count": 4}
+    assert article_log.get_article_count() == 2
+    assert article_log.get_chunk_count() == 4
+
+    snapshot = article_log.get_corpus_snapshot()
+    assert snapshot["article_count"] == 2
+    assert {doc["article_id"]: doc["title"] for doc in snapshot["documents"]} == {"a": "A", "b": "B v2"}
+
+
+def test_shared_connection_uses_wal_and_backfills_stats_for_existing_db(article_db):
+    with sqlite3.connect(article_db) as conn:
+        conn.execute(article_log.CREATE_TABLE)
+        conn.execute(
+            "INSERT INTO corpus_articles (article_id, source_type, chunk_count) VALUES ('old', 'own', 7)"
+        )
+
+    assert article_log.get_corpus_stats() == {"article_count": 1, "chunk_count": 7}
+    db = article_log._get_db()
+    assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert article_log._get_db() is db
+
+
+def test_concurrent_writers_share_one_connection(article_db):
+    def write(worker: int) -> None:
+        article_log.log_articles(
+            [(f"w{worker}-{i}", "own", "", "", 1, "") for i in range(20)]
+        )
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert article_log.get_corpus_stats() == {"article_count": 80, "chunk_count": 80}
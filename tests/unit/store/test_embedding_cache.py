@@ -0,0 +1,76 @@
+import numpy as np
+
+from bond.store.embedding_cache import CachedEmbeddingFunction, EmbeddingCache
+
+
+class CountingEmbeddingFunction:
+    model_name = "fake-model"
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def __call__(self, input):
+        self.calls.append(list(input))
+        return [np.array([float(len(text)), 1.0], dtype=np.float32) for text in input]
+
+    def get_config(self):
+        return {"model_name": self.model_name}
+
+
+def test_query_embeddings_are_cached_by_normalized_text():
+    inner = CountingEmbeddingFunction()
+    cache = EmbeddingCache(max_entries=10)
+    ef = CachedEmbeddingFunction(inner, cache=cache)
+
+    first = ef.embed_query(["Jak pisać  o AI?"])
+    second = ef.embed_query(["  Jak pisać o AI?\n", "Inny temat"])
+
+    assert inner.calls == [["Jak pisać  o AI?"], ["Inny temat"]]
+    assert np.array_equal(first[0], second[0])
+    assert cache.stats() == {"hits": 1, "disk_hits": 0, "misses": 2, "entries": 2, "max_entries": 10}
+
+
+def test_documents_reuse_cached_queries_without_filling_the_cache():
+    inner = CountingEmbeddingFunction()
+    cache = EmbeddingCache(max_entries=10)
+    ef = CachedEmbeddingFunction(inner, cache=cache)
+
+    ef.embed_query(["temat"])
+    ef(["temat", "fragment korpusu"])
+
+    assert inner.calls == [["temat"], ["fragment korpusu"]]
+    assert cache.stats()["entries"] == 1
+
+
+def test_lru_evicts_oldest_entry():
+    inner = CountingEmbeddingFunction()
+    ef = CachedEmbeddingFunction(inner, cache=EmbeddingCache(max_entries=2))
+
+    ef.embed_query(["a"])
+    ef.embed_query(["b"])
+    ef.embed_query(["a"])
+    ef.embed_query(["c"])
+    ef.embed_query(["b"])
+
+    assert inner.calls == [["a"], ["b"], ["c"], ["b"]]
+
+
+def test_disk_tier_survives_a_new_cache_instance(tmp_path):
+    path = str(tmp_path / "embeddings.db")
+    inner = CountingEmbeddingFunction()
+    CachedEmbeddingFunction(inner, cache=EmbeddingCache(max_entries=10, disk_path=path)).embed_query(["temat"])
+
+    restarted = EmbeddingCache(max_entries=10, disk_path=path)
+    vectors = CachedEmbeddingFunction(inner, cache=restarted).embed_query(["temat"])
+
+    assert len(inner.calls) == 1
+    assert vectors[0].tolist() == [5.0, 1.0]
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_wrapper_reports_sentence_transformer_identity():
+    inner = CountingEmbeddingFunction()
+    ef = CachedEmbeddingFunction(inner, cache=EmbeddingCache(max_entries=1))
+
+    assert ef.name() == "sentence_transformer"
+    assert ef.get_config() == {"model_name": "fake-model"}
@@ -0,0 +1,82 @@
+import sqlite3
+
+import numpy as np
+
+from bond.store import embedding_cache, embeddings
+from bond.store.embedding_cache import EmbeddingCache
+
+
+class FakeSentenceTransformerEF:
+    instances: list[dict] = []
+
+    def __init__(self, model_name, device, **kwargs):
+        self.model_name = model_name
+        self.calls = 0
+        FakeSentenceTransformerEF.instances.append({"model_name": model_name, "device": device, **kwargs})
+
+    def __call__(self, input):
+        self.calls += 1
+        return [np.ones(3, dtype=np.float32) for _ in input]
+
+
+def _install_fake(monkeypatch, backend="torch", onnx_file=""):
+    FakeSentenceTransformerEF.instances = []
+    monkeypatch.setattr(embeddings, "SentenceTransformerEmbeddingFunction", FakeSentenceTransformerEF)
+    monkeypatch.setattr(embeddings, "_registry", {})
+    monkeypatch.setattr(embeddings, "_load_seconds", {})
+    monkeypatch.setattr(embeddings.settings, "embedding_backend", backend)
+    monkeypatch.setattr(embeddings.settings, "embedding_onnx_file", onnx_file)
+
+
+def test_registry_loads_each_model_once(monkeypatch):
+    _install_fake(monkeypatch)
+
+    first = embeddings.get_embedding_function()
+    second = embeddings.get_embedding_function()
+
+    assert first is second
+    assert FakeSentenceTransformerEF.instances == [
+        {"model_name": embeddings.EMBEDDING_MODEL, "device": "cpu"}
+    ]
+
+
+def test_onnx_backend_passes_quantized_file(monkeypatch):
+    _install_fake(monkeypatch, backend="onnx", onnx_file="onnx/model_qint8_avx512_vnni.onnx")
+
+    embeddings.get_embedding_function()
+
+    assert FakeSentenceTransformerEF.instances[0]["backend"] == "onnx"
+    assert FakeSentenceTransformerEF.instances[0]["model_kwargs"] == {
+        "file_name": "onnx/model_qint8_avx512_vnni.onnx"
+    }
+
+
+def test_warm_up_reports_load_and_memory(monkeypatch):
+    _install_fake(monkeypatch)
+
+    report = embeddings.warm_up_embeddings()
+
+    assert [model["model"] for model in report["models"]] == [embeddings.EMBEDDING_MODEL]
+    assert report["backend"] == "torch"
+    assert report["rss_mb"] is None or report["rss_mb"] > 0
+    assert "warm_up_seconds" in report
+
+
+def test_backend_switch_misses_the_embedding_cache(monkeypatch, tmp_path):
+    cache = EmbeddingCache(max_entries=10, disk_path=str(tmp_path / "embeddings.db"))
+    monkeypatch.setattr(embedding_cache, "_cache", cache)
+    _install_fake(monkeypatch)
+    torch_ef = embeddings.get_embedding_function()
+    torch_ef.embed_query(["temat"])
+
+    _install_fake(monkeypatch, backend="onnx", onnx_file="onnx/model_qint8_avx512_vnni.onnx")
+    onnx_ef = embeddings.get_embedding_function()
+    onnx_ef.embed_query(["temat"])
+
+    assert onnx_ef._inner.calls == 1
+    assert torch_ef.model_name != onnx_ef.model_name
+    assert onnx_ef.model_name == f"{embeddings.EMBEDDING_MODEL}|onnx|onnx/model_qint8_avx512_vnni.onnx"
+    assert cache.stats()["misses"] == 2
+    with sqlite3.connect(str(tmp_path / "embeddings.db")) as conn:
+        stored = {row[0] for row in conn.execute("SELECT model_name FROM embedding_cache")}
+    assert stored == {torch_ef.model_name, onnx_ef.model_name}
@@ -0,0 +1,191 @@
+import importlib
+import random
+import sys
+
+import pytest
+
+# Other tests stub these modules; the reference path needs the real ones
+sys.modules["markdown"] = importlib.import_module("markdown")
+sys.modules["bs4"] = importlib.import_module("bs4")
+
+from bond.validation.draft import (  # noqa: E402
+    DraftDocument,
+    find_forbidden_stems,
+    parse_block,
+    reference_measurements,
+)
+
+_MIXED_DRAFT = """Meta-description: Krótki **opis** artykułu o automatyzacji redakcji.
+
+# Automatyzacja redakcji z *agentem* i [linkiem](https://example.com)
+
+Pierwszy akapit z `kodem`, **pogrubieniem** i nowoczesnym podejściem.
+Druga linia tego samego akapitu.
+
+## Lista kontrolna
+- punkt pierwszy z _kursywą_
+- punkt drugi
+  z kontynuacją
+
+1. jeden
+2. dwa
+
+> cytat z treścią
+> i drugą linią
+
+```python
+def f():
+
+    return "kluczowy"
+```
+
+Tytuł setext
+------------
+
+Tekst&nbsp;z encją &amp; znakiem < mniejszości.
+#Nagłówek bez spacji
+Akapit po nagłówku."""
+
+_EDGE_DRAFT = """Akapit przed meta, który nie jest meta.
+
+Meta description: druga forma prefiksu
+
+***
+
+    wcięty kod liczy się jako tekst
+
+Meta-description pojawia się tu w treści akapitu."""
+
+
+def _long_draft(sections: int = 30) -> str:
+    blocks = ["Meta-description: Opis.", "# Długi szkic"]
+    for index in range(sections):
+        blocks.append(f"## Sekcja {index}")
+        blocks.append(
+            f"Akapit {index} opisuje proces publikacji, **dane** i wnioski z praktyki zespołu. " * 3
+        )
+        blocks.append("- pierwszy punkt\n- drugi punkt z [linkiem](https://example.com)")
+    return "\n\n".join(blocks)
+
+
+_WORDS = ["marketing", "AI", "firma", "kampania", "dane", "klienci", "budżet", "raport", "nowoczesny", "wyjątkowe"]
+_INLINE = [
+    "{w}",
+    "{w}",
+    "{w}",
+    "**{w}**",
+    "*{w}*",
+    "_{w}_",
+    "`{w}`",
+    "[{w}](https://example.com/{w})",
+    "\\*{w}\\*",
+    "\\_{w}\\_",
+    "\\#{w}",
+    "{w}&amp;{w}",
+    "<{w}>",
+    "2 * 3",
+]
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_INLINE).format(w=rng.choice(_WORDS)) for _ in range(words))
+
+
+def _list(rng: random.Random, *, ordered: bool, loose: bool) -> str:
+    items = [
+        (f"{index}." if ordered else rng.choice("-*+")) + " " + _text(rng, rng.randint(1, 6))
+        for index in range(1, rng.randint(2, 5))
+    ]
+    return ("\n\n" if loose else "\n").join(items)
+
+
+_BLOCK_MAKERS = [
+    lambda rng: _text(rng, rng.randint(3, 20)),
+    lambda rng: _text(rng, rng.randint(3, 10)) + "\n" + _text(rng, rng.randint(3, 10)),
+    lambda rng: _list(rng, ordered=False, loose=False),
+    lambda rng: _list(rng, ordered=False, loose=True),
+    lambda rng: _list(rng, ordered=True, loose=rng.random() < 0.5),
+    lambda rng: _list(rng, ordered=False, loose=False) + "\n\n    " + _text(rng, 4),
+    lambda rng: _list(rng, ordered=False, loose=False) + "\n    - " + _text(rng, 3),
+    lambda rng: "    " + _text(rng, 5) + "\n    " + _text(rng, 3),
+    lambda rng: "```\n" + _text(rng, 5) + "\n```",
+    lambda rng: "> " + _text(rng, rng.randint(3, 10)),
+    lambda rng: "## " + _text(rng, rng.randint(1, 4)),
+    lambda rng: "### " + _text(rng, rng.randint(1, 4)),
+    lambda rng: _text(rng, rng.randint(1, 4)) + "\n" + rng.choice(["===", "---"]),
+    lambda rng: "***",
+]
+
+
+def _generated_draft(rng: random.Random) -> str:
+    """A draft in the shape the writer produces, with the markup a model tends to slip in."""
+    blocks = [rng.choice(_BLOCK_MAKERS)(rng) for _ in range(rng.randint(2, 10))]
+    blocks.insert(0, "# " + _text(rng, rng.randint(2, 5)))
+    if rng.random() < 0.7:
+        blocks.insert(0, "Meta-description: " + _text(rng, rng.randint(5, 15)))
+    if rng.random() < 0.2:
+        blocks.insert(0, rng.choice(_BLOCK_MAKERS)(rng))
+    return "\n\n".join(blocks)
+
+
+@pytest.mark.parametrize("draft", [_MIXED_DRAFT, _EDGE_DRAFT, _long_draft(), "", "# Tylko H1"])
+def test_single_pass_measurements_match_markdown_rendering(draft):
+    assert DraftDocument.from_markdown(draft).measure() == reference_measurements(draft)
+
+
+# Constructs the engine either parses itself or hands to python-markdown (raw HTML, reference links)
+_EDGE_CONSTRUCTS = {
+    "html_block": "# Tytuł\n\n<div>\nUkryty blok HTML z tekstem.\n\nDalej w bloku.\n</div>\n\nPierwszy akapit po bloku.",
+    "html_block_one_line": '# Tytuł\n\n<div class="box">Tekst w divie</div>\n\nAkapit.',
+    "html_comment": "# Tytuł\n\n<!-- komentarz redakcji -->\n\nPierwszy akapit.",
+    "html_comment_inline": "# Tytuł\n\nAkapit <!-- uwaga --> z komentarzem.",
+    "html_comment_multiline": "# Tytuł\n\n<!--\nkomentarz\n\nna kilka akapitów\n-->\n\nPierwszy akapit.",
+    "reference_link": '# Tytuł\n\nZobacz [to][1] teraz.\n\n[1]: https://example.com/a "Tytuł linku"',
+    "reference_defined_first": "# Tytuł\n\n[1]: https://example.com/a\n\nAkapit z [linkiem][1].",
+    "reference_shortcut": "# Tytuł\n\nZobacz [raport] tutaj.\n\n[raport]: https://example.com",
+    "heading_in_list_item": "# Tytuł\n\n- # nagłówek\n- punkt\n\nAkapit.",
+    "hard_break": "# Tytuł\n\nPierwsza linia  \ndruga linia akapitu.",
+    "intraword_underscores": "# Tytuł\n\nfoo__bar__baz i snake_case_name oraz foo*bar*baz.",
+    "link_url_with_parentheses": "# Tytuł\n\nZobacz [Wiki](https://pl.wikipedia.org/wiki/A_(b)) teraz.",
+    "link_url_with_parentheses_and_title": '# Tytuł\n\nZobacz [Wiki](https://pl.wikipedia.org/wiki/A_(b) "tytuł") teraz.',
+    "image_url_with_parentheses": "# Tytuł\n\n![alt](https://example.com/a_(b).png) Tekst.",
+}
+
+
+@pytest.mark.parametrize("draft", list(_EDGE_CONSTRUCTS.values()), ids=list(_EDGE_CONSTRUCTS))
+def test_edge_constructs_match_markdown_rendering(draft):
+    assert DraftDocument.from_markdown(draft).measure() == reference_measurements(draft)
+
+
+def test_generated_drafts_match_markdown_rendering():
+    rng = random.Random(20260418)
+    drafts = [_generated_draft(rng) for _ in range(500)]
+
+    mismatches = [
+        draft for draft in drafts if DraftDocument.from_markdown(draft).measure() != reference_measurements(draft)
+    ]
+
+    assert mismatches == []
+
+
+def test_forbidden_stems_follow_list_order_and_catch_inflections():
+    text = "Innowacyjne i NOWOCZESNE, a przy tym nowoczesny"
+    assert find_forbidden_stems(text) == ["nowoczesn", "innowacyjn"]
+    assert find_forbidden_stems("Zwykły tekst bez zakazanych słów.") == []
+
+
+def test_replacing_one_block_reparses_only_that_block():
+    document = DraftDocument.from_markdown(_long_draft())
+    index = document.find(lambda block: block.is_body_paragraph)
+    untouched = [block for position, block in enumerate(document.blocks) if position != index]
+
+    misses = parse_block.cache_info().misses
+    document.replace_block(index, "Nowy akapit z nowoczesnym słowem.\n\nI drugi akapit.")
+    assert parse_block.cache_info().misses - misses == 2
+
+    reparsed = DraftDocument.from_markdown(document.markdown)
+    assert parse_block.cache_info().misses - misses == 2
+    kept = reparsed.blocks[:index] + reparsed.blocks[index + 2 :]
+    assert all(block is old for block, old in zip(kept, untouched, strict=True))
+    assert reparsed.measure() == reference_measurements(document.markdown)
+    assert reparsed.measure().forbidden_stems == ["nowoczesn"]